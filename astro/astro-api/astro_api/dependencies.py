@@ -12,6 +12,7 @@ It creates singletons for:
 - LaunchpadController (main entry point)
 """
 
+import asyncio
 import logging
 import os
 from typing import Any
@@ -39,6 +40,9 @@ _second_brain: Any | None = None
 _foundry: Any | None = None
 _constellation_runner: Any | None = None
 _launchpad_controller: LaunchpadController | None = None
+_consolidation_task: asyncio.Task[None] | None = None
+_response_cache: Any | None = None
+_response_cache_loaded = False
 
 # Conversation cache (TTLCache prevents unbounded memory growth)
 _conversations: TTLCache[str, Conversation] = TTLCache(
@@ -91,34 +95,78 @@ async def get_second_brain() -> Any:
 
         from astro.core.llm.utils import get_embedding_provider
         from astro.core.memory import ContextWindow, LongTermMemory, SecondBrain
+        from astro.core.memory.compression import SummarizationCompression
+        from astro.core.memory.hybrid import HybridMemoryBackend
         from astro_mongodb import MongoDBMemory
 
         mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
         db_name = os.getenv("MONGO_DB", "astro")
         use_atlas = os.getenv("USE_ATLAS_SEARCH", "false").lower() == "true"
+        # Scope memories to user/workspace/global namespaces, one index each
+        namespaced = os.getenv("MEMORY_NAMESPACES", "false").lower() == "true"
 
+        embedding_provider = get_embedding_provider()
         memory_backend = MongoDBMemory(
             uri=mongo_uri,
             database=db_name,
             collection="memories",
             use_atlas_search=use_atlas,
+            # Recorded per memory; startup warns about memories from other models
+            embedding_model=getattr(embedding_provider, "model", None),
+            namespace_partitions=namespaced,
         )
+        # Fuse local BM25 with vector search so tickers and figures match exactly
+        if os.getenv("MEMORY_HYBRID_SEARCH", "true").lower() == "true":
+            memory_backend = HybridMemoryBackend(memory_backend)
         await memory_backend.startup()
 
-        context_window = ContextWindow(max_chars=50000)
-        embedding_provider = get_embedding_provider()
+        # Summarize older turns with the fast model, off the request path
+        context_window = ContextWindow(
+            max_chars=50000,
+            compression_strategy=SummarizationCompression(llm=await get_lightweight_llm()),
+        )
+        # Persist memories in background batches so responses don't wait
+        write_behind = os.getenv("MEMORY_WRITE_BEHIND", "true").lower() == "true"
+        # Merge near-duplicate exchanges instead of storing each copy (0 disables)
+        dedup_threshold = float(os.getenv("MEMORY_DEDUP_THRESHOLD", "0.95"))
         long_term = LongTermMemory(
             backend=memory_backend,
             embedding_provider=embedding_provider,
+            write_behind=write_behind,
+            dedup_threshold=dedup_threshold or None,
         )
 
-        _second_brain = SecondBrain(context_window, long_term)
+        _second_brain = SecondBrain(context_window, long_term, namespaced=namespaced)
+
+        # Periodically summarize and archive aged memory clusters (0 disables)
+        consolidation_interval = float(os.getenv("MEMORY_CONSOLIDATION_INTERVAL", "0"))
+        if consolidation_interval > 0:
+            await _start_consolidation(memory_backend, embedding_provider, consolidation_interval)
 
         logger.info("SecondBrain initialized with MongoDBMemory backend")
 
     return _second_brain
 
 
+async def _start_consolidation(
+    backend: Any, embedding_provider: Any, interval_s: float
+) -> None:
+    """Start the background memory consolidation task."""
+    global _consolidation_task
+    from astro.core.memory.consolidation import MemoryConsolidator
+
+    consolidator = MemoryConsolidator(
+        backend,
+        await get_lightweight_llm(),
+        embedding_provider,
+        checkpoint_path=os.getenv(
+            "MEMORY_CONSOLIDATION_CHECKPOINT", ".astro/consolidation.json"
+        ),
+    )
+    _consolidation_task = asyncio.create_task(consolidator.run_periodically(interval_s))
+    logger.info(f"Memory consolidation scheduled every {interval_s:.0f}s")
+
+
 class FoundryAdapter:
     """Adapts Registry + OrchestrationStorage into the interface expected by ConstellationRunner.
 
@@ -270,11 +318,11 @@ async def get_lightweight_llm() -> Any:
     Returns:
         LLM provider for directive selection.
     """
-    # Use existing V1 LLM utilities
-    from astro.core.llm.utils import get_langchain_llm
+    from astro.core.llm.routing import get_router
 
-    # TODO: Consider adding model parameter to use Haiku specifically
-    return get_langchain_llm()
+    # Fast tier per the routing policy (LLM_FAST_MODEL / LLM_ROUTING_POLICY)
+    router = get_router()
+    return router.get_llm(router.route("interpreter"))
 
 
 async def get_powerful_llm() -> Any:
@@ -283,10 +331,30 @@ async def get_powerful_llm() -> Any:
     Returns:
         LLM provider for execution.
     """
-    # Use existing V1 LLM utilities
-    from astro.core.llm.utils import get_langchain_llm
+    from astro.core.llm.routing import get_router
+
+    # Strong tier per the routing policy
+    router = get_router()
+    return router.get_llm(router.route("running_agent"))
+
 
-    return get_langchain_llm()
+async def get_response_cache() -> Any:
+    """Get the zero-shot response cache singleton.
+
+    Configured by RESPONSE_CACHE, RESPONSE_CACHE_TTL and
+    RESPONSE_CACHE_THRESHOLD.
+
+    Returns:
+        SemanticResponseCache, or None when disabled.
+    """
+    global _response_cache, _response_cache_loaded
+    if not _response_cache_loaded:
+        from astro.core.llm.utils import get_embedding_provider
+        from astro.launchpad.response_cache import response_cache_from_env
+
+        _response_cache = response_cache_from_env(get_embedding_provider())
+        _response_cache_loaded = True
+    return _response_cache
 
 
 async def get_zero_shot_pipeline() -> Any:
@@ -319,13 +387,20 @@ async def get_launchpad_controller() -> LaunchpadController:
         lightweight_llm = await get_lightweight_llm()
         powerful_llm = await get_powerful_llm()
 
+        from astro.core.llm.routing import get_router
+
         # Import ProbeRegistry (class-level singleton, not an instance)
         from astro.core.probes.registry import ProbeRegistry
 
-        # Create Interpreter (uses lightweight LLM)
+        # Create Interpreter (uses lightweight LLM, escalating to the powerful
+        # one on low confidence when the two tiers differ)
+        router = get_router()
+        escalation = router.escalate(router.route("interpreter"), "low confidence")
         interpreter = Interpreter(
             registry=registry,
             llm_provider=lightweight_llm,
+            escalation_llm=powerful_llm if escalation is not None else None,
+            min_confidence=router.policy.min_confidence,
         )
 
         # Create RunningAgent (uses powerful LLM)
@@ -355,6 +430,7 @@ async def get_launchpad_controller() -> LaunchpadController:
             second_brain=second_brain,
             directive_generator=directive_generator,
             context_gatherer=context_gatherer,
+            response_cache=await get_response_cache(),
         )
 
         # Create ConstellationPipeline
@@ -420,7 +496,8 @@ async def get_runner() -> Any:
 
 async def cleanup() -> None:
     """Cleanup resources on shutdown."""
-    global _registry, _second_brain, _foundry, _constellation_runner, _launchpad_controller, _conversations
+    global _registry, _second_brain, _foundry, _constellation_runner, _launchpad_controller, _conversations, _consolidation_task
+    global _response_cache, _response_cache_loaded
 
     logger.debug("Starting cleanup of global resources...")
 
@@ -431,16 +508,25 @@ async def cleanup() -> None:
         _registry = None
         logger.debug("Registry shutdown complete")
 
+    if _consolidation_task is not None:
+        _consolidation_task.cancel()
+        _consolidation_task = None
+
     if _second_brain is not None:
         # SecondBrain cleanup
         if hasattr(_second_brain, 'shutdown'):
             await _second_brain.shutdown()
+        backend = _second_brain.long_term.backend
+        if hasattr(backend, 'shutdown'):
+            await backend.shutdown()
         _second_brain = None
         logger.debug("SecondBrain shutdown complete")
 
     _foundry = None
     _constellation_runner = None
     _launchpad_controller = None
+    _response_cache = None
+    _response_cache_loaded = False
 
     conversation_count = len(_conversations)
     _conversations.clear()
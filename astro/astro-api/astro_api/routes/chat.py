@@ -77,7 +77,9 @@ async def stream_chat_response(
             pipeline = await get_zero_shot_pipeline()
 
             final_output = None
-            async for event in pipeline.execute_with_events(request.message, conversation):
+            async for event in pipeline.execute_with_events(
+                request.message, conversation, use_cache=not request.bypass_cache
+            ):
                 event_type = event.get("type")
 
                 if event_type == "thinking":
@@ -143,6 +145,15 @@ async def stream_chat_response(
                         "message": event.get("message", ""),
                     })
 
+                elif event_type == "cache_hit":
+                    # Answer served from the response cache
+                    yield sse_event("cache_hit", {
+                        "cached_query": event.get("cached_query", ""),
+                        "similarity": event.get("similarity", 0.0),
+                        "age_s": event.get("age_s", 0.0),
+                        "message": event.get("message", ""),
+                    })
+
                 elif event_type == "output":
                     # This is the final output
                     final_output = event.get("output")
@@ -85,6 +85,7 @@ def _build_constellation(request: ConstellationCreate) -> Constellation:
         max_loop_iterations=request.max_loop_iterations,
         max_retry_attempts=request.max_retry_attempts,
         retry_delay_base=request.retry_delay_base,
+        budget=request.budget,
         metadata=request.metadata,
     )
 
@@ -204,8 +205,12 @@ async def update_constellation(
         logger.debug(f"Constellation not found for update: {id}")
         raise HTTPException(status_code=404, detail=f"Constellation '{id}' not found")
 
-    # Apply updates
+    # Apply updates (validating the budget, which is a nested model)
     for key, value in updates.items():
+        if key == "budget" and value is not None:
+            from astro.orchestration.models import RunBudget
+
+            value = RunBudget.model_validate(value)
         setattr(existing, key, value)
 
     try:
@@ -238,6 +243,7 @@ async def delete_constellation(
 async def run_constellation(
     id: str,
     variables: str = Form("{}"),  # JSON string of variables
+    budget: str | None = Form(None),  # Optional JSON RunBudget for this run
     file: UploadFile | None = File(None),  # Optional file upload
     storage = Depends(get_orchestration_storage),
     runner: ConstellationRunner = Depends(get_runner),
@@ -265,6 +271,17 @@ async def run_constellation(
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON in variables field")
 
+    # Parse the optional per-run budget
+    run_budget = None
+    if budget:
+        from astro.orchestration.models import RunBudget
+        from pydantic import ValidationError
+
+        try:
+            run_budget = RunBudget.model_validate_json(budget)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid budget: {e}")
+
     # Verify constellation exists
     constellation = await storage.get_constellation(id)
     if constellation is None:
@@ -331,6 +348,7 @@ async def run_constellation(
                 variables=variables_dict,
                 original_query=original_query,
                 run_id=run_id,
+                budget=run_budget,
             )
             logger.info(f"Background execution completed: run_id={run_id}")
         except Exception as e:
@@ -6,7 +6,7 @@ from astro.core.models import Directive
 from astro.core.registry import Registry, ValidationError
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from astro_api.dependencies import get_registry
+from astro_api.dependencies import get_registry, get_response_cache
 from astro_api.schemas import (
     DirectiveCreate,
     DirectiveResponse,
@@ -19,6 +19,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def _invalidate_cached_responses(directive_id: str) -> None:
+    """Drop cached zero-shot answers built from a changed directive."""
+    cache = await get_response_cache()
+    if cache is not None:
+        dropped = cache.invalidate(directive_id)
+        logger.debug(f"Invalidated {dropped} cached responses for directive {directive_id}")
+
+
 @router.get("", response_model=list[DirectiveSummary])
 async def list_directives(
     foundry: Registry = Depends(get_registry),
@@ -94,6 +102,7 @@ async def update_directive(
     try:
         updated, warnings = await foundry.update_directive(id, updates)
         logger.info(f"Directive updated: {id} with {len(warnings)} warnings")
+        await _invalidate_cached_responses(id)
         return DirectiveResponse(
             directive=updated.model_dump(),
             warnings=[w.message for w in warnings],
@@ -119,6 +128,7 @@ async def delete_directive(
             logger.debug(f"Directive not found for deletion: {id}")
             raise HTTPException(status_code=404, detail=f"Directive '{id}' not found")
         logger.info(f"Directive deleted: {id}")
+        await _invalidate_cached_responses(id)
     except ValidationError as e:
         if "referenced by" in str(e).lower():
             logger.warning(f"Cannot delete directive {id}: still referenced")
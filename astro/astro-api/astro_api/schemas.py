@@ -84,6 +84,7 @@ class ConstellationCreate(BaseModel):
     max_loop_iterations: int = 3
     max_retry_attempts: int = 3
     retry_delay_base: float = 2.0
+    budget: dict[str, Any] = Field(default_factory=dict)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
@@ -97,6 +98,7 @@ class ConstellationUpdate(BaseModel):
     max_loop_iterations: int | None = None
     max_retry_attempts: int | None = None
     retry_delay_base: float | None = None
+    budget: dict[str, Any] | None = None
     metadata: dict[str, Any] | None = None
 
 
@@ -104,6 +106,9 @@ class RunRequest(BaseModel):
     """Request schema for running a constellation."""
 
     variables: dict[str, Any]
+    budget: dict[str, Any] | None = Field(
+        None, description="Per-run limits; each can only tighten the constellation's"
+    )
 
 
 class ConfirmRequest(BaseModel):
@@ -121,6 +126,7 @@ class ChatRequest(BaseModel):
 
     message: str
     conversation_id: str | None = None
+    bypass_cache: bool = False
 
 
 # =============================================================================
@@ -4,6 +4,7 @@ This package provides MongoDB implementations of Astro's storage protocols:
 - MongoDBCoreStorage: CoreStorageBackend implementation for directives
 - MongoDBOrchestrationStorage: OrchestrationStorageBackend implementation for stars/constellations/runs
 - MongoDBMemory: MemoryBackend implementation with vector search
+- ReembeddingJob: Re-embeds stored memories after an embedding model change
 
 Requirements:
 - MongoDB 6.0+ for vector search support
@@ -45,6 +46,7 @@ Example usage:
 from astro_mongodb.core_storage import MongoDBCoreStorage
 from astro_mongodb.memory import MongoDBMemory
 from astro_mongodb.orchestration_storage import MongoDBOrchestrationStorage
+from astro_mongodb.reembed import ReembeddingJob
 
 __version__ = "2.0.0"
 
@@ -52,4 +54,5 @@ __all__ = [
     "MongoDBCoreStorage",
     "MongoDBOrchestrationStorage",
     "MongoDBMemory",
+    "ReembeddingJob",
 ]
@@ -0,0 +1,126 @@
+"""Compact embedding encodings for memory documents.
+
+Embeddings stored as float lists become BSON doubles: 8 bytes per dimension,
+decoded into Python lists on every read. The compact formats pack the vector
+into a single BinData value:
+
+- "float32": BSON vector (subtype 9, FLOAT32), 4 bytes/dim. Searchable by
+  Atlas vector search.
+- "int8": BSON vector (subtype 9, INT8) with a per-vector scale, 1 byte/dim.
+  Cosine similarity is scale-invariant, so Atlas can search it unscaled.
+- "float16": raw little-endian float16 BinData, 2 bytes/dim. Local mode only.
+- "float64": the legacy float list.
+
+Compact documents carry ``embedding_format``, ``embedding_norm`` (L2 norm of
+the original vector) and, for int8, ``embedding_scale``. Documents without
+``embedding_format`` are legacy float lists, so both layouts can coexist
+while a migration runs.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from bson.binary import Binary
+
+if TYPE_CHECKING:
+    from astro.interfaces.memory import EmbeddingFormat
+
+EMBEDDING_FORMATS = ("float64", "float32", "float16", "int8")
+
+# Formats Atlas $vectorSearch can index
+ATLAS_EMBEDDING_FORMATS = ("float64", "float32", "int8")
+
+# Document fields written alongside a compact embedding
+EMBEDDING_FIELDS = ("embedding", "embedding_format", "embedding_norm", "embedding_scale")
+
+# BSON binary vector subtype and its dtype header bytes (dtype, padding)
+VECTOR_SUBTYPE = 9
+_FLOAT32_HEADER = b"\x27\x00"
+_INT8_HEADER = b"\x03\x00"
+
+
+def encode_embedding(
+    embedding: list[float] | np.ndarray, embedding_format: "EmbeddingFormat"
+) -> dict[str, Any]:
+    """Encode an embedding into document fields.
+
+    Args:
+        embedding: Embedding vector.
+        embedding_format: Target storage format.
+
+    Returns:
+        Fields to set on the memory document. For "float64" this is just the
+        float list; compact formats add format, norm and (int8) scale.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if embedding_format == "float64":
+        return {"embedding": [float(x) for x in embedding]}
+
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    fields: dict[str, Any] = {
+        "embedding_format": embedding_format,
+        "embedding_norm": float(np.linalg.norm(vector)),
+    }
+    if embedding_format == "float32":
+        fields["embedding"] = Binary(
+            _FLOAT32_HEADER + vector.astype("<f4").tobytes(), VECTOR_SUBTYPE
+        )
+    elif embedding_format == "float16":
+        fields["embedding"] = Binary(vector.astype("<f2").tobytes())
+    elif embedding_format == "int8":
+        peak = float(np.max(np.abs(vector))) if vector.size else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        fields["embedding"] = Binary(_INT8_HEADER + quantized.tobytes(), VECTOR_SUBTYPE)
+        fields["embedding_scale"] = scale
+    else:
+        raise ValueError(
+            f"Unknown embedding format {embedding_format!r}; "
+            f"expected one of {', '.join(EMBEDDING_FORMATS)}"
+        )
+    return fields
+
+
+def decode_embedding(doc: dict[str, Any]) -> np.ndarray:
+    """Decode a document's embedding, whatever format it was stored in.
+
+    Args:
+        doc: Memory document (needs the fields in ``EMBEDDING_FIELDS``).
+
+    Returns:
+        float32 vector (int8 vectors are rescaled to the original range).
+    """
+    embedding = doc["embedding"]
+    embedding_format = doc.get("embedding_format")
+    if embedding_format is None or embedding_format == "float64":
+        return np.asarray(embedding, dtype=np.float32)
+
+    data = bytes(embedding)
+    if embedding_format == "float32":
+        return np.frombuffer(data, dtype="<f4", offset=2).astype(np.float32)
+    if embedding_format == "float16":
+        return np.frombuffer(data, dtype="<f2").astype(np.float32)
+    if embedding_format == "int8":
+        quantized = np.frombuffer(data, dtype=np.int8, offset=2)
+        vector: np.ndarray = quantized.astype(np.float32) * np.float32(
+            doc.get("embedding_scale", 1.0)
+        )
+        return vector
+    raise ValueError(f"Unknown embedding format {embedding_format!r}")
+
+
+def embedding_size(doc: dict[str, Any]) -> int:
+    """Approximate stored size of a document's embedding in bytes.
+
+    Args:
+        doc: Memory document.
+
+    Returns:
+        Bytes used by the embedding value (BSON doubles count 8 per dimension).
+    """
+    embedding = doc["embedding"]
+    if isinstance(embedding, (bytes, Binary)):
+        return len(embedding)
+    return 8 * len(embedding)
@@ -1,15 +1,55 @@
 """MongoDB implementation of MemoryBackend with vector search support."""
 
+import asyncio
 import logging
 import time
-from typing import Any
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import ASCENDING
+from pymongo import ASCENDING, DESCENDING, ReplaceOne, UpdateOne
 from pymongo.errors import ConnectionFailure
+from pymongo.operations import SearchIndexModel
+
+from astro_mongodb.embedding_codec import (
+    ATLAS_EMBEDDING_FORMATS,
+    EMBEDDING_FIELDS,
+    EMBEDDING_FORMATS,
+    decode_embedding,
+    embedding_size,
+    encode_embedding,
+)
+from astro_mongodb.partitions import DEFAULT_MAX_RESIDENT_PARTITIONS, PartitionedIndex
+from astro_mongodb.vector_index import DEFAULT_ANN_THRESHOLD, AnnMode, VectorIndex
+
+if TYPE_CHECKING:
+    from astro.interfaces.memory import EmbeddingFormat
 
 logger = logging.getLogger(__name__)
 
+# Documents fetched per batch when loading the local vector index
+INDEX_LOAD_BATCH_SIZE = 1000
+
+# Documents rewritten per bulk write when migrating embedding formats
+MIGRATION_BATCH_SIZE = 500
+
+# Projection for reading just the (possibly compact) embedding of a document
+EMBEDDING_PROJECTION = {field: 1 for field in EMBEDDING_FIELDS}
+
+# Metadata fields indexed for filtered search unless filter_fields is given
+DEFAULT_FILTER_FIELDS = ("user_id", "conversation_id", "directive_ids", "type", "namespace")
+
+# Metadata key partitioning memories (see astro.core.memory.namespaces)
+NAMESPACE_FIELD = "namespace"
+
+# Namespace of memories stored without one
+GLOBAL_NAMESPACE = "global"
+
+# Range operators accepted on "timestamp" filters (matched against store time)
+RANGE_OPERATORS = frozenset({"$gt", "$gte", "$lt", "$lte"})
+
 
 class MongoDBMemory:
     """MongoDB implementation of MemoryBackend with vector search.
@@ -17,8 +57,9 @@ class MongoDBMemory:
     Stores memory entries with vector embeddings for semantic search.
     Requires MongoDB 6.0+ with Atlas Search or vector search capabilities.
 
-    For local development without Atlas, uses aggregation pipeline with
-    cosine similarity (slower but functional).
+    Without Atlas, embeddings are kept in an in-process VectorIndex loaded
+    at startup() and updated on store()/delete(), so searches never scan
+    the collection.
 
     Args:
         uri: MongoDB connection URI
@@ -26,6 +67,22 @@ class MongoDBMemory:
         collection: Collection name for memories (default: "memories")
         use_atlas_search: Whether to use Atlas vector search (default: False)
         atlas_index_name: Name of Atlas search index (default: "memory_vector_index")
+        use_local_index: Keep a resident vector index in local mode (default: True)
+        index_snapshot_path: File to snapshot the local index to on shutdown
+            and restore from on startup (default: None, no snapshot)
+        ann: Local index search mode: "auto", "exact", "ivf" or "hnsw"
+        ann_threshold: Index size at which "auto" switches to approximate search
+        embedding_format: How embeddings are stored: "float64" (float list,
+            default), "float32" (BinData vector), "float16" or "int8"
+            (quantized, with stored norms). See migrate_embeddings().
+        filter_fields: Metadata fields declared filterable (default:
+            user_id, conversation_id, directive_ids, type, namespace)
+        embedding_model: Name of the model producing stored embeddings,
+            recorded on each memory (default: None, not recorded)
+        namespace_partitions: In local mode, keep one index per memory
+            namespace, loaded on first use (default: False)
+        max_resident_partitions: Namespace indexes kept in RAM before the
+            least recently used is evicted
 
     Example:
         ```python
@@ -87,13 +144,55 @@ class MongoDBMemory:
                }
              }
              ```
+           Or call ``await memory.create_atlas_index(dimensions=1536)``,
+           which also declares the filter fields (see atlas_index_definition()).
         3. Set use_atlas_search=True
 
+    Filtering:
+        ``filter_metadata`` is an equality match on ``metadata.<key>`` (list
+        fields match any element); ``{"timestamp": {"$gte": t}}`` with range
+        operators filters on store time (epoch seconds). Each declared
+        ``filter_fields`` entry gets a compound (field, timestamp) index,
+        is an Atlas pre-filter, and in local mode keeps per-value segments
+        in the resident index, so equality-filtered searches score only the
+        matching partition without querying MongoDB. Other keys still work
+        locally but are resolved by MongoDB; Atlas rejects filters on paths
+        its index does not declare.
+
     Local Development:
         For local MongoDB without Atlas:
         - Set use_atlas_search=False
-        - Uses aggregation pipeline with cosine similarity
-        - Slower but functional for development
+        - Embeddings are loaded into an in-process VectorIndex at startup
+          (exact top-k; IVF or HNSW above ``ann_threshold`` memories)
+        - Set index_snapshot_path to restart from a snapshot instead of
+          re-reading every embedding
+        - Writes made by other processes are picked up by refresh_index()
+        - With use_local_index=False, every search scans the collection
+
+    Embedding Storage:
+        Float lists cost 8 bytes per dimension. embedding_format="float32"
+        halves that (and is searchable by Atlas); "float16" and "int8" cut it
+        4x and 8x at a small accuracy cost ("float16" is local mode only).
+        Documents in different formats can coexist; migrate_embeddings()
+        rewrites existing documents in place.
+
+    Namespace Partitions:
+        With namespace_partitions=True, the local index is split into one
+        VectorIndex per ``metadata["namespace"]`` (user, workspace or
+        global tier; memories without one are global). A search filtered on
+        a single namespace loads that shard on first use and scores only
+        it; up to max_resident_partitions shards stay in RAM, least
+        recently used evicted first. Searches across namespaces are fanned
+        out by the caller (LongTermMemory with ``namespaces``); searches
+        without a namespace filter scan the collection. Shards are not
+        snapshotted.
+
+    Embedding Models:
+        Each memory records ``embedding_dim`` and, when embedding_model is
+        set, ``embedding_model``. Vectors from different models are not
+        comparable, so startup() warns when stored memories were embedded
+        by another model; astro_mongodb.reembed.ReembeddingJob re-embeds
+        them without stopping writes or searches.
     """
 
     def __init__(
@@ -103,6 +202,15 @@ class MongoDBMemory:
         collection: str = "memories",
         use_atlas_search: bool = False,
         atlas_index_name: str = "memory_vector_index",
+        use_local_index: bool = True,
+        index_snapshot_path: str | Path | None = None,
+        ann: AnnMode = "auto",
+        ann_threshold: int = DEFAULT_ANN_THRESHOLD,
+        embedding_format: "EmbeddingFormat" = "float64",
+        filter_fields: list[str] | tuple[str, ...] | None = None,
+        embedding_model: str | None = None,
+        namespace_partitions: bool = False,
+        max_resident_partitions: int = DEFAULT_MAX_RESIDENT_PARTITIONS,
     ) -> None:
         """Initialize MongoDB memory backend.
 
@@ -112,14 +220,54 @@ class MongoDBMemory:
             collection: Collection name for memories (default: "memories")
             use_atlas_search: Whether to use Atlas vector search (default: False)
             atlas_index_name: Name of Atlas search index (default: "memory_vector_index")
+            use_local_index: Keep a resident vector index in local mode (default: True)
+            index_snapshot_path: Local index snapshot file (default: None)
+            ann: Local index search mode (default: "auto")
+            ann_threshold: Size at which "auto" switches to approximate search
+            embedding_format: Embedding storage format (default: "float64")
+            filter_fields: Filterable metadata fields (default:
+                DEFAULT_FILTER_FIELDS)
+            embedding_model: Embedding model name recorded on each memory
+            namespace_partitions: One local index per namespace (default: False)
+            max_resident_partitions: Namespace indexes kept in RAM
+
+        Raises:
+            ValueError: If the embedding format is unknown, or not searchable
+                by Atlas when use_atlas_search is set
         """
+        if embedding_format not in EMBEDDING_FORMATS:
+            raise ValueError(
+                f"Unknown embedding format {embedding_format!r}; "
+                f"expected one of {', '.join(EMBEDDING_FORMATS)}"
+            )
+        if use_atlas_search and embedding_format not in ATLAS_EMBEDDING_FORMATS:
+            raise ValueError(
+                f"Atlas vector search cannot index {embedding_format} embeddings; "
+                f"use one of {', '.join(ATLAS_EMBEDDING_FORMATS)}"
+            )
+
         self.uri = uri
         self.database_name = database
         self.collection_name = collection
         self.use_atlas_search = use_atlas_search
         self.atlas_index_name = atlas_index_name
+        self.use_local_index = use_local_index
+        self.index_snapshot_path = (
+            Path(index_snapshot_path) if index_snapshot_path else None
+        )
+        self.ann = ann
+        self.ann_threshold = ann_threshold
+        self.embedding_format = embedding_format
+        self.filter_fields = tuple(
+            DEFAULT_FILTER_FIELDS if filter_fields is None else filter_fields
+        )
+        self.embedding_model = embedding_model
+        self.namespace_partitions = namespace_partitions
+        self.max_resident_partitions = max_resident_partitions
         self._client: AsyncIOMotorClient | None = None
         self._db: AsyncIOMotorDatabase | None = None
+        self._index: VectorIndex | None = None
+        self._partitions: PartitionedIndex | None = None
 
     async def startup(self) -> None:
         """Initialize storage backend.
@@ -148,15 +296,34 @@ class MongoDBMemory:
                 [("timestamp", ASCENDING)],
                 background=True,
             )
+            # Filter field first, then time, so partition + range scans are tight
+            for field in self.filter_fields:
+                await collection.create_index(
+                    [(f"metadata.{field}", ASCENDING), ("timestamp", DESCENDING)],
+                    background=True,
+                )
             logger.info(f"Created indexes on {self.collection_name}")
 
+            if self.embedding_model:
+                await self._check_embedding_model()
+
             if self.use_atlas_search:
                 logger.info(
                     f"Using Atlas vector search with index: {self.atlas_index_name}"
                 )
+            elif self.use_local_index and self.namespace_partitions:
+                self._partitions = PartitionedIndex(
+                    self._load_partition, self.max_resident_partitions
+                )
+                logger.info(
+                    "Using per-namespace local vector indexes "
+                    f"(up to {self.max_resident_partitions} resident)"
+                )
+            elif self.use_local_index:
+                await self._load_index()
             else:
                 logger.info(
-                    "Using aggregation pipeline for vector search (local mode)"
+                    "Using collection scan for vector search (local mode)"
                 )
 
         except ConnectionFailure as e:
@@ -169,8 +336,17 @@ class MongoDBMemory:
     async def shutdown(self) -> None:
         """Cleanup storage backend.
 
-        Closes MongoDB connection. Safe to call multiple times.
+        Saves the local index snapshot (if configured) and closes the MongoDB
+        connection. Safe to call multiple times.
         """
+        if self._index is not None and self.index_snapshot_path:
+            try:
+                self._index.save(self.index_snapshot_path)
+            except OSError as e:
+                logger.warning(f"Failed to save vector index snapshot: {e}")
+        self._index = None
+        self._partitions = None
+
         if self._client:
             self._client.close()
             self._client = None
@@ -205,7 +381,7 @@ class MongoDBMemory:
             doc = {
                 "_id": id,
                 "content": content,
-                "embedding": embedding,
+                **self._embedding_fields(embedding),
                 "metadata": metadata,
                 "timestamp": time.time(),
             }
@@ -217,12 +393,161 @@ class MongoDBMemory:
                 upsert=True,
             )
 
+            if self._index is not None:
+                self._index.add(id, embedding, metadata)
+                self._index.watermark = max(self._index.watermark, doc["timestamp"])
+            if self._partitions is not None:
+                self._partitions.add(
+                    _namespace(metadata), id, embedding, metadata, doc["timestamp"]
+                )
+
             logger.debug(f"Stored memory: {id}")
 
         except Exception as e:
             logger.error(f"Failed to store memory {id}: {e}")
             raise RuntimeError(f"Failed to store memory: {e}") from e
 
+    async def store_many(
+        self,
+        entries: list[tuple[str, str, list[float], dict[str, Any]]],
+    ) -> None:
+        """Store several memory entries in one bulk write.
+
+        Args:
+            entries: (id, content, embedding, metadata) tuples
+
+        Raises:
+            RuntimeError: If storage not initialized or store fails
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        if not entries:
+            return
+
+        try:
+            collection = self._db[self.collection_name]
+            now = time.time()
+            await collection.bulk_write(
+                [
+                    ReplaceOne(
+                        {"_id": id},
+                        {
+                            "_id": id,
+                            "content": content,
+                            **self._embedding_fields(embedding),
+                            "metadata": metadata,
+                            "timestamp": now,
+                        },
+                        upsert=True,
+                    )
+                    for id, content, embedding, metadata in entries
+                ],
+                ordered=False,
+            )
+
+            if self._index is not None:
+                for id, _, embedding, metadata in entries:
+                    self._index.add(id, embedding, metadata)
+                self._index.watermark = max(self._index.watermark, now)
+            if self._partitions is not None:
+                for id, _, embedding, metadata in entries:
+                    self._partitions.add(_namespace(metadata), id, embedding, metadata, now)
+
+            logger.debug(f"Stored {len(entries)} memories")
+
+        except Exception as e:
+            logger.error(f"Failed to store {len(entries)} memories: {e}")
+            raise RuntimeError(f"Failed to store memories: {e}") from e
+
+    def _embedding_fields(self, embedding: list[float]) -> dict[str, Any]:
+        """Encoded embedding plus the model and dimension that produced it."""
+        fields = {
+            **encode_embedding(embedding, self.embedding_format),
+            "embedding_dim": len(embedding),
+        }
+        if self.embedding_model:
+            fields["embedding_model"] = self.embedding_model
+        return fields
+
+    async def _check_embedding_model(self) -> None:
+        """Warn when stored memories were embedded by a different model."""
+        try:
+            stale = await self.count_stale_embeddings()
+        except Exception as e:
+            logger.debug(f"Skipped embedding model check: {e}")
+            return
+        if stale:
+            logger.warning(
+                f"{stale} memories in {self.collection_name} were not embedded "
+                f"with {self.embedding_model} and will not match its queries; "
+                f"re-embed them with astro_mongodb.reembed.ReembeddingJob"
+            )
+
+    async def count_stale_embeddings(self, model: str | None = None) -> int:
+        """Count memories not embedded by a model.
+
+        Memories stored before models were recorded count as stale.
+
+        Args:
+            model: Embedding model name (default: this backend's
+                embedding_model)
+
+        Returns:
+            Number of memories with an embedding from another model
+
+        Raises:
+            RuntimeError: If storage not initialized
+            ValueError: If no model is given or configured
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        model = model or self.embedding_model
+        if not model:
+            raise ValueError("No embedding model given or configured")
+        return int(
+            await self._db[self.collection_name].count_documents(
+                {"embedding": {"$exists": True}, "embedding_model": {"$ne": model}}
+            )
+        )
+
+    async def update_metadata(self, id: str, metadata: dict[str, Any]) -> bool:
+        """Replace a memory's metadata and refresh its timestamp.
+
+        Leaves content and embedding untouched, so merging a near-duplicate
+        does not rewrite the vector.
+
+        Args:
+            id: Unique memory ID
+            metadata: New metadata
+
+        Returns:
+            True if updated, False if not found
+
+        Raises:
+            RuntimeError: If storage not initialized or the update fails
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+
+        try:
+            now = time.time()
+            result = await self._db[self.collection_name].update_one(
+                {"_id": id}, {"$set": {"metadata": metadata, "timestamp": now}}
+            )
+            if self._index is not None:
+                vector = self._index.vector(id)
+                if vector is not None:
+                    # Re-add so segments follow the new metadata
+                    self._index.add(id, vector.copy(), metadata)
+                self._index.watermark = max(self._index.watermark, now)
+            if self._partitions is not None:
+                self._partitions.update(id, _namespace(metadata), metadata)
+            return result.matched_count > 0
+
+        except Exception as e:
+            logger.error(f"Failed to update memory {id}: {e}")
+            raise RuntimeError(f"Failed to update memory: {e}") from e
+
     async def retrieve(self, id: str) -> Any | None:
         """Retrieve a specific memory by ID.
 
@@ -256,6 +581,104 @@ class MongoDBMemory:
             logger.error(f"Failed to retrieve memory {id}: {e}")
             raise RuntimeError(f"Failed to retrieve memory: {e}") from e
 
+    async def iter_memories(
+        self,
+        batch_size: int = INDEX_LOAD_BATCH_SIZE,
+        include_embeddings: bool = False,
+        after: float | None = None,
+        before: float | None = None,
+    ) -> AsyncIterator[Any]:
+        """Yield stored memories in timestamp order.
+
+        Used to warm in-process indexes such as HybridMemoryBackend's BM25,
+        and by offline jobs such as MemoryConsolidator.
+
+        Args:
+            batch_size: Documents fetched per round-trip
+            include_embeddings: Also decode and attach each embedding
+            after: Only memories with a timestamp after this
+            before: Only memories with a timestamp before this
+
+        Yields:
+            Memory objects
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+
+        from astro.interfaces.memory import Memory
+
+        query: dict[str, Any] = {}
+        if after is not None or before is not None:
+            query["timestamp"] = {
+                **({"$gt": after} if after is not None else {}),
+                **({"$lt": before} if before is not None else {}),
+            }
+        projection: dict[str, Any] = {"content": 1, "metadata": 1, "timestamp": 1}
+        if include_embeddings:
+            projection.update(EMBEDDING_PROJECTION)
+
+        collection = self._db[self.collection_name]
+        cursor = collection.find(query, projection, batch_size=batch_size).sort(
+            "timestamp", ASCENDING
+        )
+        async for doc in cursor:
+            embedding = None
+            if include_embeddings and doc.get("embedding"):
+                embedding = decode_embedding(doc).tolist()
+            yield Memory(
+                id=doc["_id"],
+                content=doc["content"],
+                metadata=doc.get("metadata") or {},
+                timestamp=doc.get("timestamp") or 0.0,
+                embedding=embedding,
+            )
+
+    async def archive(self, ids: list[str]) -> int:
+        """Move memories to the ``<collection>_archive`` collection.
+
+        Archived memories no longer appear in searches but remain
+        recoverable. Used by MemoryConsolidator for compacted sources.
+
+        Args:
+            ids: Memory IDs to archive
+
+        Returns:
+            Number of memories archived
+
+        Raises:
+            RuntimeError: If storage not initialized or the move fails
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        if not ids:
+            return 0
+
+        try:
+            collection = self._db[self.collection_name]
+            docs = await collection.find({"_id": {"$in": ids}}).to_list(length=None)
+            if docs:
+                now = time.time()
+                # Copy before deleting so an interrupted move loses nothing
+                await self._db[f"{self.collection_name}_archive"].bulk_write(
+                    [
+                        ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": now}, upsert=True)
+                        for doc in docs
+                    ],
+                    ordered=False,
+                )
+                await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+            for id in ids:
+                if self._index is not None:
+                    self._index.remove(id)
+                if self._partitions is not None:
+                    self._partitions.remove(id)
+            logger.debug(f"Archived {len(docs)} memories")
+            return len(docs)
+
+        except Exception as e:
+            logger.error(f"Failed to archive {len(ids)} memories: {e}")
+            raise RuntimeError(f"Failed to archive memories: {e}") from e
+
     async def search(
         self,
         query_embedding: list[float],
@@ -279,8 +702,16 @@ class MongoDBMemory:
             raise RuntimeError("Storage not initialized. Call startup() first.")
 
         try:
+            namespace = self._partition_for(filter_metadata)
             if self.use_atlas_search:
                 return await self._search_atlas(query_embedding, limit, filter_metadata)
+            elif namespace is not None:
+                results = await self._search_partition(
+                    [query_embedding], limit, filter_metadata, namespace
+                )
+                return results[0]
+            elif self._index is not None:
+                return await self._search_index(query_embedding, limit, filter_metadata)
             else:
                 return await self._search_aggregation(
                     query_embedding, limit, filter_metadata
@@ -290,6 +721,48 @@ class MongoDBMemory:
             logger.error(f"Failed to search memories: {e}")
             raise RuntimeError(f"Failed to search memories: {e}") from e
 
+    async def search_many(
+        self,
+        query_embeddings: list[list[float]],
+        limit: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[list[Any]]:
+        """Vector similarity search for several queries in one call.
+
+        With the local index, all queries are scored in one matrix product
+        and the winning documents fetched in one query. Otherwise the
+        searches run concurrently.
+
+        Args:
+            query_embeddings: Vectors to search for
+            limit: Maximum number of results per query
+            filter_metadata: Optional metadata filters
+
+        Returns:
+            Memories sorted by relevance, per query
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        namespace = None if self.use_atlas_search else self._partition_for(filter_metadata)
+        if namespace is None and (self.use_atlas_search or self._index is None):
+            return list(
+                await asyncio.gather(
+                    *(self.search(e, limit, filter_metadata) for e in query_embeddings)
+                )
+            )
+
+        try:
+            if namespace is not None:
+                return await self._search_partition(
+                    query_embeddings, limit, filter_metadata, namespace
+                )
+            return await self._search_index_many(
+                query_embeddings, limit, filter_metadata
+            )
+        except Exception as e:
+            logger.error(f"Failed to search memories: {e}")
+            raise RuntimeError(f"Failed to search memories: {e}") from e
+
     async def _search_atlas(
         self,
         query_embedding: list[float],
@@ -310,11 +783,8 @@ class MongoDBMemory:
         """
         collection = self._db[self.collection_name]
 
-        # Build filter for metadata
-        filters = {}
-        if filter_metadata:
-            for key, value in filter_metadata.items():
-                filters[f"metadata.{key}"] = value
+        # Pre-filter inside the index; paths must be declared filter fields
+        filters = _filter_query(filter_metadata)
 
         # Atlas vector search pipeline
         pipeline = [
@@ -325,7 +795,7 @@ class MongoDBMemory:
                     "queryVector": query_embedding,
                     "numCandidates": limit * 10,  # Over-fetch for better results
                     "limit": limit,
-                    "filter": filters if filters else {},
+                    "filter": filters,
                 }
             },
             {
@@ -334,6 +804,7 @@ class MongoDBMemory:
                     "content": 1,
                     "metadata": 1,
                     "timestamp": 1,
+                    **EMBEDDING_PROJECTION,
                     "score": {"$meta": "vectorSearchScore"},
                 }
             },
@@ -347,12 +818,15 @@ class MongoDBMemory:
 
         memories = []
         for doc in docs:
+            embedding = decode_embedding(doc).tolist() if doc.get("embedding") else None
             memories.append(
                 Memory(
                     id=doc["_id"],
                     content=doc["content"],
                     metadata=doc["metadata"],
                     timestamp=doc["timestamp"],
+                    score=doc.get("score"),
+                    embedding=embedding,
                 )
             )
 
@@ -367,8 +841,9 @@ class MongoDBMemory:
     ) -> list[Any]:
         """Search using Python-based cosine similarity.
 
-        Fallback for local MongoDB without Atlas vector search.
-        Fetches all documents matching filters and computes similarity in Python.
+        Fallback for local MongoDB when the local index is disabled or
+        failed to load. Fetches all documents matching filters and computes
+        similarity in Python.
 
         This is not ideal for production with large datasets, but works well
         for development and small memory collections.
@@ -383,30 +858,22 @@ class MongoDBMemory:
         """
         collection = self._db[self.collection_name]
 
-        # Build query for metadata filters
-        query: dict[str, Any] = {}
-        if filter_metadata:
-            for key, value in filter_metadata.items():
-                query[f"metadata.{key}"] = value
-
         # Fetch all matching documents
-        cursor = collection.find(query)
+        cursor = collection.find(_filter_query(filter_metadata))
         docs = await cursor.to_list(length=None)
 
         if not docs:
             return []
 
         # Compute cosine similarity in Python
-        import numpy as np
-
         query_vec = np.array(query_embedding)
         query_norm = np.linalg.norm(query_vec)
 
         # Calculate similarity scores
         scored_docs = []
         for doc in docs:
-            doc_vec = np.array(doc["embedding"])
-            doc_norm = np.linalg.norm(doc_vec)
+            doc_vec = decode_embedding(doc)
+            doc_norm = doc.get("embedding_norm") or np.linalg.norm(doc_vec)
 
             # Cosine similarity
             if query_norm > 0 and doc_norm > 0:
@@ -414,10 +881,10 @@ class MongoDBMemory:
             else:
                 similarity = 0.0
 
-            scored_docs.append((doc, float(similarity)))
+            scored_docs.append((doc, doc_vec, float(similarity)))
 
         # Sort by similarity (highest first)
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
+        scored_docs.sort(key=lambda x: x[2], reverse=True)
 
         # Take top N
         top_docs = scored_docs[:limit]
@@ -426,24 +893,425 @@ class MongoDBMemory:
         from astro.interfaces.memory import Memory
 
         memories = []
-        for doc, score in top_docs:
+        for doc, doc_vec, score in top_docs:
             memories.append(
                 Memory(
                     id=doc["_id"],
                     content=doc["content"],
                     metadata=doc["metadata"],
                     timestamp=doc["timestamp"],
+                    score=score,
+                    embedding=np.asarray(doc_vec, dtype=float).tolist(),
                 )
             )
 
         logger.debug(
             f"Found {len(memories)} memories via Python cosine similarity "
-            f"(top similarity: {top_docs[0][1]:.4f})"
+            f"(top similarity: {top_docs[0][2]:.4f})"
             if top_docs
             else "Found 0 memories"
         )
         return memories
 
+    async def _search_index(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> list[Any]:
+        """Search using the in-process vector index.
+
+        Equality filters on declared fields are resolved from the index's
+        segments; other filters are resolved to candidate IDs by MongoDB
+        (IDs only, no embeddings). Candidates are then ranked by the index. Only the top ``limit``
+        documents are fetched, without their embeddings; results carry the
+        index's normalized vectors instead.
+
+        Args:
+            query_embedding: Vector to search for
+            limit: Maximum number of results
+            filter_metadata: Optional metadata filters
+
+        Returns:
+            List of Memory objects sorted by similarity
+        """
+        results = await self._search_index_many([query_embedding], limit, filter_metadata)
+        return results[0]
+
+    async def _search_index_many(
+        self,
+        query_embeddings: list[list[float]],
+        limit: int,
+        filter_metadata: dict[str, Any] | None,
+        index: VectorIndex | None = None,
+    ) -> list[list[Any]]:
+        """Search the local vector index for several queries.
+
+        Args:
+            query_embeddings: Vectors to search for
+            limit: Maximum number of results per query
+            filter_metadata: Optional metadata filters
+            index: Index to search (default: the collection-wide index)
+
+        Returns:
+            Memory objects sorted by similarity, per query
+
+        Raises:
+            RuntimeError: If storage not initialized
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        if index is None:
+            index = self._index
+        assert index is not None
+        collection = self._db[self.collection_name]
+
+        allowed_ids: set[str] | list[str] | None = None
+        if filter_metadata:
+            allowed_ids = index.segment_ids(filter_metadata)
+            if allowed_ids is None:
+                cursor = collection.find(_filter_query(filter_metadata), {"_id": 1})
+                allowed_ids = [doc["_id"] for doc in await cursor.to_list(length=None)]
+
+        hits = index.search_many(query_embeddings, limit, allowed_ids)
+        ids = list(dict.fromkeys(id for query_hits in hits for id, _ in query_hits))
+        if not ids:
+            return [[] for _ in query_embeddings]
+
+        cursor = collection.find({"_id": {"$in": ids}}, {"embedding": 0})
+        docs = {doc["_id"]: doc for doc in await cursor.to_list(length=None)}
+
+        from astro.interfaces.memory import Memory
+
+        # Returned with the results so re-ranking needs no second fetch
+        vectors = {
+            id: vector.tolist()
+            for id in ids
+            if (vector := index.vector(id)) is not None
+        }
+        results = [
+            [
+                Memory(
+                    id=doc["_id"],
+                    content=doc["content"],
+                    metadata=doc["metadata"],
+                    timestamp=doc["timestamp"],
+                    score=score,
+                    embedding=vectors.get(id),
+                )
+                for id, score in query_hits
+                if (doc := docs.get(id)) is not None
+            ]
+            for query_hits in hits
+        ]
+
+        logger.debug(
+            f"Found {len(ids)} memories for {len(query_embeddings)} queries "
+            f"via local vector index"
+        )
+        return results
+
+    async def _search_partition(
+        self,
+        query_embeddings: list[list[float]],
+        limit: int,
+        filter_metadata: dict[str, Any] | None,
+        namespace: str,
+    ) -> list[list[Any]]:
+        """Search one namespace's index shard, loading it if needed.
+
+        Args:
+            query_embeddings: Vectors to search for
+            limit: Maximum number of results per query
+            filter_metadata: Metadata filters, including the namespace
+            namespace: Namespace to search
+
+        Returns:
+            Memory objects sorted by similarity, per query
+        """
+        assert self._partitions is not None
+        index = await self._partitions.get(namespace)
+        # The shard holds only this namespace (including global memories
+        # stored without one), so the namespace filter is already applied
+        rest = {k: v for k, v in (filter_metadata or {}).items() if k != NAMESPACE_FIELD}
+        return await self._search_index_many(query_embeddings, limit, rest or None, index)
+
+    def _partition_for(self, filter_metadata: dict[str, Any] | None) -> str | None:
+        """Namespace shard serving a search, if partitioned and filtered on one."""
+        if self._partitions is None:
+            return None
+        namespace = (filter_metadata or {}).get(NAMESPACE_FIELD)
+        return namespace if isinstance(namespace, str) else None
+
+    async def _load_partition(self, namespace: str) -> VectorIndex:
+        """Build the index shard of one namespace from the collection."""
+        options = self._index_options()
+        # Every shard memory shares the namespace; no segment needed
+        options["segment_fields"] = tuple(
+            f for f in self.filter_fields if f != NAMESPACE_FIELD
+        )
+        index = VectorIndex(**options)
+        await self._fill_index(index, _namespace_query(namespace))
+        logger.info(f"Loaded vector index shard {namespace} ({len(index)} memories)")
+        return index
+
+    def _index_options(self) -> dict[str, Any]:
+        """VectorIndex constructor options for this backend."""
+        return {
+            "ann": self.ann,
+            "ann_threshold": self.ann_threshold,
+            "segment_fields": self.filter_fields,
+            # Memories stored before namespaces existed are global
+            "segment_defaults": {NAMESPACE_FIELD: GLOBAL_NAMESPACE},
+        }
+
+    async def _load_index(self) -> None:
+        """Build the local vector index, from a snapshot if one exists.
+
+        Failures are logged and leave the index unset, in which case searches
+        fall back to scanning the collection.
+        """
+        options = self._index_options()
+        index = None
+        if self.index_snapshot_path and self.index_snapshot_path.exists():
+            try:
+                index = VectorIndex.load(self.index_snapshot_path, **options)
+                logger.info(
+                    f"Loaded vector index snapshot: {len(index)} vectors "
+                    f"from {self.index_snapshot_path}"
+                )
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable vector index snapshot: {e}")
+        self._index = index or VectorIndex(**options)
+
+        try:
+            await self.refresh_index()
+        except Exception as e:
+            logger.warning(
+                f"Failed to load local vector index, falling back to collection scans: {e}"
+            )
+            self._index = None
+            return
+        logger.info(
+            f"Using local vector index for vector search ({len(self._index)} memories)"
+        )
+
+    async def refresh_index(self) -> None:
+        """Bring the local vector index up to date with the collection.
+
+        Loads embeddings written since the index's watermark (of each
+        resident shard, with namespace partitions) and drops IDs no longer
+        in the collection. Called at startup; call it periodically
+        when other processes write to the same collection.
+        """
+        if self._db is None:
+            return
+        if self._index is not None:
+            await self._fill_index(self._index)
+        if self._partitions is not None:
+            for namespace, shard in self._partitions.resident():
+                await self._fill_index(shard, _namespace_query(namespace))
+
+    async def _fill_index(
+        self, index: VectorIndex, scope: dict[str, Any] | None = None
+    ) -> None:
+        """Load embeddings newer than the index's watermark, drop deleted IDs.
+
+        Args:
+            index: Index to update
+            scope: Query selecting the documents the index holds (default: all)
+        """
+        if self._db is None:
+            return
+        collection = self._db[self.collection_name]
+
+        query: dict[str, Any] = dict(scope or {})
+        if index.watermark:
+            query["timestamp"] = {"$gt": index.watermark}
+        cursor = collection.find(
+            query,
+            {
+                **EMBEDDING_PROJECTION,
+                "timestamp": 1,
+                **{f"metadata.{field}": 1 for field in self.filter_fields},
+            },
+            batch_size=INDEX_LOAD_BATCH_SIZE,
+        )
+        loaded = 0
+        async for doc in cursor:
+            if doc.get("embedding"):
+                index.add(doc["_id"], decode_embedding(doc), doc.get("metadata"))
+                loaded += 1
+            index.watermark = max(index.watermark, doc.get("timestamp") or 0.0)
+
+        # Drop memories deleted since the snapshot (IDs only)
+        removed = 0
+        if len(index) > loaded:
+            live = set()
+            async for doc in collection.find(
+                scope or {}, {"_id": 1}, batch_size=INDEX_LOAD_BATCH_SIZE
+            ):
+                live.add(doc["_id"])
+            for id in index.ids:
+                if id not in live:
+                    index.remove(id)
+                    removed += 1
+
+        if loaded or removed:
+            logger.info(f"Refreshed vector index: {loaded} loaded, {removed} removed")
+
+    async def rebuild_index(self, dim: int | None = None) -> None:
+        """Reload the local vector index from the collection.
+
+        Unlike refresh_index(), which only reads newer writes, this re-reads
+        every embedding (ignoring the snapshot). Use it after embeddings were
+        rewritten in place, e.g. by a re-embedding job. The new index is
+        built aside and swapped in, so searches keep using the old one until
+        it is complete. No-op with Atlas search or use_local_index=False.
+
+        Args:
+            dim: Embedding dimensions to index; vectors of other sizes are
+                skipped (default: inferred from the first vector)
+
+        Raises:
+            RuntimeError: If storage not initialized
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        if self.use_atlas_search or not self.use_local_index:
+            return
+        if self._partitions is not None:
+            # Shards reload from the collection on next use
+            self._partitions.evict()
+            return
+        index = VectorIndex(dim=dim, **self._index_options())
+        await self._fill_index(index)
+        self._index = index
+        # Pick up writes that landed in the old index while this one loaded
+        await self.refresh_index()
+        logger.info(f"Rebuilt local vector index ({len(index)} memories)")
+
+    def atlas_index_definition(self, dimensions: int) -> dict[str, Any]:
+        """Atlas vector search index definition for this collection.
+
+        Declares the embedding plus every filter field (and store time) as
+        pre-filter paths, so filtered searches narrow candidates inside
+        the index instead of after it.
+
+        Args:
+            dimensions: Embedding dimensions
+
+        Returns:
+            Definition for a "vectorSearch" search index
+        """
+        return {
+            "fields": [
+                {
+                    "type": "vector",
+                    "path": "embedding",
+                    "numDimensions": dimensions,
+                    "similarity": "cosine",
+                },
+                {"type": "filter", "path": "timestamp"},
+                *(
+                    {"type": "filter", "path": f"metadata.{field}"}
+                    for field in self.filter_fields
+                ),
+            ]
+        }
+
+    async def create_atlas_index(self, dimensions: int) -> None:
+        """Create the Atlas vector search index (Atlas only).
+
+        Args:
+            dimensions: Embedding dimensions
+
+        Raises:
+            RuntimeError: If storage not initialized or creation fails
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+
+        try:
+            await self._db[self.collection_name].create_search_index(
+                SearchIndexModel(
+                    definition=self.atlas_index_definition(dimensions),
+                    name=self.atlas_index_name,
+                    type="vectorSearch",
+                )
+            )
+            logger.info(f"Created Atlas vector search index {self.atlas_index_name}")
+        except Exception as e:
+            logger.error(f"Failed to create Atlas vector search index: {e}")
+            raise RuntimeError(f"Failed to create Atlas vector search index: {e}") from e
+
+    async def migrate_embeddings(
+        self,
+        embedding_format: "EmbeddingFormat | None" = None,
+        batch_size: int = MIGRATION_BATCH_SIZE,
+    ) -> dict[str, int]:
+        """Rewrite stored embeddings in place to another format.
+
+        Only documents not already in the target format are touched, so an
+        interrupted migration can simply be run again. Timestamps are left
+        unchanged.
+
+        Args:
+            embedding_format: Target format (default: this backend's
+                embedding_format)
+            batch_size: Documents rewritten per bulk write
+
+        Returns:
+            Counts: "migrated" documents, and embedding "bytes_before" and
+            "bytes_after" for them
+
+        Raises:
+            RuntimeError: If storage not initialized or the migration fails
+        """
+        if self._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        target = embedding_format or self.embedding_format
+        if target not in EMBEDDING_FORMATS:
+            raise ValueError(f"Unknown embedding format {target!r}")
+
+        collection = self._db[self.collection_name]
+        query: dict[str, Any] = {"embedding": {"$exists": True}}
+        if target == "float64":
+            query["embedding_format"] = {"$exists": True}
+        else:
+            query["embedding_format"] = {"$ne": target}
+
+        stats = {"migrated": 0, "bytes_before": 0, "bytes_after": 0}
+        try:
+            while True:
+                cursor = collection.find(query, EMBEDDING_PROJECTION).limit(batch_size)
+                docs = await cursor.to_list(length=batch_size)
+                if not docs:
+                    break
+
+                updates = []
+                for doc in docs:
+                    fields = encode_embedding(decode_embedding(doc), target)
+                    stale = [f for f in EMBEDDING_FIELDS if f not in fields]
+                    update: dict[str, Any] = {"$set": fields}
+                    if stale:
+                        update["$unset"] = {f: "" for f in stale}
+                    updates.append(UpdateOne({"_id": doc["_id"]}, update))
+                    stats["bytes_before"] += embedding_size(doc)
+                    stats["bytes_after"] += embedding_size(fields)
+
+                await collection.bulk_write(updates, ordered=False)
+                stats["migrated"] += len(updates)
+                logger.info(
+                    f"Migrated {stats['migrated']} embeddings to {target} "
+                    f"in {self.collection_name}"
+                )
+        except Exception as e:
+            logger.error(f"Failed to migrate embeddings: {e}")
+            raise RuntimeError(f"Failed to migrate embeddings: {e}") from e
+
+        return stats
+
     async def delete(self, id: str) -> bool:
         """Delete a memory entry.
 
@@ -461,6 +1329,10 @@ class MongoDBMemory:
             result = await collection.delete_one({"_id": id})
 
             deleted = result.deleted_count > 0
+            if self._index is not None:
+                self._index.remove(id)
+            if self._partitions is not None:
+                self._partitions.remove(id)
             if deleted:
                 logger.debug(f"Deleted memory: {id}")
             else:
@@ -471,3 +1343,34 @@ class MongoDBMemory:
         except Exception as e:
             logger.error(f"Failed to delete memory {id}: {e}")
             raise RuntimeError(f"Failed to delete memory: {e}") from e
+
+
+def _namespace(metadata: dict[str, Any] | None) -> str:
+    """Namespace of a memory (global when unset)."""
+    return str((metadata or {}).get(NAMESPACE_FIELD) or GLOBAL_NAMESPACE)
+
+
+def _namespace_query(namespace: str) -> dict[str, Any]:
+    """MongoDB query selecting a namespace's memories."""
+    if namespace == GLOBAL_NAMESPACE:
+        # Memories stored before namespaces existed belong to the global tier
+        return {f"metadata.{NAMESPACE_FIELD}": {"$in": [GLOBAL_NAMESPACE, None]}}
+    return {f"metadata.{NAMESPACE_FIELD}": namespace}
+
+
+def _filter_query(filter_metadata: dict[str, Any] | None) -> dict[str, Any]:
+    """Translate filter_metadata into a MongoDB query.
+
+    Range conditions on "timestamp" apply to the document's store time, and
+    the global namespace includes memories stored without one (as in
+    _namespace_query); everything else matches ``metadata.<key>``.
+    """
+    query: dict[str, Any] = {}
+    for key, value in (filter_metadata or {}).items():
+        if key == "timestamp" and isinstance(value, dict) and set(value) <= RANGE_OPERATORS:
+            query["timestamp"] = value
+        elif key == NAMESPACE_FIELD and value == GLOBAL_NAMESPACE:
+            query.update(_namespace_query(value))
+        else:
+            query[f"metadata.{key}"] = value
+    return query
@@ -0,0 +1,165 @@
+"""Per-namespace vector index shards for MongoDBMemory.
+
+With ``namespace_partitions=True``, MongoDBMemory keeps one VectorIndex per
+memory namespace (user, workspace or global) instead of one for the whole
+collection. A shard is loaded from MongoDB the first time its namespace is
+searched; once more than ``max_resident`` shards are in RAM, the least
+recently used one is evicted. Search cost and resident memory then follow
+the partitions in use rather than total tenancy.
+
+Writes update resident shards. Writes to a shard that is still loading are
+replayed once it is ready; writes to evicted or never-loaded namespaces are
+read from MongoDB when their shard is next loaded.
+"""
+
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import numpy as np
+
+from astro_mongodb.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+# Namespace shards kept in RAM before the least recently used is evicted
+DEFAULT_MAX_RESIDENT_PARTITIONS = 64
+
+# Write replayed on a shard after it loads: (id, embedding or None to remove,
+# metadata, timestamp)
+_Write = tuple[str, list[float] | np.ndarray | None, dict[str, Any] | None, float]
+
+
+class PartitionedIndex:
+    """LRU set of VectorIndex shards keyed by namespace, loaded on demand.
+
+    Example:
+        partitions = PartitionedIndex(load_namespace, max_resident=32)
+        shard = await partitions.get("user:u1")
+        hits = shard.search(query_vector, k=5)
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[VectorIndex]],
+        max_resident: int = DEFAULT_MAX_RESIDENT_PARTITIONS,
+    ):
+        """Initialize the partitioned index.
+
+        Args:
+            loader: Coroutine function building the shard of a namespace.
+            max_resident: Max shards kept in RAM.
+
+        Raises:
+            ValueError: If max_resident is not positive.
+        """
+        if max_resident <= 0:
+            raise ValueError(f"max_resident must be positive, got {max_resident}")
+        self.max_resident = max_resident
+        self.stats: Counter[str] = Counter()
+        self._loader = loader
+        self._shards: OrderedDict[str, VectorIndex] = OrderedDict()
+        self._loading: dict[str, asyncio.Task[VectorIndex]] = {}
+        self._pending: dict[str, list[_Write]] = {}
+
+    async def get(self, namespace: str) -> VectorIndex:
+        """Shard of a namespace, loading it if not resident.
+
+        Concurrent callers share one load.
+
+        Args:
+            namespace: Memory namespace.
+
+        Returns:
+            The namespace's VectorIndex.
+        """
+        shard = self._shards.get(namespace)
+        if shard is not None:
+            self._shards.move_to_end(namespace)
+            self.stats["hits"] += 1
+            return shard
+
+        task = self._loading.get(namespace)
+        if task is None:
+            self._pending[namespace] = []
+            task = asyncio.create_task(self._load(namespace))
+            self._loading[namespace] = task
+        # A caller that gives up (e.g. a retrieval deadline) leaves the load running
+        return await asyncio.shield(task)
+
+    def add(
+        self,
+        namespace: str,
+        id: str,
+        embedding: list[float] | np.ndarray,
+        metadata: dict[str, Any] | None,
+        timestamp: float = 0.0,
+    ) -> None:
+        """Index a written memory if its namespace's shard is resident or loading."""
+        shard = self._shards.get(namespace)
+        if shard is not None:
+            shard.add(id, embedding, metadata)
+            shard.watermark = max(shard.watermark, timestamp)
+        elif namespace in self._pending:
+            self._pending[namespace].append((id, embedding, metadata, timestamp))
+
+    def remove(self, id: str) -> None:
+        """Drop a memory from every resident or loading shard."""
+        for shard in self._shards.values():
+            shard.remove(id)
+        for writes in self._pending.values():
+            writes.append((id, None, None, 0.0))
+
+    def update(self, id: str, namespace: str, metadata: dict[str, Any]) -> None:
+        """Re-index a memory whose metadata (possibly its namespace) changed."""
+        vector = None
+        for shard_namespace, shard in self._shards.items():
+            found = shard.vector(id)
+            if found is not None:
+                vector = found.copy()
+                if shard_namespace != namespace:
+                    shard.remove(id)
+        if vector is not None:
+            self.add(namespace, id, vector, metadata)
+        elif namespace in self._shards:
+            # Moved in from a namespace that is not resident: reload on next use
+            self.evict(namespace)
+
+    def evict(self, namespace: str | None = None) -> None:
+        """Drop one namespace's shard from RAM (None = all shards)."""
+        if namespace is None:
+            self.stats["evictions"] += len(self._shards)
+            self._shards.clear()
+        elif self._shards.pop(namespace, None) is not None:
+            self.stats["evictions"] += 1
+
+    def resident(self) -> list[tuple[str, VectorIndex]]:
+        """Resident (namespace, shard) pairs, least recently used first."""
+        return list(self._shards.items())
+
+    def __len__(self) -> int:
+        return len(self._shards)
+
+    async def _load(self, namespace: str) -> VectorIndex:
+        try:
+            shard = await self._loader(namespace)
+        finally:
+            self._loading.pop(namespace, None)
+            writes = self._pending.pop(namespace, [])
+
+        for id, embedding, metadata, timestamp in writes:
+            if embedding is None:
+                shard.remove(id)
+            else:
+                shard.add(id, embedding, metadata)
+                shard.watermark = max(shard.watermark, timestamp)
+
+        self._shards[namespace] = shard
+        self.stats["loads"] += 1
+        while len(self._shards) > self.max_resident:
+            evicted, _ = self._shards.popitem(last=False)
+            self.stats["evictions"] += 1
+            logger.debug(f"Evicted vector index shard {evicted}")
+        return shard
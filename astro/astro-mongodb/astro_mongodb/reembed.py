@@ -0,0 +1,312 @@
+"""Resumable re-embedding of stored memories after an embedding model change.
+
+Vectors from different embedding models are not comparable, so changing
+EMBEDDING_MODEL leaves every stored memory unreachable by new queries.
+ReembeddingJob re-embeds the memories collection in the background without
+stopping reads or writes:
+
+1. run() walks memories not yet embedded by the target model in ``_id``
+   order, embeds their content with batched ``embed_batch`` calls paced to a
+   rate budget, and writes each vector to the ``reembed`` shadow field. The
+   live ``embedding`` field keeps serving searches with the old model. After
+   every batch the position is checkpointed in ``<collection>_jobs``, so an
+   interrupted job resumes where it stopped. Each pass only covers memories
+   stored before it started, and one final pass picks up those written
+   during the first; later ones are left for the next run (switch() reports
+   them as ``stale``), so a steady stream of writes cannot keep the job
+   from finishing.
+2. switch() catches up once more, then promotes the shadow vectors in one
+   server-side update (atomic per document) and rebuilds the local vector
+   index aside before swapping it in.
+
+Point query embedding at the new model at the same time as the switch (and
+restart other processes sharing the collection, so they rebuild their
+indexes). With Atlas vector search, recreate the search index if the
+dimension changed (create_atlas_index()).
+
+Example:
+    job = ReembeddingJob(memory, get_embedding_provider("text-embedding-3-large"))
+    await job.run()
+    await job.switch()
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pymongo import ASCENDING, UpdateOne
+
+from astro_mongodb.embedding_codec import EMBEDDING_FIELDS, encode_embedding
+from astro_mongodb.memory import MongoDBMemory
+
+logger = logging.getLogger(__name__)
+
+# Document field holding a memory's new embedding until the switch
+SHADOW_FIELD = "reembed"
+
+# Texts per embed_batch call (and per checkpoint)
+DEFAULT_BATCH_SIZE = 64
+
+# Suffix of the collection holding job checkpoints
+JOBS_COLLECTION_SUFFIX = "_jobs"
+
+
+class ReembeddingJob:
+    """Re-embeds a MongoDBMemory collection with a new model.
+
+    Args:
+        memory: Started MongoDBMemory whose collection is re-embedded
+        embedding_provider: EmbeddingProvider for the new model
+        model: New model name (default: the provider's ``model``)
+        batch_size: Texts per embed_batch call
+        max_texts_per_s: Rate budget in texts per second (default: None,
+            unlimited)
+        clock: Monotonic clock used for pacing
+    """
+
+    def __init__(
+        self,
+        memory: MongoDBMemory,
+        embedding_provider: Any,
+        model: str | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_texts_per_s: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the job.
+
+        Args:
+            memory: Started MongoDBMemory whose collection is re-embedded
+            embedding_provider: EmbeddingProvider for the new model
+            model: New model name (default: the provider's ``model``)
+            batch_size: Texts per embed_batch call
+            max_texts_per_s: Rate budget in texts per second
+            clock: Monotonic clock used for pacing
+
+        Raises:
+            ValueError: If no model name is given or known, or the budget or
+                batch size is not positive
+        """
+        model = model or getattr(embedding_provider, "model", None)
+        if not model:
+            raise ValueError("Embedding model name required (provider has no 'model')")
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        if max_texts_per_s is not None and max_texts_per_s <= 0:
+            raise ValueError(f"max_texts_per_s must be positive, got {max_texts_per_s}")
+
+        self.memory = memory
+        self.embedding_provider = embedding_provider
+        self.model = str(model)
+        self.batch_size = batch_size
+        self.max_texts_per_s = max_texts_per_s
+        self._clock = clock
+        self.checkpoint_id = f"reembed:{memory.collection_name}:{self.model}"
+
+    async def run(self, max_batches: int | None = None) -> dict[str, Any]:
+        """Re-embed memories into the shadow field, resuming from the checkpoint.
+
+        Args:
+            max_batches: Stop after this many batches (default: until done)
+
+        Returns:
+            Checkpoint state: "status" ("running" or "complete"),
+            "reembedded" count, "dim", "last_id", "passes", "cutoff" (store
+            time bounding the current pass) and "final_pass"
+
+        Raises:
+            RuntimeError: If storage not initialized or a write fails
+        """
+        collection = self._collection()
+        state = await self._load_checkpoint()
+        if state["status"] == "running":
+            logger.info(
+                f"Resuming re-embedding to {self.model}: {state['reembedded']} done, "
+                f"after {state['last_id']!r}"
+            )
+        else:
+            state["cutoff"] = time.time()
+            state["final_pass"] = False
+
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            query = self._pending_query()
+            if state["cutoff"] is not None:
+                query["timestamp"] = {"$lte": state["cutoff"]}
+            if state["last_id"] is not None:
+                query["_id"] = {"$gt": state["last_id"]}
+            docs = await (
+                collection.find(query, {"content": 1})
+                .sort("_id", ASCENDING)
+                .limit(self.batch_size)
+                .to_list(length=self.batch_size)
+            )
+
+            if not docs:
+                if state["last_id"] is None or state["final_pass"]:
+                    state["status"] = "complete"
+                    state["last_id"] = None
+                    await self._save_checkpoint(state)
+                    break
+                # End of the first pass: one more for memories written meanwhile
+                state["last_id"] = None
+                state["passes"] += 1
+                state["cutoff"] = time.time()
+                state["final_pass"] = True
+                await self._save_checkpoint(state)
+                continue
+
+            started = self._clock()
+            written = await self._reembed(docs, state)
+            state["reembedded"] += written
+            state["last_id"] = docs[-1]["_id"]
+            state["status"] = "running"
+            await self._save_checkpoint(state)
+            batches += 1
+            logger.info(
+                f"Re-embedded {state['reembedded']} memories with {self.model} "
+                f"(pass {state['passes'] + 1})"
+            )
+            await self._pace(len(docs), started)
+
+        return state
+
+    async def switch(self, rebuild_index: bool = True) -> dict[str, Any]:
+        """Promote the shadow embeddings to live embeddings.
+
+        Runs the job to completion first, so memories written since the last
+        run are included, then rewrites every shadowed document server-side.
+
+        Args:
+            rebuild_index: Rebuild the memory's local vector index afterwards
+
+        Returns:
+            Checkpoint state with "switched" count and "stale" (memories
+            written after the final pass, still on the old model; call
+            switch() again for them)
+
+        Raises:
+            RuntimeError: If storage not initialized or the switch fails
+        """
+        state = await self.run()
+        collection = self._collection()
+        shadow = f"${SHADOW_FIELD}"
+        try:
+            result = await collection.update_many(
+                {f"{SHADOW_FIELD}.model": self.model},
+                [
+                    {"$unset": list(EMBEDDING_FIELDS)},
+                    {
+                        "$set": {
+                            **{field: f"{shadow}.{field}" for field in EMBEDDING_FIELDS},
+                            "embedding_model": f"{shadow}.model",
+                            "embedding_dim": f"{shadow}.dim",
+                        }
+                    },
+                    {"$unset": SHADOW_FIELD},
+                ],
+            )
+        except Exception as e:
+            logger.error(f"Failed to switch embeddings to {self.model}: {e}")
+            raise RuntimeError(f"Failed to switch embeddings: {e}") from e
+
+        self.memory.embedding_model = self.model
+        if rebuild_index:
+            await self.memory.rebuild_index(dim=state.get("dim"))
+
+        state["status"] = "switched"
+        state["switched"] = result.modified_count
+        await self._save_checkpoint(state)
+        state["stale"] = await self.memory.count_stale_embeddings(self.model)
+        logger.info(
+            f"Switched {state['switched']} memories to {self.model} "
+            f"({state['stale']} still stale)"
+        )
+        return state
+
+    async def progress(self) -> dict[str, Any]:
+        """Checkpoint state plus the count of memories still to re-embed."""
+        state = await self._load_checkpoint()
+        state["pending"] = int(await self._collection().count_documents(self._pending_query()))
+        return state
+
+    async def _reembed(self, docs: list[dict[str, Any]], state: dict[str, Any]) -> int:
+        """Embed a batch and write the shadow fields; returns documents written."""
+        vectors = await self.embedding_provider.embed_batch(
+            [doc.get("content") or "" for doc in docs]
+        )
+        updates = []
+        for doc, vector in zip(docs, vectors):
+            if state["dim"] is None:
+                state["dim"] = len(vector)
+            updates.append(
+                UpdateOne(
+                    # Skip memories rewritten since they were read
+                    {"_id": doc["_id"], "content": doc.get("content")},
+                    {
+                        "$set": {
+                            SHADOW_FIELD: {
+                                **encode_embedding(vector, self.memory.embedding_format),
+                                "model": self.model,
+                                "dim": len(vector),
+                            }
+                        }
+                    },
+                )
+            )
+        try:
+            await self._collection().bulk_write(updates, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to write re-embedded memories: {e}")
+            raise RuntimeError(f"Failed to write re-embedded memories: {e}") from e
+        return len(updates)
+
+    async def _pace(self, texts: int, started: float) -> None:
+        """Sleep so the batch does not exceed the rate budget."""
+        if self.max_texts_per_s is None:
+            return
+        remaining = texts / self.max_texts_per_s - (self._clock() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    def _pending_query(self) -> dict[str, Any]:
+        """Memories neither embedded nor shadow-embedded by the target model."""
+        return {
+            "embedding_model": {"$ne": self.model},
+            f"{SHADOW_FIELD}.model": {"$ne": self.model},
+        }
+
+    def _collection(self) -> Any:
+        if self.memory._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        return self.memory._db[self.memory.collection_name]
+
+    def _jobs(self) -> Any:
+        if self.memory._db is None:
+            raise RuntimeError("Storage not initialized. Call startup() first.")
+        return self.memory._db[f"{self.memory.collection_name}{JOBS_COLLECTION_SUFFIX}"]
+
+    async def _load_checkpoint(self) -> dict[str, Any]:
+        doc = await self._jobs().find_one({"_id": self.checkpoint_id})
+        state: dict[str, Any] = {
+            "model": self.model,
+            "status": "pending",
+            "last_id": None,
+            "reembedded": 0,
+            "passes": 0,
+            "dim": None,
+            "cutoff": None,
+            "final_pass": False,
+        }
+        if doc:
+            state.update({k: v for k, v in doc.items() if k not in ("_id", "updated_at")})
+        return state
+
+    async def _save_checkpoint(self, state: dict[str, Any]) -> None:
+        await self._jobs().replace_one(
+            {"_id": self.checkpoint_id},
+            {"_id": self.checkpoint_id, **state, "updated_at": time.time()},
+            upsert=True,
+        )
@@ -0,0 +1,574 @@
+"""In-process vector index for MongoDBMemory local mode.
+
+Without Atlas vector search, every search used to pull every embedding over
+the wire and score it in Python. VectorIndex keeps the collection's
+embeddings resident instead:
+
+- A contiguous float32 matrix of L2-normalized rows (cosine = dot product),
+  with an id -> row map and a free list so deletes and upserts are O(1).
+- Exact top-k with one matrix-vector product and ``np.argpartition``.
+- Optional approximate search for large collections: IVF (k-means coarse
+  quantizer, numpy only) or HNSW (requires the optional ``hnswlib`` package).
+- Segments: for declared metadata fields, the IDs holding each value, so
+  filtered searches score only the matching partition.
+- Snapshots to a ``.npz`` file so restarts only catch up on what changed.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+AnnMode = Literal["auto", "exact", "ivf", "hnsw"]
+
+# Collections at or above this size use approximate search in "auto" mode
+DEFAULT_ANN_THRESHOLD = 50_000
+
+# IVF: lists probed per query, and k-means iterations when (re)training
+IVF_NPROBE = 8
+IVF_TRAIN_ITERATIONS = 10
+
+# HNSW build/search parameters (hnswlib)
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Bumped when the snapshot layout changes
+SNAPSHOT_VERSION = 2
+
+
+class VectorIndex:
+    """Resident cosine-similarity index over memory embeddings.
+
+    Example:
+        ```python
+        index = VectorIndex(segment_fields=["user_id"])
+        index.add("mem1", [0.1, 0.2, 0.3], {"user_id": "u1"})
+        index.search([0.1, 0.2, 0.25], k=5)  # [("mem1", 0.99...)]
+        index.search([0.1, 0.2, 0.25], k=5, index.segment_ids({"user_id": "u1"}))
+        ```
+    """
+
+    def __init__(
+        self,
+        dim: int | None = None,
+        ann: AnnMode = "auto",
+        ann_threshold: int = DEFAULT_ANN_THRESHOLD,
+        initial_capacity: int = 1024,
+        segment_fields: Sequence[str] = (),
+        segment_defaults: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Initialize an empty index.
+
+        Args:
+            dim: Embedding dimensions (inferred from the first vector if None).
+            ann: "exact", "ivf", "hnsw", or "auto" (exact below
+                ``ann_threshold`` vectors, then HNSW if hnswlib is installed,
+                else IVF).
+            ann_threshold: Size at which "auto" switches to approximate search.
+            initial_capacity: Initial matrix rows (grows by doubling).
+            segment_fields: Metadata fields to keep per-value ID sets for.
+            segment_defaults: Segment value of memories without a value for a
+                field (e.g. the global namespace for memories stored before
+                namespaces existed).
+        """
+        self.dim = dim
+        self.ann = ann
+        self.ann_threshold = ann_threshold
+        self.segment_fields = tuple(segment_fields)
+        self.segment_defaults = {
+            f: v for f, v in (segment_defaults or {}).items() if f in self.segment_fields
+        }
+        self.watermark = 0.0  # Latest document timestamp reflected in the index
+
+        self._capacity = max(initial_capacity, 1)
+        self._matrix: np.ndarray | None = None
+        self._valid = np.zeros(self._capacity, dtype=bool)
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
+        self._free: list[int] = []
+
+        # IVF state: centroids and each row's list assignment (-1 = unassigned)
+        self._centroids: np.ndarray | None = None
+        self._assign = np.full(self._capacity, -1, dtype=np.int32)
+        self._ivf_trained_size = 0
+
+        # HNSW state (hnswlib.Index), built lazily
+        self._hnsw: Any = None
+
+        # Segments: (field, value) -> IDs, and each ID's segment values
+        self._segments: dict[tuple[str, Any], set[str]] = {}
+        self._memberships: dict[str, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._rows
+
+    @property
+    def ids(self) -> list[str]:
+        """IDs currently in the index."""
+        return list(self._rows)
+
+    def vector(self, id: str) -> np.ndarray | None:
+        """Unit-normalized embedding for an ID, if indexed."""
+        row = self._rows.get(id)
+        if row is None or self._matrix is None:
+            return None
+        vector: np.ndarray = self._matrix[row]
+        return vector
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def add(
+        self,
+        id: str,
+        embedding: list[float] | np.ndarray,
+        metadata: dict[str, Any] | None = None,
+    ) -> bool:
+        """Insert or replace a vector.
+
+        Args:
+            id: Memory ID.
+            embedding: Embedding vector.
+            metadata: Memory metadata; values of ``segment_fields`` are
+                added to their segments (each element, for lists).
+
+        Returns:
+            True if indexed, False if the vector's dimensions do not match
+            the index (logged and skipped).
+        """
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if self.dim is None:
+            self.dim = int(vector.shape[0])
+        if vector.shape[0] != self.dim:
+            logger.warning(
+                f"Not indexing memory {id}: {vector.shape[0]} dimensions, index has {self.dim}"
+            )
+            return False
+        if self._matrix is None:
+            self._matrix = np.zeros((self._capacity, self.dim), dtype=np.float32)
+
+        row = self._rows.get(id)
+        if row is None:
+            row = self._free.pop() if self._free else len(self._ids)
+            if row == len(self._ids):
+                self._ids.append(id)
+                self._ensure_capacity(row + 1)
+            else:
+                self._ids[row] = id
+            self._rows[id] = row
+
+        self._matrix[row] = _normalize(vector)
+        self._valid[row] = True
+        self._index_row(row)
+        if self.segment_fields:
+            self._set_segments(id, metadata or {})
+        return True
+
+    def remove(self, id: str) -> bool:
+        """Remove a vector.
+
+        Args:
+            id: Memory ID.
+
+        Returns:
+            True if the ID was indexed.
+        """
+        row = self._rows.pop(id, None)
+        if row is None:
+            return False
+        self._valid[row] = False
+        self._ids[row] = None
+        self._assign[row] = -1
+        self._free.append(row)
+        self._drop_segments(id)
+        if self._hnsw is not None:
+            try:
+                self._hnsw.mark_deleted(row)
+            except RuntimeError:
+                pass
+        return True
+
+    def clear(self) -> None:
+        """Remove every vector (keeps dimensions and settings)."""
+        self.__init__(  # type: ignore[misc]
+            self.dim,
+            self.ann,
+            self.ann_threshold,
+            segment_fields=self.segment_fields,
+            segment_defaults=self.segment_defaults,
+        )
+
+    # =========================================================================
+    # Segments
+    # =========================================================================
+
+    def segment_ids(self, filters: dict[str, Any]) -> set[str] | None:
+        """IDs matching equality filters on segment fields.
+
+        Args:
+            filters: Field -> value equality conditions.
+
+        Returns:
+            Matching IDs, or None if any condition is not an equality on a
+            segment field (the caller must resolve the filter elsewhere).
+        """
+        keys = []
+        for field, value in filters.items():
+            if field not in self.segment_fields or not _segment_value(value):
+                return None
+            keys.append((field, value))
+        segments = sorted(
+            (self._segments.get(key, set()) for key in keys), key=len
+        )
+        if not segments:
+            return None
+        return set(segments[0]).intersection(*segments[1:])
+
+    def _set_segments(self, id: str, metadata: dict[str, Any]) -> None:
+        self._drop_segments(id)
+        values = {f: metadata[f] for f in self.segment_fields if f in metadata}
+        for field, default in self.segment_defaults.items():
+            if values.get(field) is None:
+                values[field] = default
+        if not values:
+            return
+        self._memberships[id] = values
+        for key in _segment_keys(values):
+            self._segments.setdefault(key, set()).add(id)
+
+    def _drop_segments(self, id: str) -> None:
+        values = self._memberships.pop(id, None)
+        if values is None:
+            return
+        for key in _segment_keys(values):
+            members = self._segments.get(key)
+            if members is not None:
+                members.discard(id)
+                if not members:
+                    del self._segments[key]
+
+    # =========================================================================
+    # Search
+    # =========================================================================
+
+    def search(
+        self,
+        query: list[float] | np.ndarray,
+        k: int,
+        allowed_ids: list[str] | set[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Find the most similar vectors.
+
+        Args:
+            query: Query embedding.
+            k: Number of results.
+            allowed_ids: Restrict results to these IDs (metadata filters).
+                Filtered searches are exact over the allowed rows.
+
+        Returns:
+            (id, cosine similarity) pairs, most similar first.
+        """
+        if self._matrix is None or not self._rows or k <= 0:
+            return []
+        q = _normalize(np.asarray(query, dtype=np.float32).ravel())
+        if q.shape[0] != self.dim:
+            raise ValueError(
+                f"Query has {q.shape[0]} dimensions, index has {self.dim}"
+            )
+
+        if allowed_ids is not None:
+            return self._top_k(self._candidate_rows(allowed_ids), q, k)
+
+        mode = self._effective_mode()
+        if mode == "hnsw":
+            return self._search_hnsw(q, k)
+        if mode == "ivf":
+            return self._search_ivf(q, k)
+        return self._top_k(self._candidate_rows(None), q, k)
+
+    def search_many(
+        self,
+        queries: list[list[float]] | np.ndarray,
+        k: int,
+        allowed_ids: list[str] | set[str] | None = None,
+    ) -> list[list[tuple[str, float]]]:
+        """Find the most similar vectors for several queries at once.
+
+        Exact searches score every query with one matrix product.
+
+        Args:
+            queries: Query embeddings.
+            k: Number of results per query.
+            allowed_ids: Restrict results to these IDs.
+
+        Returns:
+            (id, cosine similarity) pairs per query, most similar first.
+        """
+        if self._matrix is None or not self._rows or k <= 0:
+            return [[] for _ in queries]
+        if allowed_ids is None and self._effective_mode() != "exact":
+            return [self.search(q, k) for q in queries]
+
+        q = np.stack([_normalize(np.asarray(v, dtype=np.float32).ravel()) for v in queries])
+        if q.shape[1] != self.dim:
+            raise ValueError(
+                f"Query has {q.shape[1]} dimensions, index has {self.dim}"
+            )
+        rows = self._candidate_rows(allowed_ids)
+        if rows.size == 0:
+            return [[] for _ in queries]
+        scores = self._matrix[rows] @ q.T  # (rows, queries)
+        k = min(k, rows.size)
+        top = np.argpartition(-scores, k - 1, axis=0)[:k]
+
+        results = []
+        for j in range(q.shape[0]):
+            column = top[:, j][np.argsort(-scores[top[:, j], j])]
+            results.append(
+                [(self._ids[rows[i]], float(scores[i, j])) for i in column]
+            )
+        return results
+
+    def _candidate_rows(self, allowed_ids: list[str] | set[str] | None) -> np.ndarray:
+        """Rows to score: the allowed IDs, or every live row."""
+        if allowed_ids is None:
+            return np.flatnonzero(self._valid[: len(self._ids)])
+        return np.fromiter(
+            (self._rows[i] for i in allowed_ids if i in self._rows), dtype=np.int64
+        )
+
+    def _top_k(self, rows: np.ndarray, q: np.ndarray, k: int) -> list[tuple[str, float]]:
+        """Exact top-k over a set of rows."""
+        if rows.size == 0:
+            return []
+        assert self._matrix is not None
+        scores = self._matrix[rows] @ q
+        k = min(k, rows.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+    def _effective_mode(self) -> str:
+        """Resolve "auto" to a concrete search mode for the current size."""
+        if self.ann != "auto":
+            return self.ann
+        if len(self._rows) < self.ann_threshold:
+            return "exact"
+        return "hnsw" if _hnswlib() is not None else "ivf"
+
+    # =========================================================================
+    # IVF
+    # =========================================================================
+
+    def _search_ivf(self, q: np.ndarray, k: int) -> list[tuple[str, float]]:
+        size = len(self._ids)
+        # Retrain once the index has doubled since the last training
+        if self._centroids is None or size >= 2 * self._ivf_trained_size:
+            self._train_ivf()
+        assert self._centroids is not None
+        nprobe = min(IVF_NPROBE, len(self._centroids))
+        probes = np.argpartition(-(self._centroids @ q), nprobe - 1)[:nprobe]
+        mask = np.isin(self._assign[:size], probes) & self._valid[:size]
+        results = self._top_k(np.flatnonzero(mask), q, k)
+        if len(results) < min(k, len(self._rows)):
+            # Probed lists too small; fall back to exact
+            return self._top_k(self._candidate_rows(None), q, k)
+        return results
+
+    def _train_ivf(self) -> None:
+        """Train the coarse quantizer (spherical k-means) and assign rows."""
+        assert self._matrix is not None
+        size = len(self._ids)
+        rows = np.flatnonzero(self._valid[:size])
+        nlist = max(1, int(np.sqrt(rows.size)))
+        rng = np.random.default_rng(0)
+        sample = rows if rows.size <= 256 * nlist else rng.choice(rows, 256 * nlist, replace=False)
+        vectors = self._matrix[sample]
+        centroids = vectors[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            labels = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = vectors[labels == c]
+                if len(members):
+                    centroids[c] = _normalize(members.mean(axis=0))
+        self._centroids = centroids
+        self._assign[:size] = -1
+        self._assign[rows] = np.argmax(self._matrix[rows] @ centroids.T, axis=1)
+        self._ivf_trained_size = size
+        logger.info(f"Trained IVF index: {nlist} lists over {rows.size} vectors")
+
+    # =========================================================================
+    # HNSW
+    # =========================================================================
+
+    def _search_hnsw(self, q: np.ndarray, k: int) -> list[tuple[str, float]]:
+        if self._hnsw is None:
+            self._build_hnsw()
+        k = min(k, len(self._rows))
+        labels, distances = self._hnsw.knn_query(q, k=k)
+        return [
+            (self._ids[int(label)], float(1.0 - distance))  # type: ignore[misc]
+            for label, distance in zip(labels[0], distances[0], strict=False)
+            if self._valid[int(label)]
+        ]
+
+    def _build_hnsw(self) -> None:
+        hnswlib = _hnswlib()
+        if hnswlib is None:
+            raise RuntimeError("HNSW search requires the hnswlib package")
+        assert self._matrix is not None
+        rows = np.flatnonzero(self._valid[: len(self._ids)])
+        index = hnswlib.Index(space="ip", dim=self.dim)
+        index.init_index(
+            max_elements=self._capacity, ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M,
+            allow_replace_deleted=True,
+        )
+        index.set_ef(HNSW_EF_SEARCH)
+        if rows.size:
+            index.add_items(self._matrix[rows], rows)
+        self._hnsw = index
+        logger.info(f"Built HNSW index over {rows.size} vectors")
+
+    def _index_row(self, row: int) -> None:
+        """Keep approximate structures current after a row changes."""
+        assert self._matrix is not None
+        if self._centroids is not None:
+            self._assign[row] = int(np.argmax(self._centroids @ self._matrix[row]))
+        if self._hnsw is not None:
+            if self._hnsw.get_max_elements() < self._capacity:
+                self._hnsw.resize_index(self._capacity)
+            self._hnsw.add_items(self._matrix[row : row + 1], [row], replace_deleted=True)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < rows:
+            capacity *= 2
+        assert self._matrix is not None
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[: self._capacity] = self._matrix
+        self._matrix = matrix
+        self._valid = np.concatenate([self._valid, np.zeros(capacity - self._capacity, dtype=bool)])
+        self._assign = np.concatenate(
+            [self._assign, np.full(capacity - self._capacity, -1, dtype=np.int32)]
+        )
+        self._capacity = capacity
+
+    # =========================================================================
+    # Snapshots
+    # =========================================================================
+
+    def save(self, path: str | Path) -> None:
+        """Write a snapshot atomically.
+
+        Args:
+            path: Snapshot file (``.npz``).
+        """
+        ids = self.ids
+        rows = np.fromiter((self._rows[i] for i in ids), dtype=np.int64, count=len(ids))
+        vectors = (
+            self._matrix[rows]
+            if self._matrix is not None
+            else np.zeros((0, self.dim or 0), dtype=np.float32)
+        )
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(SNAPSHOT_VERSION),
+                vectors=vectors,
+                ids=np.array(ids, dtype=str),
+                watermark=np.array(self.watermark),
+                segment_fields=np.array(self.segment_fields, dtype=str),
+                segments=np.array(json.dumps(self._memberships, default=str)),
+            )
+        os.replace(tmp, path)
+        logger.info(f"Saved vector index snapshot: {len(ids)} vectors to {path}")
+
+    @classmethod
+    def load(cls, path: str | Path, **options: Any) -> "VectorIndex":
+        """Load a snapshot.
+
+        Args:
+            path: Snapshot file written by ``save``.
+            **options: VectorIndex options (ann, ann_threshold,
+                segment_fields, segment_defaults).
+
+        Returns:
+            VectorIndex with the snapshot's vectors, segments and watermark.
+
+        Raises:
+            ValueError: If the snapshot version is not supported, or it was
+                segmented on different fields.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported vector index snapshot version in {path}")
+            segment_fields = tuple(str(f) for f in data["segment_fields"])
+            if segment_fields != tuple(options.get("segment_fields", ())):
+                raise ValueError(f"Vector index snapshot {path} has other segment fields")
+            vectors = data["vectors"].astype(np.float32, copy=False)
+            ids = [str(i) for i in data["ids"]]
+            watermark = float(data["watermark"])
+            memberships = json.loads(str(data["segments"]))
+
+        index = cls(
+            dim=int(vectors.shape[1]) if vectors.size else None,
+            initial_capacity=max(len(ids), 1),
+            **options,
+        )
+        if ids:
+            # Rows are already normalized; bulk-load without per-row work
+            index._matrix = np.zeros((index._capacity, vectors.shape[1]), dtype=np.float32)
+            index._matrix[: len(ids)] = vectors
+            index._valid[: len(ids)] = True
+            index._ids = list(ids)
+            index._rows = {id: row for row, id in enumerate(ids)}
+        for id, values in memberships.items():
+            index._set_segments(id, values)
+        index.watermark = watermark
+        return index
+
+
+def _segment_value(value: Any) -> bool:
+    """Whether a metadata value can key a segment."""
+    return isinstance(value, str | int | float | bool) or value is None
+
+
+def _segment_keys(values: dict[str, Any]) -> list[tuple[str, Any]]:
+    """(field, value) segment keys, one per element for list values."""
+    keys = []
+    for field, value in values.items():
+        for item in value if isinstance(value, list) else [value]:
+            if _segment_value(item):
+                keys.append((field, item))
+    return keys
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    """L2-normalize a vector (zero vectors are returned unchanged)."""
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
+
+
+def _hnswlib() -> Any:
+    """Import hnswlib if installed."""
+    try:
+        import hnswlib  # type: ignore[import-untyped]
+    except ImportError:
+        return None
+    return hnswlib
@@ -0,0 +1,129 @@
+"""In-memory stand-ins for motor collections used by astro-mongodb tests."""
+
+from types import SimpleNamespace
+
+from pymongo import ReplaceOne
+
+
+class FakeCollection:
+    """Minimal motor collection over a dict, recording find() queries."""
+
+    def __init__(self):
+        self.docs: dict[str, dict] = {}
+        self.queries: list[dict] = []
+        self.bulk_writes = 0
+
+    @staticmethod
+    def _get(doc, key):
+        value = doc
+        for part in key.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    def _matches(self, doc, query):
+        for key, condition in query.items():
+            value = self._get(doc, key)
+            if not isinstance(condition, dict):
+                if value != condition:
+                    return False
+                continue
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$gt" in condition and (value is None or value <= condition["$gt"]):
+                return False
+            if "$gte" in condition and (value is None or value < condition["$gte"]):
+                return False
+            if "$lt" in condition and (value is None or value >= condition["$lt"]):
+                return False
+            if "$lte" in condition and (value is None or value > condition["$lte"]):
+                return False
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+            if "$exists" in condition and (value is not None) != condition["$exists"]:
+                return False
+        return True
+
+    def find(self, query, projection=None, **kwargs):
+        self.queries.append(query)
+        docs = [dict(d) for d in self.docs.values() if self._matches(d, query)]
+        if projection and projection.get("embedding") == 0:
+            for doc in docs:
+                doc.pop("embedding")
+        return FakeCursor(docs)
+
+    async def find_one(self, filter):
+        return next((dict(d) for d in self.docs.values() if self._matches(d, filter)), None)
+
+    async def count_documents(self, filter):
+        return sum(self._matches(doc, filter) for doc in self.docs.values())
+
+    async def replace_one(self, filter, doc, upsert=False):
+        self.docs[filter["_id"]] = doc
+
+    async def update_many(self, filter, pipeline):
+        """Apply an update pipeline of $set (literals or "$path") and $unset."""
+        matched = [doc for doc in self.docs.values() if self._matches(doc, filter)]
+        for doc in matched:
+            for stage in pipeline:
+                unset = stage.get("$unset", [])
+                for field in [unset] if isinstance(unset, str) else unset:
+                    doc.pop(field, None)
+                for field, value in stage.get("$set", {}).items():
+                    if isinstance(value, str) and value.startswith("$"):
+                        value = self._get(doc, value[1:])
+                        if value is None:
+                            continue
+                    doc[field] = value
+        return SimpleNamespace(matched_count=len(matched), modified_count=len(matched))
+
+    async def update_one(self, filter, update):
+        doc = self.docs.get(filter["_id"])
+        if doc is not None:
+            doc.update(update.get("$set", {}))
+        return SimpleNamespace(matched_count=int(doc is not None))
+
+    async def delete_many(self, filter):
+        ids = [id for id, doc in self.docs.items() if self._matches(doc, filter)]
+        for id in ids:
+            del self.docs[id]
+        return SimpleNamespace(deleted_count=len(ids))
+
+    async def delete_one(self, filter):
+        removed = self.docs.pop(filter["_id"], None)
+        return SimpleNamespace(deleted_count=int(removed is not None))
+
+    async def bulk_write(self, requests, ordered=True):
+        self.bulk_writes += 1
+        for request in requests:
+            if isinstance(request, ReplaceOne):
+                self.docs[request._filter["_id"]] = request._doc
+                continue
+            doc = self.docs.get(request._filter["_id"])
+            if doc is None or not self._matches(doc, request._filter):
+                continue
+            doc.update(request._doc.get("$set", {}))
+            for field in request._doc.get("$unset", {}):
+                doc.pop(field, None)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction=1):
+        self.docs.sort(key=lambda doc: doc.get(key) or 0, reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+    def __aiter__(self):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+
+        return iterate()
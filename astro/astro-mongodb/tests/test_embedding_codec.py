@@ -0,0 +1,73 @@
+"""Tests for compact embedding storage and format migration."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from bson import BSON
+from bson.binary import Binary
+
+from astro_mongodb.embedding_codec import decode_embedding, encode_embedding
+from astro_mongodb.memory import MongoDBMemory
+from tests.fakes import FakeCollection
+
+
+def _embedding(seed: int = 0, dim: int = 1536) -> list[float]:
+    return np.random.default_rng(seed).normal(size=dim).tolist()
+
+
+@pytest.mark.parametrize(
+    ("embedding_format", "max_ratio", "tolerance"),
+    [("float64", 1.0, 1e-6), ("float32", 0.51, 1e-6), ("float16", 0.26, 1e-2), ("int8", 0.14, 5e-2)],
+)
+def test_round_trip_size_and_accuracy(embedding_format, max_ratio, tolerance):
+    embedding = _embedding()
+    fields = encode_embedding(embedding, embedding_format)
+    decoded = decode_embedding(BSON.decode(BSON.encode(fields)))
+
+    legacy_size = len(BSON.encode({"embedding": embedding}))
+    assert len(BSON.encode(fields)) <= max_ratio * legacy_size
+    assert np.allclose(decoded, embedding, atol=tolerance * np.max(np.abs(embedding)))
+    if embedding_format != "float64":
+        assert fields["embedding_norm"] == pytest.approx(np.linalg.norm(embedding), rel=1e-5)
+
+
+def test_float32_and_int8_use_bson_vector_subtype():
+    for embedding_format in ("float32", "int8"):
+        embedding = encode_embedding([0.5, -1.0], embedding_format)["embedding"]
+        assert isinstance(embedding, Binary) and embedding.subtype == 9
+    assert encode_embedding([0.5, -1.0], "float32")["embedding"].as_vector().data == [0.5, -1.0]
+
+
+def test_atlas_rejects_float16():
+    with pytest.raises(ValueError, match="Atlas"):
+        MongoDBMemory("mongodb://localhost", "test", use_atlas_search=True, embedding_format="float16")
+
+
+async def test_store_search_and_migrate_in_place():
+    fake_collection = FakeCollection()
+    memory = MongoDBMemory("mongodb://localhost", "test", use_local_index=False)
+    memory._db = MagicMock()
+    memory._db.__getitem__ = MagicMock(return_value=fake_collection)
+
+    for i in range(5):
+        await memory.store(f"m{i}", f"memory {i}", _embedding(i, dim=64), {})
+    memory.embedding_format = "int8"
+    await memory.store("m5", "memory 5", _embedding(5, dim=64), {})
+    timestamps = {id: doc["timestamp"] for id, doc in fake_collection.docs.items()}
+
+    stats = await memory.migrate_embeddings(batch_size=2)
+    assert stats["migrated"] == 5
+    assert stats["bytes_after"] * 7 < stats["bytes_before"]
+    assert {doc["embedding_format"] for doc in fake_collection.docs.values()} == {"int8"}
+    assert {id: doc["timestamp"] for id, doc in fake_collection.docs.items()} == timestamps
+    assert (await memory.migrate_embeddings())["migrated"] == 0
+
+    # Mixed-format collections still search correctly
+    results = await memory.search(_embedding(3, dim=64), limit=1)
+    assert results[0].id == "m3"
+
+    stats = await memory.migrate_embeddings("float64")
+    assert stats["migrated"] == 6
+    doc = fake_collection.docs["m0"]
+    assert isinstance(doc["embedding"], list) and "embedding_scale" not in doc
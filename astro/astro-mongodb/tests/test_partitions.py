@@ -0,0 +1,111 @@
+"""Tests for per-namespace vector index shards."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from astro_mongodb.memory import MongoDBMemory, _filter_query
+from astro_mongodb.partitions import PartitionedIndex
+from astro_mongodb.vector_index import VectorIndex
+from tests.fakes import FakeCollection
+
+
+async def test_shards_load_once_replay_writes_and_evict_lru():
+    release = asyncio.Event()
+    loads: list[str] = []
+
+    async def load(namespace):
+        loads.append(namespace)
+        await release.wait()
+        index = VectorIndex()
+        index.add(f"{namespace}-old", [1.0, 0.0])
+        return index
+
+    partitions = PartitionedIndex(load, max_resident=2)
+    first = asyncio.create_task(partitions.get("user:a"))
+    second = asyncio.create_task(partitions.get("user:a"))
+    await asyncio.sleep(0)
+    # Writes landing mid-load are replayed on the loaded shard
+    partitions.add("user:a", "new", [0.0, 1.0], {})
+    partitions.remove("user:a-old")
+    partitions.add("user:z", "ignored", [0.0, 1.0], {})
+    release.set()
+
+    shard = await first
+    assert await second is shard and loads == ["user:a"]
+    assert shard.ids == ["new"]
+
+    await partitions.get("user:b")
+    await partitions.get("user:a")
+    await partitions.get("global")
+    assert [ns for ns, _ in partitions.resident()] == ["user:a", "global"]
+    assert partitions.stats["loads"] == 3 and partitions.stats["evictions"] == 1
+
+
+async def test_memory_searches_only_the_namespace_shard():
+    fake_collection = FakeCollection()
+    memory = MongoDBMemory(
+        uri="mongodb://localhost",
+        database="test",
+        namespace_partitions=True,
+        max_resident_partitions=2,
+    )
+    memory._db = MagicMock()
+    memory._db.__getitem__ = MagicMock(return_value=fake_collection)
+    memory._partitions = PartitionedIndex(memory._load_partition, 2)
+
+    await memory.store("a1", "A", [1.0, 0.0], {"namespace": "user:a"})
+    await memory.store("b1", "B", [1.0, 0.05], {"namespace": "user:b"})
+    await memory.store("g1", "G", [0.9, 0.1], {"namespace": "global"})
+    fake_collection.docs["legacy"] = {
+        "_id": "legacy",
+        "content": "L",
+        "embedding": [0.8, 0.2],
+        "metadata": {},
+        "timestamp": 1.0,
+    }
+    # Nothing is resident until a namespace is searched
+    assert len(memory._partitions) == 0
+
+    results = await memory.search([1.0, 0.0], limit=5, filter_metadata={"namespace": "user:a"})
+    assert [m.id for m in results] == ["a1"]
+    global_results = await memory.search_many(
+        [[1.0, 0.0]], limit=5, filter_metadata={"namespace": "global"}
+    )
+    assert [m.id for m in global_results[0]] == ["g1", "legacy"]
+
+    # Writes go to resident shards; a third namespace evicts the oldest
+    await memory.store("a2", "A2", [0.0, 1.0], {"namespace": "user:a"})
+    results = await memory.search([0.0, 1.0], limit=1, filter_metadata={"namespace": "user:a"})
+    assert [m.id for m in results] == ["a2"]
+    await memory.search([1.0, 0.0], limit=5, filter_metadata={"namespace": "user:b"})
+    assert [ns for ns, _ in memory._partitions.resident()] == ["user:a", "user:b"]
+
+    assert await memory.delete("a2")
+    results = await memory.search([0.0, 1.0], limit=5, filter_metadata={"namespace": "user:a"})
+    assert [m.id for m in results] == ["a1"]
+
+
+async def test_unpartitioned_global_filter_includes_memories_without_namespace():
+    fake_collection = FakeCollection()
+    memory = MongoDBMemory(uri="mongodb://localhost", database="test")
+    memory._db = MagicMock()
+    memory._db.__getitem__ = MagicMock(return_value=fake_collection)
+    fake_collection.docs["legacy"] = {
+        "_id": "legacy",
+        "content": "L",
+        "embedding": [0.8, 0.2],
+        "metadata": {},
+        "timestamp": 1.0,
+    }
+    await memory._load_index()
+    await memory.store("g1", "G", [0.9, 0.1], {"namespace": "global"})
+    await memory.store("a1", "A", [1.0, 0.0], {"namespace": "user:a"})
+
+    # Resolved from the index's namespace segment, as the shards would
+    results = await memory.search([1.0, 0.0], limit=5, filter_metadata={"namespace": "global"})
+    assert [m.id for m in results] == ["g1", "legacy"]
+    # Atlas pre-filters and collection scans get the same condition
+    assert _filter_query({"namespace": "global", "type": "note"}) == {
+        "metadata.namespace": {"$in": ["global", None]},
+        "metadata.type": "note",
+    }
@@ -0,0 +1,118 @@
+"""Tests for embedding model tracking and the re-embedding job."""
+
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+from astro_mongodb.memory import MongoDBMemory
+from astro_mongodb.reembed import SHADOW_FIELD, ReembeddingJob
+from tests.fakes import FakeCollection
+
+
+def _memory(collection, jobs, **options) -> MongoDBMemory:
+    memory = MongoDBMemory(uri="mongodb://localhost", database="test", **options)
+    memory._db = MagicMock()
+    memory._db.__getitem__ = MagicMock(
+        side_effect=lambda name: jobs if name.endswith("_jobs") else collection
+    )
+    return memory
+
+
+def _embedder() -> AsyncMock:
+    embedder = AsyncMock()
+    embedder.model = "new-model"
+    # Three dimensions, so new vectors are distinguishable from the old two
+    embedder.embed_batch = AsyncMock(
+        side_effect=lambda texts: [[1.0, 0.0, float(len(t))] for t in texts]
+    )
+    return embedder
+
+
+async def test_memory_records_embedding_model_and_warns_on_mixed_state(caplog):
+    fake_collection = FakeCollection()
+    memory = _memory(fake_collection, None, embedding_model="old-model")
+    await memory.store("a", "A", [1.0, 0.0], {})
+    await memory.store_many([("b", "B", [0.0, 1.0], {})])
+    fake_collection.docs["legacy"] = {"_id": "legacy", "content": "L", "embedding": [1.0, 1.0]}
+
+    assert fake_collection.docs["a"]["embedding_model"] == "old-model"
+    assert fake_collection.docs["b"]["embedding_dim"] == 2
+    assert await memory.count_stale_embeddings() == 1
+    assert await memory.count_stale_embeddings("new-model") == 3
+
+    with caplog.at_level(logging.WARNING):
+        await memory._check_embedding_model()
+    assert "1 memories" in caplog.text
+
+
+async def test_reembedding_resumes_from_checkpoint_and_paces(monkeypatch):
+    fake_collection = FakeCollection()
+    jobs = FakeCollection()
+    memory = _memory(fake_collection, jobs, embedding_model="old-model")
+    for id in ("m1", "m2", "m3", "m4"):
+        await memory.store(id, id, [1.0, 0.0], {})
+    sleep = AsyncMock()
+    monkeypatch.setattr("astro_mongodb.reembed.asyncio.sleep", sleep)
+    embedder = _embedder()
+
+    job = ReembeddingJob(
+        memory, embedder, batch_size=2, max_texts_per_s=100, clock=lambda: 0.0
+    )
+    state = await job.run(max_batches=1)
+    assert state["last_id"] == "m2" and state["reembedded"] == 2
+    # Shadow written, live embedding still on the old model
+    doc = fake_collection.docs["m1"]
+    assert doc[SHADOW_FIELD]["model"] == "new-model" and doc[SHADOW_FIELD]["dim"] == 3
+    assert doc["embedding"] == [1.0, 0.0] and doc["embedding_model"] == "old-model"
+    sleep.assert_awaited_once_with(0.02)
+
+    # A new job resumes after m2 and also picks up a memory written meanwhile
+    await memory.store("m0", "late", [0.0, 1.0], {})
+    resumed = ReembeddingJob(memory, embedder, batch_size=2)
+    state = await resumed.run()
+    batches = [call.args[0] for call in embedder.embed_batch.await_args_list]
+    assert batches == [["m1", "m2"], ["m3", "m4"], ["late"]]
+    assert state["status"] == "complete" and state["reembedded"] == 5
+    assert (await resumed.progress())["pending"] == 0
+
+
+async def test_run_finishes_under_steady_writes():
+    fake_collection = FakeCollection()
+    memory = _memory(fake_collection, FakeCollection(), embedding_model="old-model")
+    await memory.store("m1", "m1", [1.0, 0.0], {})
+    embedder = _embedder()
+    embed = embedder.embed_batch.side_effect
+
+    async def embed_while_writing(texts):
+        # Every batch races a new write
+        await memory.store(f"w{embedder.embed_batch.await_count}", "write", [0.0, 1.0], {})
+        return embed(texts)
+
+    embedder.embed_batch.side_effect = embed_while_writing
+
+    state = await ReembeddingJob(memory, embedder).switch()
+
+    # m1 in the first pass, w1 in the final one; w2 arrived after it started
+    assert state["status"] == "switched" and state["passes"] == 1
+    assert state["switched"] == 2 and state["stale"] == 1
+    assert "reembed" not in fake_collection.docs["w2"]
+
+
+async def test_switch_promotes_shadow_embeddings_and_rebuilds_index():
+    fake_collection = FakeCollection()
+    jobs = FakeCollection()
+    memory = _memory(fake_collection, jobs, embedding_model="old-model")
+    await memory._load_index()
+    await memory.store("a", "a", [1.0, 0.0], {})
+    await memory.store("bbb", "bbb", [0.0, 1.0], {})
+
+    state = await ReembeddingJob(memory, _embedder()).switch()
+
+    assert state["switched"] == 2 and state["stale"] == 0
+    doc = fake_collection.docs["bbb"]
+    assert doc["embedding"] == [1.0, 0.0, 3.0]
+    assert doc["embedding_model"] == "new-model" and doc["embedding_dim"] == 3
+    assert SHADOW_FIELD not in doc
+    assert memory.embedding_model == "new-model"
+    assert memory._index.dim == 3
+    results = await memory.search([0.0, 0.0, 1.0], limit=1)
+    assert [m.id for m in results] == ["bbb"]
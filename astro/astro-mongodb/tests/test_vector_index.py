@@ -0,0 +1,277 @@
+"""Tests for the in-process vector index and MongoDBMemory local mode."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from astro_mongodb.memory import MongoDBMemory
+from astro_mongodb.vector_index import VectorIndex
+from tests.fakes import FakeCollection
+
+
+def _vectors(n: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def _brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> list[int]:
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+def test_exact_search_matches_brute_force():
+    vectors = _vectors(500)
+    index = VectorIndex(initial_capacity=4)  # Forces several resizes
+    for i, vector in enumerate(vectors):
+        index.add(f"m{i}", vector)
+
+    query = _vectors(1, seed=1)[0]
+    hits = index.search(query, k=10)
+    assert [id for id, _ in hits] == [f"m{i}" for i in _brute_force(vectors, query, 10)]
+    assert hits[0][1] >= hits[-1][1]
+
+
+def test_upsert_remove_and_filtered_search():
+    index = VectorIndex()
+    index.add("a", [1.0, 0.0])
+    index.add("b", [0.0, 1.0])
+    index.add("c", [1.0, 1.0])
+
+    assert index.search([1.0, 0.1], k=1)[0][0] == "a"
+    assert [id for id, _ in index.search([1.0, 0.1], k=3, allowed_ids={"b", "x"})] == ["b"]
+
+    index.add("a", [0.0, 1.0])  # Replace in place
+    index.remove("b")
+    index.add("d", [1.0, 0.0])  # Reuses b's row
+    assert len(index) == 3
+    assert index.search([1.0, 0.0], k=1)[0][0] == "d"
+    assert "b" not in index
+    assert not index.add("e", [1.0, 0.0, 0.0])  # Wrong dimensions are skipped
+
+
+def test_ivf_recall_on_clustered_data():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 32))
+    vectors = np.concatenate([c + 0.05 * rng.normal(size=(100, 32)) for c in centers])
+    index = VectorIndex(ann="ivf")
+    for i, vector in enumerate(vectors):
+        index.add(str(i), vector)
+
+    query = centers[3] + 0.05 * rng.normal(size=32)
+    expected = {str(i) for i in _brute_force(vectors.astype(np.float32), query, 10)}
+    found = {id for id, _ in index.search(query, k=10)}
+    assert len(found & expected) >= 9
+
+    index.add("new", query)  # Incrementally assigned to a trained list
+    assert index.search(query, k=1)[0][0] == "new"
+
+
+def test_snapshot_round_trip(tmp_path):
+    vectors = _vectors(50)
+    index = VectorIndex()
+    for i, vector in enumerate(vectors):
+        index.add(f"m{i}", vector)
+    index.remove("m3")
+    index.watermark = 123.0
+
+    path = tmp_path / "index.npz"
+    index.save(path)
+    restored = VectorIndex.load(path)
+
+    query = _vectors(1, seed=2)[0]
+    assert restored.search(query, k=5) == pytest.approx(index.search(query, k=5))
+    assert len(restored) == 49 and restored.watermark == 123.0
+    restored.add("m50", query)
+    assert restored.search(query, k=1)[0][0] == "m50"
+
+
+async def _started(collection, **options) -> MongoDBMemory:
+    memory = MongoDBMemory(uri="mongodb://localhost", database="test", **options)
+    memory._db = MagicMock()
+    memory._db.__getitem__ = MagicMock(return_value=collection)
+    await memory._load_index()
+    return memory
+
+
+async def test_memory_searches_resident_index_without_scanning(tmp_path):
+    fake_collection = FakeCollection()
+    collection = fake_collection
+    memory = await _started(collection, index_snapshot_path=tmp_path / "idx.npz")
+
+    await memory.store("fr", "Paris", [1.0, 0.0], {"domain": "geo"})
+    await memory.store("de", "Berlin", [0.9, 0.1], {"domain": "geo"})
+    await memory.store("tax", "VAT", [1.0, 0.05], {"domain": "finance"})
+    collection.queries.clear()
+
+    results = await memory.search([1.0, 0.0], limit=2, filter_metadata={"domain": "geo"})
+    assert [m.id for m in results] == ["fr", "de"]
+    # Filter resolved to IDs, then only the winners fetched by ID
+    assert collection.queries == [{"metadata.domain": "geo"}, {"_id": {"$in": ["fr", "de"]}}]
+
+    assert await memory.delete("fr")
+    results = await memory.search([1.0, 0.0], limit=5)
+    assert [m.id for m in results] == ["tax", "de"]
+
+
+async def test_memory_restarts_from_snapshot_and_catches_up(tmp_path):
+    fake_collection = FakeCollection()
+    collection = fake_collection
+    snapshot = tmp_path / "idx.npz"
+    memory = await _started(collection, index_snapshot_path=snapshot)
+    await memory.store("a", "A", [1.0, 0.0], {})
+    await memory.store("b", "B", [0.0, 1.0], {})
+    memory._client = MagicMock()
+    await memory.shutdown()
+    assert snapshot.exists()
+
+    # Changes made while this process was down
+    collection.docs.pop("a")
+    collection.docs["c"] = {
+        "_id": "c", "content": "C", "embedding": [1.0, 0.1], "metadata": {},
+        "timestamp": collection.docs["b"]["timestamp"] + 1,
+    }
+
+    restarted = await _started(collection, index_snapshot_path=snapshot)
+    assert sorted(restarted._index.ids) == ["b", "c"]
+    results = await restarted.search([1.0, 0.0], limit=1)
+    assert [m.id for m in results] == ["c"]
+
+
+async def test_memory_search_many_fetches_winners_once():
+    fake_collection = FakeCollection()
+    memory = await _started(fake_collection)
+    await memory.store("x", "X", [1.0, 0.0], {})
+    await memory.store("y", "Y", [0.0, 1.0], {})
+    await memory.store("xy", "XY", [1.0, 1.0], {})
+    fake_collection.queries.clear()
+
+    results = await memory.search_many([[1.0, 0.0], [0.0, 1.0]], limit=2)
+
+    assert [[m.id for m in r] for r in results] == [["x", "xy"], ["y", "xy"]]
+    assert len(fake_collection.queries) == 1
+
+
+async def test_memory_store_many_writes_one_bulk_and_indexes():
+    fake_collection = FakeCollection()
+    memory = await _started(fake_collection, embedding_format="float32")
+
+    await memory.store_many(
+        [("a", "A", [1.0, 0.0], {"k": 1}), ("b", "B", [0.0, 1.0], {"k": 2})]
+    )
+
+    assert fake_collection.bulk_writes == 1
+    assert fake_collection.docs["a"]["embedding_format"] == "float32"
+    results = await memory.search([0.1, 1.0], limit=1)
+    assert [m.id for m in results] == ["b"]
+
+
+async def test_memory_search_returns_scores_and_index_vectors():
+    fake_collection = FakeCollection()
+    memory = await _started(fake_collection)
+    await memory.store("x", "X", [3.0, 0.0], {})
+    await memory.store("xy", "XY", [1.0, 1.0], {})
+
+    results = await memory.search([1.0, 0.0], limit=2)
+
+    assert [m.id for m in results] == ["x", "xy"]
+    assert [round(m.score, 3) for m in results] == [1.0, 0.707]
+    # Normalized vectors come from the index rather than the documents
+    assert results[0].embedding == [1.0, 0.0]
+
+
+def test_segments_follow_updates_and_snapshots(tmp_path):
+    index = VectorIndex(segment_fields=["user_id", "directive_ids"])
+    index.add("a", [1.0, 0.0], {"user_id": "u1", "directive_ids": ["fa", "sa"]})
+    index.add("b", [0.0, 1.0], {"user_id": "u2", "directive_ids": ["fa"]})
+    index.add("c", [1.0, 1.0], {"user_id": "u1"})
+
+    assert index.segment_ids({"user_id": "u1"}) == {"a", "c"}
+    assert index.segment_ids({"user_id": "u1", "directive_ids": "fa"}) == {"a"}
+    assert index.segment_ids({"domain": "geo"}) is None  # Not a segment field
+    index.add("a", [1.0, 0.0], {"user_id": "u2"})
+    assert index.segment_ids({"user_id": "u1"}) == {"c"}
+    index.remove("c")
+    assert index.segment_ids({"user_id": "u1"}) == set()
+
+    index.save(tmp_path / "idx.npz")
+    restored = VectorIndex.load(
+        tmp_path / "idx.npz", segment_fields=("user_id", "directive_ids")
+    )
+    assert restored.segment_ids({"user_id": "u2"}) == {"a", "b"}
+    with pytest.raises(ValueError):
+        VectorIndex.load(tmp_path / "idx.npz", segment_fields=("user_id",))
+
+
+async def test_memory_filters_declared_fields_from_segments():
+    fake_collection = FakeCollection()
+    memory = await _started(fake_collection)
+    await memory.store("u1_a", "A", [1.0, 0.0], {"user_id": "u1", "domain": "geo"})
+    await memory.store("u1_b", "B", [0.9, 0.1], {"user_id": "u1", "domain": "tax"})
+    await memory.store("u2_a", "C", [1.0, 0.0], {"user_id": "u2", "domain": "geo"})
+    fake_collection.queries.clear()
+
+    results = await memory.search([1.0, 0.0], limit=5, filter_metadata={"user_id": "u1"})
+
+    assert [m.id for m in results] == ["u1_a", "u1_b"]
+    # Partition resolved in process; only the winners are fetched
+    assert fake_collection.queries == [{"_id": {"$in": ["u1_a", "u1_b"]}}]
+
+    # Undeclared keys and store-time ranges go to MongoDB's indexes
+    fake_collection.queries.clear()
+    since = fake_collection.docs["u1_b"]["timestamp"]
+    results = await memory.search(
+        [1.0, 0.0], limit=5, filter_metadata={"domain": "geo", "timestamp": {"$gte": since}}
+    )
+    assert [m.id for m in results] == ["u2_a"]
+    assert fake_collection.queries[0] == {
+        "metadata.domain": "geo",
+        "timestamp": {"$gte": since},
+    }
+
+
+def test_atlas_definition_declares_filter_fields():
+    memory = MongoDBMemory(
+        uri="mongodb://localhost", database="test", filter_fields=["user_id"]
+    )
+
+    fields = memory.atlas_index_definition(1536)["fields"]
+
+    assert fields[0]["numDimensions"] == 1536
+    assert [f["path"] for f in fields[1:]] == ["timestamp", "metadata.user_id"]
+
+
+async def test_memory_update_metadata_moves_segments():
+    fake_collection = FakeCollection()
+    memory = await _started(fake_collection)
+    await memory.store("a", "A", [1.0, 0.0], {"user_id": "u1"})
+    before = fake_collection.docs["a"]["timestamp"]
+
+    assert await memory.update_metadata("a", {"user_id": "u2", "hit_count": 2})
+
+    assert fake_collection.docs["a"]["metadata"] == {"user_id": "u2", "hit_count": 2}
+    assert fake_collection.docs["a"]["timestamp"] >= before
+    assert memory._index.segment_ids({"user_id": "u2"}) == {"a"}
+    assert not await memory.update_metadata("missing", {})
+
+
+async def test_memory_archive_moves_docs_and_iterates_by_time():
+    fake_collection = FakeCollection()
+    archive = FakeCollection()
+    memory = await _started(fake_collection)
+    memory._db.__getitem__ = MagicMock(
+        side_effect=lambda name: archive if name.endswith("_archive") else fake_collection
+    )
+    await memory.store("a", "A", [1.0, 0.0], {})
+    await memory.store("b", "B", [0.0, 1.0], {})
+    fake_collection.docs["a"]["timestamp"] = 1.0
+    fake_collection.docs["b"]["timestamp"] = 2.0
+
+    listed = [m async for m in memory.iter_memories(include_embeddings=True, before=3.0)]
+    assert [(m.id, m.embedding) for m in listed] == [("a", [1.0, 0.0]), ("b", [0.0, 1.0])]
+    assert [m.id async for m in memory.iter_memories(after=1.0)] == ["b"]
+
+    assert await memory.archive(["a", "missing"]) == 1
+    assert set(fake_collection.docs) == {"b"}
+    assert archive.docs["a"]["content"] == "A" and "archived_at" in archive.docs["a"]
+    assert [m.id for m in await memory.search([1.0, 0.0], limit=5)] == ["b"]
@@ -0,0 +1,176 @@
+"""
+Token-bounded text chunking along structural boundaries.
+
+Splits long documents (PDF text, spreadsheets rendered as rows, markdown)
+into chunks that fit an LLM call. Chunks break at the coarsest boundary
+available: page breaks, then headings, paragraphs, lines, sentences and
+finally words. Consecutive chunks share a small overlap so facts that span a
+boundary are seen whole by at least one chunk.
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from astro.core.llm.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Boundaries from coarsest to finest
+STRUCTURAL_SEPARATORS: list[str] = [
+    "\f",  # page break
+    "\nSheet: ",  # spreadsheet sheet (see file_processing)
+    "\n# ",
+    "\n## ",
+    "\n### ",
+    "\n\n",  # paragraph
+    "\n",  # line / spreadsheet row
+    ". ",
+    " ",
+]
+
+
+@dataclass
+class TextChunk:
+    """A contiguous slice of a document.
+
+    Attributes:
+        index: Position of the chunk in the document (0-based).
+        text: Chunk text, including any overlap from the previous chunk.
+        start: Character offset of the chunk in the source text.
+        end: Character offset just past the chunk.
+        tokens: Estimated token count.
+    """
+
+    index: int
+    text: str
+    start: int
+    end: int
+    tokens: int
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    provider: str | None = None,
+    model: str | None = None,
+) -> list[TextChunk]:
+    """Split text into token-bounded chunks along structural boundaries.
+
+    Args:
+        text: Source text.
+        max_tokens: Maximum estimated tokens per chunk.
+        overlap_tokens: Tokens of trailing context repeated at the start of
+            the next chunk. Must be smaller than max_tokens.
+        provider: LLM provider used for token estimates.
+        model: Model identifier used for token estimates.
+
+    Returns:
+        Chunks in document order. Empty text yields no chunks.
+
+    Raises:
+        ValueError: If max_tokens is not positive or overlap is too large.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+        raise ValueError("overlap_tokens must be in [0, max_tokens)")
+    if not text:
+        return []
+
+    def count(start: int, end: int) -> int:
+        return count_tokens(text[start:end], provider, model)
+
+    total = count(0, len(text))
+    if total <= max_tokens:
+        return [TextChunk(index=0, text=text, start=0, end=len(text), tokens=total)]
+
+    pieces = _split_spans(text, 0, len(text), max_tokens, STRUCTURAL_SEPARATORS, count)
+    piece_tokens = [count(start, end) for start, end in pieces]
+
+    chunks: list[TextChunk] = []
+    current: list[int] = []  # indexes into pieces
+    current_tokens = 0
+
+    def flush() -> None:
+        start = pieces[current[0]][0]
+        end = pieces[current[-1]][1]
+        chunks.append(
+            TextChunk(
+                index=len(chunks),
+                text=text[start:end],
+                start=start,
+                end=end,
+                tokens=current_tokens,
+            )
+        )
+
+    for i, tokens in enumerate(piece_tokens):
+        if current and current_tokens + tokens > max_tokens:
+            flush()
+            # Carry trailing pieces of the previous chunk as overlap
+            carried: list[int] = []
+            carried_tokens = 0
+            for j in reversed(current):
+                if carried_tokens + piece_tokens[j] > overlap_tokens:
+                    break
+                if carried_tokens + piece_tokens[j] + tokens > max_tokens:
+                    break
+                carried.insert(0, j)
+                carried_tokens += piece_tokens[j]
+            current = carried
+            current_tokens = carried_tokens
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        flush()
+
+    logger.debug(f"Chunked {total} tokens into {len(chunks)} chunks (max={max_tokens})")
+    return chunks
+
+
+def _split_spans(
+    text: str,
+    start: int,
+    end: int,
+    max_tokens: int,
+    separators: list[str],
+    count: Callable[[int, int], int],
+) -> list[tuple[int, int]]:
+    """Recursively split text[start:end] into spans that each fit max_tokens."""
+    if count(start, end) <= max_tokens:
+        return [(start, end)]
+
+    segment = text[start:end]
+    for depth, separator in enumerate(separators):
+        if separator not in segment:
+            continue
+
+        # Break after each separator, except that heading markers begin the
+        # following piece so headings stay attached to their section
+        cut = 1 if separator.startswith("\n") and separator.strip() else len(separator)
+        boundaries = [start]
+        position = segment.find(separator, 1)
+        while position != -1:
+            boundaries.append(start + position + cut)
+            position = segment.find(separator, position + len(separator))
+        boundaries.append(end)
+
+        spans: list[tuple[int, int]] = []
+        for piece_start, piece_end in zip(boundaries, boundaries[1:], strict=False):
+            if piece_start == piece_end:
+                continue
+            spans.extend(
+                _split_spans(
+                    text, piece_start, piece_end, max_tokens, separators[depth + 1 :], count
+                )
+            )
+        return spans
+
+    # No boundary left: hard split by characters, scaled by this text's
+    # own characters-per-token ratio
+    chars_per_token = (end - start) / max(count(start, end), 1)
+    step = max(int(max_tokens * chars_per_token * 0.9), 1)
+    return [(i, min(i + step, end)) for i in range(start, end, step)]
@@ -3,4 +3,49 @@
 This module exports LLM initialization helpers.
 """
 
-__all__ = []
+from astro.core.llm.caching import (
+    cacheable_human_message,
+    cacheable_system_message,
+    cacheable_tools,
+    supports_prompt_caching,
+)
+from astro.core.llm.cassette import Cassette, use_cassette
+from astro.core.llm.embedding_cache import (
+    CachingEmbeddingProvider,
+    get_embedding_cache_stats,
+)
+from astro.core.llm.local_embeddings import HashedNgramEmbeddingProvider
+from astro.core.llm.resilience import get_resilience_stats
+from astro.core.llm.routing import (
+    ModelRouter,
+    RouteDecision,
+    RoutingPolicy,
+    get_router,
+)
+from astro.core.llm.structured import (
+    StructuredOutputError,
+    get_structured_output_stats,
+    invoke_structured,
+)
+from astro.core.llm.usage import TokenUsage
+
+__all__ = [
+    "CachingEmbeddingProvider",
+    "Cassette",
+    "HashedNgramEmbeddingProvider",
+    "ModelRouter",
+    "RouteDecision",
+    "RoutingPolicy",
+    "StructuredOutputError",
+    "TokenUsage",
+    "cacheable_human_message",
+    "cacheable_system_message",
+    "cacheable_tools",
+    "get_embedding_cache_stats",
+    "get_resilience_stats",
+    "get_router",
+    "get_structured_output_stats",
+    "invoke_structured",
+    "supports_prompt_caching",
+    "use_cassette",
+]
@@ -0,0 +1,149 @@
+"""Provider-side prompt caching helpers.
+
+Anthropic caches prompt prefixes up to explicit ``cache_control`` breakpoints.
+A request is evaluated in the order tools -> system -> messages, so the cache
+only hits when everything before a breakpoint is byte-for-byte identical to a
+previous request. These helpers mark the stable parts of a prompt (directive
+content, tool schemas, long upstream context) and leave the variable parts
+unmarked. For providers without explicit breakpoints the content is returned
+unchanged.
+
+Anthropic allows at most four breakpoints per request; callers in this
+codebase use at most three (tools, system prompt, upstream context).
+
+Environment:
+    LLM_PROMPT_CACHING: Set to "false" to disable cache breakpoints
+        (default "true").
+"""
+
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Anthropic's only cache type; entries live for ~5 minutes after last use
+CACHE_CONTROL: dict[str, str] = {"type": "ephemeral"}
+
+
+def prompt_caching_enabled() -> bool:
+    """Return whether prompt caching is enabled via LLM_PROMPT_CACHING."""
+    return os.getenv("LLM_PROMPT_CACHING", "true").lower() not in ("0", "false", "no")
+
+
+def supports_prompt_caching(llm: Any) -> bool:
+    """Check whether an LLM accepts ``cache_control`` content blocks.
+
+    Args:
+        llm: A LangChain chat model (or TemperatureFixedLLMWrapper around one).
+
+    Returns:
+        True if caching is enabled and the model is an Anthropic chat model.
+    """
+    if llm is None or not prompt_caching_enabled():
+        return False
+    llm_type = getattr(llm, "_llm_type", None)
+    return isinstance(llm_type, str) and llm_type.startswith("anthropic")
+
+
+def cacheable_text(text: str, llm: Any) -> str | list[dict[str, Any]]:
+    """Return message content with a cache breakpoint after ``text``.
+
+    Args:
+        text: Stable prompt text to cache.
+        llm: The model the content will be sent to.
+
+    Returns:
+        A single cache-marked text block for Anthropic, else the plain string.
+    """
+    if not supports_prompt_caching(llm):
+        return text
+    return [{"type": "text", "text": text, "cache_control": dict(CACHE_CONTROL)}]
+
+
+def cacheable_system_message(text: str, llm: Any) -> Any:
+    """Build a SystemMessage whose content is marked as a cacheable prefix.
+
+    Args:
+        text: System prompt text. Must not contain per-request values
+            (loop counters, timestamps, etc.) or the cache will never hit.
+        llm: The model the message will be sent to.
+
+    Returns:
+        LangChain SystemMessage.
+    """
+    from langchain_core.messages import SystemMessage
+
+    return SystemMessage(content=cacheable_text(text, llm))  # type: ignore[arg-type]
+
+
+def cacheable_human_message(stable_text: str, tail_text: str, llm: Any) -> Any:
+    """Build a HumanMessage with a cached prefix and an uncached tail.
+
+    Used when a long block of context (e.g. upstream outputs) is re-sent on
+    every iteration of a tool loop while the instruction after it is short.
+
+    Args:
+        stable_text: Leading text to cache.
+        tail_text: Trailing text that is not cached.
+        llm: The model the message will be sent to.
+
+    Returns:
+        LangChain HumanMessage.
+    """
+    from langchain_core.messages import HumanMessage
+
+    if not supports_prompt_caching(llm):
+        return HumanMessage(content=f"{stable_text}\n\n{tail_text}")
+
+    return HumanMessage(
+        content=[
+            {
+                "type": "text",
+                "text": stable_text,
+                "cache_control": dict(CACHE_CONTROL),
+            },
+            {"type": "text", "text": tail_text},
+        ]
+    )
+
+
+def cacheable_tools(tools: list[Any], llm: Any) -> list[Any]:
+    """Order tools deterministically and mark the schema block as cacheable.
+
+    Tool schemas come first in an Anthropic request, so a stable order is what
+    lets the system prompt behind them hit the cache at all. The breakpoint is
+    placed on the last tool, which caches the whole tool list.
+
+    Args:
+        tools: LangChain tools (or Anthropic tool dicts).
+        llm: The model the tools will be bound to.
+
+    Returns:
+        Tools sorted by name; Anthropic tool dicts with a breakpoint on the
+        last entry when the model supports caching.
+    """
+    ordered = sorted(tools, key=_tool_name)
+    if not ordered or not supports_prompt_caching(llm):
+        return ordered
+
+    try:
+        from langchain_anthropic.chat_models import convert_to_anthropic_tool
+    except ImportError:
+        return ordered
+
+    try:
+        formatted: list[Any] = [dict(convert_to_anthropic_tool(t)) for t in ordered]
+    except Exception as e:
+        logger.debug(f"Could not convert tools for prompt caching: {e}")
+        return ordered
+
+    formatted[-1]["cache_control"] = dict(CACHE_CONTROL)
+    return formatted
+
+
+def _tool_name(tool: Any) -> str:
+    """Return a tool's name for sorting."""
+    if isinstance(tool, dict):
+        return str(tool.get("name", ""))
+    return str(getattr(tool, "name", ""))
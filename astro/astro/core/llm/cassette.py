@@ -0,0 +1,689 @@
+"""Record/replay cassettes for LLM and embedding calls.
+
+Benchmarks of the runner and pipelines need to run without a live provider.
+In record mode every chat, completion and embedding call is passed through to
+the provider and the request/response pair is captured, with its measured
+latency, into a JSON cassette file. In replay mode the same calls are served
+from the cassette without network access or API keys, sleeping for the
+recorded (or an injected) latency so concurrency and orchestration overhead
+behave as they did live.
+
+Requests are matched by a hash of the call kind, model, bound tools/kwargs and
+messages. Requests that do not match exactly (e.g. prompts containing fresh
+run IDs) fall back to the next unplayed interaction of the same kind and model
+in recorded order, unless the cassette is strict.
+
+The factories in ``astro.core.llm.utils`` (``get_langchain_llm``, ``get_llm``
+and ``get_embedding_provider``) consult the active cassette, so every call
+site is covered without changes.
+
+Environment:
+    LLM_CASSETTE_MODE: "record", "replay" or "off" (default "off").
+    LLM_CASSETTE_PATH: Cassette file (default "cassettes/llm.json").
+    LLM_CASSETTE_LATENCY: Replay latency - "recorded" (default), "none", or a
+        fixed number of seconds per call.
+    LLM_CASSETTE_LATENCY_SCALE: Multiplier for recorded latencies (default 1.0).
+    LLM_CASSETTE_STRICT: Set to "true" to fail on requests without an exact
+        match instead of falling back to recorded order.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+CassetteMode = Literal["off", "record", "replay"]
+
+# Bumped when the on-disk format changes
+CASSETTE_VERSION = 1
+
+# Default cassette file when LLM_CASSETTE_PATH is not set
+DEFAULT_CASSETTE_PATH = "cassettes/llm.json"
+
+# LangChain _llm_type per provider, so replayed models keep provider-specific
+# behaviour (e.g. Anthropic prompt-cache breakpoints)
+REPLAY_LLM_TYPES: dict[str, str] = {
+    "anthropic": "anthropic-chat",
+    "openai": "openai-chat",
+    "google_genai": "chat-google-generative-ai",
+}
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when no recorded interaction matches a request."""
+
+
+class Interaction(BaseModel):
+    """One recorded request/response pair."""
+
+    kind: Literal["chat", "structured", "completion", "stream", "embed", "embed_batch"]
+    key: str
+    model: str
+    request: Any = None
+    response: Any = None
+    latency_s: float = Field(default=0.0, ge=0)
+
+
+class Cassette:
+    """A file of recorded interactions, used for recording or replay.
+
+    Example:
+        >>> with use_cassette("tests/cassettes/run.json", mode="replay"):
+        ...     run = await runner.run("my_constellation", variables)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: CassetteMode = "replay",
+        latency: Literal["recorded", "none"] | float = "recorded",
+        latency_scale: float = 1.0,
+        strict: bool = False,
+    ):
+        """Initialize the cassette.
+
+        Args:
+            path: Cassette JSON file.
+            mode: "record" starts an empty cassette and saves it on ``save()``;
+                "replay" loads the file.
+            latency: Replay delay per call: the recorded latency, none, or a
+                fixed number of seconds.
+            latency_scale: Multiplier applied to recorded latencies.
+            strict: Fail on requests without an exact match.
+
+        Raises:
+            FileNotFoundError: In replay mode, if the cassette does not exist.
+        """
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.interactions: list[Interaction] = []
+        self.stats: Counter[str] = Counter()
+        self._played: set[int] = set()
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self.load()
+
+    def load(self) -> None:
+        """Load interactions from the cassette file."""
+        data = json.loads(self.path.read_text())
+        self.interactions = [Interaction.model_validate(i) for i in data["interactions"]]
+        self._played.clear()
+        logger.info(f"Loaded cassette {self.path} ({len(self.interactions)} interactions)")
+
+    def save(self) -> None:
+        """Write recorded interactions to the cassette file atomically."""
+        if self.mode != "record":
+            return
+        with self._lock:
+            data: dict[str, Any] = {
+                "version": CASSETTE_VERSION,
+                "interactions": [i.model_dump() for i in self.interactions],
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, indent=1, default=str))
+        os.replace(tmp, self.path)
+        logger.info(f"Saved cassette {self.path} ({len(data['interactions'])} interactions)")
+
+    def record(
+        self, kind: str, model: str, request: Any, response: Any, latency_s: float
+    ) -> None:
+        """Append an interaction (record mode).
+
+        Args:
+            kind: Call kind ("chat", "embed", ...).
+            model: Model identifier.
+            request: JSON-serializable request.
+            response: JSON-serializable response.
+            latency_s: Measured call latency.
+        """
+        interaction = Interaction(
+            kind=kind,  # type: ignore[arg-type]
+            key=request_key(kind, model, request),
+            model=model,
+            request=request,
+            response=response,
+            latency_s=latency_s,
+        )
+        with self._lock:
+            self.interactions.append(interaction)
+            self.stats["recorded"] += 1
+
+    def lookup(self, kind: str, model: str, request: Any) -> Interaction:
+        """Find the interaction to replay for a request (replay mode).
+
+        Args:
+            kind: Call kind.
+            model: Model identifier.
+            request: JSON-serializable request.
+
+        Returns:
+            The first unplayed exact match, else (unless strict) the first
+            unplayed interaction of the same kind and model.
+
+        Raises:
+            CassetteMissError: If nothing matches.
+        """
+        key = request_key(kind, model, request)
+        with self._lock:
+            index = self._first_unplayed(lambda i: i.key == key)
+            if index is not None:
+                self.stats["exact"] += 1
+            elif not self.strict:
+                index = self._first_unplayed(lambda i: i.kind == kind and i.model == model)
+                if index is not None:
+                    self.stats["fallback"] += 1
+            if index is None:
+                self.stats["misses"] += 1
+                raise CassetteMissError(
+                    f"No recorded {kind} interaction for model '{model}' in {self.path}"
+                )
+            self._played.add(index)
+            return self.interactions[index]
+
+    def delay_for(self, interaction: Interaction) -> float:
+        """Replay delay in seconds for an interaction."""
+        if self.latency == "none":
+            return 0.0
+        if self.latency == "recorded":
+            return interaction.latency_s * self.latency_scale
+        return float(self.latency)
+
+    def _first_unplayed(self, match: Any) -> int | None:
+        for index, interaction in enumerate(self.interactions):
+            if index not in self._played and match(interaction):
+                return index
+        return None
+
+
+def request_key(kind: str, model: str, request: Any) -> str:
+    """Stable hash identifying a request."""
+    payload = json.dumps(
+        {"kind": kind, "model": model, "request": request}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Serialization
+# =============================================================================
+
+
+def dump_messages(messages: Any) -> Any:
+    """Serialize chat input (LangChain messages, dicts or a string)."""
+    from langchain_core.messages import BaseMessage, message_to_dict
+
+    if isinstance(messages, list):
+        return [
+            message_to_dict(m) if isinstance(m, BaseMessage) else m for m in messages
+        ]
+    if isinstance(messages, BaseMessage):
+        return message_to_dict(messages)
+    return messages
+
+
+def dump_message(message: Any) -> Any:
+    """Serialize a chat response message."""
+    from langchain_core.messages import BaseMessage, message_to_dict
+
+    return message_to_dict(message) if isinstance(message, BaseMessage) else message
+
+
+def load_message(data: Any) -> Any:
+    """Deserialize a chat response message."""
+    from langchain_core.messages import messages_from_dict
+
+    if isinstance(data, dict) and "type" in data and "data" in data:
+        return messages_from_dict([data])[0]
+    return data
+
+
+def _plain(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """JSON-safe view of bound kwargs (callables and objects by name)."""
+    return {
+        k: v if isinstance(v, (str, int, float, bool, type(None), list, dict)) else repr(v)
+        for k, v in sorted(kwargs.items())
+    }
+
+
+def _tool_names(tools: Any) -> list[str]:
+    """Names of tools bound to a chat model."""
+    names = []
+    for tool in tools or []:
+        if isinstance(tool, dict):
+            names.append(str(tool.get("name") or tool.get("function", {}).get("name")))
+        else:
+            names.append(str(getattr(tool, "name", None) or getattr(tool, "__name__", tool)))
+    return names
+
+
+# =============================================================================
+# Wrappers
+# =============================================================================
+
+
+class CassetteChatModel:
+    """LangChain chat model that records to or replays from a cassette.
+
+    In replay mode there is no underlying model; in record mode calls are
+    passed through to ``llm``.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        cassette: Cassette,
+        model: str,
+        provider: str = "",
+        bound: dict[str, Any] | None = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            llm: Underlying chat model (None in replay mode).
+            cassette: Active cassette.
+            model: Model identifier (part of the request key).
+            provider: LLM provider, used for ``_llm_type`` in replay mode.
+            bound: Tools and kwargs bound so far (part of the request key).
+        """
+        self._llm = llm
+        self._cassette = cassette
+        self._provider = provider
+        self._bound = bound or {}
+        self.model = model
+
+    @property
+    def _llm_type(self) -> str:
+        if self._llm is not None:
+            return str(getattr(self._llm, "_llm_type", ""))
+        return REPLAY_LLM_TYPES.get(self._provider, "cassette-chat")
+
+    def _request(self, messages: Any, kwargs: dict[str, Any]) -> dict[str, Any]:
+        return {"bound": self._bound, "kwargs": _plain(kwargs), "messages": dump_messages(messages)}
+
+    async def ainvoke(self, messages: Any, **kwargs: Any) -> Any:
+        """Async invoke, recorded or replayed."""
+        request = self._request(messages, kwargs)
+        if self._llm is None:
+            interaction = self._cassette.lookup("chat", self.model, request)
+            await asyncio.sleep(self._cassette.delay_for(interaction))
+            return load_message(interaction.response)
+
+        started = time.perf_counter()
+        response = await self._llm.ainvoke(messages, **kwargs)
+        self._cassette.record(
+            "chat", self.model, request, dump_message(response), time.perf_counter() - started
+        )
+        return response
+
+    def invoke(self, messages: Any, **kwargs: Any) -> Any:
+        """Sync invoke, recorded or replayed."""
+        request = self._request(messages, kwargs)
+        if self._llm is None:
+            interaction = self._cassette.lookup("chat", self.model, request)
+            time.sleep(self._cassette.delay_for(interaction))
+            return load_message(interaction.response)
+
+        started = time.perf_counter()
+        response = self._llm.invoke(messages, **kwargs)
+        self._cassette.record(
+            "chat", self.model, request, dump_message(response), time.perf_counter() - started
+        )
+        return response
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "CassetteChatModel":
+        """Bind tools; the tool names become part of the request key."""
+        inner = self._llm.bind_tools(tools, **kwargs) if self._llm is not None else None
+        bound = {**self._bound, "tools": _tool_names(tools), **_plain(kwargs)}
+        return CassetteChatModel(inner, self._cassette, self.model, self._provider, bound)
+
+    def bind(self, **kwargs: Any) -> "CassetteChatModel":
+        """Bind call kwargs (e.g. max_tokens); they become part of the request key."""
+        inner = self._llm.bind(**kwargs) if self._llm is not None else None
+        bound = {**self._bound, **_plain(kwargs)}
+        return CassetteChatModel(inner, self._cassette, self.model, self._provider, bound)
+
+    def with_structured_output(
+        self, schema: Any, include_raw: bool = False, **kwargs: Any
+    ) -> "CassetteStructuredModel":
+        """Schema-constrained output; the raw message is what gets recorded."""
+        inner = (
+            self._llm.with_structured_output(schema, include_raw=True, **kwargs)
+            if self._llm is not None
+            else None
+        )
+        name = getattr(schema, "__name__", str(schema))
+        bound = {**self._bound, "schema": name, **_plain(kwargs)}
+        return CassetteStructuredModel(
+            inner, self._cassette, self.model, schema, include_raw, bound
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate other attributes to the underlying model (record mode)."""
+        if name.startswith("__") or self.__dict__.get("_llm") is None:
+            raise AttributeError(name)
+        return getattr(self._llm, name)
+
+
+class CassetteStructuredModel:
+    """Structured-output runnable that records/replays the raw message."""
+
+    def __init__(
+        self,
+        runnable: Any,
+        cassette: Cassette,
+        model: str,
+        schema: Any,
+        include_raw: bool,
+        bound: dict[str, Any],
+    ):
+        self._runnable = runnable
+        self._cassette = cassette
+        self._model = model
+        self._schema = schema
+        self._include_raw = include_raw
+        self._bound = bound
+
+    async def ainvoke(self, messages: Any, **kwargs: Any) -> Any:
+        """Async invoke, recorded or replayed."""
+        request = {"bound": self._bound, "kwargs": _plain(kwargs), "messages": dump_messages(messages)}
+        if self._runnable is None:
+            interaction = self._cassette.lookup("structured", self._model, request)
+            await asyncio.sleep(self._cassette.delay_for(interaction))
+            result = self._parse(load_message(interaction.response))
+        else:
+            started = time.perf_counter()
+            result = await self._runnable.ainvoke(messages, **kwargs)
+            self._cassette.record(
+                "structured",
+                self._model,
+                request,
+                dump_message(result.get("raw")),
+                time.perf_counter() - started,
+            )
+        return result if self._include_raw else result.get("parsed")
+
+    def _parse(self, raw: Any) -> dict[str, Any]:
+        """Rebuild the include_raw result from a replayed raw message."""
+        from astro.core.llm.structured import parse_structured_output
+
+        try:
+            tool_calls = getattr(raw, "tool_calls", None)
+            if tool_calls:
+                parsed = self._schema.model_validate(tool_calls[0].get("args", {}))
+            else:
+                parsed, _ = parse_structured_output(str(getattr(raw, "content", raw)), self._schema)
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+        except Exception as e:
+            return {"raw": raw, "parsed": None, "parsing_error": e}
+
+
+class CassetteLLMClient:
+    """LLMClient (``get_llm``) that records to or replays from a cassette."""
+
+    def __init__(self, client: Any, cassette: Cassette, model: str, temperature: float = 0):
+        """Initialize the wrapper.
+
+        Args:
+            client: Underlying LLMClient (None in replay mode).
+            cassette: Active cassette.
+            model: Model identifier.
+            temperature: Default temperature (part of the request key).
+        """
+        self._client = client
+        self._cassette = cassette
+        self.model = model
+        self.temperature = temperature
+
+    def _request(
+        self, messages: Any, temperature: float | None, max_tokens: int, kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            "messages": messages,
+            "temperature": self.temperature if temperature is None else temperature,
+            "max_tokens": max_tokens,
+            "kwargs": _plain(kwargs),
+        }
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float | None = None,
+        max_tokens: int = 4096,
+        **kwargs: Any,
+    ) -> str:
+        """Generate a response, recorded or replayed."""
+        request = self._request(messages, temperature, max_tokens, kwargs)
+        if self._client is None:
+            interaction = self._cassette.lookup("completion", self.model, request)
+            time.sleep(self._cassette.delay_for(interaction))
+            return str(interaction.response)
+
+        started = time.perf_counter()
+        response: str = self._client.generate(messages, temperature, max_tokens, **kwargs)
+        self._cassette.record(
+            "completion", self.model, request, response, time.perf_counter() - started
+        )
+        return response
+
+    def stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float | None = None,
+        max_tokens: int = 4096,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """Stream a response, recorded or replayed chunk by chunk."""
+        request = self._request(messages, temperature, max_tokens, kwargs)
+        if self._client is None:
+            interaction = self._cassette.lookup("stream", self.model, request)
+            chunks = list(interaction.response or [])
+            # Spread the replay delay across chunks to keep time-to-first-token
+            delay = self._cassette.delay_for(interaction) / max(len(chunks), 1)
+            for chunk in chunks:
+                time.sleep(delay)
+                yield chunk
+            return
+
+        started = time.perf_counter()
+        chunks = []
+        for chunk in self._client.stream(messages, temperature, max_tokens, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self._cassette.record(
+            "stream", self.model, request, chunks, time.perf_counter() - started
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate other attributes to the underlying client (record mode)."""
+        if name.startswith("__") or self.__dict__.get("_client") is None:
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+
+class CassetteEmbeddingProvider:
+    """EmbeddingProvider that records to or replays from a cassette."""
+
+    def __init__(self, provider: Any, cassette: Cassette, model: str):
+        """Initialize the wrapper.
+
+        Args:
+            provider: Underlying EmbeddingProvider (None in replay mode).
+            cassette: Active cassette.
+            model: Embedding model identifier.
+        """
+        self._provider = provider
+        self._cassette = cassette
+        self.model = model
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text, recorded or replayed."""
+        result: list[float] = await self._call("embed", text)
+        return result
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in one call, recorded or replayed."""
+        if not texts:
+            return []
+        result: list[list[float]] = await self._call("embed_batch", texts)
+        return result
+
+    async def _call(self, kind: str, request: Any) -> Any:
+        if self._provider is None:
+            interaction = self._cassette.lookup(kind, self.model, request)
+            await asyncio.sleep(self._cassette.delay_for(interaction))
+            return interaction.response
+
+        started = time.perf_counter()
+        response = await getattr(self._provider, kind)(request)
+        self._cassette.record(kind, self.model, request, response, time.perf_counter() - started)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate other attributes to the underlying provider (record mode)."""
+        if name.startswith("__") or self.__dict__.get("_provider") is None:
+            raise AttributeError(name)
+        return getattr(self._provider, name)
+
+
+# =============================================================================
+# Active cassette
+# =============================================================================
+
+_cassette: Cassette | None = None
+_env_loaded = False
+
+
+def cassette_from_env() -> Cassette | None:
+    """Build a cassette from the LLM_CASSETTE_* environment variables.
+
+    Returns:
+        Cassette, or None when LLM_CASSETTE_MODE is unset or "off".
+    """
+    mode = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+    if mode not in ("record", "replay"):
+        return None
+
+    raw_latency = os.getenv("LLM_CASSETTE_LATENCY", "recorded").lower()
+    latency: Literal["recorded", "none"] | float
+    if raw_latency in ("recorded", "none"):
+        latency = raw_latency  # type: ignore[assignment]
+    else:
+        latency = float(raw_latency)
+
+    return Cassette(
+        os.getenv("LLM_CASSETTE_PATH", DEFAULT_CASSETTE_PATH),
+        mode=mode,  # type: ignore[arg-type]
+        latency=latency,
+        latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1.0")),
+        strict=os.getenv("LLM_CASSETTE_STRICT", "false").lower() in ("1", "true", "yes"),
+    )
+
+
+def get_cassette() -> Cassette | None:
+    """Get the active cassette (from ``use_cassette`` or the environment)."""
+    global _cassette, _env_loaded
+    if _cassette is None and not _env_loaded:
+        _env_loaded = True
+        _cassette = cassette_from_env()
+        if _cassette is not None and _cassette.mode == "record":
+            atexit.register(_cassette.save)
+    return _cassette
+
+
+@contextmanager
+def use_cassette(
+    path: str | Path,
+    mode: CassetteMode = "replay",
+    **options: Any,
+) -> Iterator[Cassette | None]:
+    """Activate a cassette for the duration of a block.
+
+    Models and providers created inside the block record to or replay from the
+    cassette; recordings are saved when the block exits.
+
+    Args:
+        path: Cassette JSON file.
+        mode: "record", "replay" or "off".
+        **options: Cassette options (latency, latency_scale, strict).
+
+    Yields:
+        The active Cassette (None for mode "off").
+    """
+    global _cassette, _env_loaded
+    previous, previous_loaded = _cassette, _env_loaded
+    cassette = Cassette(path, mode, **options) if mode != "off" else None
+    _cassette, _env_loaded = cassette, True
+    try:
+        yield cassette
+    finally:
+        if cassette is not None:
+            cassette.save()
+        _cassette, _env_loaded = previous, previous_loaded
+
+
+def reset_cassette() -> None:
+    """Deactivate the cassette (re-reads the environment on next use)."""
+    global _cassette, _env_loaded
+    _cassette = None
+    _env_loaded = False
+
+
+def replaying() -> bool:
+    """Whether calls are being served from a cassette (no provider needed)."""
+    cassette = get_cassette()
+    return cassette is not None and cassette.mode == "replay"
+
+
+def cassette_chat_model(
+    llm: Any, model: str, provider: str = "", temperature: float = 0
+) -> Any:
+    """Wrap a chat model for the active cassette.
+
+    Args:
+        llm: LangChain chat model (None when replaying).
+        model: Model identifier.
+        provider: LLM provider.
+        temperature: Sampling temperature (part of the request key).
+
+    Returns:
+        CassetteChatModel, or ``llm`` unchanged when no cassette is active.
+    """
+    cassette = get_cassette()
+    if cassette is None:
+        return llm
+    return CassetteChatModel(
+        llm, cassette, model, provider, bound={"temperature": temperature}
+    )
+
+
+def cassette_llm_client(client: Any, model: str, temperature: float = 0) -> Any:
+    """Wrap an LLMClient for the active cassette (``client`` is None when replaying)."""
+    cassette = get_cassette()
+    if cassette is None:
+        return client
+    return CassetteLLMClient(client, cassette, model, temperature)
+
+
+def cassette_embedding_provider(provider: Any, model: str) -> Any:
+    """Wrap an EmbeddingProvider for the active cassette (``provider`` is None when replaying)."""
+    cassette = get_cassette()
+    if cassette is None:
+        return provider
+    return CassetteEmbeddingProvider(provider, cassette, model)
@@ -0,0 +1,330 @@
+"""Two-tier cache for embedding calls.
+
+Interpreter queries, memory contents and directive descriptions are
+re-embedded over and over, and every embedding call sits on the critical
+path of a zero-shot query. CachingEmbeddingProvider wraps any
+EmbeddingProvider with:
+
+- An in-memory LRU of float32 vectors, shared process-wide.
+- A persistent SQLite tier storing vectors as compact float32 blobs, so
+  restarts and other processes on the same machine start warm. The async
+  path runs its queries in a worker thread, off the event loop, and the
+  database is in WAL mode so commits do not fsync.
+
+Entries are keyed on the model and a hash of the whitespace- and
+Unicode-normalized text. ``embed_batch`` sends only the cache misses (each
+distinct text once) to the provider. Cached vectors are float32, so they
+can differ from a fresh response in the 7th significant digit.
+Hit rates are exposed via ``get_embedding_cache_stats``.
+
+Environment:
+    EMBEDDING_CACHE: Set to "false" to disable caching (default "true").
+    EMBEDDING_CACHE_SIZE: In-memory LRU entries (default 10000).
+    EMBEDDING_CACHE_PATH: SQLite file for the persistent tier (default
+        ".astro/embedding_cache.sqlite"); set to "" to keep the cache in
+        memory only.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 10_000
+DEFAULT_CACHE_PATH = ".astro/embedding_cache.sqlite"
+
+# SQLite caps bound parameters per statement; look keys up in chunks
+_LOOKUP_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    """Cache key for a model and text."""
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """In-memory LRU over an optional SQLite store of float32 vectors."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, path: str | Path | None = None):
+        """Initialize the cache.
+
+        Args:
+            max_entries: In-memory LRU capacity.
+            path: SQLite file for the persistent tier (None = memory only).
+        """
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.stats: Counter[str] = Counter()
+        self._lru: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes disk-tier queries, which run in worker threads
+        self._db_lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                # WAL commits skip the per-transaction fsync of rollback journals
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings "
+                    "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache disk tier disabled ({self.path}): {e}")
+                self._db = None
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Look keys up in memory, then on disk.
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            Vectors for the keys that were found. Disk hits are promoted
+            into the LRU.
+        """
+        found, missing = self._get_memory(keys)
+        if missing and self._db is not None:
+            self._promote(self._read_disk(missing), found)
+        return found
+
+    async def aget_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Like get_many, reading the disk tier in a worker thread."""
+        found, missing = self._get_memory(keys)
+        if missing and self._db is not None:
+            self._promote(await asyncio.to_thread(self._read_disk, missing), found)
+        return found
+
+    def put_many(self, entries: dict[str, Any]) -> None:
+        """Store vectors in memory and on disk.
+
+        Args:
+            entries: Cache key to embedding vector.
+        """
+        if entries:
+            self._write_disk(self._put_memory(entries))
+
+    async def aput_many(self, entries: dict[str, Any]) -> None:
+        """Like put_many, writing the disk tier in a worker thread."""
+        if entries:
+            packed = self._put_memory(entries)
+            if self._db is not None:
+                await asyncio.to_thread(self._write_disk, packed)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._lru.clear()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _get_memory(self, keys: list[str]) -> tuple[dict[str, np.ndarray], list[str]]:
+        """Look keys up in the LRU; returns (found, missing keys)."""
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vector
+                    self.stats["memory_hits"] += 1
+        return found, [k for k in dict.fromkeys(keys) if k not in found]
+
+    def _put_memory(self, entries: dict[str, Any]) -> dict[str, np.ndarray]:
+        """Pack vectors as float32 and insert them into the LRU."""
+        packed = {k: np.asarray(v, dtype="<f4") for k, v in entries.items()}
+        with self._lock:
+            for key, vector in packed.items():
+                self._remember(key, vector)
+        return packed
+
+    def _promote(self, rows: dict[str, np.ndarray], found: dict[str, np.ndarray]) -> None:
+        """Add disk hits to the LRU and the lookup result."""
+        with self._lock:
+            for key, vector in rows.items():
+                found[key] = vector
+                self._remember(key, vector)
+                self.stats["disk_hits"] += 1
+
+    def _read_disk(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Fetch keys from the disk tier (blocking)."""
+        rows: dict[str, np.ndarray] = {}
+        with self._db_lock:
+            if self._db is None:
+                return rows
+            try:
+                for start in range(0, len(keys), _LOOKUP_CHUNK):
+                    chunk = keys[start : start + _LOOKUP_CHUNK]
+                    for key, blob in self._db.execute(
+                        "SELECT key, vector FROM embeddings WHERE key IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    ):
+                        rows[key] = np.frombuffer(blob, dtype="<f4")
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read cached embeddings: {e}")
+        return rows
+
+    def _write_disk(self, packed: dict[str, np.ndarray]) -> None:
+        """Persist vectors to the disk tier in one transaction (blocking)."""
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(k, v.tobytes()) for k, v in packed.items()],
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist embeddings: {e}")
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the LRU, evicting the oldest entries (lock held)."""
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self.stats["evictions"] += 1
+
+
+class CachingEmbeddingProvider:
+    """EmbeddingProvider wrapper that serves repeated texts from an EmbeddingCache."""
+
+    def __init__(self, provider: Any, model: str, cache: EmbeddingCache | None = None):
+        """Initialize the wrapper.
+
+        Args:
+            provider: EmbeddingProvider implementation.
+            model: Embedding model name (part of every cache key).
+            cache: Cache to use (default: the shared process-wide cache).
+        """
+        self._provider = provider
+        self._model = model
+        self._cache = cache or get_embedding_cache()
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text, from cache when possible."""
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, sending only cache misses to the provider.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            One embedding per text, in order.
+        """
+        if not texts:
+            return []
+        keys = [cache_key(self._model, text) for text in texts]
+        self._cache.stats["requests"] += len(set(keys))
+        vectors: dict[str, Any] = dict(await self._cache.aget_many(keys))
+
+        # Each distinct missing text is sent once
+        misses = {k: text for k, text in zip(keys, texts, strict=True) if k not in vectors}
+        if misses:
+            self._cache.stats["misses"] += len(misses)
+            self._cache.stats["provider_calls"] += 1
+            if len(misses) == 1:
+                fresh = [await self._provider.embed(next(iter(misses.values())))]
+            else:
+                fresh = await self._provider.embed_batch(list(misses.values()))
+            computed = dict(zip(misses, fresh, strict=True))
+            await self._cache.aput_many(computed)
+            vectors.update(computed)
+
+        return [
+            v.tolist() if isinstance(v, np.ndarray) else list(v)
+            for v in (vectors[k] for k in keys)
+        ]
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate all other attributes to the underlying provider."""
+        return getattr(self._provider, name)
+
+
+_cache: EmbeddingCache | None = None
+
+
+def embedding_cache_enabled() -> bool:
+    """Whether embedding caching is enabled (EMBEDDING_CACHE)."""
+    return os.getenv("EMBEDDING_CACHE", "true").lower() not in ("0", "false", "no")
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide EmbeddingCache, configured from the environment."""
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache(
+            max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", str(DEFAULT_CACHE_SIZE))),
+            path=os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH) or None,
+        )
+    return _cache
+
+
+def reset_embedding_cache() -> None:
+    """Close the shared cache so the next use re-reads the environment."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+def cached_embedding_provider(provider: Any, model: str) -> Any:
+    """Wrap an embedding provider with the shared cache, if enabled."""
+    if not embedding_cache_enabled():
+        return provider
+    return CachingEmbeddingProvider(provider, model)
+
+
+def get_embedding_cache_stats() -> dict[str, float]:
+    """Return hit/miss counters for the shared cache.
+
+    Returns:
+        Counts of requests (distinct texts per call), memory_hits, disk_hits, misses,
+        provider_calls and evictions, plus hit_rate (hits / requests).
+    """
+    cache = get_embedding_cache()
+    stats: dict[str, float] = {
+        name: cache.stats.get(name, 0)
+        for name in (
+            "requests",
+            "memory_hits",
+            "disk_hits",
+            "misses",
+            "provider_calls",
+            "evictions",
+        )
+    }
+    hits = stats["memory_hits"] + stats["disk_hits"]
+    stats["hit_rate"] = round(hits / stats["requests"], 4) if stats["requests"] else 0.0
+    return stats
@@ -2,6 +2,7 @@
 
 import logging
 import os
+from typing import Any
 
 from openai import AsyncOpenAI
 
@@ -23,6 +24,7 @@ class OpenAIEmbeddingProvider:
         model: str = DEFAULT_EMBEDDING_MODEL,
         api_key: str | None = None,
         base_url: str | None = None,
+        max_retries: int | None = None,
     ):
         """Initialize the OpenAI embedding provider.
 
@@ -30,6 +32,7 @@ class OpenAIEmbeddingProvider:
             model: OpenAI embedding model name.
             api_key: OpenAI API key. Falls back to OPENAI_API_KEY env var.
             base_url: Optional custom base URL. Falls back to OPENAI_BASE_URL env var.
+            max_retries: SDK-level retries. None keeps the SDK default.
         """
         self.model = model
         resolved_key = api_key or os.getenv("OPENAI_API_KEY")
@@ -40,9 +43,14 @@ class OpenAIEmbeddingProvider:
 
         resolved_base = base_url or os.getenv("OPENAI_BASE_URL")
 
+        client_kwargs: dict[str, Any] = {}
+        if max_retries is not None:
+            client_kwargs["max_retries"] = max_retries
+
         self._client = AsyncOpenAI(
             api_key=resolved_key,
             base_url=resolved_base,
+            **client_kwargs,
         )
         logger.info(f"OpenAI embedding provider initialized: model={model}")
 
@@ -0,0 +1,157 @@
+"""Local CPU embedding provider using hashed n-gram features.
+
+OpenAIEmbeddingProvider puts a network round-trip (50-300ms) on every
+query. HashedNgramEmbeddingProvider embeds on the CPU with no network and no
+model download, for indexes where latency matters more than embedding
+quality (registry and matching pre-filters, tests, air-gapped deployments).
+
+Each text is NFKC-normalized and lowercased, then mapped to sparse features:
+
+- Word unigrams and bigrams.
+- Character n-grams (default 3-5) of each word padded with boundary marks,
+  so inflections and typos still overlap.
+
+Features are hashed (CRC32, stable across processes and platforms) into a
+fixed number of signed buckets, weighted by sublinear term frequency and
+L2-normalized. A batch is encoded into one matrix with vectorized NumPy
+scatter-adds. Output is deterministic: the same text always gives the same
+vector.
+"""
+
+import asyncio
+import math
+import re
+import unicodedata
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+# Default vector size (power of two keeps bucket collisions uniform)
+DEFAULT_DIMENSIONS = 512
+
+# Character n-gram sizes taken from each word
+DEFAULT_CHAR_NGRAMS = (3, 5)
+
+# Relative weights of the feature families
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.7
+CHAR_WEIGHT = 0.35
+
+# Batches at least this large are encoded off the event loop
+THREAD_BATCH_SIZE = 256
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, dimensions: int) -> tuple[int, float]:
+    """Stable (bucket, sign) for a feature."""
+    h = zlib.crc32(feature.encode())
+    return h % dimensions, 1.0 if h & 0x80000000 else -1.0
+
+
+class HashedNgramEmbeddingProvider:
+    """Offline EmbeddingProvider over hashed word and character n-grams.
+
+    Example:
+        provider = HashedNgramEmbeddingProvider(dimensions=512)
+        vector = await provider.embed("Tesla Q4 revenue")
+    """
+
+    def __init__(
+        self,
+        dimensions: int = DEFAULT_DIMENSIONS,
+        char_ngrams: tuple[int, int] = DEFAULT_CHAR_NGRAMS,
+    ):
+        """Initialize the provider.
+
+        Args:
+            dimensions: Embedding size.
+            char_ngrams: Smallest and largest character n-gram size.
+        """
+        if dimensions <= 0:
+            raise ValueError(f"dimensions must be positive, got {dimensions}")
+        self.dimensions = dimensions
+        self.char_ngrams = char_ngrams
+        # Identifies the feature space, e.g. for cache keys and stored memories
+        self.model = f"hashed-ngram-{dimensions}-c{char_ngrams[0]}{char_ngrams[1]}"
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Unit-length embedding (all zeros for text with no words).
+        """
+        vector: list[float] = self.encode([text])[0].tolist()
+        return vector
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts in one vectorized pass.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            One embedding per text, in order.
+        """
+        if not texts:
+            return []
+        if len(texts) >= THREAD_BATCH_SIZE:
+            matrix = await asyncio.to_thread(self.encode, texts)
+        else:
+            matrix = self.encode(texts)
+        vectors: list[list[float]] = matrix.tolist()
+        return vectors
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Encode texts into an (n, dimensions) float32 matrix.
+
+        Args:
+            texts: Texts to encode.
+
+        Returns:
+            Row-normalized embeddings.
+        """
+        rows: list[int] = []
+        cols: list[int] = []
+        values: list[float] = []
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text).items():
+                bucket, sign = _bucket(feature, self.dimensions)
+                rows.append(row)
+                cols.append(bucket)
+                values.append(sign * weight)
+
+        # One scatter-add over the flattened matrix sums colliding features
+        flat = np.array(rows, dtype=np.int64) * self.dimensions + np.array(cols, dtype=np.int64)
+        matrix = (
+            np.bincount(flat, weights=values, minlength=len(texts) * self.dimensions)
+            .reshape(len(texts), self.dimensions)
+            .astype(np.float32)
+        )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms > 0, norms, 1.0)
+
+    def _features(self, text: str) -> dict[str, float]:
+        """Weighted features of a text (sublinear term frequency)."""
+        words = _WORD_RE.findall(unicodedata.normalize("NFKC", text).lower())
+        counts: dict[str, float] = {}
+        low, high = self.char_ngrams
+
+        def add(feature: str, weight: float) -> None:
+            counts[feature] = counts.get(feature, 0.0) + weight
+
+        for i, word in enumerate(words):
+            add(f"w:{word}", WORD_WEIGHT)
+            if i:
+                add(f"b:{words[i - 1]} {word}", BIGRAM_WEIGHT)
+            padded = f"<{word}>"
+            for n in range(low, high + 1):
+                for start in range(len(padded) - n + 1):
+                    add(f"c:{padded[start : start + n]}", CHAR_WEIGHT)
+
+        return {feature: math.log1p(weight) for feature, weight in counts.items()}
@@ -0,0 +1,132 @@
+"""Estimated LLM cost per call.
+
+Prices are list prices in USD per million tokens and are only used for budget
+accounting; they are not a billing source of truth. Models are matched by
+longest prefix, so dated snapshots ("claude-sonnet-4-20250514") share the
+price of their family.
+
+Environment:
+    LLM_PRICES: Inline JSON (or path to a JSON file) mapping model prefixes to
+        ``{"input": ..., "output": ..., "cache_read": ..., "cache_write": ...}``
+        USD per million tokens, merged over the built-in table.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from astro.core.llm.usage import TokenUsage
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPrice(BaseModel):
+    """USD per million tokens for one model family."""
+
+    input: float = Field(ge=0)
+    output: float = Field(ge=0)
+    cache_read: float | None = Field(
+        default=None, ge=0, description="Cached input reads (default: input price)"
+    )
+    cache_write: float | None = Field(
+        default=None, ge=0, description="Cache writes (default: input price)"
+    )
+
+
+# List prices by model prefix (USD per million tokens)
+MODEL_PRICES: dict[str, ModelPrice] = {
+    "claude-opus-4": ModelPrice(input=15, output=75, cache_read=1.5, cache_write=18.75),
+    "claude-sonnet-4": ModelPrice(input=3, output=15, cache_read=0.3, cache_write=3.75),
+    "claude-3-7-sonnet": ModelPrice(input=3, output=15, cache_read=0.3, cache_write=3.75),
+    "claude-3-5-sonnet": ModelPrice(input=3, output=15, cache_read=0.3, cache_write=3.75),
+    "claude-3-5-haiku": ModelPrice(input=0.8, output=4, cache_read=0.08, cache_write=1),
+    "claude-3-haiku": ModelPrice(input=0.25, output=1.25, cache_read=0.03, cache_write=0.3),
+    "gpt-4o-mini": ModelPrice(input=0.15, output=0.6, cache_read=0.075),
+    "gpt-4o": ModelPrice(input=2.5, output=10, cache_read=1.25),
+    "gpt-4.1-mini": ModelPrice(input=0.4, output=1.6, cache_read=0.1),
+    "gpt-4.1": ModelPrice(input=2, output=8, cache_read=0.5),
+    "gpt-4": ModelPrice(input=30, output=60),
+    "gemini-2.0-flash-lite": ModelPrice(input=0.075, output=0.3),
+    "gemini-2.0-flash": ModelPrice(input=0.1, output=0.4, cache_read=0.025),
+    "gemini-2.5-pro": ModelPrice(input=1.25, output=10, cache_read=0.31),
+}
+
+_price_table: dict[str, ModelPrice] | None = None
+
+
+def get_price_table() -> dict[str, ModelPrice]:
+    """Return the price table, including LLM_PRICES overrides.
+
+    Returns:
+        Mapping of model prefix to price. Invalid overrides are logged and
+        ignored.
+    """
+    global _price_table
+    if _price_table is None:
+        table = dict(MODEL_PRICES)
+        raw = os.getenv("LLM_PRICES")
+        if raw:
+            try:
+                text = raw if raw.lstrip().startswith("{") else Path(raw).read_text()
+                for prefix, price in json.loads(text).items():
+                    table[prefix] = ModelPrice.model_validate(price)
+            except Exception as e:
+                logger.warning(f"Invalid LLM_PRICES, using built-in prices: {e}")
+        _price_table = table
+    return _price_table
+
+
+def reset_price_table() -> None:
+    """Drop the cached price table (re-reads LLM_PRICES on next use)."""
+    global _price_table
+    _price_table = None
+
+
+def price_for(model: str | None) -> ModelPrice | None:
+    """Find the price for a model by longest matching prefix.
+
+    Args:
+        model: Model identifier as reported by the provider.
+
+    Returns:
+        ModelPrice, or None for unknown models.
+    """
+    if not model:
+        return None
+    table = get_price_table()
+    matches = [prefix for prefix in table if model.startswith(prefix)]
+    return table[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(usage: "TokenUsage", model: str | None) -> float:
+    """Estimate the USD cost of a call's token usage.
+
+    ``input_tokens`` includes cached tokens, so cache reads and writes are
+    priced separately and subtracted from the uncached input.
+
+    Args:
+        usage: Token usage of the call.
+        model: Model that served the call.
+
+    Returns:
+        Estimated cost in USD (0.0 for unknown models).
+    """
+    price = price_for(model)
+    if price is None:
+        return 0.0
+
+    cache_read = usage.cache_read_tokens
+    cache_write = usage.cache_creation_tokens
+    uncached = max(usage.input_tokens - cache_read - cache_write, 0)
+    cost = (
+        uncached * price.input
+        + cache_read * (price.input if price.cache_read is None else price.cache_read)
+        + cache_write * (price.input if price.cache_write is None else price.cache_write)
+        + usage.output_tokens * price.output
+    )
+    return cost / 1_000_000
@@ -0,0 +1,462 @@
+"""Retries, hedging and timeouts for chat and embedding calls.
+
+Provider latency has a long tail and transient errors (rate limits,
+overload, dropped connections) used to fail a whole node. The wrappers here
+make each call:
+
+- Time out after ``timeout_s``.
+- Retry retryable errors with full-jitter exponential backoff.
+- Optionally hedge: when a call is still running after the observed p95
+  latency for that model, issue one duplicate request and take whichever
+  response arrives first.
+
+Retries and hedges draw from a shared retry budget that refills in
+proportion to first attempts, so a provider outage cannot multiply load
+(in steady state each request amplifies to at most ``1 + budget_ratio``
+calls on average).
+Counts are exposed via ``get_resilience_stats``.
+
+Environment:
+    LLM_RESILIENCE: Set to "false" to call providers directly (default "true").
+    LLM_MAX_RETRIES: Retries per call (default 3).
+    LLM_TIMEOUT_SECONDS: Per-attempt timeout (default 120).
+    LLM_HEDGING: Set to "true" to hedge slow async calls (default "false").
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying (timeouts, conflicts, rate limits, server errors)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Provider SDK exception names worth retrying (anthropic, openai, google)
+RETRYABLE_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "RateLimitError",
+    "InternalServerError",
+    "OverloadedError",
+    "ServiceUnavailable",
+    "ServiceUnavailableError",
+    "DeadlineExceeded",
+    "ResourceExhausted",
+}
+
+# Latency samples kept per model for the hedging quantile
+LATENCY_WINDOW = 200
+
+
+class ResiliencePolicy(BaseModel):
+    """Retry, hedging and timeout settings."""
+
+    max_retries: int = Field(default=3, ge=0, description="Retries per call")
+    base_delay_s: float = Field(default=0.5, gt=0, description="First backoff cap")
+    max_delay_s: float = Field(default=8.0, gt=0, description="Maximum backoff")
+    timeout_s: float | None = Field(
+        default=120.0, gt=0, description="Per-attempt timeout (None = no timeout)"
+    )
+    hedge: bool = Field(default=False, description="Hedge slow async calls")
+    hedge_quantile: float = Field(
+        default=0.95, gt=0, lt=1, description="Latency quantile after which to hedge"
+    )
+    hedge_min_samples: int = Field(
+        default=20, ge=1, description="Latency samples needed before hedging"
+    )
+    budget_ratio: float = Field(
+        default=0.1,
+        ge=0,
+        description="Retry/hedge tokens earned per first attempt",
+    )
+    budget_min_tokens: float = Field(
+        default=10.0,
+        ge=0,
+        description="Retry/hedge tokens available regardless of traffic",
+    )
+
+    @classmethod
+    def from_env(cls) -> "ResiliencePolicy":
+        """Build a policy from LLM_MAX_RETRIES, LLM_TIMEOUT_SECONDS and LLM_HEDGING."""
+        timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+        return cls(
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+            timeout_s=timeout if timeout > 0 else None,
+            hedge=os.getenv("LLM_HEDGING", "false").lower() in ("1", "true", "yes"),
+        )
+
+
+def resilience_enabled() -> bool:
+    """Return whether provider calls are wrapped (LLM_RESILIENCE)."""
+    return os.getenv("LLM_RESILIENCE", "true").lower() not in ("0", "false", "no")
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether an error is transient and worth retrying.
+
+    Args:
+        error: Exception raised by a provider call.
+
+    Returns:
+        True for timeouts, connection errors, rate limits and server errors.
+    """
+    if isinstance(error, TimeoutError | ConnectionError):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+class RetryBudget:
+    """Token bucket limiting retries and hedges relative to first attempts."""
+
+    def __init__(self, ratio: float, min_tokens: float):
+        """Initialize the budget.
+
+        Args:
+            ratio: Tokens earned per first attempt.
+            min_tokens: Starting balance, so low traffic can still retry.
+        """
+        self.ratio = ratio
+        self.tokens = min_tokens
+        # Cap so a long quiet period cannot bank an unbounded burst
+        self.max_tokens = min_tokens + 100 * ratio
+
+    def deposit(self) -> None:
+        """Credit one first attempt."""
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        """Take one token for a retry or hedge; False if the budget is spent."""
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: dict[str, deque[float]] = {}
+        self._window = window
+
+    def record(self, key: str, seconds: float) -> None:
+        """Record a successful call's latency."""
+        self._samples.setdefault(key, deque(maxlen=self._window)).append(seconds)
+
+    def quantile(self, key: str, q: float, min_samples: int = 1) -> float | None:
+        """Latency quantile for a model, or None with too few samples."""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class ResilientCaller:
+    """Executes provider calls with timeouts, retries and hedging."""
+
+    def __init__(self, policy: ResiliencePolicy | None = None):
+        """Initialize the caller.
+
+        Args:
+            policy: Resilience settings. Defaults to ResiliencePolicy.from_env().
+        """
+        self.policy = policy or ResiliencePolicy.from_env()
+        self.budget = RetryBudget(self.policy.budget_ratio, self.policy.budget_min_tokens)
+        self.latency = LatencyTracker()
+        self.stats: Counter[str] = Counter()
+
+    async def call(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run an async provider call with timeout, retries and hedging.
+
+        Args:
+            key: Latency bucket, e.g. "chat:claude-sonnet-4".
+            fn: Factory creating a fresh awaitable per attempt.
+
+        Returns:
+            The first successful result.
+
+        Raises:
+            Exception: The last error once retries or the budget are exhausted,
+                or immediately for non-retryable errors.
+        """
+        self.stats["calls"] += 1
+        self.budget.deposit()
+
+        for attempt in range(self.policy.max_retries + 1):
+            try:
+                return await self._attempt(key, fn)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"{key} failed ({type(e).__name__}: {e}); "
+                    f"retry {attempt + 1}/{self.policy.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def call_sync(self, key: str, fn: Callable[[], T]) -> T:
+        """Run a blocking provider call with retries (no hedging).
+
+        Timeouts for blocking calls are enforced by the provider client.
+
+        Args:
+            key: Latency bucket.
+            fn: Function performing one attempt.
+
+        Returns:
+            The first successful result.
+        """
+        self.stats["calls"] += 1
+        self.budget.deposit()
+
+        for attempt in range(self.policy.max_retries + 1):
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"{key} failed ({type(e).__name__}: {e}); "
+                    f"retry {attempt + 1}/{self.policy.max_retries} in {delay:.2f}s"
+                )
+                time.sleep(delay)
+            else:
+                self.latency.record(key, time.monotonic() - started)
+                return result
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def _attempt(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """One attempt: primary request, plus a hedge if it runs past p95."""
+        started = time.monotonic()
+        deadline = started + self.policy.timeout_s if self.policy.timeout_s else None
+
+        hedge_after = None
+        if self.policy.hedge:
+            hedge_after = self.latency.quantile(
+                key, self.policy.hedge_quantile, self.policy.hedge_min_samples
+            )
+
+        primary: asyncio.Future[T] = asyncio.ensure_future(fn())
+        tasks: list[asyncio.Future[T]] = [primary]
+        hedged = False
+        error: BaseException | None = None
+        try:
+            while tasks:
+                now = time.monotonic()
+                remaining = deadline - now if deadline is not None else None
+                wait_for = remaining
+                if hedge_after is not None and not hedged:
+                    until_hedge = max(started + hedge_after - now, 0)
+                    wait_for = until_hedge if remaining is None else min(until_hedge, remaining)
+
+                done, _ = await asyncio.wait(
+                    tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    tasks.remove(task)
+                    if task.exception() is None:
+                        self.latency.record(key, time.monotonic() - started)
+                        if task is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+
+                if done:
+                    continue
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.stats["timeouts"] += 1
+                    raise TimeoutError(f"{key} timed out after {self.policy.timeout_s}s")
+
+                if not hedged and hedge_after is not None:
+                    hedged = True
+                    if self.budget.withdraw():
+                        self.stats["hedges"] += 1
+                        tasks.append(asyncio.ensure_future(fn()))
+                    else:
+                        self.stats["budget_exhausted"] += 1
+
+            # Every request failed
+            raise error if error is not None else RuntimeError(f"{key} failed")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Decide whether to retry after a failed attempt."""
+        if attempt >= self.policy.max_retries or not is_retryable(error):
+            return False
+        if not self.budget.withdraw():
+            self.stats["budget_exhausted"] += 1
+            logger.warning(f"Retry budget exhausted, not retrying: {error}")
+            return False
+        self.stats["retries"] += 1
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry."""
+        cap = min(self.policy.max_delay_s, self.policy.base_delay_s * (2**attempt))
+        return random.uniform(0, cap)
+
+
+class ResilientChatModel:
+    """Wraps a LangChain chat model so its calls go through a ResilientCaller.
+
+    Like TemperatureFixedLLMWrapper, other attributes are delegated to the
+    wrapped model; ``bind_tools``, ``bind`` and ``with_structured_output``
+    return wrapped runnables so tool-calling loops are covered too.
+    """
+
+    def __init__(self, llm: Any, caller: "ResilientCaller", key: str):
+        """Initialize the wrapper.
+
+        Args:
+            llm: LangChain chat model or runnable.
+            caller: Shared caller (retry budget, latency tracking).
+            key: Latency bucket, e.g. "chat:<model>".
+        """
+        self._llm = llm
+        self._caller = caller
+        self._key = key
+
+    async def ainvoke(self, *args: Any, **kwargs: Any) -> Any:
+        """Async invoke with timeout, retries and hedging."""
+        return await self._caller.call(self._key, lambda: self._llm.ainvoke(*args, **kwargs))
+
+    def invoke(self, *args: Any, **kwargs: Any) -> Any:
+        """Sync invoke with retries."""
+        return self._caller.call_sync(self._key, lambda: self._llm.invoke(*args, **kwargs))
+
+    def bind_tools(self, *args: Any, **kwargs: Any) -> "ResilientChatModel":
+        """Bind tools, keeping the resilient wrapper."""
+        return ResilientChatModel(self._llm.bind_tools(*args, **kwargs), self._caller, self._key)
+
+    def bind(self, **kwargs: Any) -> "ResilientChatModel":
+        """Bind call kwargs (e.g. max_tokens), keeping the resilient wrapper."""
+        return ResilientChatModel(self._llm.bind(**kwargs), self._caller, self._key)
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> "ResilientChatModel":
+        """Structured-output runnable, keeping the resilient wrapper."""
+        return ResilientChatModel(
+            self._llm.with_structured_output(*args, **kwargs), self._caller, self._key
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate all other attributes to the underlying model."""
+        return getattr(self._llm, name)
+
+
+class ResilientEmbeddingProvider:
+    """Wraps an EmbeddingProvider so its calls go through a ResilientCaller."""
+
+    def __init__(self, provider: Any, caller: "ResilientCaller", key: str):
+        """Initialize the wrapper.
+
+        Args:
+            provider: EmbeddingProvider implementation.
+            caller: Shared caller (retry budget, latency tracking).
+            key: Latency bucket, e.g. "embed:<model>".
+        """
+        self._provider = provider
+        self._caller = caller
+        self._key = key
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text with timeout, retries and hedging."""
+        result: list[float] = await self._caller.call(
+            self._key, lambda: self._provider.embed(text)
+        )
+        return result
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in one call with timeout, retries and hedging."""
+        if not texts:
+            return []
+        result: list[list[float]] = await self._caller.call(
+            f"{self._key}:batch", lambda: self._provider.embed_batch(texts)
+        )
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate all other attributes to the underlying provider."""
+        return getattr(self._provider, name)
+
+
+_caller: ResilientCaller | None = None
+
+
+def get_resilient_caller() -> ResilientCaller:
+    """Get the process-wide ResilientCaller (shared retry budget)."""
+    global _caller
+    if _caller is None:
+        _caller = ResilientCaller()
+    return _caller
+
+
+def reset_resilient_caller() -> None:
+    """Drop the shared caller so the next call re-reads the environment."""
+    global _caller
+    _caller = None
+
+
+def resilient_chat_model(llm: Any, model: str) -> Any:
+    """Wrap a chat model with the shared caller, if resilience is enabled."""
+    if not resilience_enabled():
+        return llm
+    return ResilientChatModel(llm, get_resilient_caller(), f"chat:{model}")
+
+
+def resilient_embedding_provider(provider: Any, model: str) -> Any:
+    """Wrap an embedding provider with the shared caller, if enabled."""
+    if not resilience_enabled():
+        return provider
+    return ResilientEmbeddingProvider(provider, get_resilient_caller(), f"embed:{model}")
+
+
+def get_resilience_stats() -> dict[str, float]:
+    """Return retry/hedge counters for the shared caller.
+
+    Returns:
+        Counts of calls, retries, hedges, hedge_wins, timeouts, failures and
+        budget_exhausted, plus the remaining retry budget tokens.
+    """
+    caller = get_resilient_caller()
+    stats: dict[str, float] = {
+        name: caller.stats.get(name, 0)
+        for name in (
+            "calls",
+            "retries",
+            "hedges",
+            "hedge_wins",
+            "timeouts",
+            "failures",
+            "budget_exhausted",
+        )
+    }
+    stats["budget_tokens"] = round(caller.budget.tokens, 2)
+    return stats
@@ -0,0 +1,306 @@
+"""Model cascade routing across fast and strong model tiers.
+
+Every LLM call site used the single LLM_MODEL default, so cheap routing
+decisions (eval, directive selection) ran on the same heavyweight model as
+synthesis. The router maps a call site to a tier using a declarative policy:
+
+1. An explicit model pinned in the star config always wins.
+2. Directive tags (e.g. ``{"quick-check": "fast"}``).
+3. Latency SLO: requests with an SLO at or below ``fast_slo_ms`` use the
+   fast tier.
+4. The call site (star type or launchpad component, e.g. "eval",
+   "interpreter").
+5. The policy's default tier.
+
+Callers escalate to the strong tier when the fast tier's structured output
+fails validation or reports low confidence (see ``ModelRouter.escalate``).
+
+Environment:
+    LLM_ROUTING: Set to "false" to send every call to LLM_MODEL (default "true").
+    LLM_ROUTING_POLICY: Path to a JSON file, or inline JSON, overriding the
+        default RoutingPolicy.
+    LLM_FAST_MODEL: Fast tier model (default: LLM_MODEL if set, else the
+        provider's small model; see ``astro.core.llm.utils.get_fast_model``).
+    LLM_STRONG_MODEL: Strong tier model (default: LLM_MODEL or provider default).
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+Tier = Literal["fast", "strong"]
+
+# Default tier per call site
+_DEFAULT_TARGETS: dict[str, Tier] = {
+    "eval": "fast",
+    "interpreter": "fast",
+    "context_gatherer": "fast",
+    "synthesis": "strong",
+}
+
+
+class RoutingPolicy(BaseModel):
+    """Declarative model routing policy."""
+
+    default_tier: Tier = Field(default="strong", description="Tier when no rule matches")
+    targets: dict[str, Tier] = Field(
+        default_factory=_DEFAULT_TARGETS.copy,
+        description="Tier per call site (star type or launchpad component)",
+    )
+    directive_tags: dict[str, Tier] = Field(
+        default_factory=dict, description="Tier per directive tag (first match wins)"
+    )
+    fast_slo_ms: int | None = Field(
+        default=5000,
+        ge=0,
+        description="Requests with a latency SLO at or below this use the fast tier",
+    )
+    models: dict[str, str] = Field(
+        default_factory=dict,
+        description="Model per tier, overriding LLM_FAST_MODEL/LLM_STRONG_MODEL",
+    )
+    escalate_on_failure: bool = Field(
+        default=True,
+        description="Retry on the strong tier when fast-tier output fails validation",
+    )
+    min_confidence: float = Field(
+        default=0.6,
+        ge=0.0,
+        le=1.0,
+        description="Fast-tier results reporting lower confidence are escalated",
+    )
+
+
+class RouteDecision(BaseModel):
+    """A routing decision, recorded in run telemetry."""
+
+    target: str
+    tier: Tier
+    provider: str
+    model: str
+    reason: str
+    escalated: bool = False
+    node_id: str | None = None
+
+
+def routing_enabled() -> bool:
+    """Return whether tier routing is enabled via LLM_ROUTING."""
+    return os.getenv("LLM_ROUTING", "true").lower() not in ("0", "false", "no")
+
+
+def load_routing_policy() -> RoutingPolicy:
+    """Load the routing policy from LLM_ROUTING_POLICY, or the default.
+
+    Returns:
+        RoutingPolicy. Invalid policies are logged and replaced by the default.
+    """
+    raw = os.getenv("LLM_ROUTING_POLICY")
+    if not raw:
+        return RoutingPolicy()
+
+    try:
+        text = raw if raw.lstrip().startswith("{") else Path(raw).read_text()
+        return RoutingPolicy.model_validate(json.loads(text))
+    except Exception as e:
+        logger.warning(f"Invalid LLM_ROUTING_POLICY, using default policy: {e}")
+        return RoutingPolicy()
+
+
+class ModelRouter:
+    """Routes LLM call sites to model tiers according to a RoutingPolicy.
+
+    Example:
+        >>> router = get_router()
+        >>> decision = router.route("eval", tags=directive.tags)
+        >>> llm = router.get_llm(decision, temperature=0.2)
+    """
+
+    def __init__(
+        self,
+        policy: RoutingPolicy | None = None,
+        provider: str | None = None,
+        enabled: bool | None = None,
+    ):
+        """Initialize the router.
+
+        Args:
+            policy: Routing policy. Defaults to the default RoutingPolicy.
+            provider: LLM provider. Defaults to LLM_PROVIDER.
+            enabled: Whether routing is active. Defaults to LLM_ROUTING.
+        """
+        from astro.core.llm.utils import DEFAULT_PROVIDER
+
+        self.policy = policy or RoutingPolicy()
+        self.provider = (provider or os.getenv("LLM_PROVIDER") or DEFAULT_PROVIDER).lower()
+        self.enabled = routing_enabled() if enabled is None else enabled
+
+    def model_for(self, tier: Tier) -> str:
+        """Resolve the model for a tier.
+
+        Args:
+            tier: "fast" or "strong".
+
+        Returns:
+            Model identifier.
+        """
+        from astro.core.llm.utils import DEFAULT_MODELS, get_fast_model
+
+        if tier in self.policy.models:
+            return self.policy.models[tier]
+
+        if tier == "fast":
+            return get_fast_model(self.provider)
+        return (
+            os.getenv("LLM_STRONG_MODEL")
+            or os.getenv("LLM_MODEL")
+            or DEFAULT_MODELS.get(self.provider, "")
+        )
+
+    def route(
+        self,
+        target: str,
+        tags: list[str] | None = None,
+        latency_slo_ms: int | None = None,
+        model: str | None = None,
+    ) -> RouteDecision:
+        """Choose the tier and model for a call site.
+
+        Args:
+            target: Call site, e.g. a star type ("eval") or "interpreter".
+            tags: Directive tags.
+            latency_slo_ms: Latency SLO for the request, if any.
+            model: Explicitly configured model; bypasses the policy.
+
+        Returns:
+            RouteDecision.
+        """
+        if model:
+            return self._decide(target, self._tier_of(model), "pinned by config", model)
+
+        if not self.enabled:
+            return self._decide(target, "strong", "routing disabled")
+
+        for tag in tags or []:
+            if tag in self.policy.directive_tags:
+                return self._decide(target, self.policy.directive_tags[tag], f"tag '{tag}'")
+
+        slo = self.policy.fast_slo_ms
+        if latency_slo_ms is not None and slo is not None and latency_slo_ms <= slo:
+            return self._decide(target, "fast", f"latency SLO {latency_slo_ms}ms")
+
+        if target in self.policy.targets:
+            return self._decide(target, self.policy.targets[target], f"target '{target}'")
+
+        return self._decide(target, self.policy.default_tier, "default tier")
+
+    def escalate(self, decision: RouteDecision, reason: str) -> RouteDecision | None:
+        """Escalate a fast-tier decision to the strong tier.
+
+        Args:
+            decision: The decision whose result was unsatisfactory.
+            reason: Why the result was rejected (validation failure, ...).
+
+        Returns:
+            Strong-tier RouteDecision, or None if escalation does not apply
+            (already strong, disabled by policy, or the same model).
+        """
+        if decision.tier != "fast" or not self.policy.escalate_on_failure:
+            return None
+
+        escalated = self._decide(decision.target, "strong", f"escalated: {reason}")
+        if escalated.model == decision.model:
+            return None
+        escalated.escalated = True
+        escalated.node_id = decision.node_id
+        return escalated
+
+    def downgrade(self, decision: RouteDecision, reason: str) -> RouteDecision | None:
+        """Move a strong-tier decision to the fast tier (e.g. to save budget).
+
+        Args:
+            decision: The decision to downgrade.
+            reason: Why the fast tier is required.
+
+        Returns:
+            Fast-tier RouteDecision, or None if the decision is already fast
+            or the fast tier resolves to the same model.
+        """
+        if decision.tier != "strong":
+            return None
+
+        downgraded = self._decide(decision.target, "fast", reason)
+        if downgraded.model == decision.model:
+            return None
+        downgraded.node_id = decision.node_id
+        return downgraded
+
+    def should_escalate(self, confidence: float | None) -> bool:
+        """Check whether a reported confidence is below the policy minimum."""
+        return confidence is not None and confidence < self.policy.min_confidence
+
+    def get_llm(
+        self,
+        decision: RouteDecision,
+        temperature: float = 0,
+        max_tokens: int | None = None,
+    ) -> Any:
+        """Create the LangChain chat model for a decision.
+
+        Args:
+            decision: Routing decision.
+            temperature: Sampling temperature.
+            max_tokens: Output token cap (None = model default).
+
+        Returns:
+            LangChain chat model.
+        """
+        from astro.core.llm.utils import get_langchain_llm
+
+        return get_langchain_llm(
+            temperature=temperature,
+            provider=decision.provider,
+            model=decision.model,
+            max_tokens=max_tokens,
+        )
+
+    def _tier_of(self, model: str) -> Tier:
+        """Classify a pinned model by the tier it is configured for."""
+        return "fast" if model == self.model_for("fast") else "strong"
+
+    def _decide(
+        self, target: str, tier: Tier, reason: str, model: str | None = None
+    ) -> RouteDecision:
+        decision = RouteDecision(
+            target=target,
+            tier=tier,
+            provider=self.provider,
+            model=model or self.model_for(tier),
+            reason=reason,
+        )
+        logger.debug(
+            f"Routing {target} -> {decision.tier} ({decision.model}): {decision.reason}"
+        )
+        return decision
+
+
+_router: ModelRouter | None = None
+
+
+def get_router() -> ModelRouter:
+    """Get the process-wide ModelRouter, built from the environment."""
+    global _router
+    if _router is None:
+        _router = ModelRouter(policy=load_routing_policy())
+    return _router
+
+
+def reset_router() -> None:
+    """Drop the cached router so the next call re-reads the environment."""
+    global _router
+    _router = None
@@ -0,0 +1,358 @@
+"""Schema-constrained structured output with local repair and bounded re-asks.
+
+Stars that need a typed result (Plan, EvalDecision) used to split the
+response on code fences and call ``json.loads``; any formatting slip wasted
+the whole call. ``invoke_structured`` instead:
+
+1. Uses the provider's structured-output mode (tool calling / JSON schema)
+   against the Pydantic model when available.
+2. Otherwise, or when the provider output does not validate, parses the text
+   with a tolerant local JSON repair pass (code fences, comments, trailing
+   commas, single quotes, bare keys, Python literals, truncated output).
+3. Re-asks the model with the validation error, a bounded number of times.
+
+Outcomes are counted per schema (see ``get_structured_output_stats``).
+
+Environment:
+    LLM_STRUCTURED_OUTPUT: Set to "false" to disable provider structured-output
+        modes and parse text responses only (default "true").
+"""
+
+import json
+import logging
+import os
+import re
+from collections import Counter
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# Outcome labels counted per schema
+OUTCOMES = ("native", "parsed", "repaired", "reasked", "failed")
+
+REASK_PROMPT = """Your previous response could not be parsed as the required {schema} JSON object:
+{error}
+
+Respond with only the corrected JSON object, with no other text."""
+
+# Bare-word literals accepted by the repair pass
+_LITERALS = {
+    "true": "true",
+    "false": "false",
+    "null": "null",
+    "True": "true",
+    "False": "false",
+    "None": "null",
+}
+
+_outcomes: Counter[tuple[str, str]] = Counter()
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a response cannot be coerced into the requested schema."""
+
+
+def structured_output_enabled() -> bool:
+    """Return whether provider structured-output modes are enabled."""
+    return os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() not in ("0", "false", "no")
+
+
+def record_outcome(schema_name: str, outcome: str) -> None:
+    """Count a structured-output outcome for a schema."""
+    _outcomes[(schema_name, outcome)] += 1
+
+
+def get_structured_output_stats() -> dict[str, dict[str, int]]:
+    """Return structured-output outcome counts by schema name.
+
+    Returns:
+        Mapping of schema name to {outcome: count}.
+    """
+    stats: dict[str, dict[str, int]] = {}
+    for (schema_name, outcome), count in sorted(_outcomes.items()):
+        stats.setdefault(schema_name, {})[outcome] = count
+    return stats
+
+
+def reset_structured_output_stats() -> None:
+    """Clear structured-output outcome counts."""
+    _outcomes.clear()
+
+
+def repair_json(text: str) -> Any:
+    """Parse JSON from a model response, repairing common defects.
+
+    Args:
+        text: Raw response text.
+
+    Returns:
+        Parsed JSON value.
+
+    Raises:
+        StructuredOutputError: If no JSON value can be recovered.
+    """
+    candidate = _extract_json_block(text)
+    if candidate is None:
+        raise StructuredOutputError("Response contains no JSON object")
+
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+
+    repaired = _repair(candidate)
+    try:
+        return json.loads(repaired)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Invalid JSON: {e}") from e
+
+
+def parse_structured_output(content: Any, schema: type[T]) -> tuple[T, bool]:
+    """Validate a text response against a schema, repairing it if needed.
+
+    Args:
+        content: Response content (string or list of content blocks).
+        schema: Pydantic model to validate against.
+
+    Returns:
+        Tuple of (validated model, whether the repair pass was needed).
+
+    Raises:
+        StructuredOutputError: If the response does not match the schema.
+    """
+    text = _content_text(content)
+    candidate = _extract_json_block(text)
+    if candidate is not None:
+        try:
+            return schema.model_validate_json(candidate), False
+        except ValidationError:
+            pass
+
+    data = repair_json(text)
+    try:
+        return schema.model_validate(data), True
+    except ValidationError as e:
+        raise StructuredOutputError(_summarize_validation_error(e)) from e
+
+
+async def invoke_structured(
+    llm: Any,
+    messages: list[Any],
+    schema: type[T],
+    draft: Any | None = None,
+    max_reasks: int = 1,
+    context: Any | None = None,
+) -> T:
+    """Get a response from an LLM that validates against a Pydantic model.
+
+    Args:
+        llm: LangChain chat model.
+        messages: Conversation to answer. Not modified.
+        schema: Pydantic model the response must match.
+        draft: An already generated response (e.g. the final answer of a
+            tool loop) to parse before calling the model.
+        max_reasks: Maximum follow-up calls after a response fails validation.
+        context: Optional ConstellationContext for usage accounting.
+
+    Returns:
+        Validated model instance.
+
+    Raises:
+        StructuredOutputError: If no valid response is obtained.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    schema_name = schema.__name__
+    attempt_messages = list(messages)
+    content = draft
+    error: Exception | None = None
+
+    for attempt in range(max_reasks + 1):
+        if content is None:
+            parsed, content = await _ask(llm, attempt_messages, schema, context)
+            if parsed is not None:
+                record_outcome(schema_name, "reasked" if attempt else "native")
+                return parsed
+
+        try:
+            result, repaired = parse_structured_output(content, schema)
+        except StructuredOutputError as e:
+            error = e
+        else:
+            if attempt:
+                outcome = "reasked"
+            else:
+                outcome = "repaired" if repaired else "parsed"
+            record_outcome(schema_name, outcome)
+            return result
+
+        if attempt == max_reasks:
+            break
+
+        logger.info(f"{schema_name} output invalid, re-asking ({attempt + 1}/{max_reasks}): {error}")
+        attempt_messages = [
+            *attempt_messages,
+            AIMessage(content=_content_text(content) or "(empty response)"),
+            HumanMessage(content=REASK_PROMPT.format(schema=schema_name, error=error)),
+        ]
+        content = None
+
+    record_outcome(schema_name, "failed")
+    raise StructuredOutputError(f"No valid {schema_name} after {max_reasks + 1} attempts: {error}")
+
+
+async def _ask(
+    llm: Any, messages: list[Any], schema: type[T], context: Any | None
+) -> tuple[T | None, Any]:
+    """Call the model once; returns (validated result or None, raw content)."""
+    if structured_output_enabled() and callable(getattr(llm, "with_structured_output", None)):
+        try:
+            structured = llm.with_structured_output(schema, include_raw=True)
+            response = await structured.ainvoke(messages)
+        except NotImplementedError as e:
+            # Provider without a schema mode; fall back to a plain call. Any
+            # other error (rate limit, timeout, bad request) is not retried
+            # here: the resilience layer already had its chance.
+            logger.debug(f"Structured output mode unavailable: {e}")
+        else:
+            raw = response.get("raw")
+            if context is not None and raw is not None:
+                context.record_llm_usage(raw)
+            parsed = response.get("parsed")
+            if isinstance(parsed, schema):
+                return parsed, None
+            # Hand the raw output to the repair pass
+            tool_calls = getattr(raw, "tool_calls", None)
+            if tool_calls:
+                return None, json.dumps(tool_calls[0].get("args", {}))
+            return None, getattr(raw, "content", "")
+
+    response = await llm.ainvoke(messages)
+    if context is not None:
+        context.record_llm_usage(response)
+    return None, getattr(response, "content", response)
+
+
+def _content_text(content: Any) -> str:
+    """Flatten string or content-block responses to text."""
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, str):
+                parts.append(block)
+            elif isinstance(block, dict) and block.get("type") == "text":
+                parts.append(str(block.get("text", "")))
+        return "".join(parts)
+    return str(content)
+
+
+def _summarize_validation_error(error: ValidationError) -> str:
+    """Compact, model-readable description of validation errors."""
+    parts = []
+    for item in error.errors()[:5]:
+        location = ".".join(str(part) for part in item["loc"]) or "(root)"
+        parts.append(f"{location}: {item['msg']}")
+    return "; ".join(parts)
+
+
+def _extract_json_block(text: str) -> str | None:
+    """Return the JSON-looking part of a response (fenced block or braces)."""
+    fence = re.search(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", text, re.DOTALL)
+    if fence and fence.group(1).strip():
+        text = fence.group(1)
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    closer = "}" if text[start] == "{" else "]"
+    end = text.rfind(closer)
+    # Truncated output has no closer; the repair pass closes it
+    return text[start : end + 1] if end > start else text[start:]
+
+
+def _repair(text: str) -> str:
+    """Fix common JSON defects with a single string-aware scan."""
+    out: list[str] = []
+    closers: list[str] = []
+    quote: str | None = None
+    i = 0
+    length = len(text)
+
+    while i < length:
+        char = text[i]
+
+        if quote is not None:
+            if char == "\\" and i + 1 < length:
+                escaped = text[i + 1]
+                # \' is not a JSON escape
+                out.append("'" if escaped == "'" else char + escaped)
+                i += 2
+                continue
+            if char == quote:
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        if char in "\"'":
+            quote = char
+            out.append('"')
+        elif text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = length if newline == -1 else newline
+            continue
+        elif text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            i = length if close == -1 else close + 2
+            continue
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if closers:
+                closers.pop()
+            out.append(char)
+        elif char.isalpha() or char == "_":
+            word = re.match(r"[A-Za-z_][A-Za-z0-9_]*", text[i:]).group(0)  # type: ignore[union-attr]
+            i += len(word)
+            if word in _LITERALS:
+                out.append(_LITERALS[word])
+            elif re.match(r"\s*:", text[i:]):
+                out.append(f'"{word}"')  # bare object key
+            else:
+                out.append(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    if quote is not None:
+        out.append('"')
+    _drop_trailing_comma(out)
+    out.extend(reversed(closers))
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: list[str]) -> None:
+    """Remove a comma (and following whitespace) at the end of the output."""
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index:]
@@ -0,0 +1,354 @@
+"""Token estimation and budget-aware context packing.
+
+Context assembly (upstream outputs, memories, conversation history) used to
+rely on fixed character cut-offs. This module estimates tokens locally per
+provider and packs context items into a token budget by priority, compressing
+individual items instead of dropping them wholesale.
+
+Token counts are estimates: OpenAI models use tiktoken when it is installed,
+other providers use a characters-per-token ratio calibrated for English prose.
+Estimates err on the high side so packed prompts stay inside the window.
+
+Environment:
+    LLM_CONTEXT_WINDOW: Override the context window size (tokens) for all models.
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Average characters per token by provider (conservative, English prose)
+CHARS_PER_TOKEN: dict[str, float] = {
+    "anthropic": 3.5,
+    "openai": 4.0,
+    "google_genai": 4.0,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# Context window sizes by model prefix (longest matching prefix wins)
+CONTEXT_WINDOWS: dict[str, int] = {
+    "claude": 200_000,
+    "gpt-4": 8_192,
+    "gpt-4-turbo": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_047_576,
+    "gpt-5": 400_000,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4": 200_000,
+    "gemini": 1_048_576,
+}
+DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Marker inserted where an item was shortened to fit its budget
+TRUNCATION_MARKER = "\n...[truncated]...\n"
+
+
+def _resolve_provider_model(
+    provider: str | None, model: str | None
+) -> tuple[str, str]:
+    """Resolve provider and model the same way get_langchain_llm does."""
+    from astro.core.llm.utils import DEFAULT_MODELS, DEFAULT_PROVIDER
+
+    resolved_provider = (provider or os.getenv("LLM_PROVIDER") or DEFAULT_PROVIDER).lower()
+    resolved_model = (
+        model or os.getenv("LLM_MODEL") or DEFAULT_MODELS.get(resolved_provider, "")
+    )
+    return resolved_provider, resolved_model
+
+
+@lru_cache(maxsize=8)
+def _tiktoken_encoding(model: str) -> Any | None:
+    """Load a tiktoken encoding for an OpenAI model, if tiktoken is installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back
+        logger.debug(f"tiktoken unavailable for {model}: {e}")
+        return None
+
+
+def count_tokens(
+    text: str, provider: str | None = None, model: str | None = None
+) -> int:
+    """Estimate the number of tokens in a text for a provider/model.
+
+    Args:
+        text: Text to measure.
+        provider: LLM provider. Defaults to LLM_PROVIDER or "anthropic".
+        model: Model identifier. Defaults to LLM_MODEL or provider default.
+
+    Returns:
+        Estimated token count.
+    """
+    if not text:
+        return 0
+
+    provider, model = _resolve_provider_model(provider, model)
+
+    if provider == "openai":
+        encoding = _tiktoken_encoding(model)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+
+    ratio = CHARS_PER_TOKEN.get(provider, DEFAULT_CHARS_PER_TOKEN)
+    return math.ceil(len(text) / ratio)
+
+
+def get_context_window(provider: str | None = None, model: str | None = None) -> int:
+    """Return the context window size (tokens) for a model.
+
+    Args:
+        provider: LLM provider. Defaults to LLM_PROVIDER or "anthropic".
+        model: Model identifier. Defaults to LLM_MODEL or provider default.
+
+    Returns:
+        Context window in tokens.
+    """
+    if override := os.getenv("LLM_CONTEXT_WINDOW"):
+        return int(override)
+
+    _, model = _resolve_provider_model(provider, model)
+    model = model.lower()
+
+    best_prefix = ""
+    for prefix in CONTEXT_WINDOWS:
+        if model.startswith(prefix) and len(prefix) > len(best_prefix):
+            best_prefix = prefix
+
+    return CONTEXT_WINDOWS[best_prefix] if best_prefix else DEFAULT_CONTEXT_WINDOW
+
+
+def truncate_to_tokens(
+    text: str,
+    max_tokens: int,
+    provider: str | None = None,
+    model: str | None = None,
+) -> str:
+    """Shorten text to fit a token budget, keeping its head and tail.
+
+    The tail of an agent's output usually holds its conclusion, so one third
+    of the budget is kept from the end rather than cutting it off.
+
+    Args:
+        text: Text to shorten.
+        max_tokens: Token budget for the result.
+        provider: LLM provider used for counting.
+        model: Model identifier used for counting.
+
+    Returns:
+        Original text if it fits, otherwise a head/tail excerpt with a marker.
+    """
+    if max_tokens <= 0:
+        return ""
+
+    tokens = count_tokens(text, provider, model)
+    if tokens <= max_tokens:
+        return text
+
+    # Scale characters by this text's own chars-per-token ratio, then
+    # tighten until the estimate fits (usually one pass)
+    chars_per_token = len(text) / tokens
+    marker_tokens = count_tokens(TRUNCATION_MARKER, provider, model)
+    target = max_tokens - marker_tokens
+
+    while target > 0:
+        keep_chars = int(target * chars_per_token)
+        head_chars = (keep_chars * 2) // 3
+        tail_chars = keep_chars - head_chars
+        tail = text[-tail_chars:] if tail_chars > 0 else ""
+        result = text[:head_chars] + TRUNCATION_MARKER + tail
+        if count_tokens(result, provider, model) <= max_tokens:
+            return result
+        target = int(target * 0.9)
+
+    return text[: int(max_tokens * chars_per_token)]
+
+
+@dataclass
+class ContextItem:
+    """A piece of context competing for space in a prompt.
+
+    Attributes:
+        text: Item content.
+        priority: Higher priorities are packed first.
+        key: Optional identifier (e.g. node ID) for callers.
+        min_tokens: Smallest useful compressed size; items that cannot get at
+            least this many tokens are dropped instead of truncated.
+        compressible: If False the item is either included whole or dropped.
+        tokens: Estimated tokens of ``text`` (set by TokenBudget.pack).
+        truncated: Whether ``text`` was compressed to fit.
+    """
+
+    text: str
+    priority: int = 0
+    key: str = ""
+    min_tokens: int = 32
+    compressible: bool = True
+    tokens: int = 0
+    truncated: bool = False
+
+
+class TokenBudget:
+    """A token budget that context items are packed into.
+
+    Example:
+        >>> budget = TokenBudget.for_model(reserved_output=4096)
+        >>> budget.consume(system_prompt)
+        >>> packed = budget.pack([ContextItem(text=r, priority=1) for r in results])
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        provider: str | None = None,
+        model: str | None = None,
+    ):
+        """Initialize the budget.
+
+        Args:
+            max_tokens: Total tokens available.
+            provider: LLM provider used for counting.
+            model: Model identifier used for counting.
+        """
+        self.max_tokens = max(max_tokens, 0)
+        self.provider = provider
+        self.model = model
+        self.used = 0
+
+    @classmethod
+    def for_model(
+        cls,
+        provider: str | None = None,
+        model: str | None = None,
+        reserved_output: int | None = None,
+        cap: int | None = None,
+    ) -> "TokenBudget":
+        """Create a budget from a model's context window.
+
+        Args:
+            provider: LLM provider. Defaults to LLM_PROVIDER.
+            model: Model identifier. Defaults to LLM_MODEL.
+            reserved_output: Tokens reserved for the response. Defaults to
+                LLM_MAX_TOKENS.
+            cap: Optional upper bound, to avoid filling a very large window.
+
+        Returns:
+            TokenBudget sized to the window minus the reserved output.
+        """
+        from astro.core.llm.utils import get_default_max_tokens
+
+        if reserved_output is None:
+            reserved_output = get_default_max_tokens()
+
+        available = get_context_window(provider, model) - reserved_output
+        if cap is not None:
+            available = min(available, cap)
+        return cls(available, provider=provider, model=model)
+
+    @property
+    def remaining(self) -> int:
+        """Tokens still available."""
+        return max(self.max_tokens - self.used, 0)
+
+    def count(self, text: str) -> int:
+        """Estimate tokens for text using this budget's provider/model."""
+        return count_tokens(text, self.provider, self.model)
+
+    def consume(self, text: str) -> int:
+        """Charge fixed prompt text (system prompt, instructions) to the budget.
+
+        Args:
+            text: Text that will be sent regardless of packing.
+
+        Returns:
+            Tokens consumed.
+        """
+        tokens = self.count(text)
+        self.used += tokens
+        return tokens
+
+    def fit(self, text: str, max_tokens: int | None = None) -> str:
+        """Compress a single text into the remaining budget and consume it.
+
+        Args:
+            text: Text to fit.
+            max_tokens: Optional tighter limit for this text.
+
+        Returns:
+            Text, truncated if necessary.
+        """
+        limit = self.remaining if max_tokens is None else min(max_tokens, self.remaining)
+        fitted = truncate_to_tokens(text, limit, self.provider, self.model)
+        self.used += self.count(fitted)
+        return fitted
+
+    def pack(self, items: list[ContextItem]) -> list[ContextItem]:
+        """Pack items into the remaining budget by priority.
+
+        Priority groups are packed from highest to lowest. When a group does
+        not fit whole, its budget is shared fairly: small items are kept
+        intact and large ones are compressed to an equal share of what is
+        left, rather than the first items crowding out the rest.
+
+        Args:
+            items: Candidate context items.
+
+        Returns:
+            Included items (possibly compressed), in their original order.
+        """
+        for item in items:
+            item.tokens = self.count(item.text)
+
+        included: set[int] = set()
+        priorities = sorted({item.priority for item in items}, reverse=True)
+
+        for priority in priorities:
+            group = [i for i, item in enumerate(items) if item.priority == priority]
+            group_tokens = sum(items[i].tokens for i in group)
+
+            if group_tokens <= self.remaining:
+                included.update(group)
+                self.used += group_tokens
+                continue
+
+            # Fair share: smallest first, each gets min(size, remaining / left)
+            group.sort(key=lambda i: items[i].tokens)
+            for position, index in enumerate(group):
+                item = items[index]
+                share = self.remaining // (len(group) - position)
+
+                if item.tokens <= share:
+                    included.add(index)
+                    self.used += item.tokens
+                elif item.compressible and share >= item.min_tokens:
+                    item.text = truncate_to_tokens(
+                        item.text, share, self.provider, self.model
+                    )
+                    item.tokens = self.count(item.text)
+                    item.truncated = True
+                    included.add(index)
+                    self.used += item.tokens
+
+        dropped = len(items) - len(included)
+        truncated = sum(1 for i in included if items[i].truncated)
+        if dropped or truncated:
+            logger.debug(
+                f"Packed {len(included)}/{len(items)} context items "
+                f"({truncated} compressed, {dropped} dropped), "
+                f"used={self.used}/{self.max_tokens} tokens"
+            )
+
+        return [item for i, item in enumerate(items) if i in included]
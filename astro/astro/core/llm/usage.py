@@ -0,0 +1,103 @@
+"""Token usage accounting for LLM calls."""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class TokenUsage(BaseModel):
+    """Accumulated token usage across one or more LLM calls.
+
+    ``input_tokens`` follows LangChain's convention and includes cached
+    tokens; ``cache_read_tokens`` and ``cache_creation_tokens`` break out how
+    much of the input was served from or written to the provider's prompt
+    cache. ``cost_usd`` is estimated from list prices (see
+    ``astro.core.llm.pricing``) and is 0.0 for models without a known price.
+    """
+
+    input_tokens: int = Field(default=0, ge=0)
+    output_tokens: int = Field(default=0, ge=0)
+    cache_read_tokens: int = Field(default=0, ge=0)
+    cache_creation_tokens: int = Field(default=0, ge=0)
+    llm_calls: int = Field(default=0, ge=0)
+    cost_usd: float = Field(default=0.0, ge=0)
+
+    @classmethod
+    def from_response(cls, response: Any) -> "TokenUsage":
+        """Extract usage from a LangChain AIMessage.
+
+        Reads the standard ``usage_metadata`` first and falls back to the raw
+        Anthropic ``usage`` block in ``response_metadata``. Responses without
+        usage information count as a single call with zero tokens.
+
+        Args:
+            response: LLM response object.
+
+        Returns:
+            TokenUsage for this single call.
+        """
+        usage = cls(llm_calls=1)
+
+        metadata = getattr(response, "usage_metadata", None)
+        if isinstance(metadata, dict):
+            usage.input_tokens = _as_int(metadata.get("input_tokens"))
+            usage.output_tokens = _as_int(metadata.get("output_tokens"))
+            details = metadata.get("input_token_details")
+            if isinstance(details, dict):
+                usage.cache_read_tokens = _as_int(details.get("cache_read"))
+                usage.cache_creation_tokens = _as_int(details.get("cache_creation"))
+            if usage.cache_read_tokens or usage.cache_creation_tokens:
+                return usage._priced(response)
+
+        response_metadata = getattr(response, "response_metadata", None)
+        raw = (
+            response_metadata.get("usage")
+            if isinstance(response_metadata, dict)
+            else None
+        )
+        if isinstance(raw, dict):
+            usage.cache_read_tokens = _as_int(raw.get("cache_read_input_tokens"))
+            usage.cache_creation_tokens = _as_int(
+                raw.get("cache_creation_input_tokens")
+            )
+            if not usage.input_tokens:
+                usage.input_tokens = (
+                    _as_int(raw.get("input_tokens"))
+                    + usage.cache_read_tokens
+                    + usage.cache_creation_tokens
+                )
+            if not usage.output_tokens:
+                usage.output_tokens = _as_int(raw.get("output_tokens"))
+
+        return usage._priced(response)
+
+    def add(self, other: "TokenUsage") -> None:
+        """Add another usage record into this one in place."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cache_creation_tokens += other.cache_creation_tokens
+        self.llm_calls += other.llm_calls
+        self.cost_usd += other.cost_usd
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of input tokens served from the prompt cache."""
+        if not self.input_tokens:
+            return 0.0
+        return self.cache_read_tokens / self.input_tokens
+
+    def _priced(self, response: Any) -> "TokenUsage":
+        """Fill in the estimated cost from the model named in the response."""
+        from astro.core.llm.pricing import estimate_cost
+
+        metadata = getattr(response, "response_metadata", None)
+        if isinstance(metadata, dict):
+            model = metadata.get("model") or metadata.get("model_name")
+            self.cost_usd = estimate_cost(self, model if isinstance(model, str) else None)
+        return self
+
+
+def _as_int(value: Any) -> int:
+    """Coerce a usage value to a non-negative int."""
+    return value if isinstance(value, int) and value > 0 else 0
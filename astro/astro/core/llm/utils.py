@@ -8,6 +8,8 @@ from anthropic import Anthropic
 from dotenv import find_dotenv, load_dotenv
 from openai import OpenAI
 
+from astro.core.llm.cassette import cassette_llm_client, replaying
+
 load_dotenv(find_dotenv())
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,14 @@ DEFAULT_MODELS = {
     "google_genai": "gemini-2.0-flash-exp",
 }
 
+# Fast tier defaults by provider, used when neither LLM_FAST_MODEL nor
+# LLM_MODEL is set (see get_fast_model)
+DEFAULT_FAST_MODELS = {
+    "anthropic": "claude-3-5-haiku-20241022",
+    "openai": "gpt-4o-mini",
+    "google_genai": "gemini-2.0-flash-lite",
+}
+
 # Models that only support default temperature (1.0)
 FIXED_TEMPERATURE_MODELS = [
     "gpt-5-nano",
@@ -35,6 +45,27 @@ def get_default_max_tokens() -> int:
     return int(os.getenv("LLM_MAX_TOKENS", "4096"))
 
 
+def get_fast_model(provider: str | None = None) -> str:
+    """Return the configured fast tier model for a provider.
+
+    Resolved from LLM_FAST_MODEL, then LLM_MODEL (a deployment that pins its
+    model, e.g. behind a gateway, may not serve the provider's small model),
+    then the provider's entry in DEFAULT_FAST_MODELS.
+
+    Args:
+        provider: LLM provider. Defaults to LLM_PROVIDER or "anthropic".
+
+    Returns:
+        Model identifier.
+    """
+    provider = (provider or os.getenv("LLM_PROVIDER") or DEFAULT_PROVIDER).lower()
+    return (
+        os.getenv("LLM_FAST_MODEL")
+        or os.getenv("LLM_MODEL")
+        or DEFAULT_FAST_MODELS.get(provider, DEFAULT_MODELS.get(provider, ""))
+    )
+
+
 class LLMClient(ABC):
     """Abstract interface for LLM clients.
 
@@ -357,13 +388,19 @@ def get_llm(
 
     model = model or os.getenv("LLM_MODEL") or DEFAULT_MODELS[provider]
 
+    # Served offline from a cassette (see astro.core.llm.cassette)
+    if replaying():
+        replayed: LLMClient = cassette_llm_client(None, model, temperature)
+        return replayed
+
     # Check cache
     cache_key = (provider, model, temperature)
     if cache_key in _llm_cache:
         logger.debug(
             f"Reusing cached LLM: provider={provider}, model={model}, temperature={temperature}"
         )
-        return _llm_cache[cache_key]
+        cached: LLMClient = cassette_llm_client(_llm_cache[cache_key], model, temperature)
+        return cached
 
     # Create new client instance
     logger.debug(
@@ -381,7 +418,8 @@ def get_llm(
 
     _llm_cache[cache_key] = llm
     logger.info(f"LLM initialized and cached: provider={provider}, model={model}")
-    return llm
+    recorded: LLMClient = cassette_llm_client(llm, model, temperature)
+    return recorded
 
 
 def clear_llm_cache() -> None:
@@ -434,27 +472,83 @@ class TemperatureFixedLLMWrapper:
 def get_embedding_provider(
     model: str | None = None,
     api_key: str | None = None,
+    provider: str | None = None,
 ) -> Any:
-    """Get an EmbeddingProvider instance (OpenAI).
+    """Get an EmbeddingProvider instance.
 
     Args:
-        model: Embedding model name. Defaults to EMBEDDING_MODEL env var
-               or text-embedding-3-small.
+        model: OpenAI embedding model name. Defaults to EMBEDDING_MODEL env
+               var or text-embedding-3-small.
         api_key: OpenAI API key. Falls back to OPENAI_API_KEY env var.
+        provider: "openai" or "local". Defaults to EMBEDDING_PROVIDER env
+               var or "openai".
 
     Returns:
-        OpenAIEmbeddingProvider instance implementing EmbeddingProvider protocol.
+        With provider "local", a HashedNgramEmbeddingProvider (offline, CPU;
+        LOCAL_EMBEDDING_DIMENSIONS sets its size, default 512). Otherwise
+        OpenAIEmbeddingProvider (wrapped with retries and timeouts unless
+        LLM_RESILIENCE is false) implementing EmbeddingProvider protocol.
+        Recorded to or replayed from the active LLM cassette, if any;
+        otherwise served from the shared embedding cache unless
+        EMBEDDING_CACHE is false.
+
+    Raises:
+        ValueError: If the provider is unknown, or a model is given for the
+            local provider (which has no models).
     """
+    resolved_provider = (provider or os.getenv("EMBEDDING_PROVIDER") or "openai").lower()
+    if resolved_provider == "local":
+        from astro.core.llm.local_embeddings import (
+            DEFAULT_DIMENSIONS,
+            HashedNgramEmbeddingProvider,
+        )
+
+        if model is not None:
+            raise ValueError(
+                f"Embedding model '{model}' cannot be used with the local provider"
+            )
+
+        # Deterministic and network-free: no cassette, cache or retries needed
+        return HashedNgramEmbeddingProvider(
+            dimensions=int(os.getenv("LOCAL_EMBEDDING_DIMENSIONS", str(DEFAULT_DIMENSIONS)))
+        )
+    if resolved_provider != "openai":
+        raise ValueError(
+            f"Unknown embedding provider '{resolved_provider}' (expected 'openai' or 'local')"
+        )
+
+    from astro.core.llm.cassette import cassette_embedding_provider, get_cassette
+    from astro.core.llm.embedding_cache import cached_embedding_provider
     from astro.core.llm.embeddings import OpenAIEmbeddingProvider
+    from astro.core.llm.resilience import (
+        resilience_enabled,
+        resilient_embedding_provider,
+    )
 
-    resolved_model = model or os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
-    return OpenAIEmbeddingProvider(model=resolved_model, api_key=api_key)
+    resolved_model: str = model or os.getenv("EMBEDDING_MODEL") or "text-embedding-3-small"
+    if replaying():
+        return cassette_embedding_provider(None, resolved_model)
+
+    openai_provider = OpenAIEmbeddingProvider(
+        model=resolved_model,
+        api_key=api_key,
+        # The resilience wrapper owns retries (shared retry budget)
+        max_retries=0 if resilience_enabled() else None,
+    )
+    wrapped = cassette_embedding_provider(
+        resilient_embedding_provider(openai_provider, resolved_model), resolved_model
+    )
+    # Cassettes must see every request, so the cache only applies without one
+    if get_cassette() is not None:
+        return wrapped
+    return cached_embedding_provider(wrapped, resolved_model)
 
 
 def get_langchain_llm(
     temperature: float = 0,
     provider: str | None = None,
     model: str | None = None,
+    max_tokens: int | None = None,
 ) -> Any:
     """Initialize and return a LangChain chat model instance for tool calling.
 
@@ -467,9 +561,17 @@ def get_langchain_llm(
                  If not specified, uses LLM_PROVIDER env var or defaults to "anthropic".
         model: Model identifier. If not specified, uses LLM_MODEL env var
                or provider-specific default.
+        max_tokens: Output token cap set on the model itself (None = model
+            default). Unlike ``llm.bind(max_tokens=...)``, it also applies
+            to ``with_structured_output`` runnables.
 
     Returns:
         LangChain chat model instance supporting .bind_tools() and .invoke().
+        Anthropic models accept cache_control content blocks; see
+        astro.core.llm.caching for building cacheable prompts. Calls are
+        retried, timed out and optionally hedged by
+        astro.core.llm.resilience unless LLM_RESILIENCE is false, and
+        recorded to or replayed from the active LLM cassette, if any.
 
     Raises:
         ValueError: If required environment variables are not set or provider is invalid.
@@ -481,6 +583,14 @@ def get_langchain_llm(
     """
     from langchain.chat_models import init_chat_model
 
+    from astro.core.llm.caching import prompt_caching_enabled
+    from astro.core.llm.cassette import cassette_chat_model
+    from astro.core.llm.resilience import (
+        get_resilient_caller,
+        resilience_enabled,
+        resilient_chat_model,
+    )
+
     # Determine provider and model
     provider = provider or os.getenv("LLM_PROVIDER", DEFAULT_PROVIDER)
     provider = provider.lower()  # type: ignore[union-attr]
@@ -493,6 +603,10 @@ def get_langchain_llm(
 
     model = model or os.getenv("LLM_MODEL") or DEFAULT_MODELS[provider]
 
+    # Served offline from a cassette (see astro.core.llm.cassette)
+    if replaying():
+        return cassette_chat_model(None, model, provider, temperature)
+
     # Check if model only supports default temperature
     if model in FIXED_TEMPERATURE_MODELS:
         temperature = 1.0
@@ -506,6 +620,16 @@ def get_langchain_llm(
 
     # Build provider-specific kwargs
     model_kwargs: dict[str, Any] = {"temperature": temperature}
+    if max_tokens:
+        model_kwargs["max_tokens"] = max_tokens
+
+    # Retries and timeouts are owned by the resilience wrapper (shared retry
+    # budget); disable the SDK's own retries so they do not multiply
+    if resilience_enabled():
+        policy = get_resilient_caller().policy
+        model_kwargs["max_retries"] = 0
+        if policy.timeout_s:
+            model_kwargs["timeout"] = policy.timeout_s
 
     if provider == "anthropic":
         api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -528,6 +652,10 @@ def get_langchain_llm(
             proxy_token = os.getenv("PROXY_TOKEN", "")
             default_headers["Authorization"] = f"Bearer {proxy_token}"
             default_headers["anthropic-version"] = "2024-05-01"
+            # Gateways pinned to the older API version only honour
+            # cache_control breakpoints with the prompt-caching beta header
+            if prompt_caching_enabled():
+                default_headers["anthropic-beta"] = "prompt-caching-2024-07-31"
 
         # Add custom headers if configured
         if app_id := os.getenv("ANTHROPIC_APPLICATION_ID"):
@@ -565,6 +693,10 @@ def get_langchain_llm(
     # Wrap models that only support default temperature
     if model in FIXED_TEMPERATURE_MODELS:
         logger.debug(f"Wrapping {model} with TemperatureFixedLLMWrapper")
-        return TemperatureFixedLLMWrapper(llm, model)
+        llm = TemperatureFixedLLMWrapper(llm, model)
 
-    return llm
+    # Timeouts, retries with backoff and optional hedging; recorded to the
+    # active cassette, if any
+    return cassette_chat_model(
+        resilient_chat_model(llm, model), model, provider, temperature
+    )
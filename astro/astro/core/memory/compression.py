@@ -62,7 +62,7 @@ class SummarizationCompression:
         """Initialize summarization compression.
 
         Args:
-            llm: LLM provider for generating summaries
+            llm: LLM provider (or LangChain chat model) for generating summaries
             max_chars: Target character count for summary
         """
         self.llm = llm
@@ -84,16 +84,18 @@ class SummarizationCompression:
             # Fallback to truncation if no LLM provided
             return content[: self.max_chars] + "..."
 
+        messages = [
+            {
+                "role": "user",
+                "content": f"Summarize the following in approximately {self.max_chars} characters, "
+                f"retaining key information:\n\n{content}",
+            }
+        ]
         try:
-            response = await self.llm.invoke(
-                [
-                    {
-                        "role": "user",
-                        "content": f"Summarize the following in approximately {self.max_chars} characters, "
-                        f"retaining key information:\n\n{content}",
-                    }
-                ]
-            )
+            # LangChain chat models (as served by the LLM router) are async via ainvoke
+            if hasattr(self.llm, "ainvoke"):
+                return str((await self.llm.ainvoke(messages)).content)
+            response = await self.llm.invoke(messages)
             result: str = response["content"]
             return result
         except Exception:
@@ -110,37 +112,41 @@ class SummarizationCompression:
 class TokenLimitCompression:
     """Compress by truncating to token limit.
 
-    Simple strategy that truncates text to a maximum token count.
-    Fast but may lose important information at the end.
+    Simple strategy that truncates text to a maximum token count, keeping the
+    head and tail of the text. Fast but may lose information in the middle.
     """
 
-    def __init__(self, max_tokens: int = 500):
+    def __init__(
+        self,
+        max_tokens: int = 500,
+        provider: str | None = None,
+        model: str | None = None,
+    ):
         """Initialize token limit compression.
 
         Args:
-            max_tokens: Maximum token count (approximately 4 chars per token)
+            max_tokens: Maximum token count.
+            provider: LLM provider whose tokenizer estimate to use.
+                Defaults to LLM_PROVIDER.
+            model: Model identifier. Defaults to LLM_MODEL.
         """
         self.max_tokens = max_tokens
+        self.provider = provider
+        self.model = model
 
     async def compress(self, content: str) -> str:
         """Truncate to token limit.
 
-        Uses a simple approximation of 4 characters per token.
-
         Args:
             content: Text to truncate
 
         Returns:
             Truncated content
         """
-        max_chars = self.max_tokens * 4
-        if len(content) <= max_chars:
-            return content
-        return content[:max_chars] + "..."
+        return self.compress_sync(content)
 
     def compress_sync(self, content: str) -> str:
         """Synchronous version - same as async."""
-        max_chars = self.max_tokens * 4
-        if len(content) <= max_chars:
-            return content
-        return content[:max_chars] + "..."
+        from astro.core.llm.tokens import truncate_to_tokens
+
+        return truncate_to_tokens(content, self.max_tokens, self.provider, self.model)
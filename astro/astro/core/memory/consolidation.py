@@ -0,0 +1,411 @@
+"""Offline consolidation and compaction of long-term memory.
+
+Long-term memory otherwise only grows. MemoryConsolidator walks memories
+older than ``min_age_s`` in timestamp order, one window at a time:
+
+- Groups each window by scope (``user_id``) and clusters it by embedding
+  (greedy leader clustering on cosine similarity, one matrix product).
+- Summarizes each cluster of ``min_cluster_size`` or more into a single
+  consolidated memory, several clusters per LLM call.
+- Stores the summaries (metadata: source IDs, summed hit counts, first and
+  last seen) and archives or deletes their sources.
+- Scores unclustered memories by recency and usage (hit count halved every
+  ``half_life_s`` since last seen) and archives those below
+  ``prune_below``.
+
+Progress is checkpointed to a JSON file after every window, so an
+interrupted run resumes where it stopped and each run only looks at
+memories that aged past the cutoff since the last one. Requires a backend
+providing ``iter_memories`` (and ``archive`` unless ``archive=False``),
+as MongoDBMemory does.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from astro.core.memory.dedup import DEFAULT_SCOPE_FIELDS, HIT_COUNT_KEY, LAST_SEEN_KEY
+from astro.interfaces.llm import EmbeddingProvider
+from astro.interfaces.memory import Memory, MemoryBackend
+
+logger = logging.getLogger(__name__)
+
+# Memories younger than this are left alone (hot memories stay verbatim)
+DEFAULT_MIN_AGE_S = 7 * 24 * 3600
+
+# Memories clustered together per window
+DEFAULT_WINDOW_SIZE = 1000
+
+# Cosine similarity to a cluster's leader for a memory to join it
+DEFAULT_CLUSTER_THRESHOLD = 0.85
+
+# Cluster sizes that are summarized (larger clusters are split)
+DEFAULT_MIN_CLUSTER_SIZE = 3
+DEFAULT_MAX_CLUSTER_SIZE = 20
+
+# Clusters summarized per LLM call, and concurrent calls
+DEFAULT_CLUSTERS_PER_CALL = 8
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Usage decays by half over this many seconds without a hit
+DEFAULT_HALF_LIFE_S = 90 * 24 * 3600
+
+# Source characters included per memory in summarization prompts
+MAX_SOURCE_CHARS = 2000
+
+DEFAULT_CHECKPOINT_PATH = ".astro/consolidation.json"
+
+# Metadata type of consolidated memories (never re-clustered)
+CONSOLIDATED_TYPE = "consolidated"
+
+
+def decay_score(memory: Memory, now: float, half_life_s: float = DEFAULT_HALF_LIFE_S) -> float:
+    """Recency- and usage-weighted value of a memory.
+
+    Args:
+        memory: Memory to score.
+        now: Current time (epoch seconds).
+        half_life_s: Seconds without a hit that halve the score.
+
+    Returns:
+        ``hit_count * 0.5 ** (age since last seen / half_life_s)``.
+    """
+    hits = memory.metadata.get(HIT_COUNT_KEY, 1)
+    last_seen = memory.metadata.get(LAST_SEEN_KEY) or memory.timestamp
+    return float(hits * 0.5 ** (max(now - last_seen, 0.0) / half_life_s))
+
+
+def cluster_embeddings(
+    embeddings: np.ndarray,
+    threshold: float = DEFAULT_CLUSTER_THRESHOLD,
+    max_size: int = DEFAULT_MAX_CLUSTER_SIZE,
+) -> list[list[int]]:
+    """Greedy leader clustering by cosine similarity.
+
+    Each unassigned row in turn leads a cluster of the unassigned rows at
+    least ``threshold`` similar to it (up to ``max_size``, most similar
+    first).
+
+    Args:
+        embeddings: (n, dim) matrix.
+        threshold: Min cosine similarity to the leader.
+        max_size: Max rows per cluster.
+
+    Returns:
+        Row indices per cluster, covering every row.
+    """
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    vectors = embeddings / np.where(norms > 0, norms, 1.0)
+    similarity = vectors @ vectors.T
+
+    unassigned = np.ones(len(vectors), dtype=bool)
+    clusters: list[list[int]] = []
+    for leader in range(len(vectors)):
+        if not unassigned[leader]:
+            continue
+        candidates = np.flatnonzero(unassigned & (similarity[leader] >= threshold))
+        candidates = candidates[np.argsort(-similarity[leader, candidates])][:max_size]
+        members = [leader] + [int(i) for i in candidates if i != leader][: max_size - 1]
+        unassigned[members] = False
+        clusters.append(members)
+    return clusters
+
+
+class MemoryConsolidator:
+    """Clusters, summarizes and compacts aged long-term memories.
+
+    Example:
+        consolidator = MemoryConsolidator(backend, llm, embedding_provider)
+        progress = await consolidator.run()  # Resumes from the checkpoint
+        task = asyncio.create_task(consolidator.run_periodically(3600))
+    """
+
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        llm: Any,
+        embedding_provider: EmbeddingProvider,
+        min_age_s: float = DEFAULT_MIN_AGE_S,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        cluster_threshold: float = DEFAULT_CLUSTER_THRESHOLD,
+        min_cluster_size: int = DEFAULT_MIN_CLUSTER_SIZE,
+        clusters_per_call: int = DEFAULT_CLUSTERS_PER_CALL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        half_life_s: float = DEFAULT_HALF_LIFE_S,
+        prune_below: float | None = None,
+        archive: bool = True,
+        checkpoint_path: str | Path | None = DEFAULT_CHECKPOINT_PATH,
+    ):
+        """Initialize the consolidator.
+
+        Args:
+            backend: Memory backend (needs ``iter_memories``).
+            llm: LLMProvider (``invoke``) or LangChain chat model
+                (``ainvoke``) used for summaries.
+            embedding_provider: Provider for embedding summaries.
+            min_age_s: Only memories older than this are consolidated.
+            window_size: Memories clustered together.
+            cluster_threshold: Min cosine similarity within a cluster.
+            min_cluster_size: Smallest cluster that is summarized.
+            clusters_per_call: Clusters summarized per LLM call.
+            max_concurrency: Concurrent LLM calls.
+            half_life_s: Decay half-life for usage scores.
+            prune_below: Archive unclustered memories whose decay score is
+                below this (None = never prune).
+            archive: Move sources to the backend's archive (True) or
+                delete them (False).
+            checkpoint_path: JSON progress file (None = no resume).
+
+        Raises:
+            ValueError: If the backend cannot list (or archive) memories.
+        """
+        if not callable(getattr(type(backend), "iter_memories", None)):
+            raise ValueError("Consolidation needs a backend with iter_memories()")
+        if archive and not callable(getattr(type(backend), "archive", None)):
+            raise ValueError(
+                "Backend cannot archive memories; pass archive=False to delete sources"
+            )
+        self.backend = backend
+        self.llm = llm
+        self.embedding_provider = embedding_provider
+        self.min_age_s = min_age_s
+        self.window_size = window_size
+        self.cluster_threshold = cluster_threshold
+        self.min_cluster_size = min_cluster_size
+        self.clusters_per_call = clusters_per_call
+        self.half_life_s = half_life_s
+        self.prune_below = prune_below
+        self.archive = archive
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.stats: Counter[str] = Counter()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._after = self._load_checkpoint()
+
+    def progress(self) -> dict[str, Any]:
+        """Progress metrics: counters plus the checkpoint position."""
+        return {**self.stats, "checkpoint": self._after}
+
+    async def run(self, max_windows: int | None = None) -> dict[str, Any]:
+        """Consolidate memories that aged past the cutoff since the last run.
+
+        Args:
+            max_windows: Stop after this many windows (None = until done).
+
+        Returns:
+            Progress metrics (see progress()).
+        """
+        started = time.monotonic()
+        before = time.time() - self.min_age_s
+        windows = 0
+        window: list[Memory] = []
+        async for memory in self.backend.iter_memories(  # type: ignore[attr-defined]
+            include_embeddings=True, after=self._after, before=before
+        ):
+            # Never split memories sharing a timestamp across windows, so
+            # the timestamp checkpoint cannot skip any of them
+            if len(window) >= self.window_size and memory.timestamp != window[-1].timestamp:
+                await self._process(window)
+                windows += 1
+                window = []
+                if max_windows is not None and windows >= max_windows:
+                    break
+            window.append(memory)
+        else:
+            if window:
+                await self._process(window)
+
+        self.stats["runs"] += 1
+        logger.info(
+            f"Memory consolidation pass done in {time.monotonic() - started:.1f}s: "
+            f"{self.progress()}"
+        )
+        return self.progress()
+
+    async def run_periodically(self, interval_s: float) -> None:
+        """Run consolidation every ``interval_s`` seconds until cancelled."""
+        while True:
+            try:
+                await self.run()
+            except Exception as e:  # Keep the job alive across backend outages
+                self.stats["failed_runs"] += 1
+                logger.error(f"Memory consolidation failed: {e}")
+            await asyncio.sleep(interval_s)
+
+    async def _process(self, window: list[Memory]) -> None:
+        """Consolidate one window and checkpoint past it."""
+        self.stats["windows"] += 1
+        self.stats["scanned"] += len(window)
+        now = time.time()
+
+        scopes: dict[tuple[Any, ...], list[Memory]] = {}
+        for memory in window:
+            if memory.embedding is None or memory.metadata.get("type") == CONSOLIDATED_TYPE:
+                continue
+            key = tuple(memory.metadata.get(f) for f in DEFAULT_SCOPE_FIELDS)
+            scopes.setdefault(key, []).append(memory)
+
+        groups: list[list[Memory]] = []
+        singletons: list[Memory] = []
+        for members in scopes.values():
+            dims = {len(m.embedding or []) for m in members}
+            if len(dims) > 1:
+                # Mixed embedding models; cluster only the dominant one
+                dim = Counter(len(m.embedding or []) for m in members).most_common(1)[0][0]
+                members = [m for m in members if len(m.embedding or []) == dim]
+            matrix = np.array([m.embedding for m in members], dtype=np.float32)
+            for cluster in cluster_embeddings(matrix, self.cluster_threshold):
+                if len(cluster) >= self.min_cluster_size:
+                    groups.append([members[i] for i in cluster])
+                else:
+                    singletons.extend(members[i] for i in cluster)
+        self.stats["clusters"] += len(groups)
+
+        batches = [
+            groups[i : i + self.clusters_per_call]
+            for i in range(0, len(groups), self.clusters_per_call)
+        ]
+        summaries = await asyncio.gather(*(self._summarize(batch) for batch in batches))
+        consolidated = [
+            (group, summary)
+            for batch, batch_summaries in zip(batches, summaries, strict=True)
+            for group, summary in zip(batch, batch_summaries, strict=True)
+            if summary
+        ]
+        await self._store_consolidated(consolidated)
+
+        if self.prune_below is not None:
+            stale = [
+                m.id
+                for m in singletons
+                if decay_score(m, now, self.half_life_s) < self.prune_below
+            ]
+            await self._retire(stale)
+            self.stats["pruned"] += len(stale)
+
+        self._after = window[-1].timestamp
+        self._save_checkpoint()
+
+    async def _store_consolidated(self, consolidated: list[tuple[list[Memory], str]]) -> None:
+        """Store summaries, then retire their sources."""
+        if not consolidated:
+            return
+        embeddings = await self.embedding_provider.embed_batch([s for _, s in consolidated])
+        entries = [
+            (f"consolidated_{uuid.uuid4().hex[:12]}", summary, embedding, _merged_metadata(group))
+            for (group, summary), embedding in zip(consolidated, embeddings, strict=True)
+        ]
+        # Looked up on the type so plain backends use store()
+        if callable(getattr(type(self.backend), "store_many", None)):
+            await self.backend.store_many(entries)  # type: ignore[attr-defined]
+        else:
+            await asyncio.gather(*(self.backend.store(*entry) for entry in entries))
+
+        sources = [m.id for group, _ in consolidated for m in group]
+        await self._retire(sources)
+        self.stats["consolidated"] += len(entries)
+        self.stats["sources_retired"] += len(sources)
+
+    async def _retire(self, ids: list[str]) -> None:
+        if not ids:
+            return
+        if self.archive:
+            await self.backend.archive(ids)  # type: ignore[attr-defined]
+        else:
+            await asyncio.gather(*(self.backend.delete(id) for id in ids))
+
+    async def _summarize(self, groups: list[list[Memory]]) -> list[str | None]:
+        """Summarize clusters, several per LLM call.
+
+        Falls back to one call per cluster when a batched reply cannot be
+        parsed. Clusters whose summary fails are left as they are.
+        """
+        if len(groups) == 1:
+            prompt = (
+                "Consolidate these related memories into one concise memory that "
+                "keeps every distinct fact, figure and name. Reply with the "
+                "memory text only.\n\n" + _format_group(groups[0])
+            )
+            try:
+                return [(await self._complete(prompt)).strip() or None]
+            except Exception as e:
+                self.stats["failed_clusters"] += 1
+                logger.warning(f"Failed to summarize memory cluster: {e}")
+                return [None]
+
+        prompt = (
+            "Consolidate each group of related memories below into one concise "
+            "memory that keeps every distinct fact, figure and name. Reply with "
+            f"a JSON array of {len(groups)} strings, one per group, in order.\n\n"
+            + "\n\n".join(
+                f"Group {i}:\n{_format_group(group)}" for i, group in enumerate(groups, 1)
+            )
+        )
+        try:
+            reply = await self._complete(prompt)
+            summaries = json.loads(reply[reply.index("[") : reply.rindex("]") + 1])
+            if len(summaries) != len(groups) or not all(isinstance(s, str) for s in summaries):
+                raise ValueError(f"expected {len(groups)} summaries")
+            return [s.strip() or None for s in summaries]
+        except Exception as e:
+            logger.warning(f"Batched consolidation reply unusable ({e}); summarizing singly")
+            results = await asyncio.gather(*(self._summarize([g]) for g in groups))
+            return [r[0] for r in results]
+
+    async def _complete(self, prompt: str) -> str:
+        """One LLM completion, within the concurrency limit."""
+        messages = [{"role": "user", "content": prompt}]
+        async with self._semaphore:
+            self.stats["llm_calls"] += 1
+            if hasattr(self.llm, "ainvoke"):
+                response = await self.llm.ainvoke(messages, temperature=0)
+                return str(getattr(response, "content", response))
+            response = await self.llm.invoke(messages, temperature=0)
+            return str(response["content"])
+
+    def _load_checkpoint(self) -> float | None:
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return None
+        try:
+            after = json.loads(self.checkpoint_path.read_text())["after"]
+            return float(after) if after is not None else None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable consolidation checkpoint: {e}")
+            return None
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint_path is None:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp.write_text(json.dumps({"after": self._after, "stats": dict(self.stats)}))
+        tmp.replace(self.checkpoint_path)
+
+
+def _format_group(group: list[Memory]) -> str:
+    return "\n".join(f"- {m.content[:MAX_SOURCE_CHARS]}" for m in group)
+
+
+def _merged_metadata(group: list[Memory]) -> dict[str, Any]:
+    """Metadata for a consolidated memory built from a cluster."""
+    metadata: dict[str, Any] = {
+        "type": CONSOLIDATED_TYPE,
+        "source_ids": [m.id for m in group],
+        "source_count": len(group),
+        HIT_COUNT_KEY: sum(m.metadata.get(HIT_COUNT_KEY, 1) for m in group),
+        "first_seen": min(m.timestamp for m in group),
+        LAST_SEEN_KEY: max(m.metadata.get(LAST_SEEN_KEY) or m.timestamp for m in group),
+    }
+    for field in DEFAULT_SCOPE_FIELDS:
+        if field in group[0].metadata:
+            metadata[field] = group[0].metadata[field]
+    directive_ids = [d for m in group for d in m.metadata.get("directive_ids", [])]
+    if directive_ids:
+        metadata["directive_ids"] = list(dict.fromkeys(directive_ids))
+    return metadata
@@ -3,14 +3,31 @@
 This module implements the active context window - recent conversation history
 that is fully provided to the LLM on every call. It automatically compresses
 when the size exceeds a threshold to keep token usage manageable.
+
+The size is kept as a running character count, so appends are O(1).
+Compression runs as a background task when an event loop is running: older
+turns are summarized by the compression strategy (an LLM call for
+SummarizationCompression) while the request carries on, and the summary
+replaces them once ready. Outside an event loop the strategy's synchronous
+fallback is used.
 """
 
+import asyncio
+import logging
 import time
 from dataclasses import dataclass, field
 from typing import Any
 
 from astro.core.memory.compression import CompressionStrategy, SummarizationCompression
 
+logger = logging.getLogger(__name__)
+
+# Most recent messages always kept verbatim
+DEFAULT_KEEP_RECENT = 5
+
+# Characters kept by the fallback truncation when no summary is available
+FALLBACK_SUMMARY_CHARS = 1000
+
 
 @dataclass
 class Message:
@@ -63,6 +80,7 @@ class ContextWindow:
         self,
         max_chars: int = 50000,
         compression_strategy: CompressionStrategy | None = None,
+        keep_recent: int = DEFAULT_KEEP_RECENT,
     ):
         """Initialize context window.
 
@@ -70,15 +88,22 @@ class ContextWindow:
             max_chars: Maximum character count before compression triggers
             compression_strategy: Strategy for compressing old messages
                                 (defaults to summarization)
+            keep_recent: Most recent messages never compressed
         """
         self.max_chars = max_chars
         self.compression = compression_strategy or SummarizationCompression()
+        self.keep_recent = keep_recent
         self.messages: list[Message] = []
+        self._chars = 0
+        self._compression_task: asyncio.Task[None] | None = None
+        # Bumped by clear() so an in-flight summary of cleared messages is dropped
+        self._generation = 0
 
     def add_message(self, content: str, metadata: dict[str, Any]) -> None:
         """Add a message to context window.
 
-        Compresses if size exceeds threshold after adding the message.
+        Starts compression if size exceeds threshold after adding the
+        message. Never waits for the compression to finish.
 
         Args:
             content: Message content
@@ -91,6 +116,7 @@ class ContextWindow:
             timestamp=time.time(),
         )
         self.messages.append(message)
+        self._chars += len(content)
 
         # Compress if needed
         if self._size() > self.max_chars:
@@ -135,49 +161,97 @@ class ContextWindow:
     def clear(self) -> None:
         """Clear all messages from context window."""
         self.messages = []
+        self._chars = 0
+        self._generation += 1
+
+    async def wait_for_compression(self) -> None:
+        """Wait for an in-flight background compression to finish."""
+        while self._compression_task is not None:
+            await asyncio.shield(self._compression_task)
 
     def _size(self) -> int:
-        """Calculate total character count of all messages.
+        """Total character count of all messages (O(1) running count).
 
         Returns:
             Total characters across all message content
         """
-        return sum(len(msg.content) for msg in self.messages)
+        return self._chars
 
     def _compress(self) -> None:
         """Compress older messages while keeping recent ones.
 
         Strategy:
-        - Keep most recent N messages (default 5) in full
+        - Keep most recent ``keep_recent`` messages in full
         - Summarize all older messages into a single summary message
         - Replace old messages with the summary
 
-        This ensures recent context is always available while managing
-        the overall token count.
+        Inside an event loop the summary is produced by a background task
+        and at most one runs at a time; messages added meanwhile are kept
+        and picked up by the next compression.
         """
-        keep_recent = 5
-        if len(self.messages) <= keep_recent:
+        if len(self.messages) <= self.keep_recent:
             return
+        if self._compression_task is not None:
+            return  # Already summarizing; the window catches up when it lands
 
-        # Split into old and recent
-        old_messages = self.messages[:-keep_recent]
-        recent_messages = self.messages[-keep_recent:]
+        old_messages = self.messages[: -self.keep_recent]
+        if len(old_messages) == 1 and old_messages[0].metadata.get("compressed"):
+            return  # Only the previous summary is old; nothing new to fold in
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._replace(old_messages, self._compress_messages(old_messages))
+            return
 
-        # Compress old messages
-        compressed_content = self._compress_messages(old_messages)
+        self._compression_task = asyncio.create_task(
+            self._compress_in_background(old_messages, self._generation)
+        )
 
-        # Replace with summary
+    async def _compress_in_background(
+        self, old_messages: list[Message], generation: int
+    ) -> None:
+        """Summarize old messages and swap the summary in."""
+        combined = self._combine(old_messages)
+        try:
+            summary = await self.compression.compress(combined)
+        except Exception as e:
+            logger.warning(f"Context compression failed, truncating instead: {e}")
+            summary = self._truncate(combined)
+        finally:
+            self._compression_task = None
+
+        if generation != self._generation:
+            return  # Cleared while summarizing
+        self._replace(old_messages, summary)
+        # Messages added while summarizing may need another pass
+        if self._size() > self.max_chars:
+            self._compress()
+
+    def _replace(self, old_messages: list[Message], summary: str) -> None:
+        """Replace the leading old messages with a summary message."""
+        content = f"[Summary of earlier conversation]\n{summary}"
         self.messages = [
             Message(
                 role="system",
-                content=f"[Summary of earlier conversation]\n{compressed_content}",
+                content=content,
                 metadata={"compressed": True},
                 timestamp=old_messages[0].timestamp,
             )
-        ] + recent_messages
+        ] + self.messages[len(old_messages) :]
+        self._chars += len(content) - sum(len(msg.content) for msg in old_messages)
+
+    @staticmethod
+    def _combine(messages: list[Message]) -> str:
+        return "\n".join(f"{msg.role}: {msg.content}" for msg in messages)
+
+    @staticmethod
+    def _truncate(combined: str) -> str:
+        if len(combined) <= FALLBACK_SUMMARY_CHARS:
+            return combined
+        return combined[:FALLBACK_SUMMARY_CHARS] + "..."
 
     def _compress_messages(self, messages: list[Message]) -> str:
-        """Compress a list of messages into a summary.
+        """Compress messages synchronously (no event loop running).
 
         Args:
             messages: Messages to compress
@@ -185,25 +259,12 @@ class ContextWindow:
         Returns:
             Compressed summary of messages
         """
-        # Combine all message content
-        combined = "\n".join([f"{msg.role}: {msg.content}" for msg in messages])
-
-        # Note: The compression strategy should be async, but for simplicity
-        # in this context, we'll make it synchronous. In production, this
-        # should be handled with async/await.
+        combined = self._combine(messages)
         try:
             # If compression strategy has a sync method, use it
             if hasattr(self.compression, "compress_sync"):
                 return self.compression.compress_sync(combined)  # type: ignore
-            else:
-                # Fallback: simple truncation
-                max_chars = 1000
-                if len(combined) <= max_chars:
-                    return combined
-                return combined[:max_chars] + "..."
+            return self._truncate(combined)
         except Exception:
             # Fallback on error: simple truncation
-            max_chars = 1000
-            return (
-                combined[:max_chars] + "..." if len(combined) > max_chars else combined
-            )
+            return self._truncate(combined)
@@ -0,0 +1,255 @@
+"""Write-time near-duplicate suppression for long-term memory.
+
+Repeated questions produce nearly identical exchanges. Storing each one
+bloats the collection and lets copies crowd retrieval results. Before a
+memory is inserted, Deduplicator searches the nearest stored neighbours of
+its embedding; if one is at least ``threshold`` similar, the new memory is
+merged into it instead:
+
+- List metadata values are unioned, other values take the newer value.
+- ``hit_count`` is incremented and ``last_seen`` set to now.
+- The stored memory's timestamp is refreshed; nothing is inserted.
+
+Duplicates within one write-behind batch are merged the same way before
+anything is written. Merges can be scoped (``scope_fields``) so memories
+of different users are never merged.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any
+
+import numpy as np
+
+from astro.interfaces.memory import Memory, MemoryBackend
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity at which a new memory counts as a stored one's duplicate
+DEFAULT_DUPLICATE_THRESHOLD = 0.95
+
+# Stored neighbours checked per new memory
+DEFAULT_NEIGHBOURS = 3
+
+# Metadata fields a duplicate must share to be merged
+DEFAULT_SCOPE_FIELDS = ("user_id", "namespace")
+
+# Metadata keys maintained on merged memories
+HIT_COUNT_KEY = "hit_count"
+LAST_SEEN_KEY = "last_seen"
+
+# (id, content, embedding, metadata), as taken by store_many
+Entry = tuple[str, str, list[float], dict[str, Any]]
+
+
+def merge_metadata(existing: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Merge a duplicate's metadata into a stored memory's.
+
+    Args:
+        existing: Stored memory's metadata.
+        new: Duplicate's metadata.
+
+    Returns:
+        Merged metadata with ``hit_count`` and ``last_seen`` updated.
+    """
+    merged = dict(existing)
+    for key, value in new.items():
+        old = merged.get(key)
+        if isinstance(old, list) and isinstance(value, list):
+            merged[key] = old + [v for v in value if v not in old]
+        else:
+            merged[key] = value
+    merged[HIT_COUNT_KEY] = existing.get(HIT_COUNT_KEY, 1) + new.get(HIT_COUNT_KEY, 1)
+    merged[LAST_SEEN_KEY] = time.time()
+    return merged
+
+
+class Deduplicator:
+    """Merges near-duplicate memories into stored ones instead of inserting.
+
+    Example:
+        dedup = Deduplicator(backend, threshold=0.95)
+        to_insert, merged_into = await dedup.dedupe(entries)
+        await backend.store_many(to_insert)
+    """
+
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+        neighbours: int = DEFAULT_NEIGHBOURS,
+        scope_fields: tuple[str, ...] = DEFAULT_SCOPE_FIELDS,
+    ):
+        """Initialize the deduplicator.
+
+        Args:
+            backend: Backend searched for, and updated with, duplicates.
+            threshold: Min cosine similarity to merge (0-1).
+            neighbours: Stored neighbours checked per new memory.
+            scope_fields: Metadata fields a duplicate must share.
+        """
+        self.backend = backend
+        self.threshold = threshold
+        self.neighbours = neighbours
+        self.scope_fields = scope_fields
+        self.stats: Counter[str] = Counter()
+
+    async def dedupe(
+        self, entries: list[Entry]
+    ) -> tuple[list[Entry], dict[str, str]]:
+        """Merge duplicates and return the entries still to insert.
+
+        Args:
+            entries: New memories, already embedded.
+
+        Returns:
+            Entries with no stored or earlier in-batch duplicate (with
+            in-batch duplicates' metadata merged into them), and a map from
+            each merged entry's ID to the memory ID it was merged into.
+        """
+        if not entries:
+            return [], {}
+        self.stats["checked"] += len(entries)
+        neighbours = await self._search(entries)
+
+        kept: list[Entry] = []
+        kept_vectors: list[np.ndarray] = []
+        merged_into: dict[str, str] = {}
+        updates: dict[str, tuple[Memory, dict[str, Any], list[float]]] = {}
+        for entry, candidates in zip(entries, neighbours, strict=True):
+            id, content, embedding, metadata = entry
+            vector = _unit(embedding)
+
+            # Duplicate of an earlier memory in this batch
+            i = self._batch_duplicate(vector, metadata, kept, kept_vectors)
+            if i is not None:
+                kept_id, kept_content, kept_embedding, kept_metadata = kept[i]
+                merged = merge_metadata(kept_metadata, metadata)
+                kept[i] = (kept_id, kept_content, kept_embedding, merged)
+                merged_into[id] = kept_id
+                self._log_merge(id, kept_id, float(kept_vectors[i] @ vector))
+                continue
+
+            duplicate = self._best_duplicate(vector, candidates, metadata)
+            if duplicate is None:
+                kept.append(entry)
+                kept_vectors.append(vector)
+                continue
+            memory, similarity = duplicate
+            pending = updates.get(memory.id)
+            base = pending[1] if pending else memory.metadata
+            updates[memory.id] = (
+                memory,
+                merge_metadata(base, metadata),
+                memory.embedding or embedding,
+            )
+            merged_into[id] = memory.id
+            self._log_merge(id, memory.id, similarity)
+
+        await asyncio.gather(
+            *(
+                self._update(memory, merged, embedding)
+                for memory, merged, embedding in updates.values()
+            )
+        )
+        self.stats["inserted"] += len(kept)
+        return kept, merged_into
+
+    async def _search(self, entries: list[Entry]) -> list[list[Memory]]:
+        """Nearest stored neighbours per entry, within its scope."""
+        scopes = [self._scope(metadata) for _, _, _, metadata in entries]
+        try:
+            # One multi-vector search when every entry shares a scope
+            if len({tuple(sorted(s.items())) for s in scopes}) == 1 and callable(
+                getattr(type(self.backend), "search_many", None)
+            ):
+                results: list[list[Memory]] = await self.backend.search_many(  # type: ignore[attr-defined]
+                    [embedding for _, _, embedding, _ in entries],
+                    self.neighbours,
+                    scopes[0] or None,
+                )
+                return results
+            return list(
+                await asyncio.gather(
+                    *(
+                        self.backend.search(embedding, self.neighbours, scope or None)
+                        for (_, _, embedding, _), scope in zip(entries, scopes, strict=True)
+                    )
+                )
+            )
+        except Exception as e:
+            # Never lose a write over a failed duplicate check
+            logger.warning(f"Duplicate check failed, storing without dedup: {e}")
+            self.stats["check_failures"] += 1
+            return [[] for _ in entries]
+
+    def _batch_duplicate(
+        self,
+        vector: np.ndarray,
+        metadata: dict[str, Any],
+        kept: list[Entry],
+        kept_vectors: list[np.ndarray],
+    ) -> int | None:
+        """Index of the first kept entry this one duplicates, if any."""
+        for i, (_, _, _, kept_metadata) in enumerate(kept):
+            if (
+                self._same_scope(kept_metadata, metadata)
+                and kept_vectors[i].shape == vector.shape
+                and float(kept_vectors[i] @ vector) >= self.threshold
+            ):
+                return i
+        return None
+
+    def _best_duplicate(
+        self,
+        vector: np.ndarray,
+        candidates: list[Memory],
+        metadata: dict[str, Any],
+    ) -> tuple[Memory, float] | None:
+        best: tuple[Memory, float] | None = None
+        for memory in candidates:
+            if not self._same_scope(memory.metadata, metadata):
+                continue
+            similarity = memory.score
+            if memory.embedding is not None and len(memory.embedding) == len(vector):
+                similarity = float(_unit(memory.embedding) @ vector)
+            if similarity is None or similarity < self.threshold:
+                continue
+            if best is None or similarity > best[1]:
+                best = (memory, similarity)
+        return best
+
+    async def _update(
+        self, memory: Memory, metadata: dict[str, Any], embedding: list[float]
+    ) -> None:
+        """Write merged metadata and refresh the stored memory's timestamp."""
+        # Looked up on the type so mocks and plain backends re-store instead;
+        # wrappers raise NotImplementedError when their backend lacks it
+        if callable(getattr(type(self.backend), "update_metadata", None)):
+            try:
+                await self.backend.update_metadata(memory.id, metadata)  # type: ignore[attr-defined]
+                return
+            except NotImplementedError:
+                pass
+        await self.backend.store(memory.id, memory.content, embedding, metadata)
+
+    def _scope(self, metadata: dict[str, Any]) -> dict[str, Any]:
+        return {f: metadata[f] for f in self.scope_fields if f in metadata}
+
+    def _same_scope(self, a: dict[str, Any], b: dict[str, Any]) -> bool:
+        return all(a.get(f) == b.get(f) for f in self.scope_fields)
+
+    def _log_merge(self, new_id: str, into_id: str, similarity: float) -> None:
+        self.stats["merged"] += 1
+        logger.info(
+            f"Merged near-duplicate memory {new_id} into {into_id} "
+            f"(similarity {similarity:.3f})"
+        )
+
+
+def _unit(embedding: list[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
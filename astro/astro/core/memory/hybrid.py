@@ -0,0 +1,289 @@
+"""Hybrid lexical + vector memory backend.
+
+HybridMemoryBackend wraps any MemoryBackend and keeps a local BM25Index of
+memory contents, updated on store/delete. Searches that carry the query
+text run BM25 alongside the wrapped backend's vector search and merge the
+two rankings with weighted reciprocal-rank fusion, so exact matches on
+tickers, fund names and figures surface even when their embeddings are not
+the nearest. A search with ``query_embedding=None`` is answered from the
+BM25 index alone, plus a fetch of the winning memories.
+
+The index lives in process memory and keeps only term statistics, metadata
+and store times; lexical winners are fetched from the wrapped backend, so
+results carry its current content and metadata. Filters follow
+MongoDBMemory's semantics (``timestamp`` ranges, legacy memories in the
+global namespace). ``load()`` (called by ``startup()``) fills the index
+from the wrapped backend's ``iter_memories()`` when available.
+
+The wrapped backend's optional methods (``update_metadata``,
+``migrate_embeddings`` and the vector-index maintenance calls) are passed
+through, so wrapping does not hide them.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from astro.core.memory.lexical import BM25Index
+from astro.core.memory.retrieval import reciprocal_rank_fusion
+from astro.interfaces.memory import Memory, MemoryBackend
+
+logger = logging.getLogger(__name__)
+
+# Default RRF weights for the vector and lexical rankings
+DEFAULT_VECTOR_WEIGHT = 1.0
+DEFAULT_LEXICAL_WEIGHT = 1.0
+
+
+class HybridMemoryBackend:
+    """TextSearchBackend fusing BM25 and vector search.
+
+    Example:
+        backend = HybridMemoryBackend(MongoDBMemory(...), lexical_weight=1.5)
+        await backend.startup()  # Starts the wrapped backend, loads BM25
+        await backend.search(embedding, limit=5, query_text="TSLA Q4 revenue")
+    """
+
+    # Tells retrieval to pass query text (and skip embeddings for exact terms)
+    supports_text_query = True
+
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        vector_weight: float = DEFAULT_VECTOR_WEIGHT,
+        lexical_weight: float = DEFAULT_LEXICAL_WEIGHT,
+    ):
+        """Initialize the hybrid backend.
+
+        Args:
+            backend: Wrapped backend that stores memories and runs vector search.
+            vector_weight: RRF weight of the vector ranking.
+            lexical_weight: RRF weight of the BM25 ranking.
+        """
+        self.backend = backend
+        self.vector_weight = vector_weight
+        self.lexical_weight = lexical_weight
+        self.index = BM25Index()
+
+    @property
+    def embedding_format(self) -> str:
+        """Storage format of the wrapped backend."""
+        return getattr(self.backend, "embedding_format", "float64")
+
+    async def startup(self) -> None:
+        """Start the wrapped backend and load the BM25 index."""
+        startup = getattr(self.backend, "startup", None)
+        if startup is not None:
+            await startup()
+        await self.load()
+
+    async def shutdown(self) -> None:
+        """Shut down the wrapped backend."""
+        shutdown = getattr(self.backend, "shutdown", None)
+        if shutdown is not None:
+            await shutdown()
+
+    async def load(self) -> int:
+        """Index every memory in the wrapped backend.
+
+        Returns:
+            Number of memories indexed.
+        """
+        if not callable(getattr(type(self.backend), "iter_memories", None)):
+            logger.info("Backend cannot list memories; BM25 index covers new memories only")
+            return 0
+        count = 0
+        async for memory in self.backend.iter_memories():  # type: ignore[attr-defined]
+            self.index.add(memory.id, memory.content, memory.metadata, memory.timestamp)
+            count += 1
+        logger.info(f"Loaded BM25 index with {count} memories")
+        return count
+
+    async def store(
+        self,
+        id: str,
+        content: str,
+        embedding: list[float],
+        metadata: dict[str, Any],
+    ) -> None:
+        """Store a memory and index its content."""
+        await self.backend.store(id, content, embedding, metadata)
+        self.index.add(id, content, metadata, time.time())
+
+    async def store_many(
+        self,
+        entries: list[tuple[str, str, list[float], dict[str, Any]]],
+    ) -> None:
+        """Store a batch of memories and index their contents."""
+        if callable(getattr(type(self.backend), "store_many", None)):
+            await self.backend.store_many(entries)  # type: ignore[attr-defined]
+        else:
+            await asyncio.gather(*(self.backend.store(*entry) for entry in entries))
+        now = time.time()
+        for id, content, _, metadata in entries:
+            self.index.add(id, content, metadata, now)
+
+    async def retrieve(self, id: str) -> Memory | None:
+        """Retrieve a specific memory by ID."""
+        return await self.backend.retrieve(id)
+
+    async def delete(self, id: str) -> bool:
+        """Delete a memory and drop it from the index."""
+        deleted = await self.backend.delete(id)
+        self.index.remove(id)
+        return deleted
+
+    async def update_metadata(self, id: str, metadata: dict[str, Any]) -> bool:
+        """Rewrite a memory's metadata in the wrapped backend and the index.
+
+        Raises:
+            NotImplementedError: If the wrapped backend cannot update metadata
+                in place (callers then re-store the memory).
+        """
+        if not callable(getattr(type(self.backend), "update_metadata", None)):
+            raise NotImplementedError(
+                f"{type(self.backend).__name__} does not support update_metadata"
+            )
+        updated: bool = await self.backend.update_metadata(id, metadata)  # type: ignore[attr-defined]
+        if updated:
+            # The backend refreshes the store time along with the metadata
+            self.index.update_metadata(id, metadata, time.time())
+        return updated
+
+    async def iter_memories(self, **kwargs: Any) -> AsyncIterator[Memory]:
+        """Iterate the wrapped backend's memories (same arguments)."""
+        async for memory in self.backend.iter_memories(**kwargs):  # type: ignore[attr-defined]
+            yield memory
+
+    async def archive(self, ids: list[str]) -> int:
+        """Archive memories in the wrapped backend and drop them from the index."""
+        archived: int = await self.backend.archive(ids)  # type: ignore[attr-defined]
+        for id in ids:
+            self.index.remove(id)
+        return archived
+
+    async def refresh_index(self) -> None:
+        """Bring the wrapped backend's vector index up to date."""
+        await self.backend.refresh_index()  # type: ignore[attr-defined]
+
+    async def rebuild_index(self, dim: int | None = None) -> None:
+        """Reload the wrapped backend's vector index (see MongoDBMemory)."""
+        await self.backend.rebuild_index(dim=dim)  # type: ignore[attr-defined]
+
+    async def count_stale_embeddings(self, model: str | None = None) -> int:
+        """Count memories embedded by another model in the wrapped backend."""
+        count: int = await self.backend.count_stale_embeddings(model)  # type: ignore[attr-defined]
+        return count
+
+    async def migrate_embeddings(self, **kwargs: Any) -> dict[str, int]:
+        """Rewrite the wrapped backend's embeddings to another format (same arguments)."""
+        stats: dict[str, int] = await self.backend.migrate_embeddings(**kwargs)  # type: ignore[attr-defined]
+        return stats
+
+    async def search(
+        self,
+        query_embedding: list[float] | None,
+        limit: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        query_text: str | None = None,
+    ) -> list[Memory]:
+        """Search by vector, by text, or both (fused).
+
+        Args:
+            query_embedding: Vector to search for (None = lexical only).
+            limit: Maximum number of results.
+            filter_metadata: Optional metadata filters.
+            query_text: Query text for BM25 (None = vector only).
+
+        Returns:
+            Memories sorted by fused relevance.
+        """
+        vector: list[Memory] = []
+        if query_embedding is not None:
+            vector = await self.backend.search(query_embedding, limit, filter_metadata)
+        return await self._fuse(vector, query_text, limit, filter_metadata)
+
+    async def search_many(
+        self,
+        query_embeddings: list[list[float] | None],
+        limit: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        query_texts: list[str] | None = None,
+    ) -> list[list[Memory]]:
+        """Search for several queries, batching the vector searches.
+
+        Args:
+            query_embeddings: Vectors per query (None = lexical only).
+            limit: Maximum number of results per query.
+            filter_metadata: Optional metadata filters.
+            query_texts: Query texts for BM25, aligned with query_embeddings.
+
+        Returns:
+            Memories sorted by fused relevance, per query.
+        """
+        embedded = [e for e in query_embeddings if e is not None]
+        vector_results: list[list[Memory]] = []
+        if embedded:
+            if callable(getattr(type(self.backend), "search_many", None)):
+                vector_results = await self.backend.search_many(  # type: ignore[attr-defined]
+                    embedded, limit, filter_metadata
+                )
+            else:
+                vector_results = list(
+                    await asyncio.gather(
+                        *(self.backend.search(e, limit, filter_metadata) for e in embedded)
+                    )
+                )
+
+        texts: list[str | None] = (
+            list(query_texts) if query_texts else [None] * len(query_embeddings)
+        )
+        vector_iter = iter(vector_results)
+        return list(
+            await asyncio.gather(
+                *(
+                    self._fuse(
+                        next(vector_iter) if embedding is not None else [],
+                        text,
+                        limit,
+                        filter_metadata,
+                    )
+                    for embedding, text in zip(query_embeddings, texts, strict=True)
+                )
+            )
+        )
+
+    async def _fuse(
+        self,
+        vector: list[Memory],
+        query_text: str | None,
+        limit: int,
+        filter_metadata: dict[str, Any] | None,
+    ) -> list[Memory]:
+        """Merge vector results with BM25 hits for the query text."""
+        if not query_text:
+            return vector
+        ids = [id for id, _ in self.index.search(query_text, limit, filter_metadata)]
+        lexical = await self._fetch(ids, {m.id: m for m in vector})
+        if not vector:
+            return lexical
+        return reciprocal_rank_fusion(
+            [vector, lexical],
+            limit,
+            weights=[self.vector_weight, self.lexical_weight],
+        )
+
+    async def _fetch(self, ids: list[str], known: dict[str, Memory]) -> list[Memory]:
+        """Memories for BM25 winners, in order, reusing vector results."""
+        missing = [id for id in ids if id not in known]
+        fetched = await asyncio.gather(*(self.backend.retrieve(id) for id in missing))
+        found = dict(known)
+        for id, memory in zip(missing, fetched, strict=True):
+            if memory is None:
+                # Deleted behind the index's back (e.g. by another process)
+                self.index.remove(id)
+            else:
+                found[id] = memory
+        return [found[id] for id in ids if id in found]
@@ -0,0 +1,246 @@
+"""Write-behind ingestion for long-term memory.
+
+Storing a memory inline means optional LLM compression, one embedding call
+and one backend write before the response is returned. IngestionQueue takes
+that off the request path: ``put`` returns immediately, and a background
+worker flushes accumulated memories when ``max_batch`` are pending or
+``flush_interval_s`` has passed since the first one arrived, whichever
+comes first. Each flush:
+
+- Compresses the batch concurrently (if a compression strategy is set).
+- Embeds the whole batch with one ``embed_batch`` call.
+- Merges near-duplicates into stored memories (if a Deduplicator is set).
+- Writes it with one ``store_many`` call when the backend provides it
+  (MongoDBMemory does, via ``bulk_write``), else concurrent ``store`` calls.
+
+Failed batches are retried on the next flush, up to ``MAX_ATTEMPTS`` times.
+``shutdown`` drains everything still pending. Memories are not searchable
+until their batch is flushed.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from astro.core.memory.compression import CompressionStrategy
+from astro.core.memory.dedup import Deduplicator
+from astro.interfaces.llm import EmbeddingProvider
+from astro.interfaces.memory import MemoryBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_FLUSH_INTERVAL_S = 1.0
+
+# Pending memories beyond which put() waits for a flush (backpressure)
+DEFAULT_MAX_PENDING = 10_000
+
+# Flush attempts per memory before it is dropped
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class PendingMemory:
+    """A memory waiting to be embedded and written."""
+
+    id: str
+    content: str
+    metadata: dict[str, Any]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class IngestionQueue:
+    """Accumulates memories and writes them to the backend in batches.
+
+    Example:
+        queue = IngestionQueue(backend, embedding_provider)
+        await queue.put("mem_1", "Tesla Q4 revenue: $25.2B", {"type": "fact"})
+        ...
+        await queue.shutdown()  # Drains pending memories
+    """
+
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        embedding_provider: EmbeddingProvider,
+        compression: CompressionStrategy | None = None,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        dedup: Deduplicator | None = None,
+    ):
+        """Initialize the queue.
+
+        Args:
+            backend: Storage backend for memories.
+            embedding_provider: Provider for generating embeddings.
+            compression: Optional strategy for compressing before storage.
+            max_batch: Memories per flush (flush as soon as this many wait).
+            flush_interval_s: Max seconds a memory waits before a flush.
+            max_pending: Pending memories at which put() waits for a flush.
+            dedup: Optional near-duplicate suppression applied per batch.
+        """
+        self.backend = backend
+        self.embedding_provider = embedding_provider
+        self.compression = compression
+        self.max_batch = max_batch
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.dedup = dedup
+        self.stats: Counter[str] = Counter()
+
+        self._pending: list[PendingMemory] = []
+        self._oldest: float | None = None
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._worker: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Memories waiting to be written."""
+        return len(self._pending)
+
+    async def put(self, id: str, content: str, metadata: dict[str, Any]) -> None:
+        """Queue a memory for write-behind storage.
+
+        Args:
+            id: Memory ID.
+            content: Text content (compressed at flush time, if configured).
+            metadata: Metadata to attach.
+
+        Raises:
+            RuntimeError: If the queue has been shut down.
+        """
+        if self._closed:
+            raise RuntimeError("Ingestion queue is shut down")
+        if len(self._pending) >= self.max_pending:
+            self.stats["backpressure"] += 1
+            await self.flush()
+
+        self._pending.append(PendingMemory(id, content, metadata))
+        self._oldest = self._oldest or time.monotonic()
+        self.stats["enqueued"] += 1
+        self._ensure_worker()
+        if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+            # New flush deadline, or batch full
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write everything pending now.
+
+        Returns:
+            Number of memories written.
+        """
+        written = 0
+        while self._pending:
+            batch_written = await self._flush_batch()
+            if batch_written == 0 and self._pending:
+                # Whole batch failed and was re-queued; retry on a later flush
+                break
+            written += batch_written
+        return written
+
+    async def shutdown(self) -> None:
+        """Stop the worker after draining pending memories."""
+        self._closed = True
+        if self._worker is not None:
+            # Cancel only between batches, so no in-flight batch is lost
+            async with self._flush_lock:
+                self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for _ in range(MAX_ATTEMPTS):
+            await self.flush()
+            if not self._pending:
+                break
+        if self._pending:
+            self.stats["dropped"] += len(self._pending)
+            logger.error(f"Dropped {len(self._pending)} memories that failed to persist")
+            self._pending.clear()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Flush on size or interval until shut down."""
+        while True:
+            timeout = None
+            if self._oldest is not None:
+                timeout = max(self._oldest + self.flush_interval_s - time.monotonic(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            due = (
+                self._oldest is not None
+                and time.monotonic() >= self._oldest + self.flush_interval_s
+            )
+            try:
+                if due:
+                    await self.flush()
+                else:
+                    # Full batches only; a partial batch waits for its interval
+                    while len(self._pending) >= self.max_batch:
+                        if not await self._flush_batch():
+                            break
+            except Exception as e:  # Worker must survive backend outages
+                logger.error(f"Memory ingestion flush failed: {e}")
+
+    async def _flush_batch(self) -> int:
+        """Embed and write up to ``max_batch`` pending memories."""
+        async with self._flush_lock:
+            batch = self._pending[: self.max_batch]
+            del self._pending[: len(batch)]
+            self._oldest = self._pending[0].enqueued_at if self._pending else None
+            if not batch:
+                return 0
+
+            try:
+                contents = [m.content for m in batch]
+                if self.compression:
+                    contents = list(
+                        await asyncio.gather(*(self.compression.compress(c) for c in contents))
+                    )
+                embeddings = await self.embedding_provider.embed_batch(contents)
+                self.stats["embed_calls"] += 1
+
+                entries = [
+                    (m.id, content, embedding, m.metadata)
+                    for m, content, embedding in zip(batch, contents, embeddings, strict=True)
+                ]
+                if self.dedup is not None:
+                    entries, _ = await self.dedup.dedupe(entries)
+                # Looked up on the type so mocks and partial backends use store()
+                if callable(getattr(type(self.backend), "store_many", None)):
+                    await self.backend.store_many(entries)  # type: ignore[attr-defined]
+                else:
+                    await asyncio.gather(*(self.backend.store(*entry) for entry in entries))
+            except Exception as e:
+                self.stats["failed_batches"] += 1
+                retry = [m for m in batch if m.attempts + 1 < MAX_ATTEMPTS]
+                for m in retry:
+                    m.attempts += 1
+                self.stats["dropped"] += len(batch) - len(retry)
+                self._pending[:0] = retry
+                # Retry after another interval rather than immediately
+                self._oldest = time.monotonic() if self._pending else None
+                logger.warning(
+                    f"Failed to persist {len(batch)} memories "
+                    f"({len(retry)} will be retried): {e}"
+                )
+                return 0
+
+            self.stats["batches"] += 1
+            self.stats["written"] += len(batch)
+            logger.debug(f"Persisted {len(batch)} memories in one batch")
+            return len(batch)
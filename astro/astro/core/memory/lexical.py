@@ -0,0 +1,286 @@
+"""Local BM25 index over memory contents.
+
+Vector search is weak on exact identifiers (tickers, fund names, figures
+such as "$25.2B" or "Q4 2024"), which users query constantly. BM25Index is
+an in-process inverted index, updated incrementally on add/remove, that
+scores those exact-term matches. HybridMemoryBackend fuses it with vector
+search.
+
+The tokenizer keeps identifier-shaped tokens whole ("brk.b", "$25.2b",
+"10-k") and also indexes their parts, so "BRK" still matches "BRK.B".
+"""
+
+import heapq
+import math
+import operator
+import re
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+from astro.core.memory.namespaces import GLOBAL_NAMESPACE, NAMESPACE_KEY
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Word-ish tokens, keeping ".", "-" and "/" joins inside identifiers
+_TOKEN_RE = re.compile(r"[\w$%]+(?:[.\-/][\w%]+)*")
+_PART_RE = re.compile(r"[.\-/$%]")
+_TICKER_RE = re.compile(r"\b[A-Z]{2,5}(?:\.[A-Z])?\b")
+
+# Range operators accepted on "timestamp" filters (matched against store time)
+_RANGE_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+
+# Queries this short that name an identifier are answered lexically
+EXACT_QUERY_MAX_TERMS = 4
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or "
+    "that the this to was were what when where which who why will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase index terms, dropping stopwords.
+
+    Args:
+        text: Text to tokenize.
+
+    Returns:
+        Terms, with compound identifiers followed by their parts.
+    """
+    terms: list[str] = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        terms.append(token)
+        parts = [p for p in _PART_RE.split(token) if p]
+        if len(parts) > 1 or (parts and parts[0] != token):
+            terms.extend(p for p in parts if p not in STOPWORDS)
+    return terms
+
+
+def is_exact_term_query(query: str) -> bool:
+    """Whether a query is a short lookup of an identifier.
+
+    Such queries ("TSLA", "Fund IV 2023 IRR", '"Project Atlas"') are served
+    well by BM25 alone, so the embedding round-trip can be skipped.
+
+    Args:
+        query: Search query.
+
+    Returns:
+        True for short queries containing a ticker, a number or a quoted
+        phrase.
+    """
+    terms = [t for t in _TOKEN_RE.findall(query.lower()) if t not in STOPWORDS]
+    if not terms or len(terms) > EXACT_QUERY_MAX_TERMS:
+        return False
+    return (
+        '"' in query
+        or any(ch.isdigit() for ch in query)
+        or _TICKER_RE.search(query) is not None
+    )
+
+
+def matches_metadata(metadata: dict[str, Any], filter_metadata: dict[str, Any]) -> bool:
+    """Whether metadata satisfies an equality filter.
+
+    Mirrors MongoDB equality semantics: a list field matches if it contains
+    the filter value.
+
+    Args:
+        metadata: Memory metadata.
+        filter_metadata: Required key/value pairs.
+
+    Returns:
+        True if every filter key matches.
+    """
+    for key, value in filter_metadata.items():
+        actual = metadata.get(key)
+        if actual != value and not (isinstance(actual, list) and value in actual):
+            return False
+    return True
+
+
+def matches_filter(
+    metadata: dict[str, Any], timestamp: float | None, filter_metadata: dict[str, Any]
+) -> bool:
+    """Whether a memory satisfies filter_metadata as MongoDBMemory applies it.
+
+    Range conditions on "timestamp" (``$gt``, ``$gte``, ``$lt``, ``$lte``)
+    compare the store time. Memories without a namespace belong to the
+    global one. Everything else is an equality filter (see matches_metadata).
+
+    Args:
+        metadata: Memory metadata.
+        timestamp: Memory store time, if known.
+        filter_metadata: Filter conditions.
+
+    Returns:
+        True if every condition matches.
+    """
+    for key, value in filter_metadata.items():
+        if key == "timestamp" and isinstance(value, dict) and set(value) <= set(_RANGE_OPERATORS):
+            if timestamp is None or not all(
+                _RANGE_OPERATORS[op](timestamp, bound) for op, bound in value.items()
+            ):
+                return False
+        elif key == NAMESPACE_KEY and value == GLOBAL_NAMESPACE:
+            if metadata.get(key) not in (GLOBAL_NAMESPACE, None):
+                return False
+        elif not matches_metadata(metadata, {key: value}):
+            return False
+    return True
+
+
+class BM25Index:
+    """Incremental inverted index with Okapi BM25 scoring.
+
+    Example:
+        index = BM25Index()
+        index.add("mem1", "Tesla (TSLA) Q4 revenue: $25.2B", {"type": "fact"})
+        index.search("TSLA revenue", k=5)  # [("mem1", 1.2...)]
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term-frequency saturation.
+            b: Document length normalization (0 = none, 1 = full).
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._terms: dict[str, Counter[str]] = {}
+        self._lengths: dict[str, int] = {}
+        self._metadata: dict[str, dict[str, Any]] = {}
+        self._timestamps: dict[str, float | None] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._lengths
+
+    def add(
+        self,
+        id: str,
+        content: str,
+        metadata: dict[str, Any] | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Index a document, replacing any previous version.
+
+        Args:
+            id: Memory ID.
+            content: Memory content.
+            metadata: Metadata used for filtered searches.
+            timestamp: Store time, used by "timestamp" range filters.
+        """
+        if id in self._lengths:
+            self.remove(id)
+        terms = Counter(tokenize(content))
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[id] = count
+        self._terms[id] = terms
+        length = sum(terms.values())
+        self._lengths[id] = length
+        self._metadata[id] = metadata or {}
+        self._timestamps[id] = timestamp
+        self._total_length += length
+
+    def update_metadata(
+        self, id: str, metadata: dict[str, Any], timestamp: float | None = None
+    ) -> bool:
+        """Replace a document's metadata (and store time) without re-indexing it.
+
+        Args:
+            id: Memory ID.
+            metadata: New metadata.
+            timestamp: New store time (None = unchanged).
+
+        Returns:
+            True if the document was indexed.
+        """
+        if id not in self._lengths:
+            return False
+        self._metadata[id] = metadata
+        if timestamp is not None:
+            self._timestamps[id] = timestamp
+        return True
+
+    def remove(self, id: str) -> bool:
+        """Remove a document.
+
+        Args:
+            id: Memory ID.
+
+        Returns:
+            True if the document was indexed.
+        """
+        terms = self._terms.pop(id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings[term]
+            del postings[id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(id)
+        del self._metadata[id]
+        del self._timestamps[id]
+        return True
+
+    def metadata(self, id: str) -> dict[str, Any] | None:
+        """Indexed metadata for a document, if indexed."""
+        return self._metadata.get(id)
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Score documents against a query.
+
+        Args:
+            query: Search query.
+            k: Number of results.
+            filter_metadata: Only documents matching this filter (see
+                matches_filter).
+
+        Returns:
+            (id, BM25 score) pairs, best first. Documents sharing no term
+            with the query are not returned.
+        """
+        if not self._lengths or k <= 0:
+            return []
+        n = len(self._lengths)
+        avg_length = self._total_length / n or 1.0
+
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[id] / avg_length)
+                scores[id] = scores.get(id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        if filter_metadata:
+            scores = {
+                id: score
+                for id, score in scores.items()
+                if matches_filter(self._metadata[id], self._timestamps[id], filter_metadata)
+            }
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
@@ -6,11 +6,15 @@ semantic search for relevant historical context.
 """
 
 import uuid
-from typing import Any
+from typing import Any, cast
 
 from astro.core.memory.compression import CompressionStrategy
+from astro.core.memory.dedup import Deduplicator
+from astro.core.memory.ingestion import IngestionQueue
+from astro.core.memory.lexical import is_exact_term_query
+from astro.core.memory.retrieval import retrieval_timeout, search_queries
 from astro.interfaces.llm import EmbeddingProvider, LLMProvider
-from astro.interfaces.memory import Memory, MemoryBackend
+from astro.interfaces.memory import Memory, MemoryBackend, TextSearchBackend
 
 
 class LongTermMemory:
@@ -56,6 +60,8 @@ class LongTermMemory:
         embedding_provider: EmbeddingProvider,
         compression_strategy: CompressionStrategy | None = None,
         llm_provider: LLMProvider | None = None,
+        write_behind: bool = False,
+        dedup_threshold: float | None = None,
     ):
         """Initialize long-term memory.
 
@@ -64,11 +70,29 @@ class LongTermMemory:
             embedding_provider: Provider for generating embeddings
             compression_strategy: Optional strategy for compressing before storage
             llm_provider: Optional LLM provider (only needed if compression uses LLM)
+            write_behind: Queue stores and write them in background batches
+                (see IngestionQueue) instead of inline. Call shutdown() to
+                drain the queue.
+            dedup_threshold: Merge new memories into stored ones at least
+                this similar instead of inserting them (see Deduplicator).
+                None disables duplicate checks.
         """
         self.backend = backend
         self.embedding_provider = embedding_provider
         self.llm_provider = llm_provider
         self.compression = compression_strategy
+        self.dedup = (
+            Deduplicator(backend, threshold=dedup_threshold)
+            if dedup_threshold
+            else None
+        )
+        self.ingestion = (
+            IngestionQueue(
+                backend, embedding_provider, compression_strategy, dedup=self.dedup
+            )
+            if write_behind
+            else None
+        )
 
     async def store(
         self,
@@ -79,13 +103,18 @@ class LongTermMemory:
 
         The content is optionally compressed, then embedded, and finally
         stored in the backend with its embedding for future vector search.
+        With write_behind, the memory is queued and this returns at once;
+        it becomes searchable when its batch is flushed. With
+        dedup_threshold, a near-duplicate of a stored memory is merged into
+        it instead of being inserted.
 
         Args:
             content: Text content to store
             metadata: Metadata to attach (e.g., query, directives, timestamp)
 
         Returns:
-            Memory ID for the stored memory
+            Memory ID for the stored memory (the existing memory's ID if
+            merged inline)
 
         Example:
             memory_id = await memory.store(
@@ -97,6 +126,11 @@ class LongTermMemory:
                 }
             )
         """
+        memory_id = self._generate_id()
+        if self.ingestion is not None:
+            await self.ingestion.put(memory_id, content, metadata)
+            return memory_id
+
         # Optionally compress (uses llm_provider if compression needs LLM)
         stored_content = content
         if self.compression:
@@ -105,8 +139,14 @@ class LongTermMemory:
         # Generate embedding (uses embedding_provider)
         embedding = await self.embedding_provider.embed(stored_content)
 
+        if self.dedup is not None:
+            kept, merged_into = await self.dedup.dedupe(
+                [(memory_id, stored_content, embedding, metadata)]
+            )
+            if not kept:
+                return merged_into[memory_id]
+
         # Store via backend
-        memory_id = self._generate_id()
         await self.backend.store(memory_id, stored_content, embedding, metadata)
 
         return memory_id
@@ -116,6 +156,7 @@ class LongTermMemory:
         query: str,
         limit: int = 5,
         filter_metadata: dict[str, Any] | None = None,
+        namespaces: list[str] | None = None,
     ) -> list[Memory]:
         """Retrieve relevant memories via vector search.
 
@@ -127,6 +168,8 @@ class LongTermMemory:
             query: Search query (will be embedded)
             limit: Maximum number of memories to return
             filter_metadata: Optional metadata filters to narrow search
+            namespaces: Only search these namespaces (None = all memories;
+                see astro.core.memory.namespaces)
 
         Returns:
             List of relevant memories, sorted by similarity (most relevant first)
@@ -142,6 +185,28 @@ class LongTermMemory:
             for mem in memories:
                 print(f"[{mem.timestamp}] {mem.content}")
         """
+        if namespaces is not None:
+            rankings = await self.retrieve_many(
+                [query], limit, filter_metadata, namespaces=namespaces
+            )
+            return rankings[0]
+
+        if getattr(type(self.backend), "supports_text_query", False):
+            text_backend = cast(TextSearchBackend, self.backend)
+            # Hybrid backends answer exact-term lookups without an embedding
+            if is_exact_term_query(query):
+                memories = await text_backend.search(
+                    None, limit, filter_metadata, query_text=query
+                )
+                if memories:
+                    return memories
+            return await text_backend.search(
+                await self.embedding_provider.embed(query),
+                limit,
+                filter_metadata,
+                query_text=query,
+            )
+
         # Use embedding_provider for query embedding
         query_embedding = await self.embedding_provider.embed(query)
 
@@ -152,6 +217,42 @@ class LongTermMemory:
             filter_metadata,
         )
 
+    async def retrieve_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        timeout_s: float | None = None,
+        namespaces: list[str] | None = None,
+    ) -> list[list[Memory]]:
+        """Retrieve relevant memories for several queries at once.
+
+        Embeds all queries in one batch and runs the searches concurrently
+        under a deadline (see ``astro.core.memory.retrieval``).
+
+        Args:
+            queries: Search queries (will be embedded)
+            limit: Maximum number of memories per query
+            filter_metadata: Optional metadata filters to narrow search
+            timeout_s: Retrieval deadline in seconds (default:
+                MEMORY_RETRIEVAL_TIMEOUT)
+            namespaces: Only search these namespaces, concurrently (None =
+                all memories)
+
+        Returns:
+            Ranked memories per query, in query order. Queries that failed
+            or missed the deadline get an empty list.
+        """
+        return await search_queries(
+            self.backend,
+            self.embedding_provider,
+            queries,
+            limit,
+            filter_metadata,
+            timeout_s=timeout_s if timeout_s is not None else retrieval_timeout(),
+            namespaces=namespaces,
+        )
+
     async def retrieve_by_id(self, memory_id: str) -> Memory | None:
         """Retrieve a specific memory by ID.
 
@@ -174,6 +275,16 @@ class LongTermMemory:
         """
         return await self.backend.delete(memory_id)
 
+    async def flush(self) -> None:
+        """Write any queued memories now (no-op without write_behind)."""
+        if self.ingestion is not None:
+            await self.ingestion.flush()
+
+    async def shutdown(self) -> None:
+        """Drain queued memories and stop the ingestion worker."""
+        if self.ingestion is not None:
+            await self.ingestion.shutdown()
+
     def _generate_id(self) -> str:
         """Generate unique memory ID.
 
@@ -0,0 +1,75 @@
+"""Memory namespaces: per-user, per-workspace and global partitions.
+
+Every long-term memory belongs to one namespace, recorded as
+``metadata["namespace"]``:
+
+- ``user:<user_id>``: one user's history (the default when a user is known).
+- ``workspace:<workspace_id>``: memories shared within a workspace (the
+  default when only a workspace is known).
+- ``global``: memories visible to everyone (the default otherwise).
+
+A caller reads the namespaces it can see (its user, its workspace and the
+global tier). Retrieval searches each namespace separately and concurrently,
+then merges the rankings (see ``search_queries``), so a search costs the size
+of the partitions involved rather than the whole collection. Backends that
+partition by namespace (MongoDBMemory with ``namespace_partitions=True``)
+serve each one from its own resident index; others just filter on the key.
+"""
+
+from typing import Any
+
+# Metadata key holding a memory's namespace
+NAMESPACE_KEY = "namespace"
+
+# Namespace shared by all users
+GLOBAL_NAMESPACE = "global"
+
+
+def user_namespace(user_id: str) -> str:
+    """Namespace of one user's memories."""
+    return f"user:{user_id}"
+
+
+def workspace_namespace(workspace_id: str) -> str:
+    """Namespace of memories shared within a workspace."""
+    return f"workspace:{workspace_id}"
+
+
+def namespace_for(metadata: dict[str, Any]) -> str:
+    """Namespace a new memory is written to.
+
+    Args:
+        metadata: Memory metadata.
+
+    Returns:
+        An explicit ``namespace`` entry, else the user's namespace (from
+        ``user_id``), else the workspace's (``workspace_id``), else global.
+    """
+    if metadata.get(NAMESPACE_KEY):
+        return str(metadata[NAMESPACE_KEY])
+    if metadata.get("user_id"):
+        return user_namespace(str(metadata["user_id"]))
+    if metadata.get("workspace_id"):
+        return workspace_namespace(str(metadata["workspace_id"]))
+    return GLOBAL_NAMESPACE
+
+
+def visible_namespaces(
+    user_id: str | None = None, workspace_id: str | None = None
+) -> list[str]:
+    """Namespaces a caller reads, most specific first.
+
+    Args:
+        user_id: Caller's user ID, if known.
+        workspace_id: Caller's workspace ID, if known.
+
+    Returns:
+        The user and workspace namespaces (when known) and the global one.
+    """
+    namespaces = []
+    if user_id:
+        namespaces.append(user_namespace(user_id))
+    if workspace_id:
+        namespaces.append(workspace_namespace(workspace_id))
+    namespaces.append(GLOBAL_NAMESPACE)
+    return namespaces
@@ -2,23 +2,448 @@
 
 Wraps the MemoryBackend and EmbeddingProvider to provide a high-level
 retrieval interface with configurable top_k and similarity threshold.
+
+Multi-query retrieval makes one round-trip per stage instead of one per
+query: all queries are embedded with a single ``embed_batch`` call, the
+backend searches run concurrently (or as one ``search_many`` call when the
+backend provides it), and the per-query rankings are merged with
+reciprocal-rank fusion. The whole retrieval runs under a deadline so a slow
+backend degrades to partial results instead of stalling the pipeline.
+
+Backends that set ``supports_text_query`` (HybridMemoryBackend) also get
+the query text for lexical matching, and short exact-term queries (tickers,
+figures, quoted names) are sent to them without an embedding at all.
+
+Searches limited to several namespaces (see ``namespaces``) fan out: each
+namespace is searched on its own, concurrently, and the rankings merged by
+similarity.
+
+Environment:
+    MEMORY_RETRIEVAL_TIMEOUT: Retrieval deadline in seconds; 0 disables it
+        (default 5).
 """
 
+import asyncio
 import logging
-from typing import Any
+import os
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, cast
+
+import numpy as np
 
+from astro.core.memory.lexical import is_exact_term_query
+from astro.core.memory.namespaces import NAMESPACE_KEY
 from astro.interfaces.llm import EmbeddingProvider
-from astro.interfaces.memory import Memory, MemoryBackend
+from astro.interfaces.memory import Memory, MemoryBackend, TextSearchBackend
 
 logger = logging.getLogger(__name__)
 
+# Deadline for one multi-query retrieval (embedding + searches)
+DEFAULT_RETRIEVAL_TIMEOUT_S = 5.0
+
+# Reciprocal-rank fusion constant (Cormack et al.); dampens top-rank dominance
+RRF_K = 60
+
+# MMR relevance weight; the rest penalizes similarity to already-picked memories
+DEFAULT_MMR_LAMBDA = 0.7
+
+# Cosine similarity above which a candidate repeats a selected memory
+DUPLICATE_SIMILARITY = 0.95
+
+
+def retrieval_timeout() -> float | None:
+    """Retrieval deadline from MEMORY_RETRIEVAL_TIMEOUT (None = no deadline)."""
+    timeout = float(
+        os.getenv("MEMORY_RETRIEVAL_TIMEOUT", str(DEFAULT_RETRIEVAL_TIMEOUT_S))
+    )
+    return timeout if timeout > 0 else None
+
+
+async def embed_queries(
+    embedding_provider: EmbeddingProvider, queries: list[str]
+) -> list[list[float]]:
+    """Embed queries in one provider call.
+
+    Falls back to concurrent ``embed`` calls if the provider's batch result
+    does not line up with the queries.
+
+    Args:
+        embedding_provider: Provider for generating query embeddings.
+        queries: Queries to embed.
+
+    Returns:
+        One embedding per query, in order.
+    """
+    if len(queries) == 1:
+        return [await embedding_provider.embed(queries[0])]
+
+    vectors = await embedding_provider.embed_batch(queries)
+    try:
+        if len(vectors) == len(queries):
+            return list(vectors)
+    except TypeError:
+        pass
+    logger.warning(
+        f"embed_batch did not return {len(queries)} vectors; embedding queries individually"
+    )
+    return list(
+        await asyncio.gather(*(embedding_provider.embed(q) for q in queries))
+    )
+
+
+async def search_queries(
+    backend: MemoryBackend,
+    embedding_provider: EmbeddingProvider,
+    queries: list[str],
+    limit: int,
+    filter_metadata: dict[str, Any] | None = None,
+    timeout_s: float | None = None,
+    namespaces: list[str] | None = None,
+) -> list[list[Memory]]:
+    """Search the backend for several queries at once.
+
+    Args:
+        backend: Storage backend for vector search.
+        embedding_provider: Provider for generating query embeddings.
+        queries: Search queries.
+        limit: Results per query.
+        filter_metadata: Optional metadata filters passed to backend.
+        timeout_s: Deadline for the whole retrieval (None = no deadline).
+        namespaces: Only search these namespaces, concurrently (None = all
+            memories).
+
+    Returns:
+        Ranked results per query, in query order. Queries whose search
+        failed or missed the deadline get an empty list.
+    """
+    if not queries:
+        return []
+    started = time.monotonic()
+
+    def remaining() -> float | None:
+        if timeout_s is None:
+            return None
+        return max(timeout_s - (time.monotonic() - started), 0.0)
+
+    # Looked up on the type so mocks and plain backends get the original calls
+    text_search = bool(getattr(type(backend), "supports_text_query", False))
+    to_embed = [q for q in queries if not (text_search and is_exact_term_query(q))]
+
+    vectors: list[list[float]] = []
+    if to_embed:
+        try:
+            vectors = await asyncio.wait_for(
+                embed_queries(embedding_provider, to_embed), remaining()
+            )
+        except TimeoutError:
+            logger.warning(f"Query embedding missed the {timeout_s}s retrieval deadline")
+            return [[] for _ in queries]
+    # Exact-term queries get no embedding; the backend answers them lexically
+    by_query = dict(zip(to_embed, vectors, strict=True))
+    embeddings = [by_query.get(q) for q in queries]
+
+    results = await _search_namespaces(
+        backend, queries, embeddings, limit, filter_metadata, namespaces, text_search, remaining
+    )
+
+    # Lexical-only lookups that found nothing fall back to vector search
+    missed = [i for i, e in enumerate(embeddings) if e is None and not results[i]]
+    if missed:
+        retry = [queries[i] for i in missed]
+        try:
+            retry_vectors = await asyncio.wait_for(
+                embed_queries(embedding_provider, retry), remaining()
+            )
+        except TimeoutError:
+            return results
+        retried = await _search_namespaces(
+            backend,
+            retry,
+            retry_vectors,
+            limit,
+            filter_metadata,
+            namespaces,
+            text_search,
+            remaining,
+        )
+        for i, result in zip(missed, retried, strict=True):
+            results[i] = result
+    return results
+
+
+async def _search_namespaces(
+    backend: MemoryBackend,
+    queries: list[str],
+    embeddings: Sequence[list[float] | None],
+    limit: int,
+    filter_metadata: dict[str, Any] | None,
+    namespaces: list[str] | None,
+    text_search: bool,
+    remaining: Callable[[], float | None],
+) -> list[list[Memory]]:
+    """Run the searches once per namespace, concurrently, and merge them."""
+    if namespaces is None:
+        return await _search_embedded(
+            backend, queries, embeddings, limit, filter_metadata, text_search, remaining
+        )
+    per_namespace = await asyncio.gather(
+        *(
+            _search_embedded(
+                backend,
+                queries,
+                embeddings,
+                limit,
+                {**(filter_metadata or {}), NAMESPACE_KEY: namespace},
+                text_search,
+                remaining,
+            )
+            for namespace in dict.fromkeys(namespaces)
+        )
+    )
+    return [
+        merge_rankings([rankings[i] for rankings in per_namespace], limit)
+        for i in range(len(queries))
+    ]
+
+
+async def _search_embedded(
+    backend: MemoryBackend,
+    queries: list[str],
+    embeddings: Sequence[list[float] | None],
+    limit: int,
+    filter_metadata: dict[str, Any] | None,
+    text_search: bool,
+    remaining: Callable[[], float | None],
+) -> list[list[Memory]]:
+    """Run the backend searches for already-embedded queries."""
+    timeout_s = remaining()
+    if callable(getattr(type(backend), "search_many", None)):
+        text_kwargs = {"query_texts": queries} if text_search else {}
+        try:
+            return await asyncio.wait_for(
+                backend.search_many(  # type: ignore[attr-defined]
+                    query_embeddings=embeddings,
+                    limit=limit,
+                    filter_metadata=filter_metadata,
+                    **text_kwargs,
+                ),
+                timeout_s,
+            )
+        except TimeoutError:
+            logger.warning("Memory search missed the retrieval deadline")
+            return [[] for _ in queries]
+
+    tasks = [
+        asyncio.ensure_future(
+            cast(TextSearchBackend, backend).search(
+                query_embedding=embedding,
+                limit=limit,
+                filter_metadata=filter_metadata,
+                query_text=query,
+            )
+            if text_search
+            else backend.search(
+                query_embedding=cast(list[float], embedding),
+                limit=limit,
+                filter_metadata=filter_metadata,
+            )
+        )
+        for query, embedding in zip(queries, embeddings, strict=True)
+    ]
+    _, pending = await asyncio.wait(tasks, timeout=timeout_s)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(
+            f"{len(pending)} of {len(tasks)} memory searches missed the "
+            f"retrieval deadline"
+        )
+
+    results: list[list[Memory]] = []
+    for query, task in zip(queries, tasks, strict=True):
+        if task in pending:
+            results.append([])
+        elif task.exception() is not None:
+            logger.warning(f"Retrieval failed for query '{query[:50]}...': {task.exception()}")
+            results.append([])
+        else:
+            results.append(task.result())
+    return results
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[Memory]],
+    limit: int | None = None,
+    weights: list[float] | None = None,
+) -> list[Memory]:
+    """Merge rankings, deduplicating by memory ID.
+
+    Each memory scores ``sum(weight / (RRF_K + rank))`` over the rankings it
+    appears in, so memories found by several queries (or by both lexical
+    and vector search) rise to the top. Ties keep first-seen order.
+
+    Args:
+        rankings: Ranked results, e.g. one list per query.
+        limit: Max results to return (None = all).
+        weights: Weight per ranking (default 1.0 each).
+
+    Returns:
+        Fused ranking.
+    """
+    return [memory for memory, _ in _fuse_scored(rankings, weights)[:limit]]
+
+
+def merge_rankings(rankings: list[list[Memory]], limit: int | None = None) -> list[Memory]:
+    """Merge rankings of disjoint partitions into one.
+
+    Cosine scores are comparable across partitions, so scored results are
+    merged by score. Results without scores (e.g. lexical-only hits) fall
+    back to reciprocal-rank fusion.
+
+    Args:
+        rankings: Ranked results, e.g. one list per namespace.
+        limit: Max results to return (None = all).
+
+    Returns:
+        Merged ranking, deduplicated by memory ID.
+    """
+    memories = [memory for ranking in rankings for memory in ranking]
+    if any(memory.score is None for memory in memories):
+        return reciprocal_rank_fusion(rankings, limit)
+    unique: dict[str, Memory] = {}
+    for memory in memories:
+        unique.setdefault(memory.id, memory)
+    return sorted(unique.values(), key=lambda m: m.score or 0.0, reverse=True)[:limit]
+
+
+def _fuse_scored(
+    rankings: list[list[Memory]], weights: list[float] | None = None
+) -> list[tuple[Memory, float]]:
+    """RRF-ordered (memory, fused score) pairs."""
+    scores: dict[str, float] = {}
+    memories: dict[str, Memory] = {}
+    for i, ranking in enumerate(rankings):
+        weight = weights[i] if weights is not None else 1.0
+        for rank, memory in enumerate(ranking, start=1):
+            memories.setdefault(memory.id, memory)
+            scores[memory.id] = scores.get(memory.id, 0.0) + weight / (RRF_K + rank)
+
+    fused = sorted(memories, key=lambda id: scores[id], reverse=True)
+    return [(memories[id], scores[id]) for id in fused]
+
+
+def select_memories(
+    rankings: list[list[Memory]],
+    limit: int,
+    similarity_threshold: float = 0.0,
+    mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+    duplicate_similarity: float = DUPLICATE_SIMILARITY,
+) -> list[Memory]:
+    """Pick the most useful memories from per-query rankings.
+
+    Candidates are pooled across queries, those scoring below
+    ``similarity_threshold`` are dropped, and the rest are re-ranked with
+    maximal marginal relevance using the embeddings the backend returned.
+    Candidates nearly identical to one already selected are dropped
+    outright, so the result can be shorter than ``limit``. Without
+    embeddings the pool keeps its reciprocal-rank-fusion order.
+
+    Args:
+        rankings: Ranked results per query.
+        limit: Max results to return.
+        similarity_threshold: Min similarity score (0-1). Memories without a
+            score (e.g. lexical-only hits) are kept.
+        mmr_lambda: Relevance vs. diversity trade-off (1 = relevance only).
+        duplicate_similarity: Similarity at which a candidate counts as a
+            duplicate of a selected memory.
+
+    Returns:
+        Selected memories, best first.
+    """
+    pool = [
+        (memory, fused)
+        for memory, fused in _fuse_scored(rankings)
+        if memory.score is None or memory.score >= similarity_threshold
+    ]
+    if not any(memory.embedding for memory, _ in pool):
+        return [memory for memory, _ in pool[:limit]]
+
+    # Best score per memory across queries; fused rank when any is missing
+    best: dict[str, float] = {}
+    for ranking in rankings:
+        for memory in ranking:
+            if memory.score is not None:
+                best[memory.id] = max(best.get(memory.id, memory.score), memory.score)
+    if all(memory.id in best for memory, _ in pool):
+        relevance = np.array([best[memory.id] for memory, _ in pool])
+    else:
+        relevance = np.array([fused for _, fused in pool])
+        relevance /= relevance.max()
+
+    picked = maximal_marginal_relevance(
+        [memory.embedding for memory, _ in pool],
+        relevance,
+        limit,
+        mmr_lambda,
+        duplicate_similarity,
+    )
+    return [pool[i][0] for i in picked]
+
+
+def maximal_marginal_relevance(
+    embeddings: list[list[float] | None],
+    relevance: np.ndarray,
+    limit: int,
+    mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+    duplicate_similarity: float = DUPLICATE_SIMILARITY,
+) -> list[int]:
+    """Greedy MMR selection over a candidate pool.
+
+    Pairwise similarities are computed once as a single matrix product;
+    each selection step is then a vectorized update.
+
+    Args:
+        embeddings: Candidate embeddings (None = similar to nothing).
+        relevance: Relevance per candidate.
+        limit: Max candidates to select.
+        mmr_lambda: Relevance vs. diversity trade-off (1 = relevance only).
+        duplicate_similarity: Similarity at which remaining candidates are
+            dropped as duplicates of a selected one.
+
+    Returns:
+        Indices of selected candidates, in selection order.
+    """
+    n = len(embeddings)
+    dim = next(len(e) for e in embeddings if e)
+    vectors = np.zeros((n, dim), dtype=np.float32)
+    for i, embedding in enumerate(embeddings):
+        if embedding and len(embedding) == dim:
+            vectors[i] = embedding
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1.0)
+    similarity = vectors @ vectors.T
+
+    available = np.ones(n, dtype=bool)
+    redundancy = np.zeros(n)
+    picked: list[int] = []
+    while len(picked) < limit and available.any():
+        mmr = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+        best = int(np.argmax(np.where(available, mmr, -np.inf)))
+        picked.append(best)
+        available[best] = False
+        available &= similarity[best] < duplicate_similarity
+        redundancy = np.maximum(redundancy, similarity[best])
+    return picked
+
 
 class MemoryRetriever:
     """Retrieves relevant memories via vector similarity search.
 
     Takes query strings, generates embeddings via EmbeddingProvider,
     and returns ranked results from the MemoryBackend filtered by
-    a configurable similarity threshold.
+    a configurable similarity threshold and diversified with maximal
+    marginal relevance, so near-duplicates do not crowd out other context.
     """
 
     def __init__(
@@ -27,6 +452,9 @@ class MemoryRetriever:
         embedding_provider: EmbeddingProvider,
         default_top_k: int = 5,
         default_similarity_threshold: float = 0.0,
+        timeout_s: float | None = None,
+        mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+        candidates_per_query: int | None = None,
     ):
         """Initialize the retriever.
 
@@ -36,11 +464,20 @@ class MemoryRetriever:
             default_top_k: Default number of results to return per query.
             default_similarity_threshold: Minimum similarity score (0-1).
                 Results below this threshold are filtered out.
+            timeout_s: Retrieval deadline in seconds (default:
+                MEMORY_RETRIEVAL_TIMEOUT).
+            mmr_lambda: MMR relevance vs. diversity trade-off (1 = no
+                diversity re-ranking).
+            candidates_per_query: Results fetched per query for re-ranking
+                (default: top_k).
         """
         self.backend = backend
         self.embedding_provider = embedding_provider
         self.default_top_k = default_top_k
         self.default_similarity_threshold = default_similarity_threshold
+        self.timeout_s = timeout_s if timeout_s is not None else retrieval_timeout()
+        self.mmr_lambda = mmr_lambda
+        self.candidates_per_query = candidates_per_query
 
     async def retrieve(
         self,
@@ -51,8 +488,10 @@ class MemoryRetriever:
     ) -> list[Memory]:
         """Retrieve relevant memories for a list of queries.
 
-        Embeds each query, searches the backend, deduplicates by memory ID,
-        and returns the top_k most relevant results.
+        Embeds all queries in one batch, searches the backend concurrently,
+        pools the per-query results (deduplicated by memory ID), drops
+        those below the similarity threshold and picks up to top_k by
+        maximal marginal relevance.
 
         Args:
             queries: Search queries to embed and search for.
@@ -66,39 +505,21 @@ class MemoryRetriever:
         top_k = top_k or self.default_top_k
         threshold = similarity_threshold if similarity_threshold is not None else self.default_similarity_threshold
 
-        seen_ids: set[str] = set()
-        all_memories: list[Memory] = []
-
-        for query in queries:
-            try:
-                memories = await self._search_single(
-                    query, top_k, filter_metadata
-                )
-                for mem in memories:
-                    if mem.id not in seen_ids:
-                        seen_ids.add(mem.id)
-                        all_memories.append(mem)
-            except Exception as e:
-                logger.warning(f"Retrieval failed for query '{query[:50]}...': {e}")
-                continue
-
-        # Return top_k results (backend already returns ranked results,
-        # but after dedup across queries we may have more than top_k)
-        return all_memories[:top_k]
-
-    async def _search_single(
-        self,
-        query: str,
-        limit: int,
-        filter_metadata: dict[str, Any] | None,
-    ) -> list[Memory]:
-        """Search for a single query."""
-        embedding = await self.embedding_provider.embed(query)
-        return await self.backend.search(
-            query_embedding=embedding,
-            limit=limit,
-            filter_metadata=filter_metadata,
-        )
+        try:
+            rankings = await search_queries(
+                self.backend,
+                self.embedding_provider,
+                queries,
+                max(self.candidates_per_query or 0, top_k),
+                filter_metadata,
+                timeout_s=self.timeout_s,
+            )
+        except Exception as e:
+            logger.warning(f"Retrieval failed for {len(queries)} queries: {e}")
+            return []
+
+        # The pool across queries may exceed top_k; keep the most useful
+        return select_memories(rankings, top_k, threshold, self.mmr_lambda)
 
     async def retrieve_text(
         self,
@@ -9,6 +9,16 @@ from typing import Any
 
 from astro.core.memory.context_window import ContextWindow
 from astro.core.memory.long_term import LongTermMemory
+from astro.core.memory.namespaces import (
+    NAMESPACE_KEY,
+    namespace_for,
+    visible_namespaces,
+)
+from astro.core.memory.retrieval import select_memories
+from astro.interfaces.memory import Memory
+
+# Long-term memories retrieved per query
+MEMORIES_PER_QUERY = 3
 
 
 class SecondBrain:
@@ -55,26 +65,58 @@ class SecondBrain:
         # Context includes:
         # - long_term: Semantically similar memories from past queries
         # - recent: Recent messages from active conversation
+
+    With ``namespaced=True``, long-term memory is partitioned (see
+    astro.core.memory.namespaces): stores go to the namespace of the
+    memory's user or workspace, and retrieval for a conversation searches
+    its user's and workspace's namespaces plus the global one.
     """
 
     def __init__(
         self,
         context_window: ContextWindow,
         long_term: LongTermMemory,
+        namespaced: bool = False,
     ):
         """Initialize Second Brain.
 
         Args:
             context_window: Partition 1 (active context)
             long_term: Partition 2 (long-term memory)
+            namespaced: Scope long-term memory by user, workspace and
+                global namespaces
         """
         self.context_window = context_window  # Partition 1
         self.long_term = long_term  # Partition 2
+        self.namespaced = namespaced
+
+    async def prefetch(
+        self, queries: list[str], conversation: Any = None
+    ) -> dict[str, list[Memory]]:
+        """Search long-term memory ahead of retrieve().
+
+        Lets callers start retrieval on queries known early (such as the raw
+        user message) while other work runs, and hand the results to
+        retrieve() through ``prefetched``.
+
+        Args:
+            queries: Search queries
+            conversation: Current conversation (scopes the search when
+                namespaced)
+
+        Returns:
+            Ranked memories per query.
+        """
+        rankings = await self.long_term.retrieve_many(
+            queries, limit=MEMORIES_PER_QUERY, **self._scope(conversation)
+        )
+        return dict(zip(queries, rankings, strict=True))
 
     async def retrieve(
         self,
         queries: list[str],
         conversation: Any = None,  # type: ignore
+        prefetched: dict[str, list[Memory]] | None = None,
     ) -> dict[str, Any]:
         """READ: Retrieve context from both partitions.
 
@@ -84,11 +126,17 @@ class SecondBrain:
         Args:
             queries: List of search queries for long-term memory
                     (typically generated by the Interpreter in Step 1)
-            conversation: Current conversation object (for recent context)
+            conversation: Current conversation object (for recent context,
+                and its user's namespaces when namespaced)
+            prefetched: Results of an earlier prefetch(). Queries found here
+                are not searched again; prefetched queries not in
+                ``queries`` top up the candidate pool.
 
         Returns:
             Dict with two keys:
-            - long_term: List of relevant memories from vector search
+            - long_term: Relevant memories from vector search, deduplicated
+              across queries, with near-duplicates dropped and the rest
+              ranked by maximal marginal relevance
             - recent: List of recent messages from context window
 
         Example:
@@ -105,11 +153,21 @@ class SecondBrain:
                 context=context  # Contains both long-term and recent
             )
         """
-        # Query long-term memory (vector search)
-        long_term_memories = []
-        for query in queries:
-            memories = await self.long_term.retrieve(query, limit=3)
-            long_term_memories.extend(memories)
+        prefetched = prefetched or {}
+        searched: dict[str, list[Memory]] = {}
+        missing = [q for q in dict.fromkeys(queries) if q not in prefetched]
+        if missing or not prefetched:
+            # Query long-term memory (one batched embedding, concurrent searches)
+            rankings = await self.long_term.retrieve_many(
+                missing, limit=MEMORIES_PER_QUERY, **self._scope(conversation)
+            )
+            searched = dict(zip(missing, rankings, strict=True))
+        all_rankings = [
+            searched[q] if q in searched else prefetched[q] for q in queries
+        ] + [ranking for q, ranking in prefetched.items() if q not in queries]
+        long_term_memories = select_memories(
+            all_rankings, MEMORIES_PER_QUERY * len(all_rankings)
+        )
 
         # Get recent context from context window
         recent = self.context_window.get_recent(limit=10)
@@ -135,7 +193,9 @@ class SecondBrain:
 
         Args:
             content: Text content to store (typically the execution result)
-            metadata: Metadata to attach (query, directives, timestamp, etc.)
+            metadata: Metadata to attach (query, directives, timestamp, etc.).
+                When namespaced, a ``namespace`` entry is added if missing
+                (from ``user_id`` or ``workspace_id``, else global).
 
         Example:
             # In Step 4 of zero-shot pipeline
@@ -151,12 +211,34 @@ class SecondBrain:
 
             # Now this result can be retrieved in future similar queries
         """
+        if self.namespaced and NAMESPACE_KEY not in metadata:
+            metadata = {**metadata, NAMESPACE_KEY: namespace_for(metadata)}
+
         # Store in long-term (for future retrieval)
         await self.long_term.store(content, metadata)
 
         # Add to active context window (for immediate context)
         self.context_window.add_message(content, metadata)
 
+    def _scope(self, conversation: Any) -> dict[str, Any]:
+        """retrieve_many() arguments limiting a search to visible namespaces."""
+        if not self.namespaced or conversation is None:
+            return {}
+        return {
+            "namespaces": visible_namespaces(
+                user_id=getattr(conversation, "user_id", None),
+                workspace_id=getattr(conversation, "workspace_id", None),
+            )
+        }
+
+    async def shutdown(self) -> None:
+        """Drain pending long-term memory writes and context compression.
+
+        Call on application shutdown so write-behind memories are persisted.
+        """
+        await self.context_window.wait_for_compression()
+        await self.long_term.shutdown()
+
     def add_exchange(
         self,
         user_message: str,
@@ -5,9 +5,9 @@ and Layer 2 (orchestration). Layer 2-specific outputs (Plan, EvalDecision, etc.)
 will be in orchestration/models/outputs.py.
 """
 
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class ToolCall(BaseModel):
@@ -44,19 +44,79 @@ class EvalDecision(BaseModel):
     or continue forward to the next one.
     """
 
-    decision: str  # "continue" or "loop"
-    reasoning: str = ""
+    decision: Literal["continue", "loop"] = Field(
+        description='"continue" if the results satisfy the request, "loop" to retry'
+    )
+    reasoning: str = Field(default="", description="Explanation for the decision")
+    confidence: float | None = Field(
+        default=None, ge=0.0, le=1.0, description="Confidence in the decision, 0-1"
+    )
     loop_target: str | None = None  # Optional explicit node ID to loop back to
 
+    @field_validator("decision", mode="before")
+    @classmethod
+    def _normalize_decision(cls, value: Any) -> Any:
+        return value.strip().lower() if isinstance(value, str) else value
 
-class PlanTask(BaseModel):
+
+class Task(BaseModel):
     """A single task within a Plan."""
 
-    description: str
-    node_id: str | None = None
+    id: str = Field(default="", description="Unique task ID, e.g. task_1")
+    description: str = Field(description="What the worker executing the task must do")
+    dependencies: list[str] = Field(
+        default_factory=list, description="IDs of tasks that must finish first"
+    )
+    directive_id: str | None = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
 
 
 class Plan(BaseModel):
     """Output from a PlanningStar — structured list of tasks to execute."""
 
-    tasks: list[PlanTask] = Field(default_factory=list)
+    tasks: list[Task] = Field(default_factory=list)
+    context: str = Field(default="", description="Context for executing the tasks")
+    success_criteria: str = Field(
+        default="All tasks completed successfully",
+        description="How to evaluate whether the plan succeeded",
+    )
+
+    @model_validator(mode="after")
+    def _assign_task_ids(self) -> "Plan":
+        # Models sometimes omit IDs; number tasks so dependencies can resolve
+        for index, task in enumerate(self.tasks):
+            if not task.id:
+                task.id = f"task_{index + 1}"
+        return self
+
+
+class ExecutionResult(BaseModel):
+    """Output from an ExecutionStar — results of the workers it spawned."""
+
+    worker_outputs: list[WorkerOutput] = Field(default_factory=list)
+    status: str = Field(default="completed")  # "completed", "partial", "failed"
+    errors: list[str] = Field(default_factory=list)
+
+
+class SynthesisOutput(BaseModel):
+    """Output from a SynthesisStar — the formatted final result."""
+
+    formatted_result: str
+    format_type: str = Field(default="markdown")  # "markdown" or "text"
+    sources: list[str] = Field(default_factory=list)
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class DocumentExtraction(BaseModel):
+    """Information extracted from a single document by a DocExStar."""
+
+    doc_id: str
+    extracted_content: str
+    fields: dict[str, Any] = Field(default_factory=dict)  # merged structured fields
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class DocExResult(BaseModel):
+    """Output from a DocExStar — one extraction per document."""
+
+    documents: list[DocumentExtraction] = Field(default_factory=list)
@@ -57,6 +57,14 @@ class RunCompletedEvent(StreamEvent):
     duration_ms: int | None = Field(
         None, description="Total execution time in milliseconds"
     )
+    usage: dict[str, int | float] | None = Field(
+        None,
+        description="LLM token usage, including prompt-cache read/creation tokens "
+        "and estimated cost",
+    )
+    budget_status: str | None = Field(
+        None, description="Run budget status: ok, degraded or exceeded"
+    )
 
 
 class RunFailedEvent(StreamEvent):
@@ -25,6 +25,18 @@ class ExecutionError(Exception):
     pass
 
 
+class BudgetExceededError(ExecutionError):
+    """Raised when a run reaches one of its budget limits.
+
+    Attributes:
+        limits: Names of the limits that were reached (e.g. "max_cost_usd").
+    """
+
+    def __init__(self, limits: list[str]) -> None:
+        self.limits = limits
+        super().__init__(f"Run budget exceeded: {', '.join(limits)}")
+
+
 class RunNotFoundError(Exception):
     """Raised when a run cannot be found."""
 
@@ -5,7 +5,12 @@ define contracts without implementations, enabling pluggable infrastructure.
 """
 
 from astro.interfaces.llm import EmbeddingProvider, LLMProvider
-from astro.interfaces.memory import Memory, MemoryBackend
+from astro.interfaces.memory import (
+    EmbeddingFormat,
+    Memory,
+    MemoryBackend,
+    TextSearchBackend,
+)
 from astro.interfaces.orchestration_storage import OrchestrationStorageBackend
 from astro.interfaces.storage import CoreStorageBackend
 
@@ -15,5 +20,7 @@ __all__ = [
     "LLMProvider",
     "EmbeddingProvider",
     "MemoryBackend",
+    "TextSearchBackend",
     "Memory",
+    "EmbeddingFormat",
 ]
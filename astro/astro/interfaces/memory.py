@@ -1,17 +1,29 @@
 """Thin memory storage interface - implementation details left to backends."""
 
-from dataclasses import dataclass
-from typing import Any, Protocol
+from dataclasses import dataclass, field
+from typing import Any, Literal, Protocol
+
+# How a backend stores embeddings: float lists, packed float32, or
+# scalar-quantized float16/int8 (with the original norm stored alongside)
+EmbeddingFormat = Literal["float64", "float32", "float16", "int8"]
 
 
 @dataclass
 class Memory:
-    """A single memory entry."""
+    """A single memory entry.
+
+    Search results may also carry ``score`` (cosine similarity to the query)
+    and ``embedding`` (the stored vector), which retrieval uses for
+    threshold filtering and diversity re-ranking without another fetch.
+    Backends that cannot provide them leave them None.
+    """
 
     id: str
     content: str
     metadata: dict[str, Any]
     timestamp: float
+    score: float | None = field(default=None, compare=False)
+    embedding: list[float] | None = field(default=None, repr=False, compare=False)
 
 
 class MemoryBackend(Protocol):
@@ -25,8 +37,32 @@ class MemoryBackend(Protocol):
     - MongoDB with vector search
     - PostgreSQL with pgvector
     - In-memory (for testing)
+
+    Backends may also provide ``search_many(query_embeddings, limit,
+    filter_metadata) -> list[list[Memory]]`` to serve several queries in one
+    call, ``store_many(entries)`` taking ``(id, content, embedding,
+    metadata)`` tuples to write a batch in one call, and
+    ``update_metadata(id, metadata) -> bool`` to rewrite metadata without
+    the embedding. Multi-query retrieval, write-behind ingestion and
+    duplicate merging use them when present. Offline consolidation needs
+    ``iter_memories(include_embeddings, after, before)`` yielding memories
+    in timestamp order and, to keep sources recoverable,
+    ``archive(ids) -> int``. Backends that set
+    ``supports_text_query = True`` implement TextSearchBackend.
+
+    Memories may be partitioned by ``metadata["namespace"]`` (user,
+    workspace or global; see astro.core.memory.namespaces). Namespaced
+    retrieval searches each namespace with an equality filter on that key,
+    so backends should make it cheap to filter on.
+
+    Attributes:
+        embedding_format: Storage format for embeddings. Callers always pass
+            and receive float lists; backends that cannot pack vectors
+            report "float64".
     """
 
+    embedding_format: EmbeddingFormat
+
     async def store(
         self,
         id: str,
@@ -83,3 +119,35 @@ class MemoryBackend(Protocol):
             True if deleted, False if not found
         """
         ...
+
+
+class TextSearchBackend(MemoryBackend, Protocol):
+    """MemoryBackend that also matches on query text.
+
+    Backends set ``supports_text_query = True`` to advertise it. ``search``
+    then takes a ``query_text`` for lexical matching (``query_texts`` on
+    ``search_many``) and accepts ``query_embedding=None`` to search on the
+    text alone.
+    """
+
+    supports_text_query: bool
+
+    async def search(
+        self,
+        query_embedding: list[float] | None,
+        limit: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        query_text: str | None = None,
+    ) -> list[Memory]:
+        """Vector, lexical or fused search for relevant memories.
+
+        Args:
+            query_embedding: Vector to search for (None = text only)
+            limit: Maximum number of results
+            filter_metadata: Optional metadata filters
+            query_text: Query text for lexical matching (None = vector only)
+
+        Returns:
+            List of memories sorted by relevance
+        """
+        ...
@@ -52,6 +52,7 @@ from astro.launchpad.pipelines.constellation import (
 )
 from astro.launchpad.pipelines.zero_shot import ZeroShotPipeline
 from astro.launchpad.preferences import UserSynthesisPreferences
+from astro.launchpad.response_cache import SemanticResponseCache
 from astro.launchpad.running_agent import AgentOutput, RunningAgent
 from astro.launchpad.synthesis import SynthesisAgent
 
@@ -73,6 +74,7 @@ __all__ = [
     "InterpretationResult",
     "RunningAgent",
     "AgentOutput",
+    "SemanticResponseCache",
     # Constellation components
     "ConstellationMatch",
     "find_matching_constellation",
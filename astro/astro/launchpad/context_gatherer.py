@@ -21,6 +21,9 @@ from astro.launchpad.directive_generator import GatheredContext
 
 logger = logging.getLogger(__name__)
 
+# Token budget for conversation history in gathering prompts
+HISTORY_MAX_TOKENS = 4000
+
 
 @dataclass
 class InferredContext:
@@ -267,7 +270,9 @@ Return JSON:
         """
         return [
             {"role": msg.role, "content": msg.content}
-            for msg in conversation.get_context_messages(limit=10)
+            for msg in conversation.get_context_messages(
+                limit=10, max_tokens=HISTORY_MAX_TOKENS
+            )
         ]
 
     def _format_history(self, conversation: Conversation) -> str:
@@ -279,7 +284,9 @@ Return JSON:
         Returns:
             Formatted string
         """
-        messages = conversation.get_context_messages(limit=5)
+        messages = conversation.get_context_messages(
+            limit=5, max_tokens=HISTORY_MAX_TOKENS
+        )
         if not messages:
             return ""
 
@@ -68,6 +68,9 @@ class Conversation(BaseModel):
 
     id: str = Field(default_factory=generate_id)
     user_id: str | None = Field(default=None, description="For future auth")
+    workspace_id: str | None = Field(
+        default=None, description="Workspace whose shared memories are visible"
+    )
     messages: list[Message] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -119,16 +122,44 @@ class Conversation(BaseModel):
 
         return message
 
-    def get_context_messages(self, limit: int = 10) -> list[Message]:
+    def get_context_messages(
+        self,
+        limit: int | None = 10,
+        max_tokens: int | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+    ) -> list[Message]:
         """Get recent messages for context.
 
+        When ``max_tokens`` is given, messages are taken newest-first until
+        the token budget is spent. The newest message is always included.
+
         Args:
-            limit: Maximum number of messages to return.
+            limit: Maximum number of messages to return (None for no limit).
+            max_tokens: Optional token budget for the returned messages.
+            provider: LLM provider whose tokenizer estimate to use.
+            model: Model identifier for the tokenizer estimate.
 
         Returns:
-            List of recent messages.
+            List of recent messages, oldest first.
         """
-        return self.messages[-limit:]
+        candidates = self.messages if limit is None else self.messages[-limit:]
+        if max_tokens is None:
+            return candidates
+
+        from astro.core.llm.tokens import count_tokens
+
+        selected: list[Message] = []
+        used = 0
+        for message in reversed(candidates):
+            tokens = count_tokens(message.content, provider, model)
+            if selected and used + tokens > max_tokens:
+                break
+            selected.append(message)
+            used += tokens
+
+        selected.reverse()
+        return selected
 
     def to_llm_messages(self, limit: int = 10) -> list[dict[str, str]]:
         """Convert recent messages to LLM format.
@@ -16,6 +16,9 @@ from astro.launchpad.conversation import Conversation
 
 logger = logging.getLogger(__name__)
 
+# Token budget for conversation history in the interpreter prompt
+HISTORY_MAX_TOKENS = 4000
+
 
 class DirectiveSummary(BaseModel):
     """Lightweight directive info for selection."""
@@ -299,15 +302,26 @@ class Interpreter:
     tool scoping without predefined workflows.
     """
 
-    def __init__(self, registry: Any, llm_provider: Any):
+    def __init__(
+        self,
+        registry: Any,
+        llm_provider: Any,
+        escalation_llm: Any | None = None,
+        min_confidence: float = 0.6,
+    ):
         """Initialize the Interpreter.
 
         Args:
             registry: Registry for retrieving directives.
             llm_provider: LLM provider (should use lightweight model like Haiku).
+            escalation_llm: Optional stronger LLM used to re-evaluate when the
+                lightweight model's response is unparseable or low-confidence.
+            min_confidence: Confidence below which the decision is escalated.
         """
         self.registry = registry
         self.llm = llm_provider
+        self.escalation_llm = escalation_llm
+        self.min_confidence = min_confidence
 
     async def evaluate(
         self,
@@ -384,20 +398,21 @@ You CANNOT choose "ask_user" anymore. Make a decision with the information you h
         ]
 
         try:
-            response = await self.llm.ainvoke(
-                messages, temperature=0.3, max_tokens=get_default_max_tokens()
-            )
-            content = (
-                response.content
-                if hasattr(response, "content")
-                else str(response).strip()
-            )
-
-            logger.info(f"Interpreter: LLM response length: {len(content)} chars")
-            logger.info(f"Interpreter: LLM response preview: {content[:200]}...")
+            result = await self._invoke(self.llm, messages)
+
+            # Re-evaluate on the strong model when the fast model is unsure
+            # (unparseable responses also report zero confidence)
+            if (
+                self.escalation_llm is not None
+                and self.escalation_llm is not self.llm
+                and result.confidence < self.min_confidence
+            ):
+                logger.info(
+                    f"Interpreter: Escalating to strong model "
+                    f"(confidence {result.confidence:.2f} < {self.min_confidence})"
+                )
+                result = await self._invoke(self.escalation_llm, messages)
 
-            # Parse JSON response
-            result = self._parse_response(content)
             logger.info(
                 f"Interpreter: Selected {len(result.directive_ids)} directives: {result.directive_ids}"
             )
@@ -414,6 +429,29 @@ You CANNOT choose "ask_user" anymore. Make a decision with the information you h
                 confidence=0.0,
             )
 
+    async def _invoke(self, llm: Any, messages: list[dict[str, str]]) -> InterpretationResult:
+        """Call an LLM with the interpreter prompt and parse its decision.
+
+        Args:
+            llm: LLM provider to call.
+            messages: System and user messages.
+
+        Returns:
+            Parsed InterpretationResult.
+        """
+        response = await llm.ainvoke(
+            messages, temperature=0.3, max_tokens=get_default_max_tokens()
+        )
+        content = (
+            response.content if hasattr(response, "content") else str(response).strip()
+        )
+
+        logger.info(f"Interpreter: LLM response length: {len(content)} chars")
+        logger.info(f"Interpreter: LLM response preview: {content[:200]}...")
+
+        # Parse JSON response
+        return self._parse_response(content)
+
     async def select_directives(
         self,
         conversation: Conversation,
@@ -566,7 +604,9 @@ You CANNOT choose "ask_user" anymore. Make a decision with the information you h
         Returns:
             Formatted context string.
         """
-        recent_messages = conversation.get_context_messages(limit=10)
+        recent_messages = conversation.get_context_messages(
+            limit=10, max_tokens=HISTORY_MAX_TOKENS
+        )
         if not recent_messages:
             return ""
 
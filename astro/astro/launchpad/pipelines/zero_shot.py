@@ -13,15 +13,27 @@ multi-agent workflows.
 
 This pipeline was 16-19x faster than multi-agent approaches in benchmarks
 while maintaining comparable accuracy for most queries.
+
+Memory search on the raw user message starts speculatively alongside Step 1,
+so Step 2 only has to search the interpreter's additional context queries
+and merge them with the prefetched results.
+
+With a SemanticResponseCache, a fresh answer to a near-identical opening
+question with the same directives is served after Step 1, skipping Steps 2
+and 3. Such answers are marked ``cached`` in events.
 """
 
+import asyncio
 import logging
+import time
 from collections.abc import AsyncGenerator
 from datetime import UTC, datetime
 from typing import Any
 
+from astro.core.memory.namespaces import visible_namespaces
 from astro.launchpad.conversation import Conversation
 from astro.launchpad.interpreter import Interpreter
+from astro.launchpad.response_cache import SemanticResponseCache
 from astro.launchpad.running_agent import AgentOutput, RunningAgent
 
 logger = logging.getLogger(__name__)
@@ -42,6 +54,8 @@ class ZeroShotPipeline:
         second_brain: Any,
         directive_generator: Any = None,
         context_gatherer: Any = None,
+        speculative_retrieval: bool = True,
+        response_cache: SemanticResponseCache | None = None,
     ):
         """Initialize the zero-shot pipeline.
 
@@ -51,17 +65,23 @@ class ZeroShotPipeline:
             second_brain: Second Brain for memory management.
             directive_generator: Optional DirectiveGenerator for creating directives on-the-fly.
             context_gatherer: Optional ContextGatherer for gathering requirements.
+            speculative_retrieval: Search memory for the raw message while the
+                interpreter runs (needs a Second Brain with prefetch()).
+            response_cache: Optional cache of answers to repeated questions.
         """
         self.interpreter = interpreter
         self.running_agent = running_agent
         self.second_brain = second_brain
         self.directive_generator = directive_generator
         self.context_gatherer = context_gatherer
+        self.speculative_retrieval = speculative_retrieval
+        self.response_cache = response_cache
 
     async def execute_with_events(
         self,
         message: str,
         conversation: Conversation,
+        use_cache: bool = True,
     ) -> AsyncGenerator[dict[str, Any], None]:
         """Execute 4-step zero-shot pipeline with progress events.
 
@@ -70,6 +90,8 @@ class ZeroShotPipeline:
         Args:
             message: User's message/query.
             conversation: Current conversation state.
+            use_cache: Set to False to bypass the response cache (the fresh
+                answer still replaces any cached one).
 
         Yields:
             Progress events and final AgentOutput.
@@ -85,123 +107,147 @@ class ZeroShotPipeline:
         if not conversation.is_in_clarification():
             conversation.start_clarification(message, max_rounds=3)
 
-        # Step 1: Interpret (evaluate with clarification loop)
-        yield {
-            "type": "thinking",
-            "message": "Analyzing query and selecting directives...",
-        }
-
-        interpretation = None
-        attempts = 0
-        max_attempts = 5  # Safety limit to prevent infinite loops
-
-        while attempts < max_attempts:
-            attempts += 1
-            result = await self.interpreter.evaluate(conversation)
-            conversation.increment_clarification_round(result.model_dump())
-
-            if result.action == "ask_user":
-                # Need clarification - save questions to conversation history
-                questions_text = "\n".join(f"{i+1}. {q}" for i, q in enumerate(result.questions))
-                assistant_message = f"I need more information to help you:\n\n{questions_text}"
-
-                conversation.add_message(role="assistant", content=assistant_message)
-
-                # Yield event for UI
-                yield {
-                    "type": "clarification_needed",
-                    "questions": result.questions,
-                    "reasoning": result.reasoning,
-                    "round": conversation.clarification_state.rounds_completed,
-                    "max_rounds": conversation.clarification_state.max_rounds,
-                }
-                # Early return - wait for user to provide answers
-                return
-
-            elif result.action == "generate_directive":
-                # Trigger directive generation
-                interpretation = result
-                break
+        # Search memory for the raw message while the interpreter runs
+        prefetch = self._start_prefetch(message, conversation)
+        # The finally also runs when the client disconnects mid-stream
+        try:
+            # Step 1: Interpret (evaluate with clarification loop)
+            yield {
+                "type": "thinking",
+                "message": "Analyzing query and selecting directives...",
+            }
 
-            elif result.action == "select_directives":
-                # Ready to proceed with directive selection
+            interpretation = None
+            attempts = 0
+            max_attempts = 5  # Safety limit to prevent infinite loops
+
+            while attempts < max_attempts:
+                attempts += 1
+                result = await self.interpreter.evaluate(conversation)
+                conversation.increment_clarification_round(result.model_dump())
+
+                if result.action == "ask_user":
+                    # Need clarification - save questions to conversation history
+                    questions_text = "\n".join(f"{i+1}. {q}" for i, q in enumerate(result.questions))
+                    assistant_message = f"I need more information to help you:\n\n{questions_text}"
+
+                    conversation.add_message(role="assistant", content=assistant_message)
+
+                    # Yield event for UI
+                    yield {
+                        "type": "clarification_needed",
+                        "questions": result.questions,
+                        "reasoning": result.reasoning,
+                        "round": conversation.clarification_state.rounds_completed,
+                        "max_rounds": conversation.clarification_state.max_rounds,
+                    }
+                    # Early return - wait for user to provide answers
+                    return
+
+                elif result.action == "generate_directive":
+                    # Trigger directive generation
+                    interpretation = result
+                    break
+
+                elif result.action == "select_directives":
+                    # Ready to proceed with directive selection
+                    interpretation = result
+                    break
+
+                # Should never reach here, but safety fallback
+                logger.warning(
+                    f"ZeroShotPipeline: Unexpected action '{result.action}' in clarification loop"
+                )
                 interpretation = result
                 break
 
-            # Should never reach here, but safety fallback
-            logger.warning(
-                f"ZeroShotPipeline: Unexpected action '{result.action}' in clarification loop"
-            )
-            interpretation = result
-            break
-
-        # Clear clarification state now that we have a decision
-        conversation.clear_clarification()
+            # Clear clarification state now that we have a decision
+            conversation.clear_clarification()
 
-        if interpretation is None:
-            # Fallback if loop exits without interpretation
-            from astro.launchpad.interpreter import InterpretationResult
+            if interpretation is None:
+                # Fallback if loop exits without interpretation
+                from astro.launchpad.interpreter import InterpretationResult
 
-            interpretation = InterpretationResult(
-                action="select_directives",
-                directive_ids=[],
-                context_queries=[message],
-                reasoning="Max attempts reached in clarification loop",
-                confidence=0.0,
-            )
+                interpretation = InterpretationResult(
+                    action="select_directives",
+                    directive_ids=[],
+                    context_queries=[message],
+                    reasoning="Max attempts reached in clarification loop",
+                    confidence=0.0,
+                )
 
-        # Handle directive selection or generation
-        if interpretation.directive_ids:
-            directive_names = ", ".join(interpretation.directive_ids)
-            yield {
-                "type": "directive_selected",
-                "directive_ids": interpretation.directive_ids,
-                "reasoning": interpretation.reasoning,
-                "message": f"Selected directives: {directive_names}",
-            }
-        else:
-            # No directives found - try to generate one if possible
-            generated_id = None
-            async for event in self._try_generate_directive(
-                message, conversation, interpretation
-            ):
-                if event.get("type") == "directive_id":
-                    generated_id = event.get("id")
+            # Handle directive selection or generation
+            if interpretation.directive_ids:
+                directive_names = ", ".join(interpretation.directive_ids)
+                yield {
+                    "type": "directive_selected",
+                    "directive_ids": interpretation.directive_ids,
+                    "reasoning": interpretation.reasoning,
+                    "message": f"Selected directives: {directive_names}",
+                }
+            else:
+                # No directives found - try to generate one if possible
+                generated_id = None
+                async for event in self._try_generate_directive(
+                    message, conversation, interpretation
+                ):
+                    if event.get("type") == "directive_id":
+                        generated_id = event.get("id")
+                    else:
+                        yield event
+
+                if generated_id:
+                    interpretation.directive_ids = [generated_id]
                 else:
-                    yield event
+                    yield {
+                        "type": "thinking",
+                        "message": "No specialized directives needed - responding directly",
+                    }
 
-            if generated_id:
-                interpretation.directive_ids = [generated_id]
-            else:
+            cached = await self._lookup_cache(
+                message, interpretation.directive_ids, conversation, use_cache
+            )
+            if cached is not None:
                 yield {
-                    "type": "thinking",
-                    "message": "No specialized directives needed - responding directly",
+                    "type": "cache_hit",
+                    "cached_query": cached.query,
+                    "similarity": cached.similarity,
+                    "age_s": time.time() - cached.created_at,
+                    "message": "Answering from a recent response to the same question",
                 }
+                yield {"type": "output", "output": cached.output, "cached": True}
+                await self._persist_to_memory(message, cached.output, conversation)
+                return
 
-        # Step 2: Retrieve context from Second Brain
-        yield {"type": "thinking", "message": "Retrieving relevant context..."}
+            # Step 2: Retrieve context from Second Brain
+            yield {"type": "thinking", "message": "Retrieving relevant context..."}
 
-        context = await self._retrieve_context(
-            interpretation.context_queries, conversation
-        )
+            context = await self._retrieve_context(
+                interpretation.context_queries, conversation, prefetch
+            )
 
-        # Step 3: Execute with running agent (will yield its own events)
-        async for event in self._execute_agent_with_events(
-            interpretation.directive_ids,
-            context,
-            conversation,
-            message,
-            interpreter_reasoning=interpretation.reasoning,
-        ):
-            yield event
+            # Step 3: Execute with running agent (will yield its own events)
+            async for event in self._execute_agent_with_events(
+                interpretation.directive_ids,
+                context,
+                conversation,
+                message,
+                interpreter_reasoning=interpretation.reasoning,
+                cache=self._cacheable(conversation),
+            ):
+                yield event
 
-        # Get the final output (last event should be the result)
-        # We'll modify _execute_agent_with_events to yield the final output
+            # Get the final output (last event should be the result)
+            # We'll modify _execute_agent_with_events to yield the final output
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
 
     async def execute(
         self,
         message: str,
         conversation: Conversation,
+        use_cache: bool = True,
     ) -> AgentOutput:
         """Execute 4-step zero-shot pipeline (blocking mode).
 
@@ -211,6 +257,8 @@ class ZeroShotPipeline:
         Args:
             message: User's message/query.
             conversation: Current conversation state.
+            use_cache: Set to False to bypass the response cache (the fresh
+                answer still replaces any cached one).
 
         Returns:
             AgentOutput with response and execution metadata.
@@ -228,31 +276,47 @@ class ZeroShotPipeline:
         if not conversation.is_in_clarification():
             conversation.start_clarification(message, max_rounds=0)
 
-        # Step 1: Interpret (force decision in blocking mode)
-        interpretation = await self._interpret_with_clarification_blocking(
-            message, conversation
-        )
+        # Search memory for the raw message while the interpreter runs
+        prefetch = self._start_prefetch(message, conversation)
+        try:
+            # Step 1: Interpret (force decision in blocking mode)
+            interpretation = await self._interpret_with_clarification_blocking(
+                message, conversation
+            )
 
-        # Clear clarification state
-        conversation.clear_clarification()
+            # Clear clarification state
+            conversation.clear_clarification()
 
-        # Step 2: Retrieve context from Second Brain
-        context = await self._retrieve_context(
-            interpretation.context_queries, conversation
-        )
+            cached = await self._lookup_cache(
+                message, interpretation.directive_ids, conversation, use_cache
+            )
+            if cached is not None:
+                await self._persist_to_memory(message, cached.output, conversation)
+                output: AgentOutput = cached.output
+                return output
+
+            # Step 2: Retrieve context from Second Brain
+            context = await self._retrieve_context(
+                interpretation.context_queries, conversation, prefetch
+            )
 
-        # Step 3: Execute with running agent
-        output = await self._execute_agent(
-            interpretation.directive_ids,
-            context,
-            conversation,
-            interpreter_reasoning=interpretation.reasoning,
-        )
+            # Step 3: Execute with running agent
+            output = await self._execute_agent(
+                interpretation.directive_ids,
+                context,
+                conversation,
+                interpreter_reasoning=interpretation.reasoning,
+                cache=self._cacheable(conversation),
+                message=message,
+            )
 
-        # Step 4: Persist to Second Brain
-        await self._persist_to_memory(message, output, conversation)
+            # Step 4: Persist to Second Brain
+            await self._persist_to_memory(message, output, conversation)
 
-        return output
+            return output
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
 
     async def _execute_agent_with_events(
         self,
@@ -261,6 +325,7 @@ class ZeroShotPipeline:
         conversation: Conversation,
         message: str = "",
         interpreter_reasoning: str | None = None,
+        cache: bool = False,
     ) -> AsyncGenerator[dict[str, Any], None]:
         """Execute agent and yield progress events.
 
@@ -270,13 +335,14 @@ class ZeroShotPipeline:
             conversation: Current conversation.
             message: User message for persistence.
             interpreter_reasoning: Optional reasoning from interpreter.
+            cache: Store the answer in the response cache.
 
         Yields:
             Progress events and final output.
         """
         try:
             # Get directives
-            directives = await self.running_agent._get_directives(directive_ids)
+            directives = await self.running_agent.get_directives(directive_ids)
 
             if not directives:
                 yield {"type": "thinking", "message": "Generating direct response..."}
@@ -285,6 +351,8 @@ class ZeroShotPipeline:
                 )
                 yield {"type": "output", "output": output}
                 await self._persist_to_memory(message, output, conversation)
+                if cache:
+                    await self._store_in_cache(message, directive_ids, output, conversation)
                 return
 
             # Get tools
@@ -316,6 +384,8 @@ class ZeroShotPipeline:
 
             # Persist to Second Brain
             await self._persist_to_memory(message, output, conversation)
+            if cache:
+                await self._store_in_cache(message, directive_ids, output, conversation)
 
         except Exception as e:
             logger.error(f"Error in agent execution: {str(e)}")
@@ -418,8 +488,41 @@ class ZeroShotPipeline:
                 confidence=0.0,
             )
 
+    def _start_prefetch(
+        self, message: str, conversation: Conversation
+    ) -> asyncio.Task[Any] | None:
+        """Start a speculative memory search on the raw message.
+
+        Args:
+            message: User's message.
+            conversation: Current conversation (scopes the search).
+
+        Returns:
+            Task resolving to per-query rankings, or None when disabled or
+            the Second Brain cannot prefetch.
+        """
+        # Looked up on the type so mocks and minimal Second Brains opt out
+        if not self.speculative_retrieval or not callable(
+            getattr(type(self.second_brain), "prefetch", None)
+        ):
+            return None
+        return asyncio.create_task(self._prefetch(message, conversation))
+
+    async def _prefetch(self, message: str, conversation: Conversation) -> dict[str, Any]:
+        try:
+            prefetched: dict[str, Any] = await self.second_brain.prefetch(
+                [message], conversation=conversation
+            )
+            return prefetched
+        except Exception as e:
+            logger.warning(f"Speculative memory retrieval failed: {e}")
+            return {}
+
     async def _retrieve_context(
-        self, context_queries: list[str], conversation: Conversation
+        self,
+        context_queries: list[str],
+        conversation: Conversation,
+        prefetch: asyncio.Task[Any] | None = None,
     ) -> dict[str, Any]:
         """Step 2: Retrieve context from Second Brain.
 
@@ -434,14 +537,24 @@ class ZeroShotPipeline:
         Args:
             context_queries: Queries for retrieval (from interpreter).
             conversation: Current conversation.
+            prefetch: Speculative search started by _start_prefetch(); its
+                results are reused and merged with the context queries'.
 
         Returns:
             Dict with retrieved context from both memory partitions.
         """
         try:
-            raw: dict[str, Any] = await self.second_brain.retrieve(
-                queries=context_queries, conversation=conversation
-            )
+            prefetched = await prefetch if prefetch is not None else None
+            if prefetched:
+                raw: dict[str, Any] = await self.second_brain.retrieve(
+                    queries=context_queries,
+                    conversation=conversation,
+                    prefetched=prefetched,
+                )
+            else:
+                raw = await self.second_brain.retrieve(
+                    queries=context_queries, conversation=conversation
+                )
 
             # Map SecondBrain output to RunningAgent expected format
             recent = raw.get("recent", [])
@@ -469,6 +582,8 @@ class ZeroShotPipeline:
         context: dict[str, Any],
         conversation: Conversation,
         interpreter_reasoning: str | None = None,
+        cache: bool = False,
+        message: str = "",
     ) -> AgentOutput:
         """Step 3: Execute with running agent.
 
@@ -483,6 +598,8 @@ class ZeroShotPipeline:
             context: Retrieved context from Second Brain.
             conversation: Current conversation.
             interpreter_reasoning: Optional reasoning from interpreter.
+            cache: Store the answer in the response cache.
+            message: User message the answer is cached under.
 
         Returns:
             AgentOutput with response and execution metadata.
@@ -494,6 +611,8 @@ class ZeroShotPipeline:
                 context=context,
                 interpreter_reasoning=interpreter_reasoning,
             )
+            if cache:
+                await self._store_in_cache(message, directive_ids, output, conversation)
             return output
 
         except Exception as e:
@@ -505,6 +624,68 @@ class ZeroShotPipeline:
                 iterations=0,
             )
 
+    def _cacheable(self, conversation: Conversation) -> bool:
+        """Whether this turn's answer may be served from or stored in the cache.
+
+        Follow-ups depend on earlier turns, so only a conversation's opening
+        question is cached.
+        """
+        return (
+            self.response_cache is not None
+            and sum(1 for m in conversation.messages if m.role == "user") == 1
+        )
+
+    @staticmethod
+    def _cache_scope(conversation: Conversation) -> str:
+        """Cache partition: the memory namespaces the caller can read.
+
+        Answers draw on memory, so callers share cached answers exactly when
+        they see the same memories; anonymous callers share the global one.
+        """
+        return ",".join(
+            visible_namespaces(conversation.user_id, conversation.workspace_id)
+        )
+
+    async def _lookup_cache(
+        self,
+        message: str,
+        directive_ids: list[str],
+        conversation: Conversation,
+        use_cache: bool,
+    ) -> Any:
+        """Return a cached answer for this turn, if one is fresh."""
+        if self.response_cache is None or not use_cache or not self._cacheable(conversation):
+            return None
+        try:
+            return await self.response_cache.lookup(
+                message, directive_ids, scope=self._cache_scope(conversation)
+            )
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed, continuing: {e}")
+            return None
+
+    async def _store_in_cache(
+        self,
+        message: str,
+        directive_ids: list[str],
+        output: AgentOutput,
+        conversation: Conversation,
+    ) -> None:
+        """Cache an answer with its directives' freshness TTL."""
+        if self.response_cache is None:
+            return
+        try:
+            directives = await self.running_agent.get_directives(directive_ids)
+            await self.response_cache.store(
+                message,
+                directive_ids,
+                output,
+                ttl_s=self.response_cache.ttl_for(directives),
+                scope=self._cache_scope(conversation),
+            )
+        except Exception as e:
+            logger.warning(f"Response cache store failed, continuing: {e}")
+
     async def _persist_to_memory(
         self,
         message: str,
@@ -541,6 +722,13 @@ class ZeroShotPipeline:
                     "directive_ids": getattr(output, "directive_ids", []),
                     "tool_calls_count": len(output.tool_calls),
                     "iterations": output.iterations,
+                    # Scope the memory to its user and workspace
+                    **({"user_id": conversation.user_id} if conversation.user_id else {}),
+                    **(
+                        {"workspace_id": conversation.workspace_id}
+                        if conversation.workspace_id
+                        else {}
+                    ),
                 },
             )
 
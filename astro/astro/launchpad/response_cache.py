@@ -0,0 +1,261 @@
+"""Semantic response cache for the zero-shot pipeline.
+
+Users often repeat near-identical questions ("latest Apple headlines") within
+minutes. SemanticResponseCache keeps recent answers, partitioned by user and
+the set of selected directive IDs, and serves one again when a new query's
+normalized embedding is at least ``threshold`` similar to a cached query.
+
+Each entry expires after the freshness TTL of its directives: a directive can
+set ``metadata["cache_ttl_s"]`` (short for news probes, long for static
+analysis, 0 to never cache) and the shortest TTL among the selected
+directives applies. Entries for a directive are dropped with
+``invalidate(directive_id)`` when it changes; ``invalidate()`` drops all.
+
+Environment:
+    RESPONSE_CACHE: Set to "false" to disable the cache (default "true").
+    RESPONSE_CACHE_TTL: Default freshness TTL in seconds (default 900).
+    RESPONSE_CACHE_THRESHOLD: Min cosine similarity for a hit (default 0.95).
+"""
+
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from astro.core.llm.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity between normalized queries for a cache hit
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+
+# Freshness TTL for directives that do not set one
+DEFAULT_TTL_S = 900.0
+
+# Cached answers kept across all partitions (least recently used evicted)
+DEFAULT_MAX_ENTRIES = 1000
+
+# Directive metadata key overriding the TTL
+TTL_METADATA_KEY = "cache_ttl_s"
+
+
+@dataclass
+class CachedResponse:
+    """A cached answer and the query it answered."""
+
+    query: str
+    output: Any
+    vector: np.ndarray
+    created_at: float
+    expires_at: float
+    similarity: float = 1.0
+
+
+class SemanticResponseCache:
+    """Embedding-similarity cache of pipeline answers.
+
+    Example:
+        cache = SemanticResponseCache(embedding_provider)
+        hit = await cache.lookup("latest Apple headlines", ["news"])
+        if hit is None:
+            output = await run_pipeline()
+            await cache.store("latest Apple headlines", ["news"], output, ttl_s=300)
+    """
+
+    def __init__(
+        self,
+        embedding_provider: Any,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        default_ttl_s: float = DEFAULT_TTL_S,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            embedding_provider: Provider used to embed queries.
+            threshold: Min cosine similarity for a hit (0-1).
+            default_ttl_s: TTL for directives without ``cache_ttl_s``.
+            max_entries: Max cached answers.
+        """
+        self.embedding_provider = embedding_provider
+        self.threshold = threshold
+        self.default_ttl_s = default_ttl_s
+        self.max_entries = max_entries
+        self.stats: Counter[str] = Counter()
+        self._entries: OrderedDict[int, tuple[tuple[Any, ...], CachedResponse]] = OrderedDict()
+        self._next_id = 0
+
+    def ttl_for(self, directives: list[Any]) -> float:
+        """Freshness TTL for an answer built from these directives.
+
+        Args:
+            directives: Selected Directive objects.
+
+        Returns:
+            Shortest ``cache_ttl_s`` among the directives, or the default.
+        """
+        ttls = [
+            float(d.metadata[TTL_METADATA_KEY])
+            for d in directives
+            if TTL_METADATA_KEY in (getattr(d, "metadata", None) or {})
+        ]
+        return min(ttls) if ttls else self.default_ttl_s
+
+    async def lookup(
+        self, query: str, directive_ids: list[str], scope: str | None = None
+    ) -> CachedResponse | None:
+        """Find a fresh cached answer to a similar query.
+
+        Args:
+            query: User query.
+            directive_ids: Directives selected for the query.
+            scope: Partition key such as the user ID.
+
+        Returns:
+            The best matching entry (with ``similarity`` set), or None.
+        """
+        partition = self._partition(directive_ids, scope)
+        now = time.time()
+        self._expire(now)
+        candidates = [(i, e) for i, (p, e) in self._entries.items() if p == partition]
+        if not candidates:
+            self.stats["misses"] += 1
+            return None
+
+        vector = await self._embed(query)
+        best: tuple[int, CachedResponse, float] | None = None
+        for i, entry in candidates:
+            if entry.vector.shape != vector.shape:
+                continue
+            similarity = float(entry.vector @ vector)
+            if similarity >= self.threshold and (best is None or similarity > best[2]):
+                best = (i, entry, similarity)
+        if best is None:
+            self.stats["misses"] += 1
+            return None
+
+        i, entry, similarity = best
+        self._entries.move_to_end(i)
+        self.stats["hits"] += 1
+        logger.info(
+            f"Response cache hit (similarity {similarity:.3f}, "
+            f"age {now - entry.created_at:.0f}s): {entry.query[:50]}"
+        )
+        return CachedResponse(
+            query=entry.query,
+            output=entry.output,
+            vector=entry.vector,
+            created_at=entry.created_at,
+            expires_at=entry.expires_at,
+            similarity=similarity,
+        )
+
+    async def store(
+        self,
+        query: str,
+        directive_ids: list[str],
+        output: Any,
+        ttl_s: float | None = None,
+        scope: str | None = None,
+    ) -> bool:
+        """Cache an answer.
+
+        Args:
+            query: User query.
+            directive_ids: Directives the answer was built from.
+            output: Pipeline output to serve on hits.
+            ttl_s: Freshness TTL (default: ``default_ttl_s``; <= 0 skips).
+            scope: Partition key such as the user ID.
+
+        Returns:
+            True if cached.
+        """
+        ttl_s = self.default_ttl_s if ttl_s is None else ttl_s
+        if ttl_s <= 0:
+            return False
+        now = time.time()
+        partition = self._partition(directive_ids, scope)
+        vector = await self._embed(query)
+        # A fresh answer replaces cached answers to the same question
+        for i in [
+            i
+            for i, (p, e) in self._entries.items()
+            if p == partition
+            and e.vector.shape == vector.shape
+            and float(e.vector @ vector) >= self.threshold
+        ]:
+            del self._entries[i]
+        self._entries[self._next_id] = (
+            partition,
+            CachedResponse(
+                query=query,
+                output=output,
+                vector=vector,
+                created_at=now,
+                expires_at=now + ttl_s,
+            ),
+        )
+        self._next_id += 1
+        self.stats["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        return True
+
+    def invalidate(self, directive_id: str | None = None) -> int:
+        """Drop cached answers.
+
+        Args:
+            directive_id: Only answers built from this directive (None = all).
+
+        Returns:
+            Number of entries dropped.
+        """
+        if directive_id is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+        else:
+            stale = [i for i, (p, _) in self._entries.items() if directive_id in p[1]]
+            for i in stale:
+                del self._entries[i]
+            dropped = len(stale)
+        self.stats["invalidated"] += dropped
+        return dropped
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _embed(self, query: str) -> np.ndarray:
+        vector = np.asarray(
+            await self.embedding_provider.embed(normalize_text(query).lower()),
+            dtype=np.float32,
+        )
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _expire(self, now: float) -> None:
+        expired = [i for i, (_, e) in self._entries.items() if e.expires_at <= now]
+        for i in expired:
+            del self._entries[i]
+        self.stats["expired"] += len(expired)
+
+    @staticmethod
+    def _partition(directive_ids: list[str], scope: str | None) -> tuple[Any, ...]:
+        return (scope, frozenset(directive_ids))
+
+
+def response_cache_from_env(embedding_provider: Any) -> SemanticResponseCache | None:
+    """Build a SemanticResponseCache from the environment (None if disabled)."""
+    if os.getenv("RESPONSE_CACHE", "true").lower() in ("0", "false", "no"):
+        return None
+    return SemanticResponseCache(
+        embedding_provider,
+        threshold=float(
+            os.getenv("RESPONSE_CACHE_THRESHOLD", str(DEFAULT_SIMILARITY_THRESHOLD))
+        ),
+        default_ttl_s=float(os.getenv("RESPONSE_CACHE_TTL", str(DEFAULT_TTL_S))),
+    )
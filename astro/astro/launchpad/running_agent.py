@@ -10,6 +10,9 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from astro.core.llm.caching import cacheable_text, cacheable_tools
+from astro.core.llm.tokens import ContextItem, TokenBudget
+from astro.core.llm.usage import TokenUsage
 from astro.core.llm.utils import get_default_max_tokens
 from astro.launchpad.conversation import Conversation
 
@@ -43,6 +46,10 @@ class AgentOutput(BaseModel):
     )
     reasoning: str = Field(default="", description="Agent reasoning during execution")
     iterations: int = Field(default=0, description="Number of ReAct iterations")
+    usage: TokenUsage = Field(
+        default_factory=TokenUsage,
+        description="LLM token usage, including prompt-cache reads/writes",
+    )
 
 
 RUNNING_AGENT_SYSTEM_PROMPT = """You are a helpful AI assistant with access to specialized tools.
@@ -87,15 +94,26 @@ class RunningAgent:
     take actions (tool calls) until it can provide a complete answer.
     """
 
-    def __init__(self, registry: Any, llm_provider: Any):
+    # Upper bound on prompt tokens (system prompt, memory context and history)
+    DEFAULT_MAX_CONTEXT_TOKENS = 16_000
+
+    def __init__(
+        self,
+        registry: Any,
+        llm_provider: Any,
+        max_context_tokens: int = DEFAULT_MAX_CONTEXT_TOKENS,
+    ):
         """Initialize the Running Agent.
 
         Args:
             registry: Registry for retrieving directives and probes.
             llm_provider: LLM provider (should use powerful model like Sonnet).
+            max_context_tokens: Prompt token cap, further bounded by the
+                model's context window minus the reserved output tokens.
         """
         self.registry = registry
         self.llm = llm_provider
+        self.max_context_tokens = max_context_tokens
 
     async def execute(
         self,
@@ -121,7 +139,7 @@ class RunningAgent:
         )
 
         # Get directives
-        directives = await self._get_directives(directive_ids)
+        directives = await self.get_directives(directive_ids)
         logger.info(f"RunningAgent: Retrieved {len(directives)} directive objects")
 
         if not directives:
@@ -139,7 +157,9 @@ class RunningAgent:
                 f"RunningAgent: Including interpreter reasoning in system prompt: "
                 f"{interpreter_reasoning[:100]}..."
             )
-        system_prompt = self._build_system_prompt(directives, interpreter_reasoning)
+        # Interpreter reasoning varies per query, so it is kept out of the
+        # directive prompt to leave that prefix cacheable
+        system_prompt = self._build_system_prompt(directives)
 
         # Execute ReAct loop
         return await self._react_loop(
@@ -148,16 +168,17 @@ class RunningAgent:
             context=context,
             tools=tools,
             system_prompt=system_prompt,
+            reasoning_section=self._build_reasoning_section(interpreter_reasoning),
         )
 
-    async def _get_directives(self, directive_ids: list[str]) -> list[Any]:
+    async def get_directives(self, directive_ids: list[str]) -> list[Any]:
         """Retrieve directive objects from registry.
 
         Args:
             directive_ids: List of directive IDs.
 
         Returns:
-            List of Directive objects.
+            List of Directive objects (IDs that fail to load are skipped).
         """
         directives = []
         for directive_id in directive_ids:
@@ -202,9 +223,10 @@ class RunningAgent:
         if not probe_ids:
             return []
 
-        # Get probe objects from registry
+        # Get probe objects from registry (sorted so tool schemas form a
+        # stable, cacheable prompt prefix)
         tools = []
-        for probe_id in probe_ids:
+        for probe_id in sorted(probe_ids):
             try:
                 # Synchronous call
                 probe = self.registry.get_probe(probe_id)
@@ -287,8 +309,21 @@ class RunningAgent:
         base_prompt = RUNNING_AGENT_SYSTEM_PROMPT.format(directives_text=directives_text)
 
         # Add interpreter reasoning if available
-        if interpreter_reasoning:
-            reasoning_section = f"""
+        return base_prompt + self._build_reasoning_section(interpreter_reasoning)
+
+    def _build_reasoning_section(self, interpreter_reasoning: str | None) -> str:
+        """Build the query intent section from interpreter reasoning.
+
+        Args:
+            interpreter_reasoning: Optional reasoning from interpreter.
+
+        Returns:
+            Prompt section, or an empty string if there is no reasoning.
+        """
+        if not interpreter_reasoning:
+            return ""
+
+        return f"""
 
 ## Query Intent Analysis
 
@@ -298,9 +333,6 @@ The query interpretation system analyzed this request and determined:
 
 Use this context to understand which aspects of the query each directive should address and how they should work together.
 """
-            return base_prompt + reasoning_section
-
-        return base_prompt
 
     async def _react_loop(
         self,
@@ -310,6 +342,7 @@ Use this context to understand which aspects of the query each directive should
         tools: list[Any],
         system_prompt: str,
         max_iterations: int = 5,
+        reasoning_section: str = "",
     ) -> AgentOutput:
         """Execute ReAct loop: invoke LLM with tools, execute, repeat.
 
@@ -320,23 +353,28 @@ Use this context to understand which aspects of the query each directive should
             tools: Scoped tools to bind.
             system_prompt: System prompt with directives.
             max_iterations: Maximum number of ReAct iterations.
+            reasoning_section: Per-query interpreter reasoning, sent after
+                the cacheable directive prompt.
 
         Returns:
             AgentOutput with final response.
         """
         # Build initial messages
-        messages = self._build_messages(conversation, context, system_prompt)
+        messages = self._build_messages(
+            conversation, context, system_prompt, reasoning_section
+        )
 
         # Track execution
         tool_calls: list[dict[str, Any]] = []
         iteration = 0
+        usage = TokenUsage()
 
         try:
             logger.info(f"RunningAgent: Starting ReAct loop with {len(tools)} tools")
             # Bind tools to LLM if available
             if tools:
                 logger.info(f"RunningAgent: Binding {len(tools)} tools to LLM")
-                llm_with_tools = self.llm.bind_tools(tools)
+                llm_with_tools = self.llm.bind_tools(cacheable_tools(tools, self.llm))
 
                 # DEBUG: Log tool schemas being sent
                 logger.info(f"RunningAgent: Tool schemas: {[{'name': t.name, 'description': t.description} for t in tools]}")
@@ -346,6 +384,7 @@ Use this context to understand which aspects of the query each directive should
             else:
                 logger.info("RunningAgent: Invoking LLM without tools")
                 response = await self.llm.ainvoke(messages)
+            usage.add(TokenUsage.from_response(response))
 
             # LangChain returns AIMessage object, not dict
             content = _extract_text_content(
@@ -390,10 +429,10 @@ Use this context to understand which aspects of the query each directive should
 
                 # Invoke LLM again
                 if tools:
-                    llm_with_tools = self.llm.bind_tools(tools)
                     response = await llm_with_tools.ainvoke(messages)
                 else:
                     response = await self.llm.ainvoke(messages)
+                usage.add(TokenUsage.from_response(response))
 
                 # LangChain returns AIMessage object, not dict
                 content = (
@@ -411,6 +450,7 @@ Use this context to understand which aspects of the query each directive should
                 tool_calls=tool_calls,
                 reasoning=f"Completed in {iteration} iterations",
                 iterations=iteration,
+                usage=usage,
             )
 
         except Exception as e:
@@ -420,6 +460,7 @@ Use this context to understand which aspects of the query each directive should
                 tool_calls=tool_calls,
                 reasoning=f"Failed after {iteration} iterations",
                 iterations=iteration,
+                usage=usage,
             )
 
     async def _execute_tools(
@@ -466,23 +507,44 @@ Use this context to understand which aspects of the query each directive should
         return results
 
     def _build_messages(
-        self, conversation: Conversation, context: dict[str, Any], system_prompt: str
-    ) -> list[dict[str, str]]:
+        self,
+        conversation: Conversation,
+        context: dict[str, Any],
+        system_prompt: str,
+        reasoning_section: str = "",
+    ) -> list[dict[str, Any]]:
         """Build messages from conversation and context.
 
+        The directive system prompt is sent first and marked as a cacheable
+        prefix; per-query content (interpreter reasoning, memory context,
+        conversation) follows it.
+
         Args:
             conversation: Current conversation.
             context: Retrieved context.
             system_prompt: System prompt.
+            reasoning_section: Optional interpreter reasoning section.
 
         Returns:
             List of message dicts.
         """
-        messages = [{"role": "system", "content": system_prompt}]
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": cacheable_text(system_prompt, self.llm)}
+        ]
+
+        if reasoning_section:
+            messages.append({"role": "system", "content": reasoning_section.strip()})
+
+        budget = self._new_budget()
+        budget.consume(system_prompt)
+        budget.consume(reasoning_section)
+
+        # Conversation history gets up to half the budget; memory uses the rest
+        history = self._get_history(conversation, budget)
 
         # Add context if available
         if context:
-            context_text = self._format_context(context)
+            context_text = self._format_context(context, budget)
             if context_text:
                 messages.append(
                     {
@@ -492,32 +554,77 @@ Use this context to understand which aspects of the query each directive should
                 )
 
         # Add conversation history
-        for msg in conversation.get_context_messages(limit=10):
+        for msg in history:
             messages.append({"role": msg.role, "content": msg.content})
 
         return messages
 
-    def _format_context(self, context: dict[str, Any]) -> str:
+    def _new_budget(self) -> TokenBudget:
+        """Create a prompt budget from the model window and output reserve."""
+        return TokenBudget.for_model(
+            reserved_output=get_default_max_tokens(), cap=self.max_context_tokens
+        )
+
+    def _get_history(self, conversation: Conversation, budget: TokenBudget) -> list[Any]:
+        """Select conversation history within half of the remaining budget.
+
+        Args:
+            conversation: Current conversation.
+            budget: Prompt budget; consumed by the selected messages.
+
+        Returns:
+            Messages, oldest first.
+        """
+        history = conversation.get_context_messages(
+            limit=None, max_tokens=budget.remaining // 2
+        )
+        for msg in history:
+            budget.consume(msg.content)
+        return history
+
+    def _format_context(
+        self, context: dict[str, Any], budget: TokenBudget | None = None
+    ) -> str:
         """Format context for prompt.
 
+        Retrieved memories take priority over recent context-window messages;
+        both are packed into the token budget, compressing items that do not
+        fit whole.
+
         Args:
             context: Context dict from Second Brain.
+            budget: Prompt budget to pack into. Defaults to a fresh budget.
 
         Returns:
             Formatted context string.
         """
+        if budget is None:
+            budget = self._new_budget()
+
+        recent = [
+            ContextItem(text=str(msg), priority=1, key="recent")
+            for msg in context.get("recent_messages") or []
+        ]
+        memories = [
+            ContextItem(text=str(memory), priority=2, key="memory")
+            for memory in context.get("memories") or []
+        ]
+        packed = budget.pack(recent + memories)
+
         parts = []
 
         # Recent messages from context window
-        if context.get("recent_messages"):
+        packed_recent = [item.text for item in packed if item.key == "recent"]
+        if packed_recent:
             parts.append("Recent conversation:")
-            for msg in context["recent_messages"][:5]:
+            for msg in packed_recent:
                 parts.append(f"- {msg}")
 
         # Retrieved memories from long-term
-        if context.get("memories"):
+        packed_memories = [item.text for item in packed if item.key == "memory"]
+        if packed_memories:
             parts.append("\nRelevant information:")
-            for memory in context["memories"][:3]:
+            for memory in packed_memories:
                 parts.append(f"- {memory}")
 
         return "\n".join(parts) if parts else ""
@@ -548,10 +655,7 @@ Use this context to understand which aspects of the query each directive should
                 directives_text += f"- **{directive.name}**: {directive.description}\n"
 
         # Build messages with Astro-specific system prompt including actual directives
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are Astro, an AI assistant for financial analysis and market research.
+        direct_prompt = f"""You are Astro, an AI assistant for financial analysis and market research.
 
 I operate in two modes:
 - **Zero-shot mode** (default): Fast, intelligent directive selection with tool use (2-5 seconds)
@@ -559,18 +663,23 @@ I operate in two modes:
 
 I automatically select the right directives and tools based on your query. For tasks requiring external data or analysis, I'll use specialized tools to get you accurate, up-to-date information.
 {directives_text}
-When asked about my capabilities, I can reference these specific directives. I'm designed for financial analysis, market research, company intelligence, and data analysis tasks.""",
-            }
+When asked about my capabilities, I can reference these specific directives. I'm designed for financial analysis, market research, company intelligence, and data analysis tasks."""
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": cacheable_text(direct_prompt, self.llm)}
         ]
 
+        budget = self._new_budget()
+        budget.consume(direct_prompt)
+        history = self._get_history(conversation, budget)
+
         # Add context if available
         if context:
-            context_text = self._format_context(context)
+            context_text = self._format_context(context, budget)
             if context_text:
                 messages.append({"role": "system", "content": context_text})
 
         # Add conversation
-        for msg in conversation.get_context_messages(limit=10):
+        for msg in history:
             messages.append({"role": msg.role, "content": msg.content})
 
         try:
@@ -586,6 +695,7 @@ When asked about my capabilities, I can reference these specific directives. I'm
                 tool_calls=[],
                 reasoning="Direct response",
                 iterations=1,
+                usage=TokenUsage.from_response(response),
             )
 
         except Exception as e:
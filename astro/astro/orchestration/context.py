@@ -8,11 +8,15 @@ Once Phase 1+2 are complete, this will import and extend ExecutionContext from
 astro.core.runtime.context. For now, it includes all necessary fields.
 """
 
+import time
 import uuid
 from typing import TYPE_CHECKING, Any, Optional
 
 from pydantic import BaseModel, Field
 
+from astro.core.llm.routing import RouteDecision
+from astro.core.llm.usage import TokenUsage
+
 # Model imports for dynamic directive creation
 from astro.core.models.directive import Directive
 from astro.core.models.template_variable import TemplateVariable
@@ -26,6 +30,7 @@ from astro.core.runtime.events import (
     ToolResultEvent,
     truncate_output,
 )
+from astro.orchestration.models.budget import BudgetStatus, RunBudget
 from astro.orchestration.models.star_types import StarType
 from astro.orchestration.stars.worker import WorkerStar
 
@@ -76,6 +81,16 @@ class ConstellationContext(BaseModel):
     # Cache for tool/probe results across stars (keyed on tool_name + sorted args JSON)
     tool_result_cache: dict[str, str] = Field(default_factory=dict)
 
+    # LLM token usage per node ID (shared by reference with sub-contexts)
+    llm_usage: dict[str, TokenUsage] = Field(default_factory=dict)
+
+    # Model routing decisions in call order (shared by reference with sub-contexts)
+    routing_decisions: list[RouteDecision] = Field(default_factory=list)
+
+    # Effective run budget (None = unlimited) and the run's monotonic start time
+    budget: RunBudget | None = Field(default=None)
+    started_at: float = Field(default_factory=time.monotonic)
+
     # Registry/Foundry reference for lookups (Any to avoid circular import)
     # In V2, this will be a Registry instance
     foundry: Any = Field(default=None)
@@ -85,6 +100,25 @@ class ConstellationContext(BaseModel):
 
     model_config = {"arbitrary_types_allowed": True}
 
+    def for_node(self, node_id: str, node_name: str | None = None) -> "ConstellationContext":
+        """View of this context bound to one node.
+
+        Nodes executed in parallel share one context, so ``current_node_id``
+        cannot tell their calls apart; the runner hands each star its own
+        view instead. The view shares every container (variables, outputs,
+        caches, usage, routing decisions) with this context by reference.
+
+        Args:
+            node_id: ID of the node being executed.
+            node_name: Display name of the node.
+
+        Returns:
+            Shallow copy with the node identity set.
+        """
+        return self.model_copy(
+            update={"current_node_id": node_id, "current_node_name": node_name}
+        )
+
     # =========================================================================
     # Stream Event Emission Helpers
     # =========================================================================
@@ -494,3 +528,118 @@ Constraints:
 
         cache_key = f"{tool_name}:{json.dumps(tool_args, sort_keys=True, default=str)}"
         self.tool_result_cache[cache_key] = result
+
+    # =========================================================================
+    # LLM Usage Accounting
+    # =========================================================================
+
+    def record_llm_usage(self, response: Any) -> TokenUsage:
+        """Record token usage from an LLM response against the current node.
+
+        Args:
+            response: LLM response message (LangChain AIMessage).
+
+        Returns:
+            The usage extracted from this response.
+        """
+        usage = TokenUsage.from_response(response)
+        node_id = self.current_node_id or "_unassigned"
+        self.llm_usage.setdefault(node_id, TokenUsage()).add(usage)
+        return usage
+
+    def get_node_usage(self, node_id: str) -> TokenUsage | None:
+        """Get accumulated token usage for a node.
+
+        Args:
+            node_id: The node ID.
+
+        Returns:
+            TokenUsage or None if the node made no LLM calls.
+        """
+        return self.llm_usage.get(node_id)
+
+    def get_total_usage(self) -> TokenUsage:
+        """Get token usage summed across all nodes in this run.
+
+        Returns:
+            Aggregated TokenUsage.
+        """
+        total = TokenUsage()
+        for usage in self.llm_usage.values():
+            total.add(usage)
+        return total
+
+    # =========================================================================
+    # Model Routing Telemetry
+    # =========================================================================
+
+    def record_routing(self, decision: RouteDecision) -> None:
+        """Record a model routing decision against the current node.
+
+        Args:
+            decision: The routing decision (node_id is filled in).
+        """
+        decision.node_id = decision.node_id or self.current_node_id
+        self.routing_decisions.append(decision)
+
+    def get_node_routing(self, node_id: str) -> list[RouteDecision]:
+        """Get the routing decisions made for a node.
+
+        Args:
+            node_id: The node ID.
+
+        Returns:
+            Decisions in call order (escalations follow the initial route).
+        """
+        return [d for d in self.routing_decisions if d.node_id == node_id]
+
+    # =========================================================================
+    # Run Budget
+    # =========================================================================
+
+    def elapsed_s(self) -> float:
+        """Wall-clock seconds since the run (or its resume) started."""
+        return time.monotonic() - self.started_at
+
+    def budget_status(self) -> BudgetStatus:
+        """Classify the run's budget use so far.
+
+        Returns:
+            "ok", "degraded" or "exceeded" ("ok" when no budget is set).
+        """
+        if self.budget is None:
+            return "ok"
+        return self.budget.status(self.get_total_usage(), self.elapsed_s())
+
+    @property
+    def budget_degraded(self) -> bool:
+        """Whether the run should trade quality for staying within budget."""
+        return self.budget_status() != "ok"
+
+    def check_budget(self) -> None:
+        """Fail the run if any budget limit has been reached.
+
+        Raises:
+            BudgetExceededError: Naming the limits that were reached.
+        """
+        from astro.core.runtime.exceptions import BudgetExceededError
+
+        if self.budget is None:
+            return
+        fractions = self.budget.usage_fractions(self.get_total_usage(), self.elapsed_s())
+        reached = [name for name, used in fractions.items() if used >= 1.0]
+        if reached:
+            raise BudgetExceededError(reached)
+
+    def tool_iteration_limit(self, max_iterations: int) -> int:
+        """Cap a tool-calling loop's iterations while the budget is degraded.
+
+        Args:
+            max_iterations: The star's configured iteration limit.
+
+        Returns:
+            Iterations allowed for the loop.
+        """
+        if self.budget is not None and self.budget_degraded:
+            return min(max_iterations, self.budget.degraded_tool_iterations)
+        return max_iterations
@@ -5,9 +5,11 @@ This module exports all the constellation graph models:
 - Nodes: StartNode, EndNode, StarNode
 - Edge: Connections between nodes
 - StarType: Enum of star execution patterns
+- RunBudget: Per-run spend and latency limits
 """
 
 from astro.core.models.outputs import EvalDecision, Plan
+from astro.orchestration.models.budget import BudgetStatus, RunBudget
 from astro.orchestration.models.constellation import Constellation
 from astro.orchestration.models.edge import Edge
 from astro.orchestration.models.nodes import (
@@ -32,6 +34,8 @@ __all__ = [
     "NodeType",
     "Position",
     "StarType",
+    "RunBudget",
+    "BudgetStatus",
     "EvalDecision",
     "Plan",
     "BaseStar",
@@ -0,0 +1,123 @@
+"""Run budget - caps on LLM spend and wall-clock time for one run."""
+
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from astro.core.llm.usage import TokenUsage
+
+BudgetStatus = Literal["ok", "degraded", "exceeded"]
+
+# Limit fields, in the order they are reported
+LIMIT_FIELDS = (
+    "max_input_tokens",
+    "max_output_tokens",
+    "max_cost_usd",
+    "max_llm_calls",
+    "max_wall_clock_s",
+)
+
+
+class RunBudget(BaseModel):
+    """Per-run limits on tokens, estimated cost, LLM calls and wall-clock time.
+
+    Unset limits are not enforced. Once any limit is ``degrade_at`` used, the
+    run degrades: EvalStar loops are forced to continue, tool loops are capped
+    at ``degraded_tool_iterations`` and strong-tier calls are routed to the
+    fast tier. Once any limit is fully used, the run fails before starting
+    its next node.
+    """
+
+    max_input_tokens: int | None = Field(default=None, ge=1)
+    max_output_tokens: int | None = Field(default=None, ge=1)
+    max_cost_usd: float | None = Field(
+        default=None, gt=0, description="Estimated USD cost (list prices)"
+    )
+    max_llm_calls: int | None = Field(default=None, ge=1)
+    max_wall_clock_s: float | None = Field(default=None, gt=0)
+
+    degrade_at: float = Field(
+        default=0.8,
+        gt=0.0,
+        le=1.0,
+        description="Fraction of any limit at which the run starts degrading",
+    )
+    degraded_tool_iterations: int = Field(
+        default=2,
+        ge=1,
+        description="Tool-calling iterations allowed per call once degraded",
+    )
+
+    @property
+    def is_limited(self) -> bool:
+        """Whether any limit is set."""
+        return any(getattr(self, name) is not None for name in LIMIT_FIELDS)
+
+    def merge(self, override: "RunBudget | None") -> "RunBudget":
+        """Combine with a per-request budget, keeping the stricter of each limit.
+
+        Args:
+            override: Budget supplied with the run request.
+
+        Returns:
+            Effective budget. A request can tighten, never loosen, the
+            constellation's limits.
+        """
+        if override is None:
+            return self
+
+        merged: dict[str, Any] = {
+            "degrade_at": min(self.degrade_at, override.degrade_at),
+            "degraded_tool_iterations": min(
+                self.degraded_tool_iterations, override.degraded_tool_iterations
+            ),
+        }
+        for name in LIMIT_FIELDS:
+            values = [v for v in (getattr(self, name), getattr(override, name)) if v is not None]
+            merged[name] = min(values) if values else None
+        return RunBudget.model_validate(merged)
+
+    def usage_fractions(
+        self, usage: "TokenUsage", elapsed_s: float
+    ) -> dict[str, float]:
+        """Fraction of each set limit used so far.
+
+        Args:
+            usage: Run token usage so far.
+            elapsed_s: Wall-clock seconds since the run started.
+
+        Returns:
+            Mapping of limit name to used fraction (1.0 = limit reached).
+        """
+        used = {
+            "max_input_tokens": usage.input_tokens,
+            "max_output_tokens": usage.output_tokens,
+            "max_cost_usd": usage.cost_usd,
+            "max_llm_calls": usage.llm_calls,
+            "max_wall_clock_s": elapsed_s,
+        }
+        fractions: dict[str, float] = {}
+        for name in LIMIT_FIELDS:
+            limit = getattr(self, name)
+            if limit is not None:
+                fractions[name] = used[name] / limit
+        return fractions
+
+    def status(self, usage: "TokenUsage", elapsed_s: float) -> BudgetStatus:
+        """Classify budget use.
+
+        Args:
+            usage: Run token usage so far.
+            elapsed_s: Wall-clock seconds since the run started.
+
+        Returns:
+            "exceeded" once any limit is reached, "degraded" once any limit is
+            ``degrade_at`` used, otherwise "ok".
+        """
+        worst = max(self.usage_fractions(usage, elapsed_s).values(), default=0.0)
+        if worst >= 1.0:
+            return "exceeded"
+        if worst >= self.degrade_at:
+            return "degraded"
+        return "ok"
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field
 
+from astro.orchestration.models.budget import RunBudget
 from astro.orchestration.models.edge import Edge
 from astro.orchestration.models.nodes import EndNode, StarNode, StartNode
 
@@ -50,6 +51,11 @@ class Constellation(BaseModel):
         le=10.0,
         description="Base delay in seconds for exponential backoff between retries.",
     )
+    budget: RunBudget = Field(
+        default_factory=RunBudget,
+        description="Per-run token, cost, LLM call and wall-clock limits. "
+        "Runs degrade near a limit and fail once it is reached.",
+    )
 
     # Extensibility
     metadata: dict[str, Any] = Field(default_factory=dict)
@@ -5,6 +5,10 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
+from astro.core.llm.routing import RouteDecision
+from astro.core.llm.usage import TokenUsage
+from astro.orchestration.models.budget import BudgetStatus, RunBudget
+
 
 class ToolCallRecord(BaseModel):
     """Record of a tool call during execution."""
@@ -28,6 +32,14 @@ class NodeOutput(BaseModel):
     output: str | None = None
     error: str | None = None
     tool_calls: list[ToolCallRecord] = Field(default_factory=list)
+    usage: TokenUsage | None = Field(
+        default=None,
+        description="LLM token usage for this node, including prompt-cache reads/writes",
+    )
+    routing: list[RouteDecision] = Field(
+        default_factory=list,
+        description="Model tier routing decisions for this node, including escalations",
+    )
 
 
 RunStatus = Literal[
@@ -48,6 +60,19 @@ class Run(BaseModel):
     node_outputs: dict[str, NodeOutput] = Field(default_factory=dict)
     final_output: str | None = None
     error: str | None = None
+    usage: TokenUsage = Field(
+        default_factory=TokenUsage,
+        description="LLM token usage and estimated cost summed across all nodes",
+    )
+    budget: RunBudget | None = Field(
+        default=None,
+        description="Effective budget (constellation limits tightened by the request)",
+    )
+    budget_status: BudgetStatus = Field(
+        default="ok",
+        description="'degraded' once the run traded quality to stay within budget, "
+        "'exceeded' once a limit was reached",
+    )
 
     # Human-in-the-loop state
     awaiting_node_id: str | None = Field(
@@ -21,6 +21,7 @@ from astro.core.runtime.events import (
     truncate_output,
 )
 from astro.core.runtime.exceptions import (
+    BudgetExceededError,
     ExecutionError,
     ExecutionPausedException,
     ParallelExecutionError,
@@ -34,6 +35,7 @@ if TYPE_CHECKING:
         BaseStar,
         Constellation,
         EvalDecision,
+        RunBudget,
         StarNode,
     )
 
@@ -74,6 +76,7 @@ class ConstellationRunner:
         original_query: str = "",
         stream: ExecutionStream | None = None,
         run_id: str | None = None,
+        budget: Optional["RunBudget"] = None,
     ) -> Run:
         """Execute a constellation.
 
@@ -83,6 +86,8 @@ class ConstellationRunner:
             original_query: Original user query.
             stream: Optional stream for real-time event emission.
             run_id: Optional pre-generated run ID (if None, generates a new one).
+            budget: Optional per-request budget. Each limit can only tighten
+                the constellation's budget.
 
         Returns:
             Run object with status and outputs.
@@ -104,6 +109,9 @@ class ConstellationRunner:
         # Store original_query in variables for persistence (needed for resume)
         variables_with_query = {**variables, "_original_query": original_query}
 
+        # Effective budget: constellation limits, tightened by the request
+        effective_budget = constellation.budget.merge(budget)
+
         # Create run record
         run = Run(
             id=run_id or generate_run_id(),
@@ -113,6 +121,7 @@ class ConstellationRunner:
             variables=variables_with_query,
             started_at=datetime.now(UTC),
             node_outputs={},
+            budget=effective_budget if effective_budget.is_limited else None,
         )
 
         logger.info(f"Created run: id={run.id}, constellation={constellation.name}")
@@ -141,6 +150,7 @@ class ConstellationRunner:
             original_query=original_query,
             constellation_purpose=constellation.description,
             variables=variables,
+            budget=run.budget,
             foundry=self.foundry,
             stream=effective_stream,
         )
@@ -154,6 +164,7 @@ class ConstellationRunner:
             run.status = "completed"
             run.completed_at = datetime.now(UTC)
             run.final_output = self._extract_final_output(run)
+            run.budget_status = context.budget_status()
 
             # Calculate duration
             duration_ms = None
@@ -162,7 +173,13 @@ class ConstellationRunner:
                     (run.completed_at - run.started_at).total_seconds() * 1000
                 )
 
-            logger.info(f"Run completed: id={run.id}, duration_ms={duration_ms}")
+            logger.info(
+                f"Run completed: id={run.id}, duration_ms={duration_ms}, "
+                f"input_tokens={run.usage.input_tokens}, "
+                f"cache_read_tokens={run.usage.cache_read_tokens}, "
+                f"cache_creation_tokens={run.usage.cache_creation_tokens}, "
+                f"cost_usd={run.usage.cost_usd:.4f}, budget_status={run.budget_status}"
+            )
 
             # Emit run completed event
             await effective_stream.emit(
@@ -170,6 +187,8 @@ class ConstellationRunner:
                     run_id=run.id,
                     final_output=truncate_output(run.final_output, max_length=500),
                     duration_ms=duration_ms,
+                    usage=run.usage.model_dump(),
+                    budget_status=run.budget_status,
                 )
             )
 
@@ -183,6 +202,7 @@ class ConstellationRunner:
             run.status = "failed"
             run.error = str(e)
             run.completed_at = datetime.now(UTC)
+            run.budget_status = context.budget_status()
 
             logger.error(
                 f"Run failed: id={run.id}, node={context.current_node_id}, error={e}",
@@ -286,6 +306,9 @@ class ConstellationRunner:
             # Wait for all upstream to complete
             await self._wait_for_upstream(upstream_nodes, run)
 
+        # Fail the run rather than start more work past a budget limit
+        context.check_budget()
+
         # Get display name for events
         display_name = node.display_name or star.name
 
@@ -456,6 +479,12 @@ class ConstellationRunner:
                 )
             raise
         finally:
+            # Attach LLM usage (including prompt-cache tokens) to the run record
+            node_output.usage = context.get_node_usage(node.id)
+            node_output.routing = context.get_node_routing(node.id)
+            run.usage = context.get_total_usage()
+            run.budget_status = context.budget_status()
+
             # Clear current node from context
             context.current_node_id = None
             context.current_node_name = None
@@ -479,10 +508,13 @@ class ConstellationRunner:
         # Update context with bindings
         context.variables.update(bindings)
 
-        # Execute the star
+        # Execute the star against a view bound to this node, so usage,
+        # routing and stream events are attributed correctly even when
+        # parallel nodes share the context
         if hasattr(star, "execute"):
             execute_fn = getattr(star, "execute")
-            return await execute_fn(context)
+            node_context = context.for_node(node.id, node.display_name or star.name)
+            return await execute_fn(node_context)
 
         # Fallback for stars without execute method
         return {"status": "executed", "star_id": star.id}
@@ -620,7 +652,12 @@ class ConstellationRunner:
         """Handle EvalStar routing decision."""
         from astro.orchestration.models import StarType
 
-        if decision.decision == "loop":
+        if decision.decision == "loop" and context.budget_degraded:
+            # Another loop would not fit the run budget
+            object.__setattr__(decision, "decision", "continue")
+            decision.reasoning += " (forced continue: run budget nearly exhausted)"
+            logger.info(f"Run {run.id}: budget degraded, forcing eval to continue")
+        elif decision.decision == "loop":
             # Check loop limit - use lock to prevent race condition
             async with self._loop_count_lock:
                 context.loop_count += 1
@@ -842,6 +879,10 @@ class ConstellationRunner:
             original_query=original_query,
             constellation_purpose=constellation.description,
             variables=run.variables,
+            # Token and cost limits keep accumulating from the restored usage;
+            # the wall clock restarts so time spent awaiting a human is not
+            # charged to the run
+            budget=run.budget,
             foundry=self.foundry,
             stream=effective_stream,
         )
@@ -850,6 +891,10 @@ class ConstellationRunner:
         for node_id, node_output in run.node_outputs.items():
             if node_output.output:
                 context.node_outputs[node_id] = node_output.output
+            # Restore LLM usage and routing so run telemetry keeps accumulating
+            if node_output.usage:
+                context.llm_usage[node_id] = node_output.usage.model_copy()
+            context.routing_decisions.extend(node_output.routing)
 
         # Emit resumed event
         await effective_stream.emit(
@@ -888,6 +933,7 @@ class ConstellationRunner:
             run.status = "completed"
             run.completed_at = datetime.now(UTC)
             run.final_output = self._extract_final_output(run)
+            run.budget_status = context.budget_status()
 
         except ExecutionPausedException as e:
             # Another HITL pause encountered - gracefully halt
@@ -909,6 +955,8 @@ class ConstellationRunner:
                 run_id=run.id,
                 final_output=truncate_output(run.final_output, max_length=500),
                 duration_ms=duration_ms,
+                usage=run.usage.model_dump(),
+                budget_status=run.budget_status,
             )
         )
 
@@ -1050,6 +1098,9 @@ class ConstellationRunner:
                 await self._execute_node(node, constellation, context, run, node_index)
                 # Get the result from context
                 return context.node_outputs.get(node.id, {})
+            except BudgetExceededError:
+                # Retrying cannot succeed within the same budget
+                raise
             except Exception as e:
                 last_error = e
                 if attempt < max_attempts:
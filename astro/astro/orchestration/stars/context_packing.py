@@ -0,0 +1,86 @@
+"""Token-budgeted packing of upstream outputs for AtomicStar prompts."""
+
+from typing import TYPE_CHECKING, Any
+
+from astro.core.llm.tokens import ContextItem, TokenBudget
+
+if TYPE_CHECKING:
+    from astro.core.llm.routing import RouteDecision
+
+
+def output_text(output: Any) -> str | None:
+    """Extract the text content of an upstream star output.
+
+    Args:
+        output: A star output (WorkerOutput, SynthesisOutput, ExecutionResult,
+            restored dict output, ...).
+
+    Returns:
+        Output text, or None for outputs without text content
+        (e.g. Plan, EvalDecision).
+    """
+    if hasattr(output, "result"):
+        return str(output.result)
+    if hasattr(output, "formatted_result"):
+        return str(output.formatted_result)
+    if hasattr(output, "worker_outputs"):
+        results = [str(wo.result) for wo in output.worker_outputs if hasattr(wo, "result")]
+        return "\n\n".join(results) if results else None
+    if isinstance(output, dict):
+        if "output" in output:
+            return str(output["output"])
+        if "result" in output:
+            return str(output["result"])
+    if isinstance(output, str):
+        return output
+    return None
+
+
+def upstream_budget(
+    config: dict[str, Any],
+    fixed_text: str,
+    default_tokens: int,
+    route: "RouteDecision | None" = None,
+) -> TokenBudget:
+    """Create the token budget for a star's upstream context.
+
+    The budget is the model window minus the reserved output tokens and the
+    fixed prompt text, capped at ``config["max_upstream_tokens"]``.
+
+    Args:
+        config: Star config (reads ``max_tokens`` and ``max_upstream_tokens``).
+        fixed_text: Prompt text sent regardless of upstream context.
+        default_tokens: Cap used when the star does not configure one.
+        route: Routing decision for the star's model. The window and token
+            counts follow the routed model (default: LLM_MODEL).
+
+    Returns:
+        TokenBudget for upstream items.
+    """
+    window = TokenBudget.for_model(
+        provider=route.provider if route else None,
+        model=route.model if route else None,
+        reserved_output=config.get("max_tokens"),
+    )
+    window.consume(fixed_text)
+    limit = config.get("max_upstream_tokens", default_tokens)
+    return TokenBudget(
+        min(window.remaining, limit), provider=window.provider, model=window.model
+    )
+
+
+def pack_texts(
+    texts: list[tuple[str, str]], budget: TokenBudget, priority: int = 0
+) -> list[tuple[str, str]]:
+    """Pack labelled texts into a budget, compressing large ones fairly.
+
+    Args:
+        texts: (label, text) pairs in display order.
+        budget: Budget to pack into.
+        priority: Priority assigned to all items.
+
+    Returns:
+        (label, text) pairs that fit, in their original order.
+    """
+    items = [ContextItem(text=text, priority=priority, key=label) for label, text in texts]
+    return [(item.key, item.text) for item in budget.pack(items)]
@@ -1,6 +1,11 @@
 """DocExStar - document extraction orchestrator."""
 
 import asyncio
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any
 
 from pydantic import Field
@@ -8,40 +13,81 @@ from pydantic import Field
 from astro.orchestration.models.star_types import StarType
 from astro.orchestration.stars.base import OrchestratorStar
 
+logger = logging.getLogger(__name__)
+
 if TYPE_CHECKING:
-    from astro.core.models.outputs import DocExResult  # type: ignore[attr-defined]
+    from astro.core.models.outputs import DocExResult
     from astro.orchestration.context import ConstellationContext
 
 
+# Maximum cached chunk extractions kept in-process (least recently used evicted)
+CHUNK_CACHE_SIZE = 1024
+
+# Chunk extraction results keyed by content hash, shared across runs so
+# re-running a constellation on the same file does not re-extract it
+_chunk_cache: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+
+EXTRACTION_PROMPT = """{directive_content}
+
+You are a document extraction agent. Extract relevant information from the document according to the instructions above.
+Be thorough but concise. Focus on information relevant to the user's request.
+
+Long documents are split into parts; you may be given only one part. Extract only what this part contains.
+Respond with a single JSON object mapping descriptive field names to the extracted values (strings, numbers or lists).
+Use the same field name for the same kind of information so results from different parts can be merged."""
+
+
 class DocExStar(OrchestratorStar):
     """
-    Document extraction — one worker per document.
-    Parallel execution.
+    Document extraction — documents are split into token-bounded chunks
+    along structural boundaries, chunks are extracted in parallel and the
+    per-chunk results are merged per document.
     """
 
     type: StarType = Field(default=StarType.DOCEX, frozen=True)
 
+    chunk_tokens: int = Field(
+        default=6000,
+        ge=256,
+        description="Maximum estimated tokens of document text per extraction call",
+    )
+    chunk_overlap_tokens: int = Field(
+        default=200,
+        ge=0,
+        description="Tokens of trailing context repeated at the start of the next chunk",
+    )
+    max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum concurrent extraction calls across all documents",
+    )
+
     def validate_star(self) -> list[str]:
         """Validate DocExStar configuration."""
         errors = super().validate_star()
+        if self.chunk_overlap_tokens >= self.chunk_tokens:
+            errors.append(
+                f"DocExStar '{self.id}' chunk_overlap_tokens must be smaller than chunk_tokens"
+            )
         return errors
 
     async def execute(self, context: "ConstellationContext") -> "DocExResult":
-        """Extract information from documents in parallel.
+        """Extract information from documents, chunk by chunk, in parallel.
 
         Args:
             context: Execution context with documents.
 
         Returns:
-            DocExResult with extractions from each document.
+            DocExResult with one merged extraction per document.
         """
-        from langchain_core.messages import HumanMessage, SystemMessage
+        from langchain_core.messages import HumanMessage
 
-        from astro.core.llm.utils import get_llm
-        from astro.core.models.outputs import (  # type: ignore[attr-defined]
-            DocExResult,
-            DocumentExtraction,
-        )
+        from astro.core.chunking import chunk_text
+        from astro.core.llm.caching import cacheable_system_message
+        from astro.core.llm.tokens import TokenBudget
+        from astro.core.models.outputs import DocExResult, DocumentExtraction
+        from astro.orchestration.stars.model_routing import route_star_llm
 
         # Get documents from context
         documents = context.get_documents()
@@ -52,62 +98,125 @@ class DocExStar(OrchestratorStar):
         # Get directive for extraction instructions
         directive = context.get_directive(self.directive_id)
 
+        system_prompt = EXTRACTION_PROMPT.format(directive_content=directive.content)
+        llm, route = route_star_llm(
+            self, context, directive, temperature=self.config.get("temperature", 0.2)
+        )
+        # Identical for every chunk; cached after the first call
+        system_message = cacheable_system_message(system_prompt, llm)
+        max_tokens = self.config.get("max_tokens")
+
+        # Chunks must fit the window next to the prompt and reserved output
+        window = TokenBudget.for_model(
+            provider=route.provider, model=route.model, reserved_output=max_tokens
+        )
+        window.consume(f"{system_prompt}\n{context.original_query}")
+        chunk_tokens = max(min(self.chunk_tokens, window.remaining), 256)
+        overlap_tokens = min(self.chunk_overlap_tokens, chunk_tokens // 4)
+
+        # Cache keys cover everything that determines a chunk's extraction
+        model_name = str(getattr(llm, "model", "") or getattr(llm, "model_name", ""))
+        prompt_key = f"{system_prompt}\0{context.original_query}\0{model_name}"
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def extract_chunk(
+            doc_id: str, index: int, total: int, text: str
+        ) -> tuple[dict[str, Any], bool]:
+            """Extract one chunk; returns (result, served_from_cache)."""
+            key = _cache_key(prompt_key, text)
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached, True
+
+            user_message = f"""Original request: {context.original_query}
+
+Document: {doc_id} (part {index + 1} of {total})
+
+{text}
+
+Extract the relevant information from this part of the document."""
+
+            kwargs: dict[str, Any] = {}
+            if max_tokens:
+                kwargs["max_tokens"] = max_tokens
+
+            async with semaphore:
+                response = await llm.ainvoke(
+                    [system_message, HumanMessage(content=user_message)], **kwargs
+                )
+            context.record_llm_usage(response)
+
+            raw_content = response.content if hasattr(response, "content") else str(response)
+            content = raw_content if isinstance(raw_content, str) else str(raw_content)
+            result = {"content": content, "fields": parse_extraction_fields(content)}
+            _cache_put(key, result)
+            return result, False
+
         async def extract_from_document(doc: Any) -> DocumentExtraction:
             """Extract information from a single document."""
             # Get document content and ID
             if isinstance(doc, dict):
-                doc_id = doc.get("id", str(hash(str(doc)))[:8])
                 content = doc.get("content", str(doc))
+                doc_id = doc.get("id") or _content_id(str(content))
             elif hasattr(doc, "id") and hasattr(doc, "content"):
                 doc_id = doc.id
                 content = doc.content
             else:
-                doc_id = str(hash(str(doc)))[:8]
                 content = str(doc)
+                doc_id = _content_id(content)
 
-            system_prompt = f"""{directive.content}
-
-You are a document extraction agent. Extract relevant information from the document according to the instructions above.
-Be thorough but concise. Focus on information relevant to the user's request."""
-
-            user_message = f"""Original request: {context.original_query}
-
-Document to analyze:
-{content[:10000]}  # Limit content length
-
-Extract the relevant information from this document."""
+            chunks = chunk_text(str(content), chunk_tokens, overlap_tokens)
+            results = await asyncio.gather(
+                *[
+                    extract_chunk(doc_id, chunk.index, len(chunks), chunk.text)
+                    for chunk in chunks
+                ],
+                return_exceptions=True,
+            )
 
-            llm = get_llm(temperature=0.2)
+            succeeded: list[dict[str, Any]] = []
+            errors: list[str] = []
+            cached_chunks = 0
+            for result in results:
+                if isinstance(result, BaseException):
+                    errors.append(str(result))
+                    continue
+                chunk_result, from_cache = result
+                succeeded.append(chunk_result)
+                cached_chunks += int(from_cache)
 
-            try:
-                response = llm.invoke(  # type: ignore[attr-defined]
-                    [
-                        SystemMessage(content=system_prompt),
-                        HumanMessage(content=user_message),
-                    ]
-                )
-
-                raw_content = (
-                    response.content if hasattr(response, "content") else str(response)
-                )
-                extracted = (
-                    raw_content if isinstance(raw_content, str) else str(raw_content)
-                )
+            metadata: dict[str, Any] = {
+                "source": doc_id,
+                "chunks": len(chunks),
+                "cached_chunks": cached_chunks,
+            }
 
+            if errors and not succeeded:
+                metadata["error"] = errors[0]
                 return DocumentExtraction(
                     doc_id=doc_id,
-                    extracted_content=extracted,
-                    metadata={"source": doc_id},
+                    extracted_content=f"Error extracting from document: {errors[0]}",
+                    metadata=metadata,
                 )
 
-            except Exception as e:
-                return DocumentExtraction(
-                    doc_id=doc_id,
-                    extracted_content=f"Error extracting from document: {str(e)}",
-                    metadata={"error": str(e)},
+            if errors:
+                metadata["failed_chunks"] = len(errors)
+                logger.warning(
+                    f"DocEx: {len(errors)}/{len(chunks)} chunks of {doc_id} failed: {errors[0]}"
                 )
 
-        # Execute extractions in parallel
+            fields, extracted = merge_chunk_extractions(succeeded)
+            return DocumentExtraction(
+                doc_id=doc_id,
+                extracted_content=extracted,
+                fields=fields,
+                metadata=metadata,
+            )
+
+        await context.emit_progress(f"Extracting {len(documents)} documents")
+
+        # Execute extractions in parallel (chunks share one concurrency limit)
         results = await asyncio.gather(
             *[extract_from_document(doc) for doc in documents], return_exceptions=True
         )
@@ -125,4 +234,142 @@ Extract the relevant information from this document."""
             elif isinstance(result, DocumentExtraction):
                 extractions.append(result)
 
+        total_chunks = sum(e.metadata.get("chunks", 0) for e in extractions)
+        cached = sum(e.metadata.get("cached_chunks", 0) for e in extractions)
+        logger.info(
+            f"DocEx extracted {len(extractions)} documents "
+            f"({total_chunks} chunks, {cached} from cache)"
+        )
+
         return DocExResult(documents=extractions)
+
+
+def parse_extraction_fields(content: str) -> dict[str, Any] | None:
+    """Parse the JSON object of an extraction response.
+
+    Args:
+        content: Raw model response, optionally wrapped in a code fence.
+
+    Returns:
+        Field mapping, or None if the response is not a JSON object.
+    """
+    text = content.strip()
+    fence = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fence:
+        text = fence.group(1).strip()
+    else:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        text = text[start : end + 1]
+
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def merge_chunk_extractions(
+    chunk_results: list[dict[str, Any]],
+) -> tuple[dict[str, Any], str]:
+    """Merge per-chunk extraction results into one document extraction.
+
+    Results are merged in chunk order so the output is deterministic. Fields
+    repeated across chunks (overlap, or the same fact stated twice) keep a
+    single value; differing values for one field become a list of distinct
+    values. Chunks whose response was not JSON contribute their text, with
+    repeated lines removed.
+
+    Args:
+        chunk_results: Chunk results in document order, each with ``content``
+            and ``fields`` (None for non-JSON responses).
+
+    Returns:
+        Tuple of (merged fields, rendered extraction text).
+    """
+    names: dict[str, str] = {}  # normalized name -> first spelling seen
+    values: dict[str, list[Any]] = {}
+    seen_values: dict[str, set[str]] = {}
+    text_lines: list[str] = []
+    seen_lines: set[str] = set()
+
+    for result in chunk_results:
+        fields = result.get("fields")
+        if fields is None:
+            for line in str(result.get("content", "")).splitlines():
+                normalized = _normalize(line)
+                if normalized and normalized not in seen_lines:
+                    seen_lines.add(normalized)
+                    text_lines.append(line.rstrip())
+            continue
+
+        for name, value in fields.items():
+            key = _normalize(str(name)).replace(" ", "_")
+            names.setdefault(key, str(name))
+            bucket = values.setdefault(key, [])
+            seen = seen_values.setdefault(key, set())
+            for item in value if isinstance(value, list) else [value]:
+                if item is None or item == "" or item == [] or item == {}:
+                    continue
+                fingerprint = _normalize(
+                    item if isinstance(item, str) else json.dumps(item, sort_keys=True)
+                )
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    bucket.append(item)
+
+    merged: dict[str, Any] = {}
+    for key, bucket in values.items():
+        if bucket:
+            merged[names[key]] = bucket[0] if len(bucket) == 1 else bucket
+
+    lines = [f"- {name}: {_render_value(value)}" for name, value in merged.items()]
+    if text_lines:
+        if lines:
+            lines.append("")
+        lines.extend(text_lines)
+    return merged, "\n".join(lines)
+
+
+def _render_value(value: Any) -> str:
+    """Render a merged field value for the extraction text."""
+    if isinstance(value, list):
+        return "; ".join(_render_value(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+def _normalize(text: str) -> str:
+    """Normalize text for duplicate detection (case and whitespace)."""
+    return " ".join(text.lower().split())
+
+
+def _content_id(content: str) -> str:
+    """Stable short ID for a document without one."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:8]
+
+
+def _cache_key(prompt_key: str, text: str) -> str:
+    """Content hash identifying one chunk extraction."""
+    digest = hashlib.sha256(prompt_key.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_get(key: str) -> dict[str, Any] | None:
+    """Look up a cached chunk extraction, refreshing its recency."""
+    result = _chunk_cache.get(key)
+    if result is not None:
+        _chunk_cache.move_to_end(key)
+    return result
+
+
+def _cache_put(key: str, result: dict[str, Any]) -> None:
+    """Cache a chunk extraction, evicting the least recently used."""
+    _chunk_cache[key] = result
+    _chunk_cache.move_to_end(key)
+    while len(_chunk_cache) > CHUNK_CACHE_SIZE:
+        _chunk_cache.popitem(last=False)
@@ -1,7 +1,6 @@
 """EvalStar - evaluates results and routes execution."""
 
-import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pydantic import Field
 
@@ -9,10 +8,14 @@ from astro.orchestration.models.star_types import StarType
 from astro.orchestration.stars.base import AtomicStar
 
 if TYPE_CHECKING:
-    from astro.core.models.outputs import EvalDecision  # type: ignore[attr-defined]
+    from astro.core.models.outputs import EvalDecision
     from astro.orchestration.context import ConstellationContext
 
 
+# Default token cap for execution results (override with config["max_upstream_tokens"])
+DEFAULT_RESULTS_TOKENS = 6000
+
+
 class EvalStar(AtomicStar):
     """
     Evaluates results against original intent.
@@ -29,6 +32,12 @@ class EvalStar(AtomicStar):
         le=20,
         description="Maximum iterations for tool calling during evaluation",
     )
+    max_reasks: int = Field(
+        default=1,
+        ge=0,
+        le=3,
+        description="Follow-up calls allowed when the decision does not match the schema",
+    )
 
     def validate_star(self) -> list[str]:
         """Validate EvalStar configuration."""
@@ -46,14 +55,25 @@ class EvalStar(AtomicStar):
         Returns:
             EvalDecision with continue/loop decision.
         """
-        from langchain_core.messages import HumanMessage, SystemMessage
-
-        from astro.core.llm.utils import get_llm
-        from astro.core.models.outputs import (  # type: ignore[attr-defined]
-            EvalDecision,
-            Plan,
+        from astro.core.llm.routing import get_router
+        from astro.core.llm.structured import StructuredOutputError
+        from astro.core.models.outputs import EvalDecision, Plan
+        from astro.orchestration.stars.context_packing import (
+            pack_texts,
+            upstream_budget,
         )
-        from astro.orchestration.stars.tool_support import execute_with_tools
+        from astro.orchestration.stars.model_routing import (
+            escalate_star_llm,
+            route_star_llm,
+        )
+
+        # A loop would re-run planning and execution; near the run budget
+        # accept the current results without spending an evaluation call
+        if context.budget_degraded:
+            return EvalDecision(
+                decision="continue",
+                reasoning="Run budget nearly exhausted; continuing with current results",
+            )
 
         # Get directive
         directive = context.get_directive(self.directive_id)
@@ -69,17 +89,34 @@ class EvalStar(AtomicStar):
 
         # Collect execution results from direct upstream only
         direct_upstream = context.get_direct_upstream_outputs()
-        results_parts: list[str] = []
+        result_texts: list[tuple[str, str]] = []
         for node_id, output in direct_upstream.items():
             if hasattr(output, "result"):
-                results_parts.append(f"- {node_id}: {output.result[:500]}")
+                result_texts.append((node_id, str(output.result)))
             elif hasattr(output, "worker_outputs"):
                 for i, wo in enumerate(output.worker_outputs):
                     status = wo.status if hasattr(wo, "status") else "unknown"
-                    result = wo.result[:300] if hasattr(wo, "result") else "no result"
-                    results_parts.append(f"- Worker {i+1} ({status}): {result}")
+                    result = wo.result if hasattr(wo, "result") else "no result"
+                    result_texts.append((f"Worker {i+1} ({status})", str(result)))
             elif hasattr(output, "formatted_result"):
-                results_parts.append(f"- {node_id}: {output.formatted_result[:500]}")
+                result_texts.append((node_id, str(output.formatted_result)))
+
+        # Fast tier by default; escalated to the strong tier when the output
+        # fails validation or reports low confidence
+        temperature = self.config.get("temperature", 0.2)
+        llm, route = route_star_llm(self, context, directive, temperature=temperature)
+
+        # Pack results into a token budget, compressing long ones evenly
+        results_budget = upstream_budget(
+            self.config,
+            f"{directive.content}\n{context.original_query}\n{success_criteria}",
+            DEFAULT_RESULTS_TOKENS,
+            route,
+        )
+        results_parts = [
+            f"- {label}: {text}"
+            for label, text in pack_texts(result_texts, results_budget)
+        ]
 
         results_summary = (
             "\n".join(results_parts) if results_parts else "No results available"
@@ -101,60 +138,113 @@ You are an evaluation agent. Your job is to assess whether the execution results
 Respond with JSON in this exact format:
 {{
     "decision": "continue",  // or "loop" if results are inadequate
-    "reasoning": "Explanation for your decision"
+    "reasoning": "Explanation for your decision",
+    "confidence": 0.9  // how sure you are of the decision, 0-1
 }}
 
 - Choose "continue" if the results adequately address the original request
 - Choose "loop" if the results are incomplete, incorrect, or need improvement
 - Be pragmatic - minor imperfections are acceptable if the core request is satisfied
-- Consider the loop count: we've already looped {context.loop_count} times"""
+- Consider the loop count given with the results"""
 
+        # The loop count lives in the user message so the system prompt stays
+        # byte-identical across loops and can be served from the prompt cache
         user_message = f"""Original request: {context.original_query}
 
 Success criteria: {success_criteria}
 
+Loop count: we've already looped {context.loop_count} times
+
 Execution results:
 {results_summary}
 
 Evaluate these results. Should we continue to finalization or loop back for improvements?"""
 
-        llm = get_llm(temperature=0.2)
+        try:
+            decision: EvalDecision | None = None
+            escalate_reason: str | None = None
+            try:
+                decision = await self._evaluate(
+                    llm, system_prompt, user_message, resolved_probes, context
+                )
+                if get_router().should_escalate(decision.confidence):
+                    escalate_reason = f"low confidence ({decision.confidence})"
+            except StructuredOutputError as e:
+                escalate_reason = f"invalid output ({e})"
+
+            if escalate_reason:
+                escalation = escalate_star_llm(context, route, escalate_reason, temperature)
+                if escalation is not None:
+                    decision = await self._evaluate(
+                        escalation[0], system_prompt, user_message, resolved_probes, context
+                    )
+
+            if decision is None:
+                raise StructuredOutputError(escalate_reason or "no decision")
+
+            # Runner determines the loop target
+            decision.loop_target = None
+            return decision
+
+        except Exception as e:
+            # Default to continue on error
+            return EvalDecision(
+                decision="continue",
+                reasoning=f"Evaluation error ({str(e)}), defaulting to continue",
+            )
+
+    async def _evaluate(
+        self,
+        llm: Any,
+        system_prompt: str,
+        user_message: str,
+        probe_ids: list[str],
+        context: "ConstellationContext",
+    ) -> "EvalDecision":
+        """Run one evaluation (optional tool loop, then structured decision).
+
+        Args:
+            llm: LangChain chat model.
+            system_prompt: Evaluation system prompt.
+            user_message: Results and success criteria.
+            probe_ids: Probes available for verification.
+            context: Execution context.
+
+        Returns:
+            Validated EvalDecision.
+
+        Raises:
+            StructuredOutputError: If no valid decision is produced.
+        """
+        from langchain_core.messages import HumanMessage
+
+        from astro.core.llm.caching import cacheable_system_message
+        from astro.core.llm.structured import invoke_structured
+        from astro.core.models.outputs import EvalDecision
+        from astro.orchestration.stars.tool_support import execute_with_tools
 
         messages = [
-            SystemMessage(content=system_prompt),
+            cacheable_system_message(system_prompt, llm),
             HumanMessage(content=user_message),
         ]
 
-        try:
-            # Execute with tool support
-            content, tool_calls, iterations = await execute_with_tools(
-                llm=llm,  # type: ignore[arg-type]
+        draft = None
+        if probe_ids:
+            # Verify with tools; the final answer is the draft decision
+            draft, tool_calls, iterations = await execute_with_tools(
+                llm=llm,
                 messages=messages,
-                probe_ids=resolved_probes,
+                probe_ids=probe_ids,
                 max_iterations=self.max_tool_iterations,
+                context=context,
             )
 
-            # Parse JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            eval_data = json.loads(content.strip())
-
-            decision = eval_data.get("decision", "continue").lower()
-            if decision not in ("continue", "loop"):
-                decision = "continue"
-
-            return EvalDecision(
-                decision=decision,
-                reasoning=eval_data.get("reasoning", ""),
-                loop_target=None,  # Runner determines the target
-            )
-
-        except Exception as e:
-            # Default to continue on error
-            return EvalDecision(
-                decision="continue",
-                reasoning=f"Evaluation error ({str(e)}), defaulting to continue",
-            )
+        # Schema-constrained output, validated against the EvalDecision model
+        return await invoke_structured(
+            llm,
+            messages,
+            EvalDecision,
+            draft=draft,
+            max_reasks=self.max_reasks,
+            context=context,
+        )
@@ -9,7 +9,7 @@ from astro.orchestration.models.star_types import StarType
 from astro.orchestration.stars.base import OrchestratorStar
 
 if TYPE_CHECKING:
-    from astro.core.models.outputs import ExecutionResult  # type: ignore[attr-defined]
+    from astro.core.models.outputs import ExecutionResult
     from astro.orchestration.context import ConstellationContext
 
 
@@ -41,7 +41,7 @@ class ExecutionStar(OrchestratorStar):
         Returns:
             ExecutionResult with worker outputs.
         """
-        from astro.core.models.outputs import (  # type: ignore[attr-defined]
+        from astro.core.models.outputs import (
             ExecutionResult,
             Plan,
             WorkerOutput,
@@ -87,11 +87,19 @@ class ExecutionStar(OrchestratorStar):
                     node_outputs=context.node_outputs,
                     tool_result_cache=context.tool_result_cache,
                     loop_count=context.loop_count,
+                    budget=context.budget,
+                    started_at=context.started_at,
                     foundry=context.foundry,
                     stream=context.stream,
                     current_node_id=context.current_node_id,
                     current_node_name=context.current_node_name,
                 )
+                # Pydantic copies dict fields on validation; re-attach the
+                # shared containers so cache entries, LLM usage and routing
+                # decisions land on the parent context
+                task_context.tool_result_cache = context.tool_result_cache
+                task_context.llm_usage = context.llm_usage
+                task_context.routing_decisions = context.routing_decisions
 
                 # Execute the worker
                 if hasattr(star, "execute"):
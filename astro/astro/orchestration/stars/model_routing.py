@@ -0,0 +1,88 @@
+"""Model tier routing for AtomicStars.
+
+Resolves each star's chat model through the core ModelRouter and records the
+decision on the run context so it appears in run telemetry. While the run
+budget is degraded, unpinned calls use the fast tier and are not escalated.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from astro.core.llm.routing import RouteDecision
+    from astro.orchestration.context import ConstellationContext
+    from astro.orchestration.stars.base import BaseStar
+
+
+def route_star_llm(
+    star: "BaseStar",
+    context: "ConstellationContext",
+    directive: Any = None,
+    temperature: float = 0,
+    max_tokens: int | None = None,
+) -> tuple[Any, "RouteDecision"]:
+    """Choose and create the chat model for a star.
+
+    Reads ``config["model"]`` (explicit pin) and ``config["latency_slo_ms"]``
+    (falling back to the run variable of the same name), plus the directive's
+    tags.
+
+    Args:
+        star: The executing star.
+        context: Execution context (routing telemetry).
+        directive: The star's directive, if loaded.
+        temperature: Sampling temperature.
+        max_tokens: Output token cap set on the model (None = model default).
+
+    Returns:
+        Tuple of (LangChain chat model, routing decision).
+    """
+    from astro.core.llm.routing import get_router
+
+    router = get_router()
+    tags = getattr(directive, "tags", None)
+    latency_slo_ms = star.config.get(
+        "latency_slo_ms", context.variables.get("latency_slo_ms")
+    )
+    decision = router.route(
+        star.type.value,
+        tags=tags if isinstance(tags, list) else None,
+        latency_slo_ms=latency_slo_ms,
+        model=star.config.get("model"),
+    )
+    if context.budget_degraded and not star.config.get("model"):
+        decision = router.downgrade(decision, "run budget degraded") or decision
+    context.record_routing(decision)
+    return router.get_llm(decision, temperature, max_tokens), decision
+
+
+def escalate_star_llm(
+    context: "ConstellationContext",
+    decision: "RouteDecision",
+    reason: str,
+    temperature: float = 0,
+    max_tokens: int | None = None,
+) -> tuple[Any, "RouteDecision"] | None:
+    """Escalate a star's fast-tier model to the strong tier.
+
+    Args:
+        context: Execution context (routing telemetry).
+        decision: The current routing decision.
+        reason: Why the fast-tier result was rejected.
+        temperature: Sampling temperature.
+        max_tokens: Output token cap set on the model (None = model default).
+
+    Returns:
+        Tuple of (strong-tier chat model, decision), or None if the policy
+        does not allow escalation from this decision or the run budget is
+        degraded.
+    """
+    from astro.core.llm.routing import get_router
+
+    if context.budget_degraded:
+        return None
+    router = get_router()
+    escalated = router.escalate(decision, reason)
+    if escalated is None:
+        return None
+    context.record_routing(escalated)
+    return router.get_llm(escalated, temperature, max_tokens), escalated
@@ -1,7 +1,6 @@
 """PlanningStar - generates structured execution plans."""
 
-import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pydantic import Field
 
@@ -9,10 +8,14 @@ from astro.orchestration.models.star_types import StarType
 from astro.orchestration.stars.base import AtomicStar
 
 if TYPE_CHECKING:
-    from astro.core.models.outputs import Plan  # type: ignore[attr-defined]
+    from astro.core.models.outputs import Plan
     from astro.orchestration.context import ConstellationContext
 
 
+# Default token cap for upstream context (override with config["max_upstream_tokens"])
+DEFAULT_CONTEXT_TOKENS = 2000
+
+
 class PlanningStar(AtomicStar):
     """
     Generates structured execution plan.
@@ -29,6 +32,12 @@ class PlanningStar(AtomicStar):
         le=20,
         description="Maximum iterations for tool calling during planning",
     )
+    max_reasks: int = Field(
+        default=1,
+        ge=0,
+        le=3,
+        description="Follow-up calls allowed when the plan does not match the schema",
+    )
 
     def validate_star(self) -> list[str]:
         """Validate PlanningStar configuration."""
@@ -45,11 +54,16 @@ class PlanningStar(AtomicStar):
         Returns:
             Plan with tasks to execute.
         """
-        from langchain_core.messages import HumanMessage, SystemMessage
-
-        from astro.core.llm.utils import get_langchain_llm
-        from astro.core.models.outputs import Plan, Task  # type: ignore[attr-defined]
-        from astro.orchestration.stars.tool_support import execute_with_tools
+        from astro.core.llm.structured import StructuredOutputError
+        from astro.core.models.outputs import Plan, Task
+        from astro.orchestration.stars.context_packing import (
+            pack_texts,
+            upstream_budget,
+        )
+        from astro.orchestration.stars.model_routing import (
+            escalate_star_llm,
+            route_star_llm,
+        )
 
         # Get directive for system prompt
         directive = context.get_directive(self.directive_id)
@@ -90,6 +104,14 @@ Output your plan as JSON with this structure:
 
 Keep the plan focused and actionable. Each task should be completable by a single worker."""
 
+        # Get LangChain LLM for tool calling support - use temperature from config
+        temperature = self.config.get("temperature", 0.3)
+        # max_tokens is set on the model so the structured plan call is capped too
+        max_tokens = self.config.get("max_tokens")
+        llm, route = route_star_llm(
+            self, context, directive, temperature=temperature, max_tokens=max_tokens
+        )
+
         # Build user message
         user_parts = [f"User's request: {context.original_query}"]
 
@@ -104,66 +126,42 @@ Keep the plan focused and actionable. Each task should be completable by a singl
         # Include any upstream context (e.g., from DocEx)
         if context.node_outputs:
             user_parts.append("\nContext from previous steps:")
+            previous_results: list[tuple[str, str]] = []
             for output in context.node_outputs.values():
                 if hasattr(output, "documents"):
                     user_parts.append(f"- Documents available: {len(output.documents)}")
                 elif hasattr(output, "result"):
-                    user_parts.append(f"- Previous result: {str(output.result)[:300]}")
-
-        user_message = "\n".join(user_parts)
-
-        # Get LangChain LLM for tool calling support - use temperature from config
-        temperature = self.config.get("temperature", 0.3)
-        llm = get_langchain_llm(temperature=temperature)
+                    previous_results.append(("Previous result", str(output.result)))
 
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_message),
-        ]
-
-        try:
-            # Execute with tool support (and optional max_tokens from config)
-            max_tokens = self.config.get("max_tokens")
-            content, tool_calls, iterations = await execute_with_tools(
-                llm=llm,
-                messages=messages,
-                probe_ids=resolved_probes,
-                max_iterations=self.max_tool_iterations,
-                max_tokens=max_tokens,
+            budget = upstream_budget(
+                self.config,
+                f"{system_prompt}\n" + "\n".join(user_parts),
+                DEFAULT_CONTEXT_TOKENS,
+                route,
             )
+            for label, text in pack_texts(previous_results, budget):
+                user_parts.append(f"- {label}: {text}")
 
-            # Parse JSON response
-            # Handle markdown code blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            plan_data = json.loads(content.strip())
+        user_message = "\n".join(user_parts)
 
-            # Build Plan object
-            tasks: list[Task] = []
-            for task_data in plan_data.get("tasks", []):
-                tasks.append(
-                    Task(
-                        id=task_data.get("id", f"task_{len(tasks)+1}"),
-                        description=task_data.get("description", ""),
-                        directive_id=task_data.get("directive_id"),
-                        dependencies=task_data.get("dependencies", []),
-                        metadata=task_data.get("metadata", {}),
-                    )
+        try:
+            try:
+                return await self._plan(
+                    llm, system_prompt, user_message, resolved_probes, context
+                )
+            except StructuredOutputError as e:
+                # A fast-tier plan that fails validation is retried on the strong tier
+                escalation = escalate_star_llm(
+                    context, route, f"invalid output ({e})", temperature, max_tokens
+                )
+                if escalation is None:
+                    raise
+                return await self._plan(
+                    escalation[0], system_prompt, user_message, resolved_probes, context
                 )
 
-            return Plan(
-                tasks=tasks,
-                context=plan_data.get("context", ""),
-                success_criteria=plan_data.get(
-                    "success_criteria", "All tasks completed successfully"
-                ),
-            )
-
-        except json.JSONDecodeError:
-            # Fallback: create a single task from the response
+        except StructuredOutputError:
+            # Fallback: create a single task from the request
             return Plan(
                 tasks=[
                     Task(
@@ -185,3 +183,60 @@ Keep the plan focused and actionable. Each task should be completable by a singl
                 context=f"Error during planning: {str(e)}",
                 success_criteria="Task completed despite planning error",
             )
+
+    async def _plan(
+        self,
+        llm: Any,
+        system_prompt: str,
+        user_message: str,
+        probe_ids: list[str],
+        context: "ConstellationContext",
+    ) -> "Plan":
+        """Run one planning pass (optional tool loop, then structured plan).
+
+        Args:
+            llm: LangChain chat model.
+            system_prompt: Planning system prompt.
+            user_message: Request and upstream context.
+            probe_ids: Probes available for gathering context.
+            context: Execution context.
+
+        Returns:
+            Validated Plan.
+
+        Raises:
+            StructuredOutputError: If no valid plan is produced.
+        """
+        from langchain_core.messages import HumanMessage
+
+        from astro.core.llm.caching import cacheable_system_message
+        from astro.core.llm.structured import invoke_structured
+        from astro.core.models.outputs import Plan
+        from astro.orchestration.stars.tool_support import execute_with_tools
+
+        messages = [
+            cacheable_system_message(system_prompt, llm),
+            HumanMessage(content=user_message),
+        ]
+
+        draft = None
+        if probe_ids:
+            # Gather context with tools; the final answer is the draft plan
+            draft, tool_calls, iterations = await execute_with_tools(
+                llm=llm,
+                messages=messages,
+                probe_ids=probe_ids,
+                max_iterations=self.max_tool_iterations,
+                context=context,
+                max_tokens=self.config.get("max_tokens"),
+            )
+
+        # Schema-constrained output, validated against the Plan model
+        return await invoke_structured(
+            llm,
+            messages,
+            Plan,
+            draft=draft,
+            max_reasks=self.max_reasks,
+            context=context,
+        )
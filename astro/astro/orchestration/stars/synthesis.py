@@ -1,5 +1,7 @@
 """SynthesisStar - aggregates outputs from multiple upstream Stars."""
 
+import asyncio
+import logging
 from typing import TYPE_CHECKING, Any
 
 from pydantic import Field
@@ -7,16 +9,37 @@ from pydantic import Field
 from astro.orchestration.models.star_types import StarType
 from astro.orchestration.stars.base import AtomicStar
 
+logger = logging.getLogger(__name__)
+
 if TYPE_CHECKING:
-    from astro.core.models.outputs import SynthesisOutput  # type: ignore[attr-defined]
+    from astro.core.models.outputs import SynthesisOutput
     from astro.orchestration.context import ConstellationContext
 
 
+# Default token cap for upstream outputs (override with config["max_upstream_tokens"])
+DEFAULT_UPSTREAM_TOKENS = 60_000
+
+# Upper bound on reduce levels; each level divides the item count by fan-in
+MAX_REDUCE_LEVELS = 5
+
+MAP_SYSTEM_PROMPT = """{directive_content}
+
+You are summarizing one group of intermediate results that will later be combined with other groups into a final synthesis.
+- Preserve every concrete finding, figure, name and source; drop repetition and filler
+- Keep disagreements between results visible rather than resolving them
+- Do not add information that is not present in the inputs
+- Be concise: your summary must stay under {max_tokens} tokens"""
+
+
 class SynthesisStar(AtomicStar):
     """
     Aggregates outputs from multiple upstream Stars.
     Can use probes/tools for output formatting and delivery
     (e.g., PDF generation, Slack posting, external storage).
+
+    When the upstream outputs exceed the token threshold, they are first
+    summarized in parallel groups and reduced hierarchically (map-reduce)
+    before the final synthesis call.
     """
 
     type: StarType = Field(default=StarType.SYNTHESIS, frozen=True)
@@ -28,6 +51,24 @@ class SynthesisStar(AtomicStar):
         le=20,
         description="Maximum iterations for tool calling during synthesis",
     )
+    map_reduce_fan_in: int = Field(
+        default=8,
+        ge=2,
+        le=50,
+        description="Number of outputs (or summaries) combined per map/reduce call",
+    )
+    map_reduce_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum concurrent LLM calls during map/reduce",
+    )
+    map_reduce_threshold_tokens: int | None = Field(
+        default=None,
+        ge=0,
+        description="Estimated upstream tokens above which map-reduce synthesis is "
+        "used. Defaults to the upstream token budget.",
+    )
 
     def validate_star(self) -> list[str]:
         """Validate SynthesisStar configuration."""
@@ -44,12 +85,17 @@ class SynthesisStar(AtomicStar):
         Returns:
             SynthesisOutput with formatted result.
         """
-        from langchain_core.messages import HumanMessage, SystemMessage
-
-        from astro.core.llm.utils import get_langchain_llm
-        from astro.core.models.outputs import (  # type: ignore[attr-defined]
-            SynthesisOutput,
+        from astro.core.llm.caching import (
+            cacheable_human_message,
+            cacheable_system_message,
         )
+        from astro.core.models.outputs import SynthesisOutput
+        from astro.orchestration.stars.context_packing import (
+            output_text,
+            pack_texts,
+            upstream_budget,
+        )
+        from astro.orchestration.stars.model_routing import route_star_llm
         from astro.orchestration.stars.tool_support import execute_with_tools
 
         # Get directive for formatting instructions
@@ -63,11 +109,10 @@ class SynthesisStar(AtomicStar):
         # NOTE: Synthesis stars need ALL node outputs (not just direct upstream)
         # to create comprehensive reports combining all analyst inputs
         sources: list[str] = []
-        upstream_content_parts: list[str] = []
+        upstream_texts: list[tuple[str, str]] = []
 
-        # Use all node_outputs for synthesis (special case - needs full context)
-        # Truncate each output to avoid bloated context (configurable, default 3000 chars)
-        max_upstream_length = self.config.get("max_upstream_length", 3000)
+        # Legacy per-output character cap, only applied when configured
+        max_upstream_length = self.config.get("max_upstream_length")
 
         all_outputs = context.node_outputs
         for node_id, output in all_outputs.items():
@@ -77,54 +122,26 @@ class SynthesisStar(AtomicStar):
 
             sources.append(node_id)
 
-            if hasattr(output, "result"):
-                content = output.result[:max_upstream_length]
-                truncated = "..." if len(output.result) > max_upstream_length else ""
-                upstream_content_parts.append(
-                    f"## Output from {node_id}\n{content}{truncated}"
-                )
-            elif hasattr(output, "formatted_result"):
-                content = output.formatted_result[:max_upstream_length]
-                truncated = (
-                    "..." if len(output.formatted_result) > max_upstream_length else ""
-                )
-                upstream_content_parts.append(
-                    f"## Output from {node_id}\n{content}{truncated}"
-                )
-            elif hasattr(output, "worker_outputs"):
+            if hasattr(output, "worker_outputs"):
                 # ExecutionResult
                 for i, wo in enumerate(output.worker_outputs):
                     if hasattr(wo, "result"):
-                        content = wo.result[:max_upstream_length]
-                        truncated = (
-                            "..." if len(wo.result) > max_upstream_length else ""
-                        )
-                        upstream_content_parts.append(
-                            f"## Worker {i+1} output\n{content}{truncated}"
-                        )
-            elif isinstance(output, dict):
-                if "output" in output:
-                    content = str(output["output"])[:max_upstream_length]
-                    truncated = (
-                        "..."
-                        if len(str(output["output"])) > max_upstream_length
-                        else ""
-                    )
-                    upstream_content_parts.append(
-                        f"## Output from {node_id}\n{content}{truncated}"
-                    )
-                elif "result" in output:
-                    content = str(output["result"])[:max_upstream_length]
-                    truncated = (
-                        "..."
-                        if len(str(output["result"])) > max_upstream_length
-                        else ""
-                    )
-                    upstream_content_parts.append(
-                        f"## Output from {node_id}\n{content}{truncated}"
-                    )
-
-        upstream_content = "\n\n".join(upstream_content_parts)
+                        upstream_texts.append((f"Worker {i+1} output", str(wo.result)))
+            else:
+                text = output_text(output)
+                if text is not None:
+                    upstream_texts.append((f"Output from {node_id}", text))
+
+        if max_upstream_length:
+            upstream_texts = [
+                (
+                    label,
+                    text[:max_upstream_length] + "..."
+                    if len(text) > max_upstream_length
+                    else text,
+                )
+                for label, text in upstream_texts
+            ]
 
         # Build tool instructions if probes are available
         tool_instructions = ""
@@ -147,23 +164,54 @@ Guidelines:
 - If there are conflicting outputs, acknowledge and reconcile them
 - Present the most important findings first"""
 
-        user_message = f"""Original request: {context.original_query}
+        # Get LangChain LLM for tool calling support (strong tier by default)
+        temperature = self.config.get("temperature", 0.3)
+        llm, route = route_star_llm(self, context, directive, temperature=temperature)
+
+        # Pack upstream outputs into what is left of the routed model's context
+        # window after the prompt and reserved output, compressing each output
+        # fairly
+        budget = upstream_budget(
+            self.config,
+            f"{system_prompt}\n{context.original_query}\n{context.constellation_purpose}",
+            DEFAULT_UPSTREAM_TOKENS,
+            route,
+        )
 
-Goal: {context.constellation_purpose}
+        # Large fan-outs are first reduced to group summaries in parallel
+        map_reduce_stats: dict[str, Any] | None = None
+        threshold = (
+            self.map_reduce_threshold_tokens
+            if self.map_reduce_threshold_tokens is not None
+            else budget.max_tokens
+        )
+        estimated_tokens = sum(budget.count(text) for _, text in upstream_texts)
+        if estimated_tokens > threshold and len(upstream_texts) > 1:
+            upstream_texts, map_reduce_stats = await self._map_reduce(
+                llm, directive.content, context, upstream_texts, budget, threshold
+            )
 
-Here are the outputs from the execution steps that need to be synthesized:
+        upstream_content = "\n\n".join(
+            f"## {label}\n{text}" for label, text in pack_texts(upstream_texts, budget)
+        )
 
-{upstream_content}
+        upstream_message = f"""Original request: {context.original_query}
 
-Please synthesize these outputs into a clear, comprehensive final result."""
+Goal: {context.constellation_purpose}
 
-        # Get LangChain LLM for tool calling support - use temperature from config
-        temperature = self.config.get("temperature", 0.3)
-        llm = get_langchain_llm(temperature=temperature)
+Here are the outputs from the execution steps that need to be synthesized:
 
+{upstream_content}"""
+
+        # Directive prompt and upstream outputs are re-sent on every tool
+        # iteration; mark both as cacheable prefixes
         messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_message),
+            cacheable_system_message(system_prompt, llm),
+            cacheable_human_message(
+                upstream_message,
+                "Please synthesize these outputs into a clear, comprehensive final result.",
+                llm,
+            ),
         ]
 
         try:
@@ -174,6 +222,7 @@ Please synthesize these outputs into a clear, comprehensive final result."""
                 messages=messages,
                 probe_ids=resolved_probes,
                 max_iterations=self.max_tool_iterations,
+                context=context,
                 max_tokens=max_tokens,
             )
 
@@ -196,6 +245,8 @@ Please synthesize these outputs into a clear, comprehensive final result."""
                     for tc in tool_calls
                 ]
                 metadata["tool_iterations"] = iterations
+            if map_reduce_stats:
+                metadata["map_reduce"] = map_reduce_stats
 
             return SynthesisOutput(
                 formatted_result=result,
@@ -212,3 +263,113 @@ Please synthesize these outputs into a clear, comprehensive final result."""
                 sources=sources,
                 metadata={"error": str(e)},
             )
+
+    async def _map_reduce(
+        self,
+        llm: Any,
+        directive_content: str,
+        context: "ConstellationContext",
+        texts: list[tuple[str, str]],
+        budget: Any,
+        threshold: int,
+    ) -> tuple[list[tuple[str, str]], dict[str, Any]]:
+        """Reduce upstream outputs to group summaries until they fit.
+
+        Outputs are split into contiguous groups of ``map_reduce_fan_in`` and
+        each group is summarized in parallel (bounded by
+        ``map_reduce_concurrency``). Summaries are capped so that one group of
+        summaries fits the budget again, and the step repeats on the
+        summaries until their total is under ``threshold``.
+
+        Args:
+            llm: LangChain chat model.
+            directive_content: Directive prompt, prepended to map instructions.
+            context: Execution context (progress events, usage accounting).
+            texts: (label, text) upstream outputs in display order.
+            budget: Upstream TokenBudget; its size bounds each map call's input.
+            threshold: Target total tokens for the reduced outputs.
+
+        Returns:
+            Tuple of (reduced (label, text) pairs, map-reduce statistics).
+        """
+        from astro.core.llm.caching import cacheable_system_message
+        from astro.core.llm.tokens import TokenBudget
+        from astro.orchestration.stars.context_packing import pack_texts
+
+        semaphore = asyncio.Semaphore(self.map_reduce_concurrency)
+        fan_in = self.map_reduce_fan_in
+        # One reduce group of summaries must fit the budget again
+        summary_tokens = max(256, budget.max_tokens // fan_in)
+        system_message = cacheable_system_message(
+            MAP_SYSTEM_PROMPT.format(
+                directive_content=directive_content, max_tokens=summary_tokens
+            ),
+            llm,
+        )
+
+        stats: dict[str, Any] = {"input_items": len(texts), "levels": 0, "map_calls": 0}
+        items = texts
+
+        async def summarize(
+            level: int, index: int, group: list[tuple[str, str]]
+        ) -> tuple[str, str]:
+            from langchain_core.messages import HumanMessage
+
+            from astro.core.llm.tokens import truncate_to_tokens
+
+            labels = ", ".join(label for label, _ in group)
+            label = f"Summary {level}.{index + 1} ({len(group)} results)"
+
+            # Each call gets the full upstream budget, shared fairly in-group
+            group_budget = TokenBudget(budget.max_tokens)
+            body = "\n\n".join(
+                f"## {item_label}\n{text}"
+                for item_label, text in pack_texts(group, group_budget)
+            )
+            messages = [
+                system_message,
+                HumanMessage(
+                    content=f"Original request: {context.original_query}\n\n"
+                    f"Results to summarize:\n\n{body}"
+                ),
+            ]
+
+            async with semaphore:
+                try:
+                    response = await llm.ainvoke(messages, max_tokens=summary_tokens)
+                    context.record_llm_usage(response)
+                    content = getattr(response, "content", response)
+                    summary = content if isinstance(content, str) else str(content)
+                except Exception as e:
+                    # Degrade to a truncated excerpt rather than losing the group
+                    logger.warning(f"Map-reduce summary failed for {labels}: {e}")
+                    summary = truncate_to_tokens(body, summary_tokens)
+            return label, summary
+
+        while len(items) > 1 and stats["levels"] < MAX_REDUCE_LEVELS:
+            total = sum(budget.count(text) for _, text in items)
+            if total <= threshold:
+                break
+
+            stats["levels"] += 1
+            level = stats["levels"]
+            groups = [items[i : i + fan_in] for i in range(0, len(items), fan_in)]
+            await context.emit_progress(
+                f"Map-reduce synthesis level {level}: summarizing "
+                f"{len(items)} outputs in {len(groups)} groups"
+            )
+
+            items = list(
+                await asyncio.gather(
+                    *[summarize(level, i, group) for i, group in enumerate(groups)]
+                )
+            )
+            stats["map_calls"] += len(groups)
+
+        stats["output_items"] = len(items)
+        logger.info(
+            f"Map-reduce synthesis: {stats['input_items']} outputs -> "
+            f"{stats['output_items']} in {stats['levels']} levels "
+            f"({stats['map_calls']} map calls)"
+        )
+        return items, stats
@@ -5,6 +5,13 @@ from typing import TYPE_CHECKING, Any
 
 logger = logging.getLogger(__name__)
 
+# Sent when the run budget cuts a tool loop short, to get an answer from the
+# results gathered so far instead of another tool call
+BUDGET_WRAP_UP_PROMPT = (
+    "The tool budget for this run is exhausted. Do not call any more tools; "
+    "answer now using the information gathered so far."
+)
+
 if TYPE_CHECKING:
     from langchain_core.language_models import BaseChatModel
     from langchain_core.messages import BaseMessage
@@ -116,6 +123,61 @@ def execute_tool_call(
         return None, str(e)
 
 
+def record_llm_usage(context: Any | None, response: Any) -> None:
+    """Record token usage from an LLM response on the context, if supported.
+
+    Args:
+        context: Optional ConstellationContext (or any object exposing
+            record_llm_usage).
+        response: LLM response message.
+    """
+    if context is not None and hasattr(context, "record_llm_usage"):
+        context.record_llm_usage(response)
+
+
+def tool_iteration_limit(context: Any | None, max_iterations: int) -> int:
+    """Iteration cap for a tool loop, tightened while the run budget is degraded.
+
+    Args:
+        context: Optional ConstellationContext.
+        max_iterations: The star's configured iteration limit.
+
+    Returns:
+        Iterations allowed for the loop.
+    """
+    if context is not None and hasattr(context, "tool_iteration_limit"):
+        limit: int = context.tool_iteration_limit(max_iterations)
+        return limit
+    return max_iterations
+
+
+async def wrap_up_within_budget(
+    llm_with_tools: Any, messages: list["BaseMessage"], context: Any | None
+) -> str:
+    """Ask for a final answer after the run budget cut a tool loop short.
+
+    The tool-bound model is reused because providers reject tool results in
+    the history of a request that declares no tools.
+
+    Args:
+        llm_with_tools: The tool-bound chat model used by the loop.
+        messages: Conversation so far, including tool results.
+        context: Optional ConstellationContext for usage accounting.
+
+    Returns:
+        The model's answer text.
+    """
+    from langchain_core.messages import HumanMessage
+
+    logger.info("Run budget degraded: wrapping up tool loop early")
+    response = await llm_with_tools.ainvoke(
+        [*messages, HumanMessage(content=BUDGET_WRAP_UP_PROMPT)]
+    )
+    record_llm_usage(context, response)
+    content = response.content if hasattr(response, "content") else str(response)
+    return content if isinstance(content, str) else str(content)
+
+
 async def execute_with_tools(
     llm: "BaseChatModel",
     messages: list["BaseMessage"],
@@ -133,13 +195,15 @@ async def execute_with_tools(
         messages: Initial messages to send to the LLM.
         probe_ids: List of probe names allowed for tool calling.
         max_iterations: Maximum iterations for tool calling loop.
-        context: Optional ExecutionContext for tool result caching.
+        context: Optional ExecutionContext for tool result caching and
+            LLM usage accounting.
 
     Returns:
         Tuple of (final_result, list_of_tool_calls, iterations_used)
     """
     from langchain_core.messages import ToolMessage
 
+    from astro.core.llm.caching import cacheable_tools
     from astro.core.models.outputs import ToolCall
 
     tool_calls: list[ToolCall] = []
@@ -153,15 +217,16 @@ async def execute_with_tools(
         langchain_tools, probe_map = create_langchain_tools(available_probes)
 
         # Bind tools to LLM, then optionally bind max_tokens
-        llm_with_tools = llm.bind_tools(langchain_tools)
+        llm_with_tools = llm.bind_tools(cacheable_tools(langchain_tools, llm))
         if max_tokens:
             llm_with_tools = llm_with_tools.bind(max_tokens=max_tokens)
 
-        # Tool calling iteration loop
-        while iterations < max_iterations:
+        # Tool calling iteration loop (capped further if the run budget degrades)
+        while iterations < tool_iteration_limit(context, max_iterations):
             iterations += 1
 
-            response = llm_with_tools.invoke(messages)
+            response = await llm_with_tools.ainvoke(messages)
+            record_llm_usage(context, response)
 
             # Check if response has tool calls
             if hasattr(response, "tool_calls") and response.tool_calls:
@@ -224,6 +289,11 @@ async def execute_with_tools(
 
             return result, tool_calls, iterations
 
+        if iterations < max_iterations:
+            # Cut short by the run budget - answer from what was gathered
+            result = await wrap_up_within_budget(llm_with_tools, messages, context)
+            return result, tool_calls, iterations
+
         # Reached max iterations
         return "Maximum iterations reached without completion", tool_calls, iterations
 
@@ -231,9 +301,10 @@ async def execute_with_tools(
         # No tools available - simple single-shot execution
         iterations = 1
         if max_tokens:
-            response = llm.invoke(messages, max_tokens=max_tokens)
+            response = await llm.ainvoke(messages, max_tokens=max_tokens)
         else:
-            response = llm.invoke(messages)
+            response = await llm.ainvoke(messages)
+        record_llm_usage(context, response)
 
         content = response.content if hasattr(response, "content") else str(response)
         result = content if isinstance(content, str) else str(content)
@@ -15,6 +15,10 @@ if TYPE_CHECKING:
     from astro.orchestration.context import ConstellationContext
 
 
+# Default token cap for upstream context (override with config["max_upstream_tokens"])
+DEFAULT_UPSTREAM_TOKENS = 4000
+
+
 class WorkerStar(AtomicStar):
     """Generic flexible execution unit.
 
@@ -40,10 +44,20 @@ class WorkerStar(AtomicStar):
         Returns:
             WorkerOutput with the result.
         """
-        from langchain_core.messages import HumanMessage, SystemMessage
+        from langchain_core.messages import HumanMessage
 
-        from astro.core.llm.utils import get_langchain_llm
+        from astro.core.llm.caching import cacheable_system_message, cacheable_tools
         from astro.core.models.outputs import ToolCall, WorkerOutput
+        from astro.orchestration.stars.context_packing import (
+            output_text,
+            pack_texts,
+            upstream_budget,
+        )
+        from astro.orchestration.stars.model_routing import route_star_llm
+        from astro.orchestration.stars.tool_support import (
+            tool_iteration_limit,
+            wrap_up_within_budget,
+        )
 
         # Get the directive for this star
         directive = context.get_directive(self.directive_id)
@@ -66,27 +80,40 @@ class WorkerStar(AtomicStar):
         if context.constellation_purpose:
             user_message_parts.append(f"Overall goal: {context.constellation_purpose}")
 
-        # Include direct upstream outputs for context (not all prior outputs)
-        direct_upstream = context.get_direct_upstream_outputs()
-        if direct_upstream:
-            user_message_parts.append("\nContext from previous steps:")
-            for i, (node_id, output) in enumerate(direct_upstream.items()):
-                if hasattr(output, "result"):
-                    user_message_parts.append(f"- Step {i+1}: {output.result[:500]}")
-                elif hasattr(output, "formatted_result"):
-                    user_message_parts.append(
-                        f"- Step {i+1}: {output.formatted_result[:500]}"
-                    )
-                elif isinstance(output, dict) and "output" in output:
-                    user_message_parts.append(
-                        f"- Step {i+1}: {str(output['output'])[:500]}"
-                    )
-
         # Add any specific variables as context
+        variable_parts: list[str] = []
         if context.variables:
-            user_message_parts.append("\nProvided information:")
+            variable_parts.append("\nProvided information:")
             for key, value in context.variables.items():
-                user_message_parts.append(f"- {key}: {value}")
+                variable_parts.append(f"- {key}: {value}")
+
+        # Include direct upstream outputs for context (not all prior outputs),
+        # packed into a token budget instead of a fixed per-step cut-off
+        upstream_texts: list[tuple[str, str]] = []
+        for output in context.get_direct_upstream_outputs().values():
+            text = output_text(output)
+            if text is not None:
+                upstream_texts.append((f"Step {len(upstream_texts) + 1}", text))
+
+        # Use temperature from config if specified, otherwise default to 0.7
+        temperature = self.config.get("temperature", 0.7)
+
+        # Get LangChain chat model (tier chosen by the routing policy); the
+        # upstream budget is sized to the routed model's window
+        llm, route = route_star_llm(self, context, directive, temperature=temperature)
+
+        if upstream_texts:
+            budget = upstream_budget(
+                self.config,
+                "\n".join([system_prompt, *user_message_parts, *variable_parts]),
+                DEFAULT_UPSTREAM_TOKENS,
+                route,
+            )
+            user_message_parts.append("\nContext from previous steps:")
+            for label, text in pack_texts(upstream_texts, budget):
+                user_message_parts.append(f"- {label}: {text}")
+
+        user_message_parts.extend(variable_parts)
 
         user_message = (
             "\n".join(user_message_parts)
@@ -94,11 +121,9 @@ class WorkerStar(AtomicStar):
             else "Please complete the task."
         )
 
-        # Use temperature from config if specified, otherwise default to 0.7
-        temperature = self.config.get("temperature", 0.7)
-
+        # Directive content is the stable prefix; mark it for prompt caching
         messages = [
-            SystemMessage(content=system_prompt),
+            cacheable_system_message(system_prompt, llm),
             HumanMessage(content=user_message),
         ]
 
@@ -120,9 +145,6 @@ class WorkerStar(AtomicStar):
 
         # If we have tools, bind them to the LLM for tool calling
         if available_probes:
-            # Get LangChain chat model for tool calling support
-            llm = get_langchain_llm(temperature=temperature)
-
             # Convert probes to LangChain tools
             langchain_tools = []
             probe_map = {}  # name -> probe for lookup
@@ -141,17 +163,19 @@ class WorkerStar(AtomicStar):
                 probe_map[probe.name] = probe
 
             # Bind tools to LLM, then optionally bind max_tokens
-            llm_with_tools = llm.bind_tools(langchain_tools)
+            llm_with_tools = llm.bind_tools(cacheable_tools(langchain_tools, llm))
             max_tokens = self.config.get("max_tokens")
             if max_tokens:
                 llm_with_tools = llm_with_tools.bind(max_tokens=max_tokens)
 
             try:
-                # Iteration loop with tool calling
-                while iterations < self.max_iterations:
+                # Iteration loop with tool calling (capped further if the
+                # run budget degrades)
+                while iterations < tool_iteration_limit(context, self.max_iterations):
                     iterations += 1
 
-                    response = llm_with_tools.invoke(messages)
+                    response = await llm_with_tools.ainvoke(messages)
+                    context.record_llm_usage(response)
 
                     # Check if the response has tool calls
                     if hasattr(response, "tool_calls") and response.tool_calls:
@@ -239,6 +263,15 @@ class WorkerStar(AtomicStar):
                         status="completed",
                     )
 
+                if iterations < self.max_iterations:
+                    # Cut short by the run budget - answer from what was gathered
+                    return WorkerOutput(
+                        result=await wrap_up_within_budget(llm_with_tools, messages, context),
+                        tool_calls=tool_calls,
+                        iterations=iterations,
+                        status="completed",
+                    )
+
                 # Reached max iterations
                 return WorkerOutput(
                     result="Maximum iterations reached without completion",
@@ -256,16 +289,14 @@ class WorkerStar(AtomicStar):
                 )
         else:
             # No tools available - simple single-shot execution
-            # Get LangChain chat model for consistent message handling
-            llm = get_langchain_llm(temperature=temperature)
-
             try:
                 # Apply max_tokens if specified
                 max_tokens = self.config.get("max_tokens")
                 if max_tokens:
-                    response = llm.invoke(messages, max_tokens=max_tokens)
+                    response = await llm.ainvoke(messages, max_tokens=max_tokens)
                 else:
-                    response = llm.invoke(messages)
+                    response = await llm.ainvoke(messages)
+                context.record_llm_usage(response)
                 iterations = 1
 
                 content = (
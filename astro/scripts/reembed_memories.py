@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Re-embed stored memories with a new embedding model.
+
+Usage:
+    EMBEDDING_MODEL=text-embedding-3-large PYTHONPATH=. python scripts/reembed_memories.py
+
+Resumable: rerun after an interruption and it continues from its checkpoint.
+Restart the API with the same EMBEDDING_MODEL once the switch is done.
+
+Environment:
+    MONGO_URI / MONGO_DB: Database holding the memories collection.
+    EMBEDDING_MODEL: Target model (see get_embedding_provider()).
+    REEMBED_RATE: Max texts embedded per second (default: unlimited).
+    REEMBED_BATCH_SIZE: Texts per embedding call (default 64).
+    REEMBED_SWITCH: Set to "false" to only fill the shadow field.
+"""
+
+import asyncio
+import logging
+import os
+
+from astro_mongodb import MongoDBMemory, ReembeddingJob
+from astro_mongodb.reembed import DEFAULT_BATCH_SIZE
+
+from astro.core.llm.utils import get_embedding_provider
+
+# MongoDB configuration
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+DATABASE_NAME = os.getenv("MONGO_DB", "astro")
+
+
+async def reembed_memories() -> None:
+    """Run the re-embedding job and switch to the new embeddings."""
+    memory = MongoDBMemory(
+        uri=MONGO_URI,
+        database=DATABASE_NAME,
+        collection="memories",
+        # The job only writes documents; no need to load the local index
+        use_local_index=False,
+    )
+    await memory.startup()
+    try:
+        rate = os.getenv("REEMBED_RATE")
+        job = ReembeddingJob(
+            memory,
+            get_embedding_provider(),
+            batch_size=int(os.getenv("REEMBED_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))),
+            max_texts_per_s=float(rate) if rate else None,
+        )
+        print(f"Re-embedding memories with {job.model}: {await job.progress()}")
+        state = await job.run()
+        print(f"Shadow embeddings complete: {state}")
+
+        if os.getenv("REEMBED_SWITCH", "true").lower() != "false":
+            state = await job.switch()
+            print(f"Switched {state['switched']} memories ({state['stale']} still stale)")
+    finally:
+        await memory.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(reembed_memories())
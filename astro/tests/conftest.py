@@ -1,10 +1,62 @@
 """Pytest configuration for Astro tests."""
 
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
 import pytest
 
+# Recorded LLM/embedding interactions, one file per test
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "cassette(latency=..., latency_scale=..., strict=...): options for the "
+        "llm_cassette fixture",
+    )
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment() -> None:
     """Set up the test environment."""
-    # Any global test setup can go here
-    pass
+    # Keep the embedding cache in memory; tests must not write .astro/
+    os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+
+
+@pytest.fixture
+def anthropic_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Resolve LLM settings to Anthropic defaults, ignoring the local env."""
+    monkeypatch.setenv("LLM_PROVIDER", "anthropic")
+    monkeypatch.delenv("LLM_MODEL", raising=False)
+    monkeypatch.delenv("LLM_CONTEXT_WINDOW", raising=False)
+
+
+@pytest.fixture
+def llm_cassette(request: pytest.FixtureRequest) -> Iterator[Any]:
+    """Record or replay every LLM and embedding call made by a test.
+
+    The mode comes from LLM_CASSETTE_MODE ("replay" by default, "record" to
+    capture against live providers). Cassettes live in
+    tests/cassettes/<test module>/<test name>.json; replaying a test that has
+    not been recorded yet skips it. Replay is strict: a request without an
+    exact recorded match fails the test instead of taking the next recording.
+    Latency injection (and opting out with ``strict=False``) is configured with
+    ``@pytest.mark.cassette(latency=..., latency_scale=..., strict=...)``.
+    """
+    from astro.core.llm.cassette import use_cassette
+
+    mode = os.getenv("LLM_CASSETTE_MODE", "replay").lower()
+    module = request.node.module.__name__.rsplit(".", 1)[-1]
+    path = CASSETTE_DIR / module / f"{request.node.name}.json"
+    marker = request.node.get_closest_marker("cassette")
+    options = {"strict": True, **(marker.kwargs if marker else {})}
+
+    if mode == "replay" and not path.exists():
+        pytest.skip(f"No cassette recorded at {path} (run with LLM_CASSETTE_MODE=record)")
+
+    with use_cassette(path, mode, **options) as cassette:  # type: ignore[arg-type]
+        yield cassette
@@ -0,0 +1,163 @@
+"""Tests for LLM record/replay cassettes."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+from astro.core.llm.cassette import (
+    Cassette,
+    CassetteChatModel,
+    CassetteMissError,
+    cassette_chat_model,
+    cassette_embedding_provider,
+    use_cassette,
+)
+
+
+@pytest.fixture(autouse=True)
+def offline_env(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "anthropic")
+    for var in ("ANTHROPIC_API_KEY", "ANTHROPIC_BASE_URL", "OPENAI_API_KEY", "LLM_MODEL"):
+        monkeypatch.delenv(var, raising=False)
+
+
+class LiveModel:
+    """Stands in for a provider-backed chat model."""
+
+    _llm_type = "anthropic-chat"
+
+    def __init__(self):
+        self.calls = 0
+        self.tools = None
+
+    def bind_tools(self, tools, **kwargs):
+        bound = LiveModel()
+        bound.tools = tools
+        return bound
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return AIMessage(
+            content=f"answer to {messages[-1].content}",
+            usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15},
+        )
+
+
+class LiveEmbedder:
+    async def embed(self, text):
+        return [float(len(text)), 1.0]
+
+    async def embed_batch(self, texts):
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def _messages(question: str):
+    return [SystemMessage(content="Be brief."), HumanMessage(content=question)]
+
+
+def _record(path):
+    with use_cassette(path, "record") as cassette:
+        # The wrappers the factories apply in record mode
+        llm = cassette_chat_model(LiveModel(), "claude-sonnet-4", "anthropic")
+        embedder = cassette_embedding_provider(LiveEmbedder(), "text-embedding-3-small")
+
+        async def run():
+            await llm.ainvoke(_messages("q1"))
+            await llm.bind_tools([{"name": "search"}]).ainvoke(_messages("q2"))
+            await embedder.embed_batch(["alpha", "beta"])
+
+        asyncio.run(run())
+    return cassette
+
+
+def test_record_then_replay_offline_through_factories(tmp_path):
+    from astro.core.llm.utils import get_embedding_provider, get_langchain_llm
+
+    path = tmp_path / "run.json"
+    recorded = _record(path)
+    assert recorded.stats["recorded"] == 3
+    assert path.exists()
+
+    # No API keys are set: replay must not construct a provider client
+    with use_cassette(path, "replay", latency="none") as cassette:
+        llm = get_langchain_llm(model="claude-sonnet-4")
+        embedder = get_embedding_provider()
+
+        async def run():
+            # Out of order: requests are matched by content, not position
+            second = await llm.bind_tools([{"name": "search"}]).ainvoke(_messages("q2"))
+            first = await llm.ainvoke(_messages("q1"))
+            vectors = await embedder.embed_batch(["alpha", "beta"])
+            return first, second, vectors
+
+        first, second, vectors = asyncio.run(run())
+
+    assert first.content == "answer to q1"
+    assert first.usage_metadata["output_tokens"] == 3
+    assert second.content == "answer to q2"
+    assert vectors == [[5.0, 1.0], [4.0, 1.0]]
+    assert cassette.stats["exact"] == 3
+    assert llm._llm_type == "anthropic-chat"
+
+
+def test_replay_latency_injection(tmp_path):
+    path = tmp_path / "run.json"
+    _record(path)
+
+    def timed(**options):
+        cassette = Cassette(path, "replay", **options)
+        llm = CassetteChatModel(None, cassette, "claude-sonnet-4", "anthropic")
+        started = time.perf_counter()
+        asyncio.run(llm.ainvoke(_messages("q1")))
+        return time.perf_counter() - started
+
+    assert timed(latency="none") < 0.03
+    assert timed(latency="recorded") >= 0.04
+    assert timed(latency="recorded", latency_scale=3) >= 0.14
+    assert 0.1 <= timed(latency=0.1) < 0.2
+
+
+def test_unmatched_requests_fall_back_to_recorded_order_unless_strict(tmp_path):
+    path = tmp_path / "run.json"
+    _record(path)
+
+    lenient = CassetteChatModel(None, Cassette(path, "replay", latency="none"), "claude-sonnet-4")
+    reply = asyncio.run(lenient.ainvoke(_messages("q1 for run_abc123")))
+    assert reply.content == "answer to q1"
+
+    strict = CassetteChatModel(
+        None, Cassette(path, "replay", latency="none", strict=True), "claude-sonnet-4"
+    )
+    with pytest.raises(CassetteMissError):
+        asyncio.run(strict.ainvoke(_messages("q1 for run_abc123")))
+
+
+def test_structured_output_replays_from_raw_message(tmp_path):
+    class Verdict(BaseModel):
+        decision: str
+
+    class StructuredLive(LiveModel):
+        def with_structured_output(self, schema, include_raw=False, **kwargs):
+            class Runnable:
+                async def ainvoke(self, messages, **kw):
+                    raw = AIMessage(
+                        content="",
+                        tool_calls=[{"name": "Verdict", "args": {"decision": "continue"}, "id": "t1"}],
+                    )
+                    return {"raw": raw, "parsed": schema(decision="continue"), "parsing_error": None}
+
+            return Runnable()
+
+    path = tmp_path / "structured.json"
+    with use_cassette(path, "record") as cassette:
+        llm = CassetteChatModel(StructuredLive(), cassette, "claude-3-5-haiku")
+        asyncio.run(llm.with_structured_output(Verdict, include_raw=True).ainvoke(_messages("q")))
+
+    replay = CassetteChatModel(None, Cassette(path, "replay", latency="none"), "claude-3-5-haiku")
+    result = asyncio.run(replay.with_structured_output(Verdict, include_raw=True).ainvoke(_messages("q")))
+    assert result["parsed"] == Verdict(decision="continue")
+    assert result["raw"].tool_calls[0]["args"] == {"decision": "continue"}
@@ -0,0 +1,107 @@
+"""Tests for the two-tier embedding cache."""
+
+import asyncio
+import threading
+
+import pytest
+
+from astro.core.llm.embedding_cache import (
+    CachingEmbeddingProvider,
+    EmbeddingCache,
+    get_embedding_cache_stats,
+    reset_embedding_cache,
+)
+
+
+class CountingEmbedder:
+    """EmbeddingProvider stub recording what reaches the network."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    async def embed(self, text):
+        self.batches.append([text])
+        return [float(len(text)), 0.5]
+
+    async def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", "")
+    reset_embedding_cache()
+    yield
+    reset_embedding_cache()
+
+
+def test_batch_sends_only_distinct_misses():
+    embedder = CountingEmbedder()
+    provider = CachingEmbeddingProvider(embedder, "text-embedding-3-small")
+
+    async def run():
+        await provider.embed("alpha")
+        # Whitespace variants share a key; duplicates are sent once
+        return await provider.embed_batch(["alpha ", "beta", "gamma", "beta", "  alpha"])
+
+    vectors = asyncio.run(run())
+
+    assert embedder.batches == [["alpha"], ["beta", "gamma"]]
+    assert vectors == [[5.0, 0.5], [4.0, 0.5], [5.0, 0.5], [4.0, 0.5], [5.0, 0.5]]
+    stats = get_embedding_cache_stats()
+    assert (stats["requests"], stats["memory_hits"], stats["misses"]) == (4, 1, 3)
+    assert stats["hit_rate"] == 0.25
+
+
+def test_keys_include_model():
+    embedder = CountingEmbedder()
+    cache = EmbeddingCache()
+    small = CachingEmbeddingProvider(embedder, "text-embedding-3-small", cache)
+    large = CachingEmbeddingProvider(embedder, "text-embedding-3-large", cache)
+
+    asyncio.run(small.embed("alpha"))
+    asyncio.run(large.embed("alpha"))
+
+    assert len(embedder.batches) == 2
+
+
+def test_disk_tier_survives_restart_and_lru_evicts(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    first = EmbeddingCache(max_entries=2, path=path)
+    provider = CachingEmbeddingProvider(CountingEmbedder(), "m", first)
+    asyncio.run(provider.embed_batch(["a", "bb", "ccc"]))
+    assert first.stats["evictions"] == 1
+    first.close()
+
+    embedder = CountingEmbedder()
+    second = EmbeddingCache(max_entries=2, path=path)
+    vectors = asyncio.run(CachingEmbeddingProvider(embedder, "m", second).embed_batch(["ccc", "a"]))
+
+    assert vectors == [[3.0, 0.5], [1.0, 0.5]]
+    assert embedder.batches == []
+    assert second.stats["disk_hits"] == 2
+    assert path.stat().st_size < 16 * 1024  # Compact float32 blobs
+
+
+def test_disk_tier_runs_off_the_event_loop_in_wal_mode(tmp_path):
+    cache = EmbeddingCache(path=tmp_path / "cache.sqlite")
+    threads = []
+    for name in ("_read_disk", "_write_disk"):
+        method = getattr(cache, name)
+
+        def traced(arg, method=method):
+            threads.append(threading.get_ident())
+            return method(arg)
+
+        setattr(cache, name, traced)
+
+    async def run():
+        provider = CachingEmbeddingProvider(CountingEmbedder(), "m", cache)
+        await provider.embed_batch(["a", "bb"])
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert len(threads) == 2 and loop_thread not in threads
+    assert cache._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
@@ -0,0 +1,48 @@
+"""Tests for the offline hashed n-gram embedding provider."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from astro.core.llm.local_embeddings import HashedNgramEmbeddingProvider
+from astro.core.llm.utils import get_embedding_provider
+
+
+def test_embeddings_are_deterministic_unit_vectors():
+    provider = HashedNgramEmbeddingProvider(dimensions=256)
+
+    single = asyncio.run(provider.embed("Tesla Q4 revenue"))
+    batch = asyncio.run(provider.embed_batch(["Tesla Q4 revenue", "", "other"]))
+
+    assert len(single) == 256
+    assert batch[0] == single
+    assert np.linalg.norm(single) == pytest.approx(1.0, abs=1e-6)
+    assert not any(batch[1])  # No words, no features
+    # Stable across instances (no per-process hash salt)
+    assert asyncio.run(HashedNgramEmbeddingProvider(dimensions=256).embed("Tesla Q4 revenue")) == single
+
+
+def test_similar_texts_score_higher_than_unrelated():
+    provider = HashedNgramEmbeddingProvider()
+    query, near, far = provider.encode(
+        ["quarterly revenue report", "Quarterly revenues reported", "weather in Paris"]
+    )
+
+    assert float(query @ near) > 0.5
+    assert float(query @ near) > float(query @ far) + 0.3
+
+
+def test_get_embedding_provider_selects_local(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "local")
+    monkeypatch.setenv("LOCAL_EMBEDDING_DIMENSIONS", "128")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    provider = get_embedding_provider()
+
+    assert isinstance(provider, HashedNgramEmbeddingProvider)
+    assert provider.dimensions == 128
+    with pytest.raises(ValueError, match="Unknown embedding provider"):
+        get_embedding_provider(provider="word2vec")
+    with pytest.raises(ValueError, match="local provider"):
+        get_embedding_provider("text-embedding-3-small")
@@ -0,0 +1,129 @@
+"""Tests for prompt caching helpers and token usage accounting."""
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from astro.core.llm.caching import (
+    cacheable_human_message,
+    cacheable_system_message,
+    cacheable_tools,
+    supports_prompt_caching,
+)
+from astro.core.llm.usage import TokenUsage
+from astro.orchestration.context import ConstellationContext
+
+
+class FakeAnthropicLLM:
+    """Stand-in exposing the LangChain _llm_type of ChatAnthropic."""
+
+    _llm_type = "anthropic-chat"
+
+
+class FakeOpenAILLM:
+    _llm_type = "openai-chat"
+
+
+def _tool(name: str) -> StructuredTool:
+    def fn(query: str) -> str:
+        """Look something up."""
+        return query
+
+    return StructuredTool.from_function(func=fn, name=name, description=f"{name} tool")
+
+
+def test_supports_prompt_caching_by_provider(monkeypatch):
+    monkeypatch.delenv("LLM_PROMPT_CACHING", raising=False)
+    assert supports_prompt_caching(FakeAnthropicLLM())
+    assert not supports_prompt_caching(FakeOpenAILLM())
+    assert not supports_prompt_caching(object())
+
+    monkeypatch.setenv("LLM_PROMPT_CACHING", "false")
+    assert not supports_prompt_caching(FakeAnthropicLLM())
+
+
+def test_system_message_marked_for_anthropic():
+    msg = cacheable_system_message("directive", FakeAnthropicLLM())
+    assert msg.content == [
+        {"type": "text", "text": "directive", "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_system_message_plain_for_other_providers():
+    msg = cacheable_system_message("directive", FakeOpenAILLM())
+    assert msg.content == "directive"
+
+
+def test_human_message_caches_only_prefix():
+    msg = cacheable_human_message("upstream", "instruction", FakeAnthropicLLM())
+    assert msg.content[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in msg.content[1]
+
+    plain = cacheable_human_message("upstream", "instruction", FakeOpenAILLM())
+    assert plain.content == "upstream\n\ninstruction"
+
+
+def test_tools_sorted_and_last_marked():
+    tools = cacheable_tools([_tool("zeta"), _tool("alpha")], FakeAnthropicLLM())
+    assert [t["name"] for t in tools] == ["alpha", "zeta"]
+    assert "cache_control" not in tools[0]
+    assert tools[-1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_tools_sorted_without_caching():
+    tools = cacheable_tools([_tool("zeta"), _tool("alpha")], FakeOpenAILLM())
+    assert [t.name for t in tools] == ["alpha", "zeta"]
+
+
+def test_usage_from_usage_metadata():
+    response = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 1200,
+            "output_tokens": 50,
+            "total_tokens": 1250,
+            "input_token_details": {"cache_read": 1000, "cache_creation": 0},
+        },
+    )
+    usage = TokenUsage.from_response(response)
+    assert usage.input_tokens == 1200
+    assert usage.cache_read_tokens == 1000
+    assert usage.llm_calls == 1
+    assert usage.cache_hit_rate == 1000 / 1200
+
+
+def test_usage_from_raw_anthropic_metadata():
+    response = AIMessage(
+        content="ok",
+        response_metadata={
+            "usage": {
+                "input_tokens": 10,
+                "output_tokens": 5,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 900,
+            }
+        },
+    )
+    usage = TokenUsage.from_response(response)
+    assert usage.cache_creation_tokens == 900
+    assert usage.input_tokens == 910
+    assert usage.output_tokens == 5
+
+
+def test_context_accumulates_usage_per_node():
+    context = ConstellationContext(run_id="run_1", constellation_id="c1")
+    context.current_node_id = "node_a"
+    response = AIMessage(
+        content="ok",
+        usage_metadata={"input_tokens": 100, "output_tokens": 10, "total_tokens": 110},
+    )
+    context.record_llm_usage(response)
+    context.record_llm_usage(response)
+    context.current_node_id = "node_b"
+    context.record_llm_usage(response)
+
+    node_a = context.get_node_usage("node_a")
+    assert node_a is not None
+    assert node_a.llm_calls == 2
+    assert node_a.input_tokens == 200
+    assert context.get_total_usage().llm_calls == 3
+    assert context.get_node_usage("missing") is None
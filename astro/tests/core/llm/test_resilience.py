@@ -0,0 +1,173 @@
+"""Tests for retries, hedging and timeouts on provider calls."""
+
+import asyncio
+
+import pytest
+
+from astro.core.llm.resilience import (
+    ResiliencePolicy,
+    ResilientCaller,
+    ResilientChatModel,
+    RetryBudget,
+    is_retryable,
+)
+
+
+class RateLimitError(Exception):
+    """Named like the provider SDK error."""
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _policy(**overrides) -> ResiliencePolicy:
+    defaults = {"base_delay_s": 0.001, "max_delay_s": 0.002, "timeout_s": 1.0}
+    return ResiliencePolicy(**{**defaults, **overrides})
+
+
+def test_retryable_classification():
+    assert is_retryable(RateLimitError())
+    assert is_retryable(StatusError(529))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(ValueError("bad request"))
+
+
+def test_retries_transient_errors_then_succeeds():
+    caller = ResilientCaller(_policy(max_retries=3))
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError("slow down")
+        return "ok"
+
+    assert asyncio.run(caller.call("chat:m", flaky)) == "ok"
+    assert len(attempts) == 3
+    assert caller.stats["retries"] == 2
+
+
+def test_non_retryable_errors_raise_immediately():
+    caller = ResilientCaller(_policy())
+    attempts = []
+
+    async def bad():
+        attempts.append(1)
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        asyncio.run(caller.call("chat:m", bad))
+    assert len(attempts) == 1
+    assert caller.stats["failures"] == 1
+
+
+def test_timeout_is_retried():
+    caller = ResilientCaller(_policy(timeout_s=0.02, max_retries=1))
+    attempts = []
+
+    async def hangs_once():
+        attempts.append(1)
+        if len(attempts) == 1:
+            await asyncio.sleep(1)
+        return "ok"
+
+    assert asyncio.run(caller.call("chat:m", hangs_once)) == "ok"
+    assert caller.stats["timeouts"] == 1
+
+
+def test_retry_budget_limits_amplification():
+    budget = RetryBudget(ratio=0.5, min_tokens=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+    caller = ResilientCaller(_policy(max_retries=5, budget_min_tokens=1, budget_ratio=0))
+
+    async def always_down():
+        raise StatusError(503)
+
+    with pytest.raises(StatusError):
+        asyncio.run(caller.call("chat:m", always_down))
+    assert caller.stats["retries"] == 1
+    assert caller.stats["budget_exhausted"] == 1
+
+
+def test_hedge_after_p95_takes_first_response():
+    caller = ResilientCaller(_policy(hedge=True, hedge_min_samples=5))
+    for _ in range(10):
+        caller.latency.record("chat:m", 0.01)
+
+    calls = []
+
+    async def slow_then_fast():
+        calls.append(1)
+        await asyncio.sleep(0.5 if len(calls) == 1 else 0.01)
+        return f"response {len(calls)}"
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        result = await caller.call("chat:m", slow_then_fast)
+        return result, asyncio.get_running_loop().time() - started
+
+    result, elapsed = asyncio.run(run())
+    assert result == "response 2"
+    assert elapsed < 0.3
+    assert caller.stats["hedges"] == 1
+    assert caller.stats["hedge_wins"] == 1
+
+
+def test_chat_wrapper_delegates_and_keeps_wrapping_bound_tools():
+    class FakeModel:
+        _llm_type = "anthropic-chat"
+
+        def bind_tools(self, tools):
+            return self
+
+        async def ainvoke(self, messages, **kwargs):
+            return "reply"
+
+        def invoke(self, messages, **kwargs):
+            return "sync reply"
+
+    wrapped = ResilientChatModel(FakeModel(), ResilientCaller(_policy()), "chat:m")
+    assert wrapped._llm_type == "anthropic-chat"
+    bound = wrapped.bind_tools([])
+    assert isinstance(bound, ResilientChatModel)
+    assert asyncio.run(bound.ainvoke([])) == "reply"
+    assert bound.invoke([]) == "sync reply"
+
+
+def test_chat_wrapper_retries_calls_with_bound_kwargs():
+    class FakeModel:
+        def __init__(self, bound=None):
+            self.bound = bound or {}
+            self.attempts = 0
+
+        def bind_tools(self, tools):
+            return self
+
+        def bind(self, **kwargs):
+            self.bound = {**self.bound, **kwargs}
+            return self
+
+        async def ainvoke(self, messages, **kwargs):
+            self.attempts += 1
+            if self.attempts == 1:
+                raise RateLimitError("slow down")
+            return self.bound
+
+    model = FakeModel()
+    caller = ResilientCaller(_policy(max_retries=2))
+    wrapped = ResilientChatModel(model, caller, "chat:m")
+
+    # The tool loop pattern: bind tools, then cap output tokens
+    bound = wrapped.bind_tools([]).bind(max_tokens=256)
+    assert isinstance(bound, ResilientChatModel)
+    assert asyncio.run(bound.ainvoke([])) == {"max_tokens": 256}
+    assert model.attempts == 2 and caller.stats["retries"] == 1
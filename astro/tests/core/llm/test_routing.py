@@ -0,0 +1,167 @@
+"""Tests for model cascade routing."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from astro.core.llm.routing import ModelRouter, RoutingPolicy, reset_router
+from astro.core.models.outputs import WorkerOutput
+from astro.orchestration.context import ConstellationContext
+from astro.orchestration.stars.eval import EvalStar
+
+
+@pytest.fixture(autouse=True)
+def routing_env(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "anthropic")
+    for var in (
+        "LLM_MODEL",
+        "LLM_FAST_MODEL",
+        "LLM_STRONG_MODEL",
+        "LLM_ROUTING",
+        "LLM_ROUTING_POLICY",
+    ):
+        monkeypatch.delenv(var, raising=False)
+    reset_router()
+    yield
+    reset_router()
+
+
+def test_targets_map_to_tiers():
+    router = ModelRouter()
+    assert router.route("eval").tier == "fast"
+    assert router.route("interpreter").tier == "fast"
+    synthesis = router.route("synthesis")
+    assert synthesis.tier == "strong"
+    assert synthesis.model == "claude-sonnet-4-20250514"
+    assert router.route("worker").reason == "default tier"
+
+
+def test_rule_precedence():
+    router = ModelRouter(policy=RoutingPolicy(directive_tags={"deep": "strong"}))
+    # Tags beat the target rule, SLO beats the target rule, pins beat everything
+    assert router.route("eval", tags=["deep"]).tier == "strong"
+    assert router.route("synthesis", latency_slo_ms=2000).tier == "fast"
+    assert router.route("synthesis", latency_slo_ms=60_000).tier == "strong"
+    pinned = router.route("eval", tags=["deep"], model="my-model")
+    assert (pinned.model, pinned.reason) == ("my-model", "pinned by config")
+
+
+def test_disabled_routing_uses_default_model(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTING", "false")
+    monkeypatch.setenv("LLM_MODEL", "claude-opus-4")
+    router = ModelRouter()
+    decision = router.route("eval")
+    assert decision.model == "claude-opus-4"
+    assert router.escalate(decision, "invalid") is None
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTING_POLICY", '{"targets": {"worker": "fast"}}')
+    monkeypatch.setenv("LLM_FAST_MODEL", "claude-haiku-x")
+    from astro.core.llm.routing import get_router
+
+    decision = get_router().route("worker")
+    assert (decision.tier, decision.model) == ("fast", "claude-haiku-x")
+
+
+def test_escalation_only_from_fast_tier():
+    router = ModelRouter()
+    escalated = router.escalate(router.route("eval"), "low confidence")
+    assert escalated is not None
+    assert escalated.tier == "strong" and escalated.escalated
+    assert router.escalate(escalated, "again") is None
+
+
+class ScriptedLLM:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(content=self.reply)
+
+
+def test_eval_star_escalates_low_confidence_and_records_telemetry():
+    fast = ScriptedLLM('{"decision": "loop", "reasoning": "unsure", "confidence": 0.2}')
+    strong = ScriptedLLM('{"decision": "continue", "reasoning": "good", "confidence": 0.95}')
+
+    def fake_llm(temperature=0, provider=None, model=None, max_tokens=None):
+        return strong if model == "claude-sonnet-4-20250514" else fast
+
+    foundry = MagicMock()
+    foundry.get_directive.return_value = MagicMock(
+        content="Check the work", probe_ids=[], tags=[]
+    )
+    context = ConstellationContext(
+        run_id="run_1", constellation_id="c1", original_query="q", foundry=foundry
+    )
+    context.current_node_id = "eval_node"
+    context.node_outputs["worker"] = WorkerOutput(result="done")
+
+    star = EvalStar(id="e", name="e", directive_id="d")
+    with patch("astro.core.llm.utils.get_langchain_llm", side_effect=fake_llm):
+        decision = asyncio.run(star.execute(context))
+
+    assert decision.decision == "continue"
+    assert (fast.calls, strong.calls) == (1, 1)
+    routing = context.get_node_routing("eval_node")
+    assert [(d.tier, d.escalated) for d in routing] == [("fast", False), ("strong", True)]
+    assert routing[1].reason.startswith("escalated: low confidence")
+
+
+def test_planning_star_caps_structured_plan_tokens():
+    from astro.orchestration.stars.planning import PlanningStar
+
+    planner = ScriptedLLM(
+        '{"tasks": [{"id": "t1", "description": "do it"}],'
+        ' "context": "c", "success_criteria": "s"}'
+    )
+    created = []
+
+    def fake_llm(temperature=0, provider=None, model=None, max_tokens=None):
+        created.append(max_tokens)
+        return planner
+
+    foundry = MagicMock()
+    foundry.get_directive.return_value = MagicMock(
+        content="Plan the work", probe_ids=[], tags=[]
+    )
+    context = ConstellationContext(
+        run_id="run_1", constellation_id="c1", original_query="q", foundry=foundry
+    )
+    context.current_node_id = "plan_node"
+
+    star = PlanningStar(id="p", name="p", directive_id="d", config={"max_tokens": 512})
+    with patch("astro.core.llm.utils.get_langchain_llm", side_effect=fake_llm):
+        plan = asyncio.run(star.execute(context))
+
+    # No probes: the plan comes straight from the structured call, on a capped model
+    assert [t.id for t in plan.tasks] == ["t1"]
+    assert created == [512] and planner.calls == 1
+
+
+def test_fast_model_follows_pinned_llm_model(monkeypatch):
+    assert ModelRouter().model_for("fast") == "claude-3-5-haiku-20241022"
+    # A pinned deployment model is not swapped for the provider's small model
+    monkeypatch.setenv("LLM_MODEL", "gateway-claude")
+    assert ModelRouter().model_for("fast") == "gateway-claude"
+    monkeypatch.setenv("LLM_FAST_MODEL", "gateway-haiku")
+    assert ModelRouter().model_for("fast") == "gateway-haiku"
+
+
+def test_upstream_budget_sized_to_routed_model(monkeypatch):
+    from astro.core.llm.routing import RouteDecision
+    from astro.orchestration.stars.context_packing import upstream_budget
+
+    monkeypatch.delenv("LLM_CONTEXT_WINDOW", raising=False)
+    config = {"max_tokens": 1000}
+    route = RouteDecision(
+        target="worker", tier="fast", provider="openai", model="gpt-4", reason="test"
+    )
+
+    assert upstream_budget(config, "", 100_000).max_tokens == 100_000
+    budget = upstream_budget(config, "", 100_000, route)
+    assert (budget.max_tokens, budget.model) == (8_192 - 1000, "gpt-4")
@@ -0,0 +1,153 @@
+"""Tests for schema-constrained structured output and JSON repair."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from astro.core.llm.structured import (
+    StructuredOutputError,
+    get_structured_output_stats,
+    invoke_structured,
+    parse_structured_output,
+    repair_json,
+    reset_structured_output_stats,
+)
+from astro.core.models.outputs import EvalDecision, Plan
+
+
+class TextLLM:
+    """Chat model without a structured-output mode; replies from a script."""
+
+    def __init__(self, replies: list[str]):
+        self.replies = list(replies)
+        self.calls: list[list] = []
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls.append(messages)
+        return AIMessage(content=self.replies.pop(0))
+
+
+class NativeLLM:
+    """Chat model whose structured-output mode returns a parsed object."""
+
+    def __init__(self, parsed):
+        self.parsed = parsed
+
+    def with_structured_output(self, schema, include_raw=False):
+        parsed = self.parsed
+
+        class Runnable:
+            async def ainvoke(self, messages):
+                return {"raw": AIMessage(content=""), "parsed": parsed, "parsing_error": None}
+
+        return Runnable()
+
+
+class UnsupportedLLM(TextLLM):
+    """Chat model whose structured-output mode raises a given error."""
+
+    def __init__(self, replies: list[str], error: Exception):
+        super().__init__(replies)
+        self.error = error
+
+    def with_structured_output(self, schema, include_raw=False):
+        raise self.error
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_structured_output_stats()
+
+
+def test_repair_json_fixes_common_defects():
+    text = """Here is the plan:
+```json
+{
+    // planning output
+    tasks: [{'id': 'task_1', "description": "Fetch data",},],
+    "context": None,
+}
+```"""
+    assert repair_json(text) == {
+        "tasks": [{"id": "task_1", "description": "Fetch data"}],
+        "context": None,
+    }
+
+
+def test_repair_json_closes_truncated_output():
+    assert repair_json('{"decision": "loop", "reasoning": "missing sec') == {
+        "decision": "loop",
+        "reasoning": "missing sec",
+    }
+
+
+def test_parse_structured_output_reports_repairs():
+    decision, repaired = parse_structured_output('{"decision": "Continue"}', EvalDecision)
+    assert decision.decision == "continue"
+    assert not repaired
+
+    plan, repaired = parse_structured_output(
+        "{'tasks': [{'description': 'a'}, {'description': 'b'}]}", Plan
+    )
+    assert repaired
+    assert [t.id for t in plan.tasks] == ["task_1", "task_2"]
+
+
+def test_invalid_decision_rejected():
+    with pytest.raises(StructuredOutputError):
+        parse_structured_output('{"decision": "maybe"}', EvalDecision)
+
+
+def test_native_mode_used_when_available():
+    expected = EvalDecision(decision="loop", reasoning="incomplete")
+    result = asyncio.run(
+        invoke_structured(NativeLLM(expected), [HumanMessage(content="q")], EvalDecision)
+    )
+    assert result == expected
+    assert get_structured_output_stats() == {"EvalDecision": {"native": 1}}
+
+
+def test_plain_call_only_when_schema_mode_unsupported():
+    messages = [HumanMessage(content="q")]
+    llm = UnsupportedLLM(['{"decision": "continue"}'], NotImplementedError())
+    result = asyncio.run(invoke_structured(llm, messages, EvalDecision))
+    assert result.decision == "continue"
+
+    # API errors propagate instead of being re-sent as a plain call
+    llm = UnsupportedLLM(['{"decision": "continue"}'], TimeoutError("read timeout"))
+    with pytest.raises(TimeoutError):
+        asyncio.run(invoke_structured(llm, messages, EvalDecision))
+    assert llm.calls == []
+
+
+def test_reask_on_validation_failure():
+    llm = TextLLM(['{"decision": "maybe"}', '{"decision": "loop"}'])
+    result = asyncio.run(
+        invoke_structured(llm, [HumanMessage(content="q")], EvalDecision, max_reasks=1)
+    )
+
+    assert result.decision == "loop"
+    assert len(llm.calls) == 2
+    # The re-ask carries the rejected answer and the validation error
+    assert llm.calls[1][1].content == '{"decision": "maybe"}'
+    assert "decision" in llm.calls[1][2].content
+    assert get_structured_output_stats() == {"EvalDecision": {"reasked": 1}}
+
+
+def test_reasks_are_bounded():
+    llm = TextLLM(["no json here", "still none"])
+    with pytest.raises(StructuredOutputError):
+        asyncio.run(
+            invoke_structured(
+                llm,
+                [HumanMessage(content="q")],
+                Plan,
+                draft="not a plan",
+                max_reasks=1,
+            )
+        )
+
+    # The draft counts as the first attempt; one re-ask follows
+    assert len(llm.calls) == 1
+    assert get_structured_output_stats() == {"Plan": {"failed": 1}}
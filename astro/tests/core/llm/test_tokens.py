@@ -0,0 +1,107 @@
+"""Tests for token estimation and budget-aware context packing."""
+
+import pytest
+
+from astro.core.llm.tokens import (
+    TRUNCATION_MARKER,
+    ContextItem,
+    TokenBudget,
+    count_tokens,
+    get_context_window,
+    truncate_to_tokens,
+)
+from astro.core.memory.compression import TokenLimitCompression
+from astro.launchpad.conversation import Conversation
+
+pytestmark = pytest.mark.usefixtures("anthropic_env")
+
+
+def test_count_tokens_uses_provider_ratio():
+    text = "x" * 700
+    assert count_tokens(text, provider="anthropic") == 200
+    assert count_tokens(text, provider="google_genai") == 175
+    assert count_tokens("") == 0
+
+
+def test_context_window_longest_prefix(monkeypatch):
+    assert get_context_window("anthropic", "claude-sonnet-4-20250514") == 200_000
+    assert get_context_window("openai", "gpt-4") == 8_192
+    assert get_context_window("openai", "gpt-4o-mini") == 128_000
+    monkeypatch.setenv("LLM_CONTEXT_WINDOW", "32000")
+    assert get_context_window("openai", "gpt-4") == 32_000
+
+
+def test_truncate_keeps_head_and_tail():
+    text = "HEAD " + "filler " * 2000 + "CONCLUSION"
+    result = truncate_to_tokens(text, 100)
+    assert count_tokens(result) <= 100
+    assert result.startswith("HEAD")
+    assert result.endswith("CONCLUSION")
+    assert TRUNCATION_MARKER in result
+
+
+def test_truncate_returns_short_text_unchanged():
+    assert truncate_to_tokens("short", 100) == "short"
+
+
+def test_pack_fits_everything_when_budget_allows():
+    budget = TokenBudget(1000)
+    items = [ContextItem(text="a" * 35), ContextItem(text="b" * 35)]
+    packed = budget.pack(items)
+    assert [i.text for i in packed] == ["a" * 35, "b" * 35]
+    assert budget.used == 20
+
+
+def test_pack_shares_budget_fairly():
+    budget = TokenBudget(300)
+    small = ContextItem(text="s" * 35, key="small")  # 10 tokens
+    big_a = ContextItem(text="a" * 3500, key="a")  # 1000 tokens
+    big_b = ContextItem(text="b" * 3500, key="b")
+    packed = budget.pack([big_a, small, big_b])
+
+    assert [i.key for i in packed] == ["a", "small", "b"]
+    assert not packed[1].truncated
+    assert packed[0].truncated and packed[2].truncated
+    # The two large items split what the small one left over
+    assert abs(packed[0].tokens - packed[2].tokens) <= 2
+    assert budget.used <= 300
+
+
+def test_pack_prefers_higher_priority():
+    budget = TokenBudget(100)
+    low = ContextItem(text="l" * 350, priority=0, key="low")
+    high = ContextItem(text="h" * 350, priority=1, key="high")
+    packed = budget.pack([low, high])
+    assert [i.key for i in packed] == ["high"]
+
+
+def test_pack_drops_items_below_min_tokens():
+    budget = TokenBudget(40)
+    items = [ContextItem(text="x" * 3500, min_tokens=64)]
+    assert budget.pack(items) == []
+
+
+def test_budget_for_model_reserves_output():
+    budget = TokenBudget.for_model(reserved_output=4096, cap=None)
+    assert budget.max_tokens == 200_000 - 4096
+    capped = TokenBudget.for_model(reserved_output=4096, cap=8000)
+    assert capped.max_tokens == 8000
+
+
+def test_token_limit_compression_uses_estimate():
+    compression = TokenLimitCompression(max_tokens=50, provider="anthropic")
+    result = compression.compress_sync("word " * 500)
+    assert count_tokens(result, provider="anthropic") <= 50
+
+
+def test_conversation_history_within_budget():
+    conv = Conversation()
+    conv.add_message(role="user", content="old " * 400)
+    conv.add_message(role="assistant", content="reply")
+    conv.add_message(role="user", content="latest question")
+
+    messages = conv.get_context_messages(limit=10, max_tokens=50)
+    assert [m.content for m in messages] == ["reply", "latest question"]
+
+    # Without a budget the message limit still applies
+    assert len(conv.get_context_messages(limit=2)) == 2
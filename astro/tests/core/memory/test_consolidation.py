@@ -0,0 +1,146 @@
+"""Tests for offline memory consolidation."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from astro.core.memory.consolidation import (
+    CONSOLIDATED_TYPE,
+    MemoryConsolidator,
+    cluster_embeddings,
+    decay_score,
+)
+from astro.interfaces.memory import Memory
+
+OLD = time.time() - 30 * 24 * 3600
+
+
+class ArchivingBackend:
+    """Backend stub listing memories by timestamp and archiving by ID."""
+
+    def __init__(self, memories: list[Memory]):
+        self.memories = {m.id: m for m in memories}
+        self.archived: list[str] = []
+        self.stored: list[tuple] = []
+
+    async def store(self, id, content, embedding, metadata):
+        self.stored.append((id, content, embedding, metadata))
+
+    async def delete(self, id):
+        return self.memories.pop(id, None) is not None
+
+    async def search(self, query_embedding, limit=5, filter_metadata=None):
+        return []
+
+    async def iter_memories(self, include_embeddings=False, after=None, before=None):
+        for memory in sorted(self.memories.values(), key=lambda m: m.timestamp):
+            if (after is None or memory.timestamp > after) and (
+                before is None or memory.timestamp < before
+            ):
+                yield memory
+
+    async def archive(self, ids):
+        self.archived.extend(ids)
+        return sum(self.memories.pop(id, None) is not None for id in ids)
+
+
+class BatchLLM:
+    """Chat model stub answering batched prompts with a JSON array."""
+
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    async def ainvoke(self, messages, temperature=None):
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        groups = prompt.count("Group ")
+        content = json.dumps([f"summary {i}" for i in range(groups)]) if groups else "summary"
+        return SimpleNamespace(content=content)
+
+
+def _memory(id: str, embedding: list[float], offset: float = 0.0, **metadata) -> Memory:
+    return Memory(
+        id=id,
+        content=f"content {id}",
+        metadata={"user_id": "u1", **metadata},
+        timestamp=OLD + offset,
+        embedding=embedding,
+    )
+
+
+def _embedder() -> AsyncMock:
+    embedder = AsyncMock()
+    embedder.embed_batch = AsyncMock(side_effect=lambda texts: [[1.0, 0.0]] * len(texts))
+    return embedder
+
+
+def test_cluster_embeddings_and_decay():
+    vectors = np.array([[1.0, 0.0], [0.99, 0.1], [0.0, 1.0], [0.98, 0.05]])
+    assert cluster_embeddings(vectors, threshold=0.9) == [[0, 3, 1], [2]]
+    assert cluster_embeddings(vectors, threshold=0.9, max_size=2) == [[0, 3], [1], [2]]
+
+    now = OLD + 90 * 24 * 3600
+    fresh = _memory("a", [1.0], hit_count=4, last_seen=now)
+    stale = _memory("b", [1.0])
+    assert decay_score(fresh, now) == 4.0
+    assert decay_score(stale, now, half_life_s=90 * 24 * 3600) == pytest.approx(0.5)
+
+
+def test_consolidation_summarizes_clusters_and_archives_sources(tmp_path):
+    memories = [
+        _memory("a1", [1.0, 0.0], 1, hit_count=2),
+        _memory("a2", [0.99, 0.05], 2, directive_ids=["d1"]),
+        _memory("a3", [0.98, 0.1], 3),
+        _memory("b1", [0.0, 1.0], 4),
+        _memory("b2", [0.05, 0.99], 5),
+        _memory("b3", [0.1, 0.98], 6),
+        _memory("lone", [-1.0, 0.0], 7),
+        _memory("other", [1.0, 0.0], 8, user_id="u2"),
+        _memory("recent", [1.0, 0.0], 30 * 24 * 3600),
+    ]
+    backend = ArchivingBackend(memories)
+    llm = BatchLLM()
+    consolidator = MemoryConsolidator(
+        backend, llm, _embedder(), checkpoint_path=tmp_path / "ckpt.json", prune_below=0.9
+    )
+
+    progress = asyncio.run(consolidator.run())
+
+    # Both clusters summarized in one call
+    assert len(llm.prompts) == 1
+    assert [content for _, content, _, _ in backend.stored] == ["summary 0", "summary 1"]
+    metadata = backend.stored[0][3]
+    assert metadata["type"] == CONSOLIDATED_TYPE
+    assert metadata["source_ids"] == ["a1", "a2", "a3"]
+    assert metadata["hit_count"] == 4 and metadata["directive_ids"] == ["d1"]
+    assert metadata["user_id"] == "u1"
+    # Sources and decayed singletons archived, never clustered across users
+    assert set(backend.archived) == {"a1", "a2", "a3", "b1", "b2", "b3", "lone", "other"}
+    assert set(backend.memories) == {"recent"}
+    assert progress["consolidated"] == 2 and progress["pruned"] == 2
+    assert progress["checkpoint"] == OLD + 8
+
+    # A fresh consolidator resumes past the checkpoint
+    resumed = MemoryConsolidator(
+        backend, llm, _embedder(), checkpoint_path=tmp_path / "ckpt.json"
+    )
+    assert resumed.progress()["checkpoint"] == OLD + 8
+    assert asyncio.run(resumed.run()).get("scanned", 0) == 0
+
+
+def test_consolidation_requires_archive_support():
+    class ListingBackend:
+        async def iter_memories(self, **kwargs):
+            return
+            yield
+
+    with pytest.raises(ValueError, match="archive"):
+        MemoryConsolidator(ListingBackend(), BatchLLM(), _embedder(), checkpoint_path=None)
+    assert MemoryConsolidator(
+        ListingBackend(), BatchLLM(), _embedder(), archive=False, checkpoint_path=None
+    )
@@ -0,0 +1,66 @@
+"""Tests for ContextWindow sizing and background compression."""
+
+import asyncio
+
+from astro.core.memory import ContextWindow
+from astro.core.memory.compression import NoOpCompression
+
+
+class SlowSummary:
+    """Compression stub that waits until released, then summarizes."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.inputs: list[str] = []
+
+    async def compress(self, content: str) -> str:
+        self.inputs.append(content)
+        await self.release.wait()
+        return "summary"
+
+
+def test_size_is_tracked_incrementally():
+    window = ContextWindow(max_chars=100, compression_strategy=NoOpCompression())
+    window.add_exchange("hello", "world!")
+    assert window._size() == 11
+
+    window.clear()
+    assert window._size() == 0
+
+
+def test_compression_runs_in_background_and_keeps_recent_turns():
+    async def run():
+        summarizer = SlowSummary()
+        window = ContextWindow(max_chars=30, compression_strategy=summarizer, keep_recent=2)
+        for i in range(4):
+            window.add_message(f"message {i}", {"role": "user"})
+
+        # Appends return immediately while the summary is pending
+        assert len(window.messages) == 4
+        window.add_message("late", {"role": "assistant"})
+        await asyncio.sleep(0)
+        assert summarizer.inputs == ["user: message 0\nuser: message 1"]
+
+        summarizer.release.set()
+        await window.wait_for_compression()
+        return window
+
+    window = asyncio.run(run())
+
+    # Still over budget after the first summary, so it folded in one more turn
+    assert [m.content for m in window.messages] == [
+        "[Summary of earlier conversation]\nsummary",
+        "message 3",
+        "late",
+    ]
+    assert window._size() == sum(len(m.content) for m in window.messages)
+
+
+def test_compression_without_event_loop_falls_back_to_sync():
+    window = ContextWindow(max_chars=10, compression_strategy=NoOpCompression(), keep_recent=1)
+    window.add_message("first message", {"role": "user"})
+    window.add_message("second", {"role": "assistant"})
+
+    assert window.messages[0].metadata == {"compressed": True}
+    assert window.messages[1].content == "second"
+    assert window._size() == sum(len(m.content) for m in window.messages)
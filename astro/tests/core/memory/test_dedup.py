@@ -0,0 +1,101 @@
+"""Tests for write-time near-duplicate suppression."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from astro.core.memory import LongTermMemory
+from astro.core.memory.dedup import Deduplicator, merge_metadata
+from astro.interfaces.memory import Memory
+
+
+class StoredBackend:
+    """Backend stub holding memories in a dict, searched by exact cosine."""
+
+    def __init__(self):
+        self.memories: dict[str, tuple[Memory, list[float]]] = {}
+        self.updates: list[str] = []
+
+    async def store(self, id, content, embedding, metadata):
+        self.memories[id] = (Memory(id, content, metadata, 0.0), embedding)
+
+    async def store_many(self, entries):
+        for entry in entries:
+            await self.store(*entry)
+
+    async def update_metadata(self, id, metadata):
+        self.updates.append(id)
+        self.memories[id][0].metadata = metadata
+        return True
+
+    async def search(self, query_embedding, limit=5, filter_metadata=None):
+        import numpy as np
+
+        q = np.array(query_embedding) / np.linalg.norm(query_embedding)
+        scored = []
+        for memory, embedding in self.memories.values():
+            if any(memory.metadata.get(k) != v for k, v in (filter_metadata or {}).items()):
+                continue
+            score = float(q @ (np.array(embedding) / np.linalg.norm(embedding)))
+            scored.append(Memory(memory.id, memory.content, memory.metadata, 0.0, score=score))
+        return sorted(scored, key=lambda m: m.score, reverse=True)[:limit]
+
+
+def _embedder(vectors):
+    provider = AsyncMock()
+    provider.embed = AsyncMock(side_effect=lambda text: vectors[text])
+    provider.embed_batch = AsyncMock(side_effect=lambda texts: [vectors[t] for t in texts])
+    return provider
+
+
+def test_merge_metadata_unions_lists_and_counts_hits():
+    merged = merge_metadata(
+        {"directive_ids": ["fa"], "user_query": "old", "hit_count": 2},
+        {"directive_ids": ["sa", "fa"], "user_query": "new"},
+    )
+
+    assert merged["directive_ids"] == ["fa", "sa"]
+    assert merged["user_query"] == "new"
+    assert merged["hit_count"] == 3
+    assert "last_seen" in merged
+
+
+def test_inline_store_merges_near_duplicates():
+    backend = StoredBackend()
+    vectors = {
+        "Tesla revenue was $25.2B": [1.0, 0.0, 0.0],
+        "Tesla revenue: $25.2B": [0.99, 0.05, 0.0],
+        "Rivian delivered 50k cars": [0.0, 1.0, 0.0],
+    }
+    memory = LongTermMemory(backend, _embedder(vectors), dedup_threshold=0.95)
+
+    async def run():
+        first = await memory.store("Tesla revenue was $25.2B", {"directive_ids": ["fa"]})
+        second = await memory.store("Tesla revenue: $25.2B", {"directive_ids": ["sa"]})
+        third = await memory.store("Rivian delivered 50k cars", {})
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+
+    assert second == first  # Merged into the stored memory
+    assert set(backend.memories) == {first, third}
+    stored = backend.memories[first][0]
+    assert stored.metadata["directive_ids"] == ["fa", "sa"]
+    assert stored.metadata["hit_count"] == 2
+    assert backend.updates == [first]
+    assert memory.dedup.stats["merged"] == 1
+
+
+def test_batch_dedup_respects_scope_and_in_batch_copies():
+    backend = StoredBackend()
+    dedup = Deduplicator(backend, threshold=0.9)
+    entries = [
+        ("a", "q", [1.0, 0.0], {"user_id": "u1"}),
+        ("b", "q", [1.0, 0.01], {"user_id": "u1"}),  # Copy of a
+        ("c", "q", [1.0, 0.0], {"user_id": "u2"}),  # Other user: kept
+    ]
+
+    kept, merged_into = asyncio.run(dedup.dedupe(entries))
+
+    assert [e[0] for e in kept] == ["a", "c"]
+    assert merged_into == {"b": "a"}
+    assert kept[0][3]["hit_count"] == 2
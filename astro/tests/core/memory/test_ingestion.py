@@ -0,0 +1,104 @@
+"""Tests for write-behind memory ingestion."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from astro.core.memory import ContextWindow, LongTermMemory, SecondBrain
+from astro.core.memory.ingestion import IngestionQueue
+
+
+class BatchBackend:
+    """Backend stub with a bulk write, optionally failing the first N calls."""
+
+    def __init__(self, failures: int = 0):
+        self.batches: list[list[tuple]] = []
+        self.failures = failures
+
+    async def store(self, id, content, embedding, metadata):
+        raise AssertionError("store_many should be used")
+
+    async def store_many(self, entries):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("mongo unavailable")
+        self.batches.append(entries)
+
+
+def _embedder():
+    provider = AsyncMock()
+    provider.embed_batch = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+    return provider
+
+
+def test_store_returns_before_persisting_and_batches_on_size():
+    backend, embedder = BatchBackend(), _embedder()
+    memory = LongTermMemory(backend=backend, embedding_provider=embedder, write_behind=True)
+    memory.ingestion.max_batch = 10
+    memory.ingestion.flush_interval_s = 60
+
+    async def run():
+        ids = [await memory.store(f"memory {i}", {"i": i}) for i in range(25)]
+        assert backend.batches == []  # Nothing written inline
+        await asyncio.sleep(0.05)  # Two full batches flush without waiting for the interval
+        full_batches = [len(b) for b in backend.batches]
+        await memory.shutdown()  # Drains the remainder
+        return ids, full_batches
+
+    ids, full_batches = asyncio.run(run())
+
+    assert full_batches == [10, 10]
+    assert [len(b) for b in backend.batches] == [10, 10, 5]
+    assert embedder.embed_batch.call_count == 3
+    embedder.embed.assert_not_called()
+    assert [e[0] for b in backend.batches for e in b] == ids
+    assert backend.batches[0][3] == (ids[3], "memory 3", [8.0], {"i": 3})
+
+
+def test_flushes_on_interval():
+    backend = BatchBackend()
+    queue = IngestionQueue(backend, _embedder(), max_batch=100, flush_interval_s=0.05)
+
+    async def run():
+        await queue.put("m1", "a", {})
+        await queue.put("m2", "b", {})
+        await asyncio.sleep(0.2)
+        written = [len(b) for b in backend.batches]
+        await queue.shutdown()
+        return written
+
+    assert asyncio.run(run()) == [2]
+
+
+def test_failed_batches_are_retried_then_drained_on_shutdown():
+    backend = BatchBackend(failures=1)
+    queue = IngestionQueue(backend, _embedder(), max_batch=100, flush_interval_s=60)
+
+    async def run():
+        await queue.put("m1", "a", {})
+        assert await queue.flush() == 0  # Fails, re-queued
+        assert queue.pending == 1
+        await queue.shutdown()
+
+    asyncio.run(run())
+
+    assert [[e[0] for e in b] for b in backend.batches] == [["m1"]]
+    assert queue.stats["failed_batches"] == 1
+    with pytest.raises(RuntimeError):
+        asyncio.run(queue.put("m2", "b", {}))
+
+
+def test_second_brain_shutdown_drains_long_term_queue():
+    backend = BatchBackend()
+    long_term = LongTermMemory(backend=backend, embedding_provider=_embedder(), write_behind=True)
+    brain = SecondBrain(ContextWindow(max_chars=1000), long_term)
+
+    async def run():
+        await brain.store("Tesla Q4 revenue: $25.2B", {"type": "fact"})
+        await brain.shutdown()
+
+    asyncio.run(run())
+
+    assert len(backend.batches) == 1
+    assert brain.get_recent_context()[0].content == "Tesla Q4 revenue: $25.2B"
@@ -0,0 +1,154 @@
+"""Tests for BM25 and hybrid lexical + vector retrieval."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from astro.core.memory import LongTermMemory, MemoryRetriever
+from astro.core.memory.hybrid import HybridMemoryBackend
+from astro.core.memory.lexical import BM25Index, is_exact_term_query, tokenize
+from astro.interfaces.memory import Memory
+
+
+class VectorBackend:
+    """Backend stub whose vector search returns a fixed ranking."""
+
+    def __init__(self, ranking: list[Memory]):
+        self.ranking = ranking
+        self.memories = {m.id: m for m in ranking}
+        self.searches = 0
+
+    async def store(self, id, content, embedding, metadata):
+        self.memories[id] = Memory(id=id, content=content, metadata=metadata, timestamp=0.0)
+
+    async def retrieve(self, id):
+        return self.memories.get(id)
+
+    async def delete(self, id):
+        return self.memories.pop(id, None) is not None
+
+    async def update_metadata(self, id, metadata):
+        self.memories[id].metadata = metadata
+        return True
+
+    async def search(self, query_embedding, limit=5, filter_metadata=None):
+        self.searches += 1
+        return self.ranking[:limit]
+
+    async def iter_memories(self):
+        for memory in self.ranking:
+            yield memory
+
+
+def _memory(id: str, content: str, timestamp: float = 0.0, **metadata) -> Memory:
+    return Memory(id=id, content=content, metadata=metadata, timestamp=timestamp)
+
+
+def test_bm25_matches_identifiers_and_updates_incrementally():
+    assert tokenize("BRK.B 10-K") == ["brk.b", "brk", "b", "10-k", "10", "k"]
+    index = BM25Index()
+    index.add("tsla", "Tesla (TSLA) Q4 revenue: $25.2B", {"directives": ["finance"]})
+    index.add("ev", "Electric vehicle revenue grew across the industry", {})
+    index.add("brk", "BRK.B holds Apple", {})
+
+    assert [id for id, _ in index.search("TSLA revenue", k=2)] == ["tsla", "ev"]
+    assert [id for id, _ in index.search("BRK", k=5)] == ["brk"]
+    assert [id for id, _ in index.search("revenue", 5, {"directives": "finance"})] == ["tsla"]
+
+    index.remove("tsla")
+    assert "tsla" not in index
+    assert [id for id, _ in index.search("TSLA", k=5)] == []
+    assert is_exact_term_query("TSLA") and is_exact_term_query("Fund IV 2023 IRR")
+    assert not is_exact_term_query("how did electric vehicle makers perform")
+
+
+def test_bm25_filters_match_backend_semantics():
+    index = BM25Index()
+    index.add("legacy", "TSLA delivery record", {}, timestamp=100.0)
+    index.add("shared", "TSLA margin squeeze", {"namespace": "global"}, timestamp=200.0)
+    index.add("mine", "TSLA position sized", {"namespace": "user:u1"}, timestamp=300.0)
+
+    # Memories stored before namespaces existed belong to the global namespace
+    assert {id for id, _ in index.search("TSLA", 5, {"namespace": "global"})} == {
+        "legacy",
+        "shared",
+    }
+    # timestamp ranges compare the store time, not a metadata key
+    recent = index.search("TSLA", 5, {"timestamp": {"$gte": 150.0, "$lt": 300.0}})
+    assert [id for id, _ in recent] == ["shared"]
+
+
+def test_hybrid_search_fuses_lexical_hit_into_vector_results():
+    memories = [
+        _memory("ev", "Electric vehicle demand cooled in 2024"),
+        _memory("macro", "Rates stayed high through the year"),
+        _memory("tsla", "TSLA Q4 revenue: $25.2B"),
+    ]
+    backend = HybridMemoryBackend(VectorBackend(memories), lexical_weight=2.0)
+    assert asyncio.run(backend.load()) == 3
+
+    results = asyncio.run(
+        backend.search([0.1], limit=2, query_text="TSLA quarterly revenue")
+    )
+
+    # Vector search ranked it last; the exact ticker match lifts it to the top
+    assert [m.id for m in results] == ["tsla", "ev"]
+
+
+def test_exact_term_queries_skip_embedding():
+    memories = [_memory("ev", "EV demand"), _memory("tsla", "TSLA Q4 revenue: $25.2B")]
+    vector = VectorBackend(memories)
+    backend = HybridMemoryBackend(vector)
+    asyncio.run(backend.load())
+    embedder = AsyncMock()
+    embedder.embed = AsyncMock(return_value=[0.1])
+    embedder.embed_batch = AsyncMock(return_value=[[0.1]])
+    retriever = MemoryRetriever(backend, embedder)
+
+    results = asyncio.run(
+        retriever.retrieve(["TSLA", "electric vehicle market outlook"], top_k=2)
+    )
+
+    embedder.embed.assert_awaited_once_with("electric vehicle market outlook")
+    assert vector.searches == 1
+    assert {m.id for m in results} == {"tsla", "ev"}
+
+
+def test_exact_term_miss_falls_back_to_vector_search():
+    memories = [_memory("ev", "EV demand")]
+    vector = VectorBackend(memories)
+    backend = HybridMemoryBackend(vector)
+    embedder = AsyncMock()
+    embedder.embed = AsyncMock(return_value=[0.1])
+    long_term = LongTermMemory(backend=backend, embedding_provider=embedder)
+
+    async def run():
+        await long_term.store("NVDA guidance raised", {})
+        exact = await long_term.retrieve("NVDA")
+        missed = await long_term.retrieve("AMD")
+        return exact, missed
+
+    exact, missed = asyncio.run(run())
+
+    assert [m.content for m in exact] == ["NVDA guidance raised"]
+    assert [m.id for m in missed] == ["ev"]
+    assert embedder.embed.await_count == 2  # store + the fallback
+
+
+def test_hybrid_fetches_winners_and_refreshes_metadata():
+    memories = [_memory("tsla", "TSLA Q4 revenue", directives=["finance"])]
+    vector = VectorBackend(memories)
+    backend = HybridMemoryBackend(vector)
+
+    async def run():
+        await backend.load()
+        # Changed in the backend behind the index: results carry the stored copy
+        vector.memories["tsla"] = _memory("tsla", "TSLA Q4 revenue (restated)")
+        fetched = await backend.search(None, query_text="TSLA")
+        assert await backend.update_metadata("tsla", {"directives": ["macro"]})
+        return fetched, await backend.search(None, 5, {"directives": "macro"}, query_text="TSLA")
+
+    fetched, refiltered = asyncio.run(run())
+
+    assert [m.content for m in fetched] == ["TSLA Q4 revenue (restated)"]
+    assert vector.memories["tsla"].metadata == {"directives": ["macro"]}
+    assert [m.id for m in refiltered] == ["tsla"]
@@ -0,0 +1,85 @@
+"""Tests for namespaced long-term memory."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from astro.core.memory import ContextWindow, LongTermMemory, SecondBrain
+from astro.core.memory.namespaces import namespace_for, visible_namespaces
+from astro.core.memory.retrieval import merge_rankings
+from astro.interfaces.memory import Memory
+
+
+def _memory(id: str, namespace: str, score: float | None) -> Memory:
+    return Memory(
+        id=id, content=id, metadata={"namespace": namespace}, timestamp=1.0, score=score
+    )
+
+
+class NamespaceBackend:
+    """Backend stub serving each namespace after a delay, tracking overlap."""
+
+    def __init__(self, memories: list[Memory]):
+        self.memories = memories
+        self.stored: list[dict] = []
+        self.filters: list[dict] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def store(self, id, content, embedding, metadata):
+        self.stored.append(metadata)
+
+    async def search(self, query_embedding, limit=5, filter_metadata=None):
+        self.filters.append(filter_metadata)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        namespace = filter_metadata["namespace"]
+        return [m for m in self.memories if m.metadata["namespace"] == namespace][:limit]
+
+
+def test_namespace_helpers_and_merge():
+    assert namespace_for({"user_id": "u1", "workspace_id": "w1"}) == "user:u1"
+    assert namespace_for({"workspace_id": "w1"}) == "workspace:w1"
+    assert namespace_for({"namespace": "global", "user_id": "u1"}) == "global"
+    assert visible_namespaces("u1", "w1") == ["user:u1", "workspace:w1", "global"]
+    assert visible_namespaces() == ["global"]
+
+    merged = merge_rankings(
+        [[_memory("a", "user:u1", 0.7)], [_memory("g", "global", 0.9), _memory("a", "global", 0.7)]]
+    )
+    assert [m.id for m in merged] == ["g", "a"]
+    unscored = merge_rankings([[_memory("a", "user:u1", None)], [_memory("g", "global", 0.9)]])
+    assert {m.id for m in unscored} == {"a", "g"}
+
+
+def test_second_brain_scopes_writes_and_fans_out_reads():
+    backend = NamespaceBackend(
+        [
+            _memory("mine", "user:u1", 0.8),
+            _memory("theirs", "user:u2", 0.99),
+            _memory("team", "workspace:w1", 0.6),
+            _memory("shared", "global", 0.9),
+        ]
+    )
+    embedder = AsyncMock()
+    embedder.embed = AsyncMock(return_value=[1.0, 0.0])
+    brain = SecondBrain(
+        ContextWindow(max_chars=10000),
+        LongTermMemory(backend=backend, embedding_provider=embedder),
+        namespaced=True,
+    )
+    conversation = SimpleNamespace(user_id="u1", workspace_id="w1")
+
+    async def run():
+        await brain.store("answer", {"user_id": "u1"})
+        return await brain.retrieve(["revenue"], conversation=conversation)
+
+    context = asyncio.run(run())
+
+    assert backend.stored == [{"user_id": "u1", "namespace": "user:u1"}]
+    assert [f["namespace"] for f in backend.filters] == ["user:u1", "workspace:w1", "global"]
+    # Namespaces were searched concurrently; other users' memories never seen
+    assert backend.max_active == 3
+    assert [m.id for m in context["long_term"]] == ["shared", "mine", "team"]
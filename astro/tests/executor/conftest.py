@@ -58,6 +58,9 @@ class MockFoundry:
     async def get_run(self, run_id: str) -> dict[str, Any] | None:
         return self._runs.get(run_id)
 
+    async def upsert_run(self, run_data: dict[str, Any]) -> None:
+        self._runs[run_data["id"]] = run_data
+
     async def update_run(self, run_id: str, updates: dict[str, Any]) -> bool:
         if run_id in self._runs:
             self._runs[run_id].update(updates)
@@ -93,6 +96,20 @@ def mock_foundry() -> MockFoundry:
     return MockFoundry()
 
 
+@pytest.fixture
+def cassette_runner(
+    mock_foundry: MockFoundry, llm_cassette: Any, anthropic_env: None
+) -> Any:
+    """ConstellationRunner whose LLM and embedding calls go through a cassette.
+
+    Replayed offline from tests/cassettes/<test module>/<test name>.json, or
+    recorded with LLM_CASSETTE_MODE=record (see the llm_cassette fixture).
+    """
+    from astro.orchestration.runner import ConstellationRunner
+
+    return ConstellationRunner(mock_foundry)  # type: ignore[arg-type]
+
+
 @pytest.fixture
 def simple_directive() -> Directive:
     """Create a simple directive for testing."""
@@ -102,6 +102,85 @@ class TestConstellationRunner:
         assert run.started_at is not None
         assert run.started_at <= datetime.now(UTC)
 
+    @pytest.mark.asyncio
+    async def test_run_simple_constellation_from_cassette(
+        self, mock_foundry: Any, cassette_runner: Any, llm_cassette: Any
+    ) -> None:
+        """Test a full run replayed offline from a recorded cassette."""
+        # Built from the models the astro runner executes, so the replayed
+        # request matches the recording exactly (the cassette is strict)
+        from astro.core.models import Directive as AstroDirective
+        from astro.core.models import TemplateVariable
+        from astro.orchestration.models import (
+            Constellation as AstroConstellation,
+        )
+        from astro.orchestration.models import (
+            Edge,
+            EndNode,
+            Position,
+            StarNode,
+            StartNode,
+        )
+        from astro.orchestration.models import NodeType as AstroNodeType
+        from astro.orchestration.stars import WorkerStar as AstroWorkerStar
+
+        mock_foundry.add_directive(
+            AstroDirective(
+                id="test_directive",
+                name="Test Directive",
+                description="A test directive",
+                content="Do something with {{company_name}}",
+                template_variables=[
+                    TemplateVariable(
+                        name="company_name", description="Company name", required=True
+                    )
+                ],
+            )
+        )
+        mock_foundry.add_star(
+            AstroWorkerStar(
+                id="test_star", name="Test Star", directive_id="test_directive"
+            )
+        )
+        mock_foundry.add_constellation(
+            AstroConstellation(
+                id="test_constellation",
+                name="Test Constellation",
+                description="A test constellation",
+                start=StartNode(
+                    id="start", type=AstroNodeType.START, position=Position(x=0, y=0)
+                ),
+                end=EndNode(
+                    id="end", type=AstroNodeType.END, position=Position(x=400, y=0)
+                ),
+                nodes=[
+                    StarNode(
+                        id="worker_1",
+                        type=AstroNodeType.STAR,
+                        position=Position(x=200, y=0),
+                        star_id="test_star",
+                        display_name=None,
+                    )
+                ],
+                edges=[
+                    Edge(id="e1", source="start", target="worker_1", condition=None),
+                    Edge(id="e2", source="worker_1", target="end", condition=None),
+                ],
+            )
+        )
+
+        run = await cassette_runner.run(
+            "test_constellation", {"company_name": "Tesla"}, "Analyze Tesla"
+        )
+
+        assert run.status == "completed"
+        assert run.final_output == (
+            "Tesla designs and sells electric vehicles, batteries and solar "
+            "energy products."
+        )
+        assert run.usage.input_tokens == 42
+        assert llm_cassette.stats["exact"] == 1
+
     @pytest.mark.asyncio
     async def test_run_handles_error(self, mock_foundry: Any) -> None:
         """Test that run handles errors gracefully."""
@@ -5,6 +5,7 @@ Tests:
 2. Pipeline gracefully degrades when SecondBrain is unavailable
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -235,3 +236,99 @@ async def test_pipeline_graceful_degradation_on_store_failure():
 
     assert result is not None
     assert result.content
+
+
+@pytest.mark.asyncio
+async def test_pipeline_prefetches_memory_while_interpreting():
+    """Raw-message retrieval runs concurrently with the interpreter call."""
+    storage = MockCoreStorage()
+    registry = Registry(storage=storage)
+    await registry.startup()
+    await registry.create_directive(
+        Directive(
+            id="general_assistant",
+            name="General Assistant",
+            description="General purpose assistant",
+            content="You are a helpful assistant.",
+        )
+    )
+
+    prefetched_memory = Memory(
+        id="mem_weather", content="Earlier weather answer", metadata={}, timestamp=1.0
+    )
+    mock_backend = AsyncMock()
+    mock_backend.search = AsyncMock(side_effect=[[prefetched_memory], []])
+    mock_embedding = AsyncMock()
+    mock_embedding.embed = AsyncMock(return_value=[0.1] * 10)
+    second_brain = SecondBrain(
+        ContextWindow(max_chars=50000),
+        LongTermMemory(backend=mock_backend, embedding_provider=mock_embedding),
+    )
+
+    searches_during_interpretation = []
+
+    class SlowInterpreterLLM(MockLLM):
+        async def ainvoke(self, messages, **kwargs):
+            if self.call_count == 0:
+                for _ in range(10):
+                    await asyncio.sleep(0)
+                searches_during_interpretation.append(mock_backend.search.await_count)
+            return await super().ainvoke(messages, **kwargs)
+
+    mock_llm = SlowInterpreterLLM()
+    pipeline = ZeroShotPipeline(
+        interpreter=Interpreter(registry=registry, llm_provider=mock_llm),
+        running_agent=RunningAgent(registry=registry, llm_provider=mock_llm),
+        second_brain=second_brain,
+    )
+    retrieve = AsyncMock(wraps=second_brain.retrieve)
+    second_brain.retrieve = retrieve
+
+    await pipeline.execute("What is the weather?", Conversation(messages=[]))
+
+    assert searches_during_interpretation == [1]
+    # The interpreter's query is searched afterwards; the raw one is reused
+    assert [c.args[0] for c in mock_embedding.embed.await_args_list[:2]] == [
+        "What is the weather?",
+        "test query",
+    ]
+    assert mock_backend.search.await_count == 2
+    assert retrieve.await_args.kwargs["prefetched"] == {
+        "What is the weather?": [prefetched_memory]
+    }
+
+
+@pytest.mark.asyncio
+async def test_pipeline_cancels_prefetch_when_stream_is_closed():
+    """A client disconnecting mid-stream does not leave the prefetch running."""
+    registry = Registry(storage=MockCoreStorage())
+    await registry.startup()
+    mock_backend = AsyncMock()
+    mock_backend.search = AsyncMock(return_value=[])
+    mock_embedding = AsyncMock()
+    mock_embedding.embed = AsyncMock(return_value=[0.1] * 10)
+    second_brain = SecondBrain(
+        ContextWindow(max_chars=50000),
+        LongTermMemory(backend=mock_backend, embedding_provider=mock_embedding),
+    )
+    mock_llm = MockLLM()
+    pipeline = ZeroShotPipeline(
+        interpreter=Interpreter(registry=registry, llm_provider=mock_llm),
+        running_agent=RunningAgent(registry=registry, llm_provider=mock_llm),
+        second_brain=second_brain,
+    )
+    prefetches = []
+    start_prefetch = pipeline._start_prefetch
+
+    def tracked_prefetch(*args):
+        prefetches.append(start_prefetch(*args))
+        return prefetches[-1]
+
+    pipeline._start_prefetch = tracked_prefetch
+
+    events = pipeline.execute_with_events("What is the weather?", Conversation(messages=[]))
+    assert (await events.__anext__())["type"] == "thinking"
+    await events.aclose()
+    await asyncio.gather(*prefetches, return_exceptions=True)
+
+    assert len(prefetches) == 1 and prefetches[0].cancelled()
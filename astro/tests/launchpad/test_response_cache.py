@@ -0,0 +1,127 @@
+"""Tests for the zero-shot semantic response cache."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from astro.launchpad import Conversation, SemanticResponseCache, ZeroShotPipeline
+from astro.launchpad.interpreter import InterpretationResult
+from astro.launchpad.running_agent import AgentOutput
+
+VECTORS = {
+    "latest apple headlines": [1.0, 0.0, 0.0],
+    "latest apple headlines?": [0.99, 0.05, 0.0],
+    "tesla margins": [0.0, 1.0, 0.0],
+}
+
+
+def _embedder() -> AsyncMock:
+    embedder = AsyncMock()
+    embedder.embed = AsyncMock(side_effect=lambda text: VECTORS[text])
+    return embedder
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_similar_queries_within_partition_and_ttl():
+    cache = SemanticResponseCache(_embedder(), threshold=0.95)
+    await cache.store("Latest  Apple headlines", ["news"], "answer", ttl_s=60, scope="u1")
+
+    hit = await cache.lookup("latest Apple headlines?", ["news"], scope="u1")
+    assert hit is not None and hit.output == "answer" and hit.similarity > 0.95
+    assert await cache.lookup("Tesla margins", ["news"], scope="u1") is None
+    assert await cache.lookup("latest apple headlines", ["filings"], scope="u1") is None
+    assert await cache.lookup("latest apple headlines", ["news"], scope="u2") is None
+
+    next(iter(cache._entries.values()))[1].expires_at = time.time() - 1
+    assert await cache.lookup("latest apple headlines", ["news"], scope="u1") is None
+    assert cache.stats["hits"] == 1 and cache.stats["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_follows_directives_and_invalidation_drops_entries():
+    cache = SemanticResponseCache(_embedder(), default_ttl_s=900)
+    news = SimpleNamespace(metadata={"cache_ttl_s": 120})
+    analysis = SimpleNamespace(metadata={})
+    assert cache.ttl_for([news, analysis]) == 120
+    assert cache.ttl_for([analysis]) == 900
+    assert not await cache.store("tesla margins", ["live"], "x", ttl_s=0)
+
+    await cache.store("latest apple headlines", ["news", "markets"], "a")
+    await cache.store("tesla margins", ["filings"], "b")
+    # A fresh answer to the same question replaces the cached one
+    await cache.store("latest apple headlines?", ["news", "markets"], "a2")
+    assert len(cache) == 2
+
+    assert cache.invalidate("markets") == 1
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+
+def _pipeline(cache: SemanticResponseCache) -> tuple[ZeroShotPipeline, AsyncMock]:
+    interpreter = AsyncMock()
+    interpreter.evaluate = AsyncMock(
+        return_value=InterpretationResult(
+            action="select_directives",
+            directive_ids=["news"],
+            context_queries=["apple headlines"],
+            reasoning="news",
+            confidence=0.9,
+        )
+    )
+    running_agent = AsyncMock()
+    running_agent.get_directives = AsyncMock(
+        return_value=[SimpleNamespace(metadata={"cache_ttl_s": 300})]
+    )
+    running_agent.execute = AsyncMock(return_value=AgentOutput(content="Fresh answer"))
+    second_brain = AsyncMock()
+    second_brain.retrieve = AsyncMock(return_value={"long_term": [], "recent": []})
+    pipeline = ZeroShotPipeline(
+        interpreter=interpreter,
+        running_agent=running_agent,
+        second_brain=second_brain,
+        response_cache=cache,
+    )
+    return pipeline, running_agent
+
+
+@pytest.mark.asyncio
+async def test_pipeline_serves_cached_answer_and_marks_events():
+    cache = SemanticResponseCache(_embedder())
+    pipeline, running_agent = _pipeline(cache)
+
+    first = await pipeline.execute("latest Apple headlines", Conversation())
+    events = [
+        e
+        async for e in pipeline.execute_with_events(
+            "latest Apple headlines?", Conversation()
+        )
+    ]
+
+    assert first.content == "Fresh answer"
+    assert cache._entries[0][1].expires_at - cache._entries[0][1].created_at == 300
+    assert running_agent.execute.await_count == 1
+    assert [e["type"] for e in events][-2:] == ["cache_hit", "output"]
+    assert events[-1]["cached"] is True
+    assert events[-1]["output"].content == "Fresh answer"
+
+    # Bypass runs the pipeline again and refreshes the entry
+    await pipeline.execute("latest Apple headlines", Conversation(), use_cache=False)
+    assert running_agent.execute.await_count == 2
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_partitions_cache_by_visible_memory():
+    cache = SemanticResponseCache(_embedder())
+    pipeline, running_agent = _pipeline(cache)
+
+    await pipeline.execute("latest Apple headlines", Conversation(user_id="u1"))
+    await pipeline.execute("latest Apple headlines", Conversation(user_id="u2"))
+    await pipeline.execute("latest Apple headlines", Conversation())
+    await pipeline.execute("latest Apple headlines", Conversation(user_id="u1"))
+
+    # Each caller reads different memories; only u1's repeat is served from cache
+    assert running_agent.execute.await_count == 3
+    assert len(cache) == 3
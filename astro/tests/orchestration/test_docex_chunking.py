@@ -0,0 +1,124 @@
+"""Tests for chunked document extraction in DocExStar."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from astro.core.chunking import chunk_text
+from astro.core.llm.tokens import count_tokens
+from astro.orchestration.context import ConstellationContext
+from astro.orchestration.stars import docex
+from astro.orchestration.stars.docex import DocExStar, merge_chunk_extractions
+
+pytestmark = pytest.mark.usefixtures("anthropic_env")
+
+
+class FakeLLM:
+    """Returns one JSON field per chunk, derived from the chunk's part number."""
+
+    model = "fake-model"
+
+    def __init__(self):
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        await asyncio.sleep(0.01)
+        self._in_flight -= 1
+        self.calls += 1
+        return AIMessage(
+            content=json.dumps({"Company": "Acme", "sections_seen": self.calls})
+        )
+
+
+@pytest.fixture(autouse=True)
+def clear_chunk_cache():
+    docex._chunk_cache.clear()
+
+
+def _document(sections: int) -> str:
+    return "\n\n".join(
+        f"## Section {i}\n" + f"Paragraph {i} text. " * 60 for i in range(sections)
+    )
+
+
+def _context(documents: list) -> ConstellationContext:
+    foundry = MagicMock()
+    foundry.get_directive.return_value = MagicMock(content="Extract company facts")
+    context = ConstellationContext(
+        run_id="run_1",
+        constellation_id="c1",
+        original_query="Summarize the filing",
+        foundry=foundry,
+    )
+    context.variables["documents"] = documents
+    return context
+
+
+def test_chunks_fit_budget_and_break_at_headings():
+    text = _document(6)
+    chunks = chunk_text(text, max_tokens=800, overlap_tokens=0, provider="anthropic")
+
+    assert len(chunks) > 1
+    assert all(count_tokens(c.text, provider="anthropic") <= 800 for c in chunks)
+    assert all(c.text.startswith("## Section") for c in chunks[1:])
+    assert "".join(c.text for c in chunks) == text
+
+
+def test_chunks_overlap():
+    text = "\n".join(f"row {i}: value {i * 7}" for i in range(400))
+    chunks = chunk_text(text, max_tokens=300, overlap_tokens=50, provider="anthropic")
+
+    assert len(chunks) > 1
+    for previous, current in zip(chunks, chunks[1:], strict=False):
+        assert current.start < previous.end
+        assert text[current.start : previous.end] in previous.text
+
+
+def test_chunk_text_hard_splits_unbroken_text():
+    chunks = chunk_text("x" * 5000, max_tokens=100, provider="anthropic")
+    assert all(c.tokens <= 100 for c in chunks)
+    assert "".join(c.text for c in chunks) == "x" * 5000
+
+
+def test_merge_dedups_repeated_fields_deterministically():
+    fields, text = merge_chunk_extractions(
+        [
+            {"content": "", "fields": {"Company": "Acme", "revenue": ["$1M"]}},
+            {"content": "", "fields": {"company": " acme ", "revenue": "$2M"}},
+            {"content": "Free text line\nfree text  line", "fields": None},
+        ]
+    )
+
+    assert fields == {"Company": "Acme", "revenue": ["$1M", "$2M"]}
+    assert text == "- Company: Acme\n- revenue: $1M; $2M\n\nFree text line"
+
+
+def test_execute_extracts_chunks_in_parallel_and_caches():
+    llm = FakeLLM()
+    star = DocExStar(
+        id="d", name="d", directive_id="dir", chunk_tokens=800, max_concurrency=2
+    )
+    documents = [{"id": "filing", "content": _document(8)}]
+
+    with patch("astro.core.llm.utils.get_langchain_llm", return_value=llm):
+        result = asyncio.run(star.execute(_context(documents)))
+        first_calls = llm.calls
+        again = asyncio.run(star.execute(_context(documents)))
+
+    extraction = result.documents[0]
+    assert extraction.metadata["chunks"] == first_calls > 1
+    assert llm.max_in_flight == 2
+    assert extraction.fields["Company"] == "Acme"
+    assert len(extraction.fields["sections_seen"]) == first_calls
+
+    # Re-running on the same file is served from the chunk cache
+    assert llm.calls == first_calls
+    assert again.documents[0].metadata["cached_chunks"] == first_calls
+    assert again.documents[0].fields == extraction.fields
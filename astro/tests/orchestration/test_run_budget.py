@@ -0,0 +1,198 @@
+"""Tests for per-run budgets and graceful degradation."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from astro.core.llm.routing import reset_router
+from astro.core.llm.usage import TokenUsage
+from astro.core.models.outputs import EvalDecision
+from astro.orchestration.context import ConstellationContext
+from astro.orchestration.models import (
+    Constellation,
+    Edge,
+    EndNode,
+    Position,
+    RunBudget,
+    StarNode,
+    StartNode,
+    StarType,
+)
+from astro.orchestration.runner import ConstellationRunner
+from astro.orchestration.stars.eval import EvalStar
+from astro.orchestration.stars.model_routing import route_star_llm
+from astro.orchestration.stars.worker import WorkerStar
+
+
+@pytest.fixture(autouse=True)
+def routing_env(anthropic_env, monkeypatch):
+    for var in ("LLM_FAST_MODEL", "LLM_STRONG_MODEL", "LLM_ROUTING"):
+        monkeypatch.delenv(var, raising=False)
+    reset_router()
+    yield
+    reset_router()
+
+
+def _response(input_tokens: int, output_tokens: int, model: str) -> AIMessage:
+    return AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+        response_metadata={"model": model},
+    )
+
+
+def _context(budget: RunBudget | None) -> ConstellationContext:
+    context = ConstellationContext(run_id="run_1", constellation_id="c1", budget=budget)
+    context.current_node_id = "node_1"
+    return context
+
+
+def test_usage_is_priced_from_the_response_model():
+    usage = TokenUsage.from_response(
+        _response(1_000_000, 100_000, "claude-sonnet-4-20250514")
+    )
+    assert usage.cost_usd == pytest.approx(3 + 1.5)
+    assert TokenUsage.from_response(_response(1000, 10, "unknown-model")).cost_usd == 0
+
+
+def test_request_budget_only_tightens_constellation_budget():
+    constellation = RunBudget(max_llm_calls=10, max_cost_usd=1.0)
+    merged = constellation.merge(RunBudget(max_llm_calls=20, max_wall_clock_s=30))
+    assert merged.max_llm_calls == 10
+    assert merged.max_cost_usd == 1.0
+    assert merged.max_wall_clock_s == 30
+    assert not RunBudget().is_limited
+
+
+def test_status_degrades_before_exceeding():
+    context = _context(RunBudget(max_llm_calls=5, degrade_at=0.6))
+    statuses = []
+    for _ in range(5):
+        context.record_llm_usage(_response(10, 10, "claude-sonnet-4"))
+        statuses.append(context.budget_status())
+    assert statuses == ["ok", "ok", "degraded", "degraded", "exceeded"]
+    assert context.tool_iteration_limit(100) == 2
+    with pytest.raises(Exception, match="max_llm_calls"):
+        context.check_budget()
+
+
+def test_degraded_run_routes_to_fast_tier_and_skips_eval():
+    context = _context(RunBudget(max_output_tokens=100))
+    worker = WorkerStar(id="w", name="w", directive_id="d")
+
+    _, decision = route_star_llm(worker, context)
+    assert decision.tier == "strong"
+
+    context.record_llm_usage(_response(10, 90, "claude-sonnet-4"))
+    _, decision = route_star_llm(worker, context)
+    assert (decision.tier, decision.reason) == ("fast", "run budget degraded")
+
+    decision = asyncio.run(EvalStar(id="e", name="e", directive_id="d").execute(context))
+    assert decision.decision == "continue"
+
+
+class SpendingStar:
+    """Star stub that spends output tokens on every execution."""
+
+    def __init__(self, star_id: str, output_tokens: int):
+        self.id = star_id
+        self.name = star_id
+        self.type = StarType.WORKER
+        self.directive_id = f"{star_id}_directive"
+        self.output_tokens = output_tokens
+        self.executions = 0
+
+    async def execute(self, context):
+        self.executions += 1
+        context.record_llm_usage(_response(10, self.output_tokens, "claude-sonnet-4"))
+        return SimpleNamespace(result="done", tool_calls=[])
+
+
+def test_runner_fails_before_next_node_once_budget_is_exceeded():
+    first, second = SpendingStar("s1", 600), SpendingStar("s2", 600)
+    constellation = Constellation(
+        id="c1",
+        name="Budgeted",
+        description="Budget test",
+        start=StartNode(id="start", position=Position(x=0, y=0)),
+        end=EndNode(id="end", position=Position(x=0, y=0)),
+        nodes=[
+            StarNode(id="n1", star_id="s1", position=Position(x=0, y=0)),
+            StarNode(id="n2", star_id="s2", position=Position(x=0, y=0)),
+        ],
+        edges=[
+            Edge(id="e1", source="start", target="n1"),
+            Edge(id="e2", source="n1", target="n2"),
+            Edge(id="e3", source="n2", target="end"),
+        ],
+        budget=RunBudget(max_output_tokens=10_000),
+    )
+    foundry = MagicMock()
+    foundry.get_constellation.return_value = constellation
+    foundry.get_star.side_effect = {"s1": first, "s2": second}.get
+    foundry.get_directive.return_value = None
+    foundry.upsert_run = AsyncMock()
+
+    runner = ConstellationRunner(foundry)
+    run = asyncio.run(
+        runner.run("c1", {}, budget=RunBudget(max_output_tokens=500))
+    )
+
+    assert (first.executions, second.executions) == (1, 0)
+    assert run.status == "failed"
+    assert run.error == "Run budget exceeded: max_output_tokens"
+    assert run.budget is not None and run.budget.max_output_tokens == 500
+    assert run.budget_status == "exceeded"
+    assert run.usage.output_tokens == 600
+    assert run.usage.cost_usd > 0
+
+
+def test_runner_forces_continue_when_degraded():
+    context = _context(RunBudget(max_llm_calls=1))
+    context.record_llm_usage(_response(10, 10, "claude-sonnet-4"))
+    decision = EvalDecision(decision="loop", reasoning="needs more")
+
+    runner = ConstellationRunner(MagicMock())
+    asyncio.run(
+        runner._handle_eval_decision(
+            decision, MagicMock(), context, SimpleNamespace(id="run_1"), "eval"
+        )
+    )
+    assert decision.decision == "continue"
+    assert context.loop_count == 0
+
+
+def test_parallel_nodes_record_usage_against_their_own_node():
+    class YieldingStar(SpendingStar):
+        async def execute(self, context):
+            # Let the other node start before this one records its usage
+            await asyncio.sleep(0.01)
+            return await super().execute(context)
+
+    stars = {"s1": YieldingStar("s1", 100), "s2": YieldingStar("s2", 300)}
+    nodes = [
+        StarNode(id="n1", star_id="s1", position=Position(x=0, y=0)),
+        StarNode(id="n2", star_id="s2", position=Position(x=0, y=0)),
+    ]
+    foundry = MagicMock()
+    foundry.get_star.side_effect = stars.get
+    foundry.get_directive.return_value = None
+    foundry.upsert_run = AsyncMock()
+    constellation = MagicMock(max_retry_attempts=0, retry_delay_base=0.0, nodes=nodes)
+    constellation.get_upstream_nodes.return_value = []
+    context = ConstellationContext(run_id="run_1", constellation_id="c1")
+    run = SimpleNamespace(id="run_1", node_outputs={}, usage=None, budget_status=None)
+
+    runner = ConstellationRunner(foundry)
+    asyncio.run(runner._execute_parallel_nodes(nodes, constellation, context, run))
+
+    assert context.get_node_usage("n1").output_tokens == 100
+    assert context.get_node_usage("n2").output_tokens == 300
+    assert "_unassigned" not in context.llm_usage
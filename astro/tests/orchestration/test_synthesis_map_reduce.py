@@ -0,0 +1,110 @@
+"""Tests for map-reduce synthesis in SynthesisStar."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from astro.core.models.outputs import ExecutionResult, WorkerOutput
+from astro.orchestration.context import ConstellationContext
+from astro.orchestration.stars.synthesis import SynthesisStar
+
+pytestmark = pytest.mark.usefixtures("anthropic_env")
+
+
+class FakeLLM:
+    """Records calls; map calls return short summaries, the final call a report."""
+
+    def __init__(self, fail_maps: bool = False):
+        self.map_calls = 0
+        self.final_messages = None
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self.fail_maps = fail_maps
+
+    async def ainvoke(self, messages, **kwargs):
+        if "Results to summarize" not in messages[-1].content:
+            self.final_messages = messages
+            return AIMessage(content="# Final report")
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        await asyncio.sleep(0.01)
+        self._in_flight -= 1
+        self.map_calls += 1
+        if self.fail_maps:
+            raise RuntimeError("provider down")
+        return AIMessage(content=f"summary {self.map_calls}")
+
+
+def _context(worker_count: int, result_chars: int) -> ConstellationContext:
+    foundry = MagicMock()
+    foundry.get_directive.return_value = MagicMock(content="Write a report", probe_ids=[])
+    context = ConstellationContext(
+        run_id="run_1",
+        constellation_id="c1",
+        original_query="Research the market",
+        foundry=foundry,
+    )
+    context.node_outputs["execution"] = ExecutionResult(
+        worker_outputs=[
+            WorkerOutput(result=f"finding {i} " + "x" * result_chars)
+            for i in range(worker_count)
+        ]
+    )
+    return context
+
+
+def _run(star: SynthesisStar, context: ConstellationContext, llm: FakeLLM):
+    with patch("astro.core.llm.utils.get_langchain_llm", return_value=llm):
+        return asyncio.run(star.execute(context))
+
+
+def test_small_input_uses_single_pass():
+    llm = FakeLLM()
+    star = SynthesisStar(id="s", name="s", directive_id="d")
+    output = _run(star, _context(worker_count=3, result_chars=100), llm)
+
+    assert llm.map_calls == 0
+    assert "map_reduce" not in output.metadata
+    assert output.formatted_result == "# Final report"
+
+
+def test_large_fan_out_reduces_hierarchically():
+    llm = FakeLLM()
+    star = SynthesisStar(
+        id="s",
+        name="s",
+        directive_id="d",
+        map_reduce_fan_in=3,
+        map_reduce_concurrency=2,
+        map_reduce_threshold_tokens=5,
+    )
+    output = _run(star, _context(worker_count=9, result_chars=2000), llm)
+
+    stats = output.metadata["map_reduce"]
+    # 9 outputs -> 3 summaries -> 1 summary
+    assert stats["levels"] == 2
+    assert stats["map_calls"] == 4
+    assert stats["output_items"] == 1
+    assert llm.max_in_flight <= 2
+
+    final_prompt = llm.final_messages[1].content
+    final_text = final_prompt if isinstance(final_prompt, str) else final_prompt[0]["text"]
+    assert "summary 4" in final_text
+    assert "x" * 2000 not in final_text
+
+
+def test_failed_map_calls_fall_back_to_excerpts():
+    llm = FakeLLM(fail_maps=True)
+    star = SynthesisStar(
+        id="s",
+        name="s",
+        directive_id="d",
+        map_reduce_fan_in=5,
+        map_reduce_threshold_tokens=5,
+    )
+    output = _run(star, _context(worker_count=10, result_chars=500), llm)
+
+    assert output.metadata["map_reduce"]["map_calls"] >= 2
+    assert output.formatted_result == "# Final report"
@@ -0,0 +1,59 @@
+"""Tests for resilient LLM calls from parallel workers."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage
+
+from astro.core.llm.resilience import (
+    ResiliencePolicy,
+    ResilientCaller,
+    ResilientChatModel,
+)
+from astro.core.models.directive import Directive
+from astro.orchestration.context import ConstellationContext
+from astro.orchestration.stars.worker import WorkerStar
+
+
+class StragglerModel:
+    """Chat model stub whose first call stalls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.5 if self.calls == 1 else 0)
+        return AIMessage(content=f"answer {self.calls}")
+
+
+def test_slow_worker_is_hedged_without_stalling_siblings(monkeypatch):
+    caller = ResilientCaller(
+        ResiliencePolicy(hedge=True, hedge_min_samples=5, timeout_s=1.0)
+    )
+    for _ in range(10):
+        caller.latency.record("chat:m", 0.05)
+    model = StragglerModel()
+    llm = ResilientChatModel(model, caller, "chat:m")
+    monkeypatch.setattr(
+        "astro.orchestration.stars.model_routing.route_star_llm",
+        lambda *args, **kwargs: (llm, None),
+    )
+    context = ConstellationContext(run_id="run_1", constellation_id="c1")
+    context.foundry = MagicMock()
+    context.foundry.get_directive.return_value = Directive(
+        id="d", name="d", description="d", content="Answer briefly."
+    )
+    workers = [WorkerStar(id=f"w{i}", name=f"w{i}", directive_id="d") for i in range(3)]
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        outputs = await asyncio.gather(*(w.execute(context) for w in workers))
+        return outputs, asyncio.get_running_loop().time() - started
+
+    outputs, elapsed = asyncio.run(run())
+
+    # The stalled call is raced by a hedge; no worker waits out the straggler
+    assert elapsed < 0.3
+    assert all(o.status == "completed" for o in outputs)
+    assert caller.stats["hedges"] == 1 and caller.stats["hedge_wins"] == 1
@@ -106,3 +106,126 @@ async def test_retrieve_passes_filter_metadata(retriever, mock_backend):
         limit=3,
         filter_metadata={"type": "user_query"},
     )
+
+
+@pytest.mark.asyncio
+async def test_retrieve_embeds_all_queries_in_one_batch(retriever, mock_backend, mock_embedding_provider):
+    mock_embedding_provider.embed_batch = AsyncMock(return_value=[[1.0], [2.0], [3.0]])
+
+    await retriever.retrieve(["q1", "q2", "q3"])
+
+    mock_embedding_provider.embed_batch.assert_called_once_with(["q1", "q2", "q3"])
+    mock_embedding_provider.embed.assert_not_called()
+    searched = [c.kwargs["query_embedding"] for c in mock_backend.search.call_args_list]
+    assert searched == [[1.0], [2.0], [3.0]]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_fuses_rankings_across_queries(retriever, mock_backend, mock_embedding_provider):
+    mems = {i: Memory(id=f"m{i}", content=f"r{i}", metadata={}, timestamp=1.0) for i in range(4)}
+    mock_embedding_provider.embed_batch = AsyncMock(return_value=[[1.0], [2.0]])
+    # m2 is relevant to both queries, so it outranks each query's top hit
+    mock_backend.search.side_effect = [[mems[0], mems[2]], [mems[1], mems[2], mems[3]]]
+
+    result = await retriever.retrieve(["q1", "q2"], top_k=3)
+
+    assert [m.id for m in result] == ["m2", "m0", "m1"]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_searches_concurrently_within_deadline(mock_backend, mock_embedding_provider):
+    import asyncio
+    import time
+
+    fast = Memory(id="fast", content="fast", metadata={}, timestamp=1.0)
+
+    async def search(query_embedding, limit, filter_metadata):
+        await asyncio.sleep(10 if query_embedding == [2.0] else 0.05)
+        return [fast]
+
+    mock_backend.search = AsyncMock(side_effect=search)
+    mock_embedding_provider.embed_batch = AsyncMock(return_value=[[1.0], [2.0], [3.0]])
+    retriever = MemoryRetriever(mock_backend, mock_embedding_provider, timeout_s=0.3)
+
+    started = time.monotonic()
+    result = await retriever.retrieve(["a", "slow", "c"])
+
+    assert time.monotonic() - started < 1
+    assert [m.id for m in result] == ["fast"]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_uses_backend_multi_vector_search(mock_embedding_provider):
+    mem = Memory(id="m1", content="hit", metadata={}, timestamp=1.0)
+
+    class MultiSearchBackend:
+        def __init__(self):
+            self.calls = []
+
+        async def search(self, query_embedding, limit=5, filter_metadata=None):
+            raise AssertionError("per-query search should not be used")
+
+        async def search_many(self, query_embeddings, limit=5, filter_metadata=None):
+            self.calls.append(query_embeddings)
+            return [[mem] for _ in query_embeddings]
+
+    backend = MultiSearchBackend()
+    mock_embedding_provider.embed_batch = AsyncMock(return_value=[[1.0], [2.0]])
+    retriever = MemoryRetriever(backend, mock_embedding_provider)
+
+    result = await retriever.retrieve(["q1", "q2"])
+
+    assert backend.calls == [[[1.0], [2.0]]]
+    assert [m.id for m in result] == ["m1"]
+
+
+@pytest.mark.asyncio
+async def test_second_brain_retrieves_fused_long_term_memories(mock_backend, mock_embedding_provider):
+    from astro.core.memory import ContextWindow, LongTermMemory, SecondBrain
+
+    shared = Memory(id="shared", content="shared", metadata={}, timestamp=1.0)
+    other = Memory(id="other", content="other", metadata={}, timestamp=1.0)
+    mock_backend.search.side_effect = [[shared], [other, shared]]
+    mock_embedding_provider.embed_batch = AsyncMock(return_value=[[1.0], [2.0]])
+    brain = SecondBrain(
+        ContextWindow(max_chars=1000),
+        LongTermMemory(backend=mock_backend, embedding_provider=mock_embedding_provider),
+    )
+
+    context = await brain.retrieve(queries=["q1", "q2"])
+
+    assert [m.id for m in context["long_term"]] == ["shared", "other"]
+    mock_embedding_provider.embed_batch.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_retrieve_applies_threshold_and_drops_near_duplicates(mock_backend, mock_embedding_provider):
+    def mem(id, score, embedding):
+        return Memory(id=id, content=id, metadata={}, timestamp=1.0, score=score, embedding=embedding)
+
+    mock_backend.search.return_value = [
+        mem("tsla_q4", 0.92, [1.0, 0.0, 0.0]),
+        mem("tsla_q4_copy", 0.91, [0.99, 0.01, 0.0]),
+        mem("tsla_margins", 0.85, [0.6, 0.8, 0.0]),
+        mem("weather", 0.2, [0.0, 0.0, 1.0]),
+    ]
+    retriever = MemoryRetriever(
+        mock_backend, mock_embedding_provider, default_top_k=4, default_similarity_threshold=0.5
+    )
+
+    result = await retriever.retrieve(["Tesla Q4"])
+
+    # Copy dropped as a duplicate, weather below threshold: fewer, distinct memories
+    assert [m.id for m in result] == ["tsla_q4", "tsla_margins"]
+
+
+def test_mmr_prefers_diverse_candidates():
+    import numpy as np
+
+    from astro.core.memory.retrieval import maximal_marginal_relevance
+
+    embeddings = [[1.0, 0.0], [0.9, 0.3], [0.0, 1.0]]
+    relevance = np.array([0.9, 0.88, 0.7])
+
+    assert maximal_marginal_relevance(embeddings, relevance, 2, mmr_lambda=1.0) == [0, 1]
+    assert maximal_marginal_relevance(embeddings, relevance, 2, mmr_lambda=0.5) == [0, 2]